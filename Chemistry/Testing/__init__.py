@@ -6,7 +6,14 @@
 __author__ = "Dan Obermiller"
 
 __all__ = ['test_acid_base_reactions', 'test_CML', 'test_compounds',
-           'test_isomorphism', 'test_periodic_helpers', 'test_components']
+           'test_isomorphism', 'test_periodic_helpers', 'test_components',
+           'test_network', 'test_profiling', 'test_benchmarks',
+           'test_batch', 'test_imports', 'test_spatial', 'test_SMILES', 'test_SDF',
+           'test_formats', 'test_compound_batch', 'test_rings',
+           'test_aromaticity', 'test_symmetry', 'test_distances',
+           'test_huckel', 'test_equilibrium',
+           'test_kinetics', 'test_registry',
+           'test_mass_index', 'test_isotopes']
 
 
 def helper(globs, verbosity=1):
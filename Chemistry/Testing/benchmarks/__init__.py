@@ -0,0 +1,224 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Reproducible performance benchmarks.
+
+Benchmarks live in the `bench_*` modules of this package and are registered
+with the `benchmark` decorator.  Run them all with
+
+    python -m Chemistry.Testing.benchmarks
+
+which writes the results to a JSON file (`RESULTS`, in the temporary
+directory, unless told otherwise) and compares them against the stored
+baseline (baseline.json, next to this file).  See `--help` for the options.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import json
+import os
+import pkgutil
+import tempfile
+import timeit
+from collections import OrderedDict
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+# Where a run's results go by default, out of the way of the working tree
+RESULTS = os.path.join(tempfile.gettempdir(), 'pycaos_benchmarks.json')
+
+_registry = OrderedDict()
+
+
+def benchmark(name, sizes=(None,)):
+    """Registers a benchmark.
+
+    Parameters
+    ----------
+    name : string
+        The name of the benchmark.  If `sizes` is given the name is formatted
+        with each size, for example 'construct.chain.{}'.
+    sizes : iterable, optional
+        Each size gets its own benchmark.
+
+    Returns
+    -------
+    function
+        The decorator.  The decorated function is called with a size (or with
+        no arguments, if no sizes were given) and does any setup needed, then
+        returns the zero-argument callable that actually gets timed.
+    """
+
+    def decorator(func):
+        for size in sizes:
+            if size is None:
+                _registry[name] = func
+            else:
+                _registry[name.format(size)] = (
+                    lambda size=size: func(size))
+        return func
+    return decorator
+
+
+def load_benchmarks():
+    """Imports every `bench_*` module so that its benchmarks get registered.
+
+    Returns
+    -------
+    OrderedDict
+        Maps each benchmark name to its setup function.
+    """
+
+    path = os.path.dirname(os.path.abspath(__file__))
+    for _, module, _ in pkgutil.iter_modules([path]):
+        if module.startswith('bench_'):
+            __import__('{}.{}'.format(__name__, module))
+    return _registry
+
+
+def _autorange(timer, minimum=0.02):
+    """Finds how many loops are needed for a single sample to take at least
+    `minimum` seconds, so that fast benchmarks aren't dominated by noise.
+    """
+
+    number = 1
+    while True:
+        if timer.timeit(number) >= minimum or number >= 1 << 20:
+            return number
+        number *= 2
+
+
+def run(names=None, repeat=5, verbose=False):
+    """Runs benchmarks.
+
+    Parameters
+    ----------
+    names : iterable, optional
+        Substrings; only benchmarks whose name contains one of them are run.
+        Runs every benchmark by default.
+    repeat : int, optional
+        How many samples to take of each benchmark.
+    verbose : bool, optional
+        Print each result as it is measured.
+
+    Returns
+    -------
+    results : OrderedDict
+        Maps each benchmark name to a dictionary with the 'best' and 'mean'
+        time per loop (in seconds), the number of 'loops' per sample and the
+        number of samples ('repeat').
+    """
+
+    results = OrderedDict()
+    for name, setup in load_benchmarks().iteritems():
+        if names and not any(part in name for part in names):
+            continue
+        timer = timeit.Timer(setup())
+        number = _autorange(timer)
+        samples = [total / number for total in timer.repeat(repeat, number)]
+        results[name] = {'best': min(samples),
+                         'mean': sum(samples) / len(samples),
+                         'loops': number,
+                         'repeat': repeat}
+        if verbose:
+            print('{:<48} {:>12.6f} ms'.format(name, min(samples) * 1e3))
+    return results
+
+
+def save(results, path):
+    """Writes results (or a baseline) to a JSON file.
+
+    Parameters
+    ----------
+    results : dict
+        As returned by `run`.
+    path : string
+        The file to write.
+    """
+
+    with open(path, 'w') as file_:
+        json.dump(results, file_, indent=4, sort_keys=True,
+                  separators=(',', ': '))
+        file_.write('\n')
+
+
+def load(path):
+    """Reads results (or a baseline) from a JSON file.
+
+    Parameters
+    ----------
+    path : string
+        The file to read.
+
+    Returns
+    -------
+    dict
+        The results; empty if the file doesn't exist.
+    """
+
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file_:
+        return json.load(file_)
+
+
+def compare(results, baseline, tolerance=1.25):
+    """Compares results against a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        As returned by `run`.
+    baseline : dict
+        Previously saved results.
+    tolerance : float, optional
+        How many times slower than the baseline a benchmark can be before it
+        counts as a regression.
+
+    Returns
+    -------
+    list
+        A (name, baseline time, current time, ratio, status) tuple for each
+        benchmark, where status is one of 'ok', 'faster', 'slower' or 'new'.
+        Times are the best time per loop.
+    """
+
+    comparison = []
+    for name, result in results.iteritems():
+        if name not in baseline:
+            comparison.append((name, None, result['best'], None, 'new'))
+            continue
+        base = baseline[name]['best']
+        ratio = result['best'] / base if base else float('inf')
+        if ratio > tolerance:
+            status = 'slower'
+        elif ratio < 1. / tolerance:
+            status = 'faster'
+        else:
+            status = 'ok'
+        comparison.append((name, base, result['best'], ratio, status))
+    return comparison
+
+
+def format_comparison(comparison):
+    """Formats the output of `compare` as a table.
+
+    Returns
+    -------
+    string
+    """
+
+    lines = ['{:<48} {:>12} {:>12} {:>8}  {}'.format(
+        'benchmark', 'base (ms)', 'now (ms)', 'ratio', 'status')]
+    for name, base, now, ratio, status in comparison:
+        lines.append('{:<48} {:>12} {:>12.4f} {:>8}  {}'.format(
+            name,
+            '-' if base is None else '{:.4f}'.format(base * 1e3),
+            now * 1e3,
+            '-' if ratio is None else '{:.2f}'.format(ratio),
+            status))
+    return '\n'.join(lines)
@@ -0,0 +1,52 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Command line entry point for the benchmarks.  Exits with a status of 1 if
+any benchmark regressed against the baseline.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import argparse
+import sys
+
+from Chemistry.Testing import benchmarks
+
+
+parser = argparse.ArgumentParser(description="Runs the benchmark suite")
+parser.add_argument('-o', '--output', dest='output',
+                    default=benchmarks.RESULTS,
+                    help='Where the results are written')
+parser.add_argument('-b', '--baseline', dest='baseline',
+                    default=benchmarks.BASELINE,
+                    help='The baseline the results are compared against')
+parser.add_argument('-s', '--save-baseline', dest='save_baseline',
+                    default=False, action='store_true',
+                    help='Overwrites the baseline with these results')
+parser.add_argument('-k', dest='names', action='append', default=[],
+                    help='Only run benchmarks whose name contains this')
+parser.add_argument('-r', '--repeat', dest='repeat', type=int, default=5,
+                    help='Samples taken of each benchmark')
+parser.add_argument('-t', '--tolerance', dest='tolerance', type=float,
+                    default=1.25,
+                    help='Slowdown factor that counts as a regression')
+args = parser.parse_args()
+
+results = benchmarks.run(args.names, args.repeat, verbose=True)
+benchmarks.save(results, args.output)
+print('Results written to {}'.format(args.output))
+
+if args.save_baseline:
+    baseline = benchmarks.load(args.baseline)
+    baseline.update(results)
+    benchmarks.save(baseline, args.baseline)
+else:
+    comparison = benchmarks.compare(results, benchmarks.load(args.baseline),
+                                    args.tolerance)
+    print('')
+    print(benchmarks.format_comparison(comparison))
+    if any(status == 'slower' for _, _, _, _, status in comparison):
+        sys.exit(1)
@@ -0,0 +1,55 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for Kekulizing and perceiving the aromaticity of fused aromatic
+systems: acenes and graphene-like sheets, given with aromatic bonds, up to
+thousands of atoms.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.aromaticity import kekulize_bonds
+from Chemistry.base.compounds import Compound
+
+
+# 10x10 is 240 carbons, 30x30 is 1920 and 50x50 is 5200
+SHEETS = (10, 30, 50)
+RINGS = (10, 100, 1000)
+
+
+def _acene(rings):
+    """An acene with its ring bonds flagged as aromatic."""
+
+    atoms, bonds = synthetic.polyaromatic(rings)
+    for first, second, info in bonds.itervalues():
+        if atoms[first] == atoms[second] == 'C':
+            info['aromatic'] = True
+    return atoms, bonds
+
+
+@benchmark('aromaticity.kekulize.polyaromatic.{}', RINGS)
+def kekulize_polyaromatic(rings):
+    atoms, bonds = _acene(rings)
+    return lambda: kekulize_bonds(atoms, bonds)
+
+
+@benchmark('aromaticity.kekulize.honeycomb.{}', SHEETS)
+def kekulize_honeycomb(size):
+    atoms, bonds = synthetic.honeycomb(size, size, aromatic=True)
+    return lambda: kekulize_bonds(atoms, bonds)
+
+
+@benchmark('aromaticity.perceive.honeycomb.{}', SHEETS)
+def perceive_honeycomb(size):
+    compound = Compound(*synthetic.honeycomb(size, size, aromatic=True))
+    # The rings are kept, so this times the electron counting alone
+    compound.rings
+
+    def run():
+        compound._perception.pop('aromaticity', None)
+        return len(compound.aromaticity.rings)
+    return run
@@ -0,0 +1,59 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for compound batches: packing a library, materializing its
+compounds, and what handing the library to a worker costs when it is shared
+('compound_batch.share_attach') rather than pickled
+('compound_batch.pickle').
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import cPickle
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.interface.compound_batch import CompoundBatch
+
+
+SIZES = (100, 1000)
+
+
+def _compounds(size):
+    return [Compound(atoms, bonds, {'id': 'M{}'.format(i)})
+            for i, (atoms, bonds) in enumerate(synthetic.library(size))]
+
+
+@benchmark('compound_batch.pack.library.{}', SIZES)
+def pack(size):
+    compounds = _compounds(size)
+    return lambda: CompoundBatch.from_compounds(compounds)
+
+
+@benchmark('compound_batch.materialize.library.{}', SIZES)
+def materialize(size):
+    batch = CompoundBatch.from_compounds(_compounds(size))
+    return lambda: sum(1 for _ in batch)
+
+
+@benchmark('compound_batch.share_attach.library.{}', SIZES)
+def share_attach(size):
+    batch = CompoundBatch.from_compounds(_compounds(size))
+
+    def run():
+        shared = batch.share()
+        try:
+            return len(CompoundBatch.attach(shared.name))
+        finally:
+            shared.unlink()
+    return run
+
+
+@benchmark('compound_batch.pickle.library.{}', SIZES)
+def pickle_library(size):
+    compounds = _compounds(size)
+    return lambda: cPickle.loads(cPickle.dumps(compounds,
+                                               cPickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,152 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for the core pipeline: building compounds, comparing them,
+splitting a canvas into molecules, CML round trips, pickling (what sending a
+compound to a worker process costs), thawing a frozen compound and acid-base
+reactions.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import cPickle
+import io
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.interface.reaction_utility import separate_molecules
+from Chemistry.parsing.CheML import CMLParser, CMLBuilder
+from Chemistry.reactions.acid_base import AcidBase
+
+
+SIZES = (10, 100, 1000)
+RINGS = (1, 10, 100)
+# Isomorphism is far slower than everything else
+SMALL_SIZES = (10, 100)
+SMALL_RINGS = (1, 10, 30)
+
+_HYDROXIDE = ({'a1': 'H', 'a2': 'O'},
+              {'b1': ('a1', 'a2', {'order': 1, 'chirality': None})})
+
+
+def _alcohol(n):
+    """A fully hydrogenated alcohol with `n` carbons, along with the keys of
+    its oxygen and the acidic hydrogen on that oxygen.
+    """
+
+    atoms, bonds = synthetic.chain(n, heteroatom='O')
+    oxygen = next(key for key, symbol in atoms.iteritems() if symbol == 'O')
+    for first, second, _ in bonds.itervalues():
+        if oxygen in (first, second):
+            other = second if first == oxygen else first
+            if atoms[other] == 'H':
+                hydrogen = other
+    return Compound(atoms, bonds, {'id': 'Alcohol'}), oxygen, hydrogen
+
+
+@benchmark('construct.chain.{}', SIZES)
+def construct_chain(size):
+    atoms, bonds = synthetic.chain(size)
+    return lambda: Compound(atoms, bonds, {})
+
+
+@benchmark('construct.ring.{}', SIZES)
+def construct_ring(size):
+    atoms, bonds = synthetic.ring(size, hydrogens=0.75)
+    return lambda: Compound(atoms, bonds, {})
+
+
+@benchmark('construct.polyaromatic.{}', RINGS)
+def construct_polyaromatic(rings):
+    atoms, bonds = synthetic.polyaromatic(rings)
+    return lambda: Compound(atoms, bonds, {})
+
+
+@benchmark('isomorphic.chain.{}', SMALL_SIZES)
+def isomorphic_chain(size):
+    atoms, bonds = synthetic.chain(size)
+    first, second = Compound(atoms, bonds, {}), Compound(atoms, bonds, {})
+    return lambda: first.is_isomorphic(second)
+
+
+@benchmark('isomorphic.polyaromatic.{}', SMALL_RINGS)
+def isomorphic_polyaromatic(rings):
+    atoms, bonds = synthetic.polyaromatic(rings)
+    first, second = Compound(atoms, bonds, {}), Compound(atoms, bonds, {})
+    return lambda: first.is_isomorphic(second)
+
+
+@benchmark('separate.library.{}', SIZES)
+def separate_library(size):
+    atoms, bonds = synthetic.mixture(synthetic.library(size))
+    return lambda: separate_molecules(atoms, bonds)
+
+
+@benchmark('cml.build.chain.{}', SIZES)
+def cml_build(size):
+    atoms, bonds = synthetic.chain(size)
+    compound = Compound(atoms, bonds, {'id': 'Chain'})
+    return lambda: str(CMLBuilder.from_compound(compound))
+
+
+@benchmark('cml.parse.chain.{}', SIZES)
+def cml_parse(size):
+    atoms, bonds = synthetic.chain(size)
+    cml = str(CMLBuilder.from_compound(Compound(atoms, bonds, {'id': 'Chain'})))
+    return lambda: CMLParser(io.BytesIO(cml))
+
+
+@benchmark('pickle.dumps.chain.{}', SIZES)
+def pickle_dumps(size):
+    atoms, bonds = synthetic.chain(size)
+    compound = Compound(atoms, bonds, {'id': 'Chain'})
+    return lambda: cPickle.dumps(compound, cPickle.HIGHEST_PROTOCOL)
+
+
+@benchmark('pickle.loads.chain.{}', SIZES)
+def pickle_loads(size):
+    atoms, bonds = synthetic.chain(size)
+    data = cPickle.dumps(Compound(atoms, bonds, {'id': 'Chain'}),
+                         cPickle.HIGHEST_PROTOCOL)
+    return lambda: cPickle.loads(data)
+
+
+@benchmark('thaw.chain.{}', SIZES)
+def thaw(size):
+    atoms, bonds = synthetic.chain(size)
+    return Compound(atoms, bonds, {'id': 'Chain'}).freeze().thaw
+
+
+@benchmark('to_conjugate_acid.alcohol.{}', SIZES)
+def to_conjugate_acid(size):
+    compound, oxygen, _ = _alcohol(size)
+    base = Base(compound, oxygen, 16)
+    return base.to_conjugate_acid
+
+
+@benchmark('acid_base.react.alcohol.{}', SIZES)
+def acid_base_react(size):
+    compound, _, hydrogen = _alcohol(size)
+    acid = Acid(compound, hydrogen, 4.76)
+    base = Base(Compound(_HYDROXIDE[0], _HYDROXIDE[1], {'id': 'Hydroxide'}),
+                'a2', 15.7)
+    return AcidBase(acid, base, {}).react
+
+
+@benchmark('edit.chain.{}', SIZES)
+def edit_chain(size):
+    atoms, bonds = synthetic.chain(size)
+    compound = Compound(atoms, bonds, {})
+    compound.charge
+    compound.components
+    carbon = next(key for key, symbol in atoms.iteritems() if symbol == 'C')
+
+    def run():
+        key = compound.add_atom('C')
+        compound.add_bond(carbon, key)
+        compound.remove_atom(key)
+    return run
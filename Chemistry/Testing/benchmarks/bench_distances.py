@@ -0,0 +1,48 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for topological distances: filling the whole matrix for chains
+and sheets, and neighbourhood queries on a sheet too large for the whole
+matrix to be found.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+
+
+CHAINS = (100, 1000)
+# 10x10 is 240 carbons and 20x20 is 880
+SHEETS = (10, 20)
+
+
+def _matrix(compound):
+    def run():
+        compound._perception.pop('distances', None)
+        return compound.distances.matrix.shape
+    return run
+
+
+@benchmark('distances.matrix.chain.{}', CHAINS)
+def matrix_chain(n):
+    return _matrix(Compound(*synthetic.chain(n, hydrogens=0)))
+
+
+@benchmark('distances.matrix.honeycomb.{}', SHEETS)
+def matrix_honeycomb(size):
+    return _matrix(Compound(*synthetic.honeycomb(size, size, aromatic=True)))
+
+
+@benchmark('distances.within.honeycomb.50')
+def within_honeycomb():
+    compound = Compound(*synthetic.honeycomb(50, 50, aromatic=True))
+    keys = sorted(compound.atoms)[::500]
+
+    def run():
+        compound._perception.pop('distances', None)
+        return [len(compound.distances.within(key, 3)) for key in keys]
+    return run
@@ -0,0 +1,42 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for solving the acid-base equilibrium of solutions of many
+species, and for speciation curves of a library over a 1000 point pH sweep.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import random
+
+import numpy as np
+
+from Chemistry.Testing.benchmarks import benchmark
+from Chemistry.reactions.equilibrium import Solution, speciation
+
+
+FAMILIES = (10, 100, 1000)
+
+
+@benchmark('equilibrium.solve.{}', FAMILIES)
+def solve(size):
+    rng = random.Random(0)
+    solution = Solution()
+    for number in range(size):
+        pkas = sorted(rng.uniform(-2, 16) for _ in range(rng.randint(1, 3)))
+        solution.add(number, rng.uniform(0, 0.01), pkas,
+                     added=rng.randint(0, len(pkas)))
+    return solution.solve
+
+
+@benchmark('equilibrium.speciation.library.{}', (100, 1000))
+def speciation_library(size):
+    rng = np.random.RandomState(0)
+    pkas = np.sort(rng.uniform(-2, 16, (size, 3)), axis=1)
+    # Every other compound only has two pKas
+    pkas[::2, 2] = np.nan
+    ph = np.linspace(0, 14, 1000)
+    return lambda: speciation(pkas[:, np.newaxis, :], ph)
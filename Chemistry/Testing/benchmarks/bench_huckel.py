@@ -0,0 +1,36 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for Huckel molecular orbitals: a library of small molecules
+solved one at a time and all together, and a single large sheet.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.huckel import huckel, huckel_batch
+
+
+LIBRARIES = (100, 1000)
+
+
+@benchmark('huckel.single.library.{}', LIBRARIES)
+def single_library(size):
+    compounds = [Compound(*molecule) for molecule in synthetic.library(size)]
+    return lambda: [huckel(compound) for compound in compounds]
+
+
+@benchmark('huckel.batch.library.{}', LIBRARIES)
+def batch_library(size):
+    compounds = [Compound(*molecule) for molecule in synthetic.library(size)]
+    return lambda: huckel_batch(compounds)
+
+
+@benchmark('huckel.honeycomb.10')
+def honeycomb():
+    compound = Compound(*synthetic.honeycomb(10, 10, aromatic=True))
+    return lambda: huckel(compound)
@@ -0,0 +1,46 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for import time.  Each sample starts a fresh interpreter, so the
+times include the interpreter's own startup (see 'import.nothing').
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import subprocess
+import sys
+
+from Chemistry.Testing.benchmarks import benchmark
+
+
+def _importer(statement):
+    command = [sys.executable, '-c', statement]
+    return lambda: subprocess.check_call(command)
+
+
+@benchmark('import.nothing')
+def import_nothing():
+    return _importer('pass')
+
+
+@benchmark('import.Chemistry')
+def import_chemistry():
+    return _importer('import Chemistry')
+
+
+@benchmark('import.reactions')
+def import_reactions():
+    return _importer('from Chemistry.reactions import AcidBase')
+
+
+@benchmark('import.compounds')
+def import_compounds():
+    return _importer('from Chemistry.base.compounds import Compound')
+
+
+@benchmark('import.CheML')
+def import_cml():
+    return _importer('from Chemistry.parsing.CheML import CMLParser')
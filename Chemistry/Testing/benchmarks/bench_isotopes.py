@@ -0,0 +1,37 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for isotope patterns: single molecules of increasing size, and
+libraries of synthetic formulas computed as a batch.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import numpy as np
+
+from Chemistry.Testing.benchmarks import benchmark
+from Chemistry.base.isotopes import isotope_pattern, isotope_patterns
+
+
+SIZES = (100, 10000, 100000)
+LIBRARIES = (1000, 100000)
+
+
+@benchmark('isotopes.molecule.{}', SIZES)
+def molecule(size):
+    formula = 'C{}H{}N{}O{}S{}'.format(size, 2 * size, size // 4, size // 3,
+                                       max(size // 50, 1))
+    return lambda: isotope_pattern(formula)
+
+
+@benchmark('isotopes.library.{}', LIBRARIES)
+def library(size):
+    random = np.random.RandomState(0)
+    formulas = ['C{}H{}N{}O{}S{}Cl{}'.format(*counts) for counts in zip(
+        random.randint(1, 60, size), random.randint(0, 120, size),
+        random.randint(0, 8, size), random.randint(0, 12, size),
+        random.randint(0, 3, size), random.randint(0, 4, size))]
+    return lambda: isotope_patterns(formulas)
@@ -0,0 +1,38 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for simulating random, stiff reaction networks, from a size
+solved with dense matrices to one solved iteratively.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import numpy as np
+
+from Chemistry.Testing.benchmarks import benchmark
+from Chemistry.reactions.kinetics import Kinetics
+
+
+SPECIES = (100, 1000, 3000)
+
+
+@benchmark('kinetics.simulate.{}', SPECIES)
+def simulate(size):
+    random = np.random.RandomState(0)
+    network = Kinetics()
+    for number in range(size):
+        network.add_species(number)
+    # Twice as many reactions as species, half of them reversible
+    # associations, with rate constants six orders of magnitude apart
+    for _ in range(size):
+        first, second, third = random.randint(0, size, 3)
+        network.add_reaction([first], [second], 10 ** random.uniform(-2, 4))
+        network.add_reaction([first, second], [third],
+                             10 ** random.uniform(-2, 4),
+                             10 ** random.uniform(-3, 1))
+    initial = random.uniform(0, 1, size)
+    times = np.linspace(0, 10, 11)
+    return lambda: network.simulate(initial, times)
@@ -0,0 +1,63 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for the mass and formula index: building it from a library of
+synthetic entries, and weight window and isomer queries against it.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import numpy as np
+
+from Chemistry.Testing.benchmarks import benchmark
+from Chemistry.interface.mass_index import MassIndex
+
+
+SIZES = (100000, 1000000)
+
+
+def _entries(size):
+    random = np.random.RandomState(0)
+    formulas = ['C{}H{}O{}'.format(carbons, hydrogens, oxygens)
+                for carbons in range(1, 40) for hydrogens in range(0, 80, 2)
+                for oxygens in range(7)]
+    masses = random.uniform(10, 600, size).tolist()
+    chosen = [formulas[number]
+              for number in random.randint(0, len(formulas), size)]
+    return masses, chosen
+
+
+def _index(size):
+    index = MassIndex()
+    for mass, formula in zip(*_entries(size)):
+        index.add_entry(mass, formula)
+    index.isomers('C6H12O6')
+    return index
+
+
+@benchmark('mass_index.build.{}', SIZES)
+def build(size):
+    masses, formulas = _entries(size)
+
+    def run():
+        index = MassIndex()
+        for mass, formula in zip(masses, formulas):
+            index.add_entry(mass, formula)
+        index.mass_range(0, 1)
+
+    return run
+
+
+@benchmark('mass_index.mass_range.{}', SIZES)
+def mass_range(size):
+    index = _index(size)
+    return lambda: index.mass_range(180.0, 180.1)
+
+
+@benchmark('mass_index.isomers.{}', SIZES)
+def isomers(size):
+    index = _index(size)
+    return lambda: index.isomers('C6H12O6')
@@ -0,0 +1,51 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for the compound registry: registering a library in batches,
+finding each of its compounds again by canonical key, and a query over a mass
+window.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.interface.registry import CompoundRegistry, canonical_key
+
+
+SIZES = (100, 1000)
+
+
+def _compounds(size):
+    return [Compound(atoms, bonds, {'id': 'M{}'.format(i)})
+            for i, (atoms, bonds) in enumerate(synthetic.library(size))]
+
+
+@benchmark('registry.add_many.library.{}', SIZES)
+def add_many(size):
+    compounds = _compounds(size)
+
+    def run():
+        with CompoundRegistry(':memory:') as registry:
+            registry.add_many(compounds)
+
+    return run
+
+
+@benchmark('registry.lookup.library.{}', SIZES)
+def lookup(size):
+    compounds = _compounds(size)
+    registry = CompoundRegistry(':memory:')
+    registry.add_many(compounds)
+    keys = [canonical_key(compound) for compound in compounds]
+    return lambda: [registry.lookup(key) for key in keys]
+
+
+@benchmark('registry.mass_range.library.{}', SIZES)
+def mass_range(size):
+    registry = CompoundRegistry(':memory:')
+    registry.add_many(_compounds(size))
+    return lambda: registry.in_mass_range(100, 200)
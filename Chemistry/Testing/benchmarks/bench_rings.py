@@ -0,0 +1,38 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for ring perception on fused polycyclic systems: acenes (fused in
+a line) and honeycomb sheets (fused in two directions), up to thousands of
+atoms.  The perception is thrown away before each run, so these time finding
+the rings rather than the cache.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+
+
+RINGS = (10, 100, 1000)
+# 10x10 is 242 carbons, 30x30 is 1922 and 50x50 is 5202
+SHEETS = (10, 30, 50)
+
+
+def _rings(compound):
+    def run():
+        compound._perception.clear()
+        return len(compound.rings)
+    return run
+
+
+@benchmark('rings.polyaromatic.{}', RINGS)
+def rings_polyaromatic(rings):
+    return _rings(Compound(*synthetic.polyaromatic(rings, hydrogens=0)))
+
+
+@benchmark('rings.honeycomb.{}', SHEETS)
+def rings_honeycomb(size):
+    return _rings(Compound(*synthetic.honeycomb(size, size, hydrogens=0)))
@@ -0,0 +1,66 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for SD files: streaming every record of a library (plain, and
+gzipped through `formats.open_compound_file`), indexing a library by byte
+offset, and writing a library out.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import gzip
+import io
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.interface.formats import open_compound_file
+from Chemistry.parsing.SDF import SDFBuilder, build_index, iterparse
+
+
+RECORDS = (100, 1000, 10000)
+
+
+def _molecules(records):
+    return [{'atoms': atoms, 'bonds': bonds,
+             'other_info': {'id': 'M{}'.format(i)}}
+            for i, (atoms, bonds) in enumerate(synthetic.library(records))]
+
+
+def _sdf_file(records):
+    """The library of `records` synthetic molecules as an SD file."""
+
+    return ''.join(str(SDFBuilder(molecule))
+                   for molecule in _molecules(records))
+
+
+@benchmark('sdf.iterparse.library.{}', RECORDS[:2])
+def sdf_iterparse(records):
+    text = _sdf_file(records)
+    return lambda: sum(1 for _ in iterparse(io.BytesIO(text)))
+
+
+@benchmark('sdf.iterparse.gzip.{}', RECORDS[:2])
+def sdf_iterparse_gzip(records):
+    compressed = io.BytesIO()
+    with gzip.GzipFile(fileobj=compressed, mode='wb') as output:
+        output.write(_sdf_file(records))
+    data = compressed.getvalue()
+
+    def run():
+        opened = open_compound_file(io.BytesIO(data))
+        return sum(1 for _ in opened.format.iterparse(opened))
+    return run
+
+
+@benchmark('sdf.index.library.{}', RECORDS)
+def sdf_index(records):
+    text = _sdf_file(records)
+    return lambda: len(build_index(io.BytesIO(text)))
+
+
+@benchmark('sdf.build.library.{}', RECORDS[:2])
+def sdf_build(records):
+    molecules = _molecules(records)
+    return lambda: [str(SDFBuilder(molecule)) for molecule in molecules]
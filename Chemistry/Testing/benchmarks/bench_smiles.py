@@ -0,0 +1,59 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for SMILES: parsing a file of many molecules line by line,
+writing canonical SMILES, and parsing and canonicalizing single large
+molecules (compare 'smiles.parse.chain' with 'cml.parse.chain').
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import io
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.parsing.SMILES import SMILESBuilder, iterparse, parse_smiles
+
+
+LINES = (100, 1000, 10000)
+SIZES = (10, 100, 1000)
+
+
+def _smiles_file(lines):
+    """The library of `lines` synthetic molecules as a SMILES file."""
+
+    output = []
+    for i, (atoms, bonds) in enumerate(synthetic.library(lines)):
+        builder = SMILESBuilder({'atoms': atoms, 'bonds': bonds,
+                                 'other_info': {'id': 'M{}'.format(i)}})
+        output.append(str(builder) + '\n')
+    return ''.join(output)
+
+
+@benchmark('smiles.iterparse.library.{}', LINES)
+def smiles_iterparse(lines):
+    text = _smiles_file(lines)
+    return lambda: sum(1 for _ in iterparse(io.BytesIO(text)))
+
+
+@benchmark('smiles.parse.chain.{}', SIZES)
+def smiles_parse_chain(size):
+    atoms, bonds = synthetic.chain(size)
+    smiles = SMILESBuilder({'atoms': atoms, 'bonds': bonds}).smiles
+    return lambda: parse_smiles(smiles)
+
+
+@benchmark('smiles.build.library.{}', LINES[:2])
+def smiles_build(lines):
+    molecules = [{'atoms': atoms, 'bonds': bonds}
+                 for atoms, bonds in synthetic.library(lines)]
+    return lambda: [SMILESBuilder(molecule).smiles for molecule in molecules]
+
+
+@benchmark('smiles.build.chain.{}', SIZES)
+def smiles_build_chain(size):
+    atoms, bonds = synthetic.chain(size)
+    molecule = {'atoms': atoms, 'bonds': bonds}
+    return lambda: SMILESBuilder(molecule).smiles
@@ -0,0 +1,80 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for the spatial index the GUI uses for hit-testing, with atoms
+placed at random on a canvas that grows with their number.  The
+'spatial.scan' benchmarks are the linear scan it replaced, for comparison.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import random
+
+from Chemistry.Testing.benchmarks import benchmark
+from Chemistry.interface.spatial import SpatialIndex
+
+
+SIZES = (100, 1000, 10000)
+MARGIN = 15
+# Leave about 50 units by 50 units for each atom
+SPACING = 50
+
+
+def _placed(size, seed=0):
+    rng = random.Random(seed)
+    side = SPACING * size ** 0.5
+    points = {'a{}'.format(i): (rng.uniform(0, side), rng.uniform(0, side))
+              for i in xrange(size)}
+    touches = [(rng.uniform(0, side), rng.uniform(0, side))
+               for _ in xrange(100)]
+    return points, touches
+
+
+def _index(points):
+    index = SpatialIndex(2 * MARGIN)
+    for key, pos in points.iteritems():
+        index.insert(key, pos)
+    return index
+
+
+@benchmark('spatial.build.{}', SIZES)
+def build(size):
+    points, _ = _placed(size)
+    return lambda: _index(points)
+
+
+@benchmark('spatial.hit.{}', SIZES)
+def hit(size):
+    points, touches = _placed(size)
+    index = _index(points)
+
+    def run():
+        for touch in touches:
+            index.hit(touch, MARGIN)
+    return run
+
+
+@benchmark('spatial.scan.{}', SIZES)
+def scan(size):
+    points, touches = _placed(size)
+
+    def run():
+        for tx, ty in touches:
+            for key, (x, y) in points.iteritems():
+                if abs(x - tx) <= MARGIN and abs(y - ty) <= MARGIN:
+                    break
+    return run
+
+
+@benchmark('spatial.rect.{}', SIZES)
+def rect(size):
+    points, touches = _placed(size)
+    index = _index(points)
+
+    def run():
+        for x, y in touches:
+            index.query_rect(x, y, x + 4 * SPACING, y + 4 * SPACING)
+    return run
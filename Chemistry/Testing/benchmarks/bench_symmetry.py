@@ -0,0 +1,39 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Benchmarks for finding symmetry classes: long chains, where every atom but
+the middle one has a mirror image, and graphene-like sheets, which have many
+symmetries at once.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry.Testing.benchmarks import benchmark, synthetic
+from Chemistry.base.compounds import Compound
+
+
+CHAINS = (100, 1000)
+SHEETS = (10, 30, 50)
+
+
+def _timed(compound):
+    # The resonance candidates are kept, so this times the search alone
+    compound.resonance_candidates
+
+    def run():
+        compound._perception.pop('symmetry', None)
+        return len(compound.symmetry_classes)
+    return run
+
+
+@benchmark('symmetry.chain.{}', CHAINS)
+def chain(n):
+    return _timed(Compound(*synthetic.chain(n, hydrogens=0)))
+
+
+@benchmark('symmetry.honeycomb.{}', SHEETS)
+def honeycomb(size):
+    return _timed(Compound(*synthetic.honeycomb(size, size, aromatic=True)))
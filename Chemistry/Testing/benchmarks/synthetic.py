@@ -0,0 +1,287 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Generators for synthetic molecules of arbitrary size.
+
+Every generator returns a pair of dictionaries (atoms, bonds) in the form the
+Compound constructor takes, so they can be used for Compounds, for
+`separate_molecules`, or written out to a file.  Generators that make random
+choices take a `seed`, so the same arguments always give the same molecule.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import random
+
+
+class _Builder(object):
+    """Accumulates atoms and bonds, handing out sequential keys."""
+
+    def __init__(self, atoms=None, bonds=None):
+        self.atoms = {} if atoms is None else atoms
+        self.bonds = {} if bonds is None else bonds
+        self.free = {}
+
+    def atom(self, symbol, valence=0):
+        key = 'a{}'.format(len(self.atoms) + 1)
+        self.atoms[key] = symbol
+        self.free[key] = valence
+        return key
+
+    def bond(self, first, second, order=1, aromatic=False):
+        key = 'b{}'.format(len(self.bonds) + 1)
+        self.bonds[key] = (first, second, {'order': order, 'chirality': None})
+        if aromatic:
+            self.bonds[key][2]['aromatic'] = True
+        self.free[first] -= order
+        self.free[second] -= order
+        return key
+
+    def hydrogenate(self, keys, hydrogens=1.0, seed=0):
+        """Bonds hydrogens to the open valences of the given atoms.
+
+        Parameters
+        ----------
+        keys : list
+            The atoms that get hydrogens.
+        hydrogens : float, optional
+            The fraction of open valences that are filled.  Values below 1
+            leave randomly chosen valences open.
+        seed : int, optional
+            Seeds the random choice of open valences.
+        """
+
+        rng = random.Random(seed)
+        for key in keys:
+            for _ in range(max(self.free[key], 0)):
+                if hydrogens >= 1 or rng.random() < hydrogens:
+                    self.bond(key, self.atom('H', 1))
+
+    def result(self):
+        return self.atoms, self.bonds
+
+
+def chain(n, hydrogens=1.0, seed=0, heteroatom=None):
+    """A straight chain of carbons (an alkane when fully hydrogenated).
+
+    Parameters
+    ----------
+    n : int
+        The number of carbons.
+    hydrogens : float, optional
+        The fraction of open valences that are filled with hydrogens.
+    seed : int, optional
+        Seeds the random choice of open valences when `hydrogens` < 1.
+    heteroatom : string, optional
+        If given ('O' or 'N', for example) it is added to the end of the chain,
+        turning it into an alcohol, amine, etc.
+
+    Returns
+    -------
+    tuple
+        The (atoms, bonds) dictionaries.
+    """
+
+    builder = _Builder()
+    carbons = [builder.atom('C', 4) for _ in range(n)]
+    for first, second in zip(carbons, carbons[1:]):
+        builder.bond(first, second)
+    heavy = list(carbons)
+    if heteroatom is not None:
+        valence = {'O': 2, 'N': 3, 'S': 2}.get(heteroatom, 1)
+        hetero = builder.atom(heteroatom, valence)
+        if carbons:
+            builder.bond(carbons[-1], hetero)
+        heavy.append(hetero)
+    builder.hydrogenate(heavy, hydrogens, seed)
+    return builder.result()
+
+
+def ring(n, hydrogens=1.0, seed=0):
+    """A single ring of carbons (a cycloalkane when fully hydrogenated).
+
+    Parameters
+    ----------
+    n : int
+        The ring size; must be at least 3.
+    hydrogens : float, optional
+        The fraction of open valences that are filled with hydrogens.
+    seed : int, optional
+        Seeds the random choice of open valences when `hydrogens` < 1.
+
+    Returns
+    -------
+    tuple
+        The (atoms, bonds) dictionaries.
+    """
+
+    if n < 3:
+        raise ValueError("A ring needs at least 3 atoms, not {}".format(n))
+    builder = _Builder()
+    carbons = [builder.atom('C', 4) for _ in range(n)]
+    for i, first in enumerate(carbons):
+        builder.bond(first, carbons[(i + 1) % n])
+    builder.hydrogenate(carbons, hydrogens, seed)
+    return builder.result()
+
+
+def polyaromatic(rings, hydrogens=1.0, seed=0):
+    """A linear acene (benzene, naphthalene, anthracene, ...) in a Kekule
+    form.
+
+    Parameters
+    ----------
+    rings : int
+        The number of fused six-membered rings.
+    hydrogens : float, optional
+        The fraction of open valences that are filled with hydrogens.
+    seed : int, optional
+        Seeds the random choice of open valences when `hydrogens` < 1.
+
+    Returns
+    -------
+    tuple
+        The (atoms, bonds) dictionaries.
+
+    Notes
+    -----
+    The acene is built as a ladder of two chains of 2*rings + 1 carbons joined
+    by a rung at every even position.  Chain bonds (0, 1), (2, 3), ... and the
+    final rung are double, which gives every carbon exactly one double bond.
+    """
+
+    if rings < 1:
+        raise ValueError("Need at least one ring, not {}".format(rings))
+    builder = _Builder()
+    length = 2 * rings + 1
+    top = [builder.atom('C', 4) for _ in range(length)]
+    bottom = [builder.atom('C', 4) for _ in range(length)]
+    for row in (top, bottom):
+        for i in range(length - 1):
+            builder.bond(row[i], row[i + 1], 2 if i % 2 == 0 else 1)
+    for i in range(0, length, 2):
+        builder.bond(top[i], bottom[i], 2 if i == length - 1 else 1)
+    builder.hydrogenate(top + bottom, hydrogens, seed)
+    return builder.result()
+
+
+def honeycomb(rows, columns, hydrogens=1.0, seed=0, aromatic=False):
+    """A sheet of fused six-membered rings (a piece of hydrogenated graphene),
+    `rows` rings high and `columns` rings wide.
+
+    Parameters
+    ----------
+    rows, columns : int
+        The size of the sheet, in rings.
+    hydrogens : float, optional
+        The fraction of open valences that are filled with hydrogens.
+    seed : int, optional
+        Seeds the random choice of open valences when `hydrogens` < 1.
+    aromatic : bool, optional
+        Makes the sheet a polycyclic aromatic hydrocarbon (a piece of
+        graphene) instead, with every carbon-carbon bond flagged as aromatic
+        for the Compound constructor to Kekulize.
+
+    Returns
+    -------
+    tuple
+        The (atoms, bonds) dictionaries.
+
+    Notes
+    -----
+    The sheet is laid out as a brick wall: rows + 1 chains of 2*columns + 2
+    carbons, with a bond between neighbouring chains at every other carbon,
+    alternating from one pair of chains to the next.  Every brick is a ring.
+    All of the bonds are single, unless the sheet is aromatic.
+    """
+
+    if rows < 1 or columns < 1:
+        raise ValueError("Need at least one ring, not {}x{}".format(rows,
+                                                                   columns))
+    builder = _Builder()
+    width = 2 * columns + 2
+    # The first chain's last carbon and one end of the last chain aren't in
+    # any brick; an aromatic sheet leaves them out, and its carbons keep one
+    # valence for their double bonds
+    outside = set()
+    if aromatic:
+        outside = {(0, width - 1), (rows, width - 1 if rows % 2 else 0)}
+    grid = [[None if (r, i) in outside else
+             builder.atom('C', 3 if aromatic else 4) for i in range(width)]
+            for r in range(rows + 1)]
+    pairs = [(row[i], row[i + 1]) for row in grid for i in range(width - 1)]
+    for r in range(rows):
+        for i in range(r % 2, width - 1 + r % 2, 2):
+            pairs.append((grid[r][i], grid[r + 1][i]))
+    for first, second in pairs:
+        if first is not None and second is not None:
+            builder.bond(first, second, aromatic=aromatic)
+    builder.hydrogenate([key for row in grid for key in row
+                         if key is not None], hydrogens, seed)
+    return builder.result()
+
+
+def mixture(parts):
+    """Combines several molecules into one set of dictionaries, renumbering the
+    keys so none collide.  Useful as input to `separate_molecules`.
+
+    Parameters
+    ----------
+    parts : iterable
+        (atoms, bonds) pairs, as returned by the other generators.
+
+    Returns
+    -------
+    tuple
+        The combined (atoms, bonds) dictionaries.
+    """
+
+    atoms, bonds = {}, {}
+    for part_atoms, part_bonds in parts:
+        offset_a, offset_b = len(atoms), len(bonds)
+        rename = {key: 'a{}'.format(int(key[1:]) + offset_a)
+                  for key in part_atoms}
+        for key, symbol in part_atoms.iteritems():
+            atoms[rename[key]] = symbol
+        for key, (first, second, info) in part_bonds.iteritems():
+            bonds['b{}'.format(int(key[1:]) + offset_b)] = (
+                rename[first], rename[second], dict(info))
+    return atoms, bonds
+
+
+def library(size, seed=0):
+    """A reproducible assortment of chains, rings and acenes of varied sizes
+    and hydrogen counts.
+
+    Parameters
+    ----------
+    size : int
+        The number of molecules.
+    seed : int, optional
+        Seeds every random choice.
+
+    Returns
+    -------
+    list
+        A list of (atoms, bonds) pairs.
+    """
+
+    rng = random.Random(seed)
+    molecules = []
+    for i in range(size):
+        kind = rng.choice(['chain', 'alcohol', 'ring', 'polyaromatic'])
+        hydrogens = rng.choice([1.0, 1.0, 0.9, 0.75])
+        if kind == 'chain':
+            molecules.append(chain(rng.randint(1, 30), hydrogens, seed + i))
+        elif kind == 'alcohol':
+            molecules.append(chain(rng.randint(1, 30), hydrogens, seed + i,
+                                   heteroatom='O'))
+        elif kind == 'ring':
+            molecules.append(ring(rng.randint(3, 12), hydrogens, seed + i))
+        else:
+            molecules.append(polyaromatic(rng.randint(1, 5), hydrogens,
+                                          seed + i))
+    return molecules
@@ -0,0 +1,147 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import io
+import os
+import unittest
+
+from Chemistry.base.compounds import Compound
+from Chemistry.exceptions.ParseErrors import ParsingException
+from Chemistry.interface.compound_utility import compound_from_file, \
+    compounds_from_sdf, compounds_to_sdf, sdf_index
+from Chemistry.parsing import SDF as sdf
+from Chemistry.parsing.SMILES import canonical_smiles
+
+
+SDF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'test_molecules', 'SDF', 'SDF_1.sdf')
+
+
+class TestParser(unittest.TestCase):
+
+    def setUp(self):
+        with open(SDF_FILE, 'rb') as sdf_file:
+            self.text = sdf_file.read()
+
+    def test_first_record(self):
+        parser = sdf.SDFParser(io.BytesIO(self.text))
+        self.assertEqual(sorted(parser.atoms.values()),
+                         ['C', 'C', 'H', 'H', 'H', 'H', 'H', 'H', 'O'])
+        self.assertEqual(len(parser.bonds), 8)
+        self.assertEqual(parser.bonds['b1'],
+                         ('a1', 'a2', {'order': 1, 'chirality': None}))
+        self.assertEqual(parser.other, {'id': 'Ethanol', 'pka': '16',
+                                        'source': 'test\nline two'})
+
+    def test_iterparse(self):
+        parsed = list(sdf.iterparse(io.BytesIO(self.text + '\n\n')))
+        self.assertEqual([parser.other['id'] for parser in parsed],
+                         ['Ethanol', 'Ammonium', 'Acetate'])
+
+    def test_charges(self):
+        ammonium, acetate = list(sdf.iterparse(io.BytesIO(self.text)))[1:]
+        # M  CHG makes the nitrogen take four hydrogens
+        self.assertEqual(sorted(ammonium.atoms.values()),
+                         ['H', 'H', 'H', 'H', 'N'])
+        # The atom block's charge code makes the second oxygen an oxide
+        self.assertEqual(sorted(acetate.atoms.values()).count('H'), 3)
+
+    def test_crlf(self):
+        parsed = list(sdf.iterparse(io.BytesIO(
+            self.text.replace('\n', '\r\n'))))
+        self.assertEqual(parsed[0].other['source'], 'test\nline two')
+
+    def test_errors(self):
+        with self.assertRaises(ParsingException):
+            sdf.SDFParser(io.BytesIO('\n\n'))
+        with self.assertRaises(ParsingException):
+            sdf.SDFParser(io.BytesIO('Title\n\n\n  0  0  0  0  0  0  0  0'
+                                     '  0  0999 V3000\n'))
+        aromatic = self.text.replace('  2  3  1  0', '  2  3  4  0', 1)
+        with self.assertRaises(ParsingException):
+            sdf.SDFParser(io.BytesIO(aromatic))
+
+    def test_bad_charges(self):
+        # The oxygen of ethanol, the third atom, is on the record's 7th line
+        code = self.text.replace('O   0  0', 'O   0  x', 1)
+        with self.assertRaises(ParsingException) as caught:
+            sdf.SDFParser(io.BytesIO(code))
+        self.assertIn('line 7', str(caught.exception))
+        block = self.text.replace('M  CHG  1   1   1', 'M  CHG  1   1   +')
+        with self.assertRaises(ParsingException) as caught:
+            list(sdf.iterparse(io.BytesIO(block)))
+        self.assertIn('line 6', str(caught.exception))
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        with open(SDF_FILE, 'rb') as sdf_file:
+            self.text = sdf_file.read()
+
+    def test_index(self):
+        index = sdf.build_index(io.BytesIO(self.text + '\n'))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index[0], 0)
+        self.assertTrue(self.text[index[1]:].startswith('Ammonium'))
+        record = sdf.parse_record(io.BytesIO(self.text), index[2])
+        self.assertEqual(record.other['id'], 'Acetate')
+
+    def test_random_access(self):
+        file_ = io.BytesIO(self.text)
+        index = sdf_index(file_)
+        ids = [compound.other_info['id'] for compound
+               in compounds_from_sdf(file_, 1, None, index)]
+        self.assertEqual(ids, ['Ammonium', 'Acetate'])
+        ids = [compound.other_info['id'] for compound
+               in compounds_from_sdf(file_, 0, 3, index[::2])]
+        self.assertEqual(ids, ['Ethanol', 'Acetate'])
+
+    def test_slice_without_index(self):
+        ids = [compound.other_info['id'] for compound
+               in compounds_from_sdf(io.BytesIO(self.text), 1, 2)]
+        self.assertEqual(ids, ['Ammonium'])
+
+
+class TestBuilder(unittest.TestCase):
+
+    def test_round_trip(self):
+        with open(SDF_FILE, 'rb') as sdf_file:
+            compounds = list(compounds_from_sdf(sdf_file))
+        output = io.BytesIO()
+        offsets = compounds_to_sdf(output, compounds)
+        output.seek(0)
+        self.assertEqual(sdf_index(output), offsets)
+        output.seek(0)
+        again = list(compounds_from_sdf(output))
+        self.assertEqual(len(again), 3)
+        for first, second in zip(compounds, again):
+            self.assertEqual(canonical_smiles(first),
+                             canonical_smiles(second))
+            self.assertEqual(first.other_info, second.other_info)
+
+    def test_record_layout(self):
+        compound = Compound({'a1': 'O', 'a2': 'H', 'a3': 'H'},
+                            {'b1': ('a1', 'a2', {'order': 1}),
+                             'b2': ('a1', 'a3', {'order': 1})},
+                            {'id': 'Water'})
+        lines = str(sdf.SDFBuilder.from_compound(compound)).split('\n')
+        self.assertEqual(lines[0], 'Water')
+        self.assertEqual(lines[3][:6], '  3  2')
+        self.assertEqual(lines[4][31:34].strip(), 'O')
+        self.assertEqual(lines[-2:], ['$$$$', ''])
+
+    def test_filetype(self):
+        with open(SDF_FILE, 'rb') as sdf_file:
+            compound = compound_from_file(sdf_file, 'sdf')
+        self.assertEqual(compound.other_info['id'], 'Ethanol')
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
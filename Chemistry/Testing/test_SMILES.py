@@ -0,0 +1,203 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import io
+import os
+import random
+import unittest
+
+from Chemistry.base.compounds import Compound
+from Chemistry.exceptions.ParseErrors import ParsingException
+from Chemistry.interface.compound_utility import compound_from_file, \
+    compound_to_file
+from Chemistry.parsing import SMILES as smi
+
+
+SMILES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'test_molecules', 'SMILES', 'SMILES_1.smi')
+
+
+def _symbols(atoms):
+    return sorted(atoms.itervalues())
+
+
+def _orders(bonds):
+    return sorted(info['order'] for _, _, info in bonds.itervalues())
+
+
+class TestParse(unittest.TestCase):
+
+    def test_water(self):
+        atoms, bonds = smi.parse_smiles('O')
+        self.assertEqual(atoms, {'a1': 'O', 'a2': 'H', 'a3': 'H'})
+        self.assertEqual(bonds, {'b1': ('a1', 'a2', {'order': 1,
+                                                     'chirality': None}),
+                                 'b2': ('a1', 'a3', {'order': 1,
+                                                     'chirality': None})})
+
+    def test_branches_and_bonds(self):
+        atoms, bonds = smi.parse_smiles('CC(=O)O')
+        self.assertEqual(_symbols(atoms), ['C', 'C', 'H', 'H', 'H', 'H',
+                                           'O', 'O'])
+        self.assertEqual(_orders(bonds), [1] * 6 + [2])
+        atoms, bonds = smi.parse_smiles('C#N')
+        self.assertEqual(_symbols(atoms), ['C', 'H', 'N'])
+        self.assertEqual(_orders(bonds), [1, 3])
+
+    def test_two_letter_elements(self):
+        atoms, _ = smi.parse_smiles('ClCBr')
+        self.assertEqual(_symbols(atoms), ['Br', 'C', 'Cl', 'H', 'H'])
+
+    def test_rings(self):
+        atoms, bonds = smi.parse_smiles('C1CC1')
+        self.assertEqual(len(atoms), 9)
+        self.assertEqual(len(bonds), 9)
+        self.assertEqual(smi.parse_smiles('C%10CC%10'),
+                         smi.parse_smiles('C1CC1'))
+
+    def test_brackets(self):
+        atoms, _ = smi.parse_smiles('[NH4+]')
+        self.assertEqual(_symbols(atoms), ['H', 'H', 'H', 'H', 'N'])
+        atoms, _ = smi.parse_smiles('[OH-]')
+        self.assertEqual(_symbols(atoms), ['H', 'O'])
+        atoms, _ = smi.parse_smiles('[13CH3][C@@H](O)[Na]')
+        self.assertEqual(_symbols(atoms).count('H'), 5)
+
+    def test_disconnected(self):
+        atoms, bonds = smi.parse_smiles('[Na+].[Cl-]')
+        self.assertEqual(_symbols(atoms), ['Cl', 'Na'])
+        self.assertEqual(bonds, {})
+
+    def test_aromatic(self):
+        for smiles, doubles in [('c1ccccc1', 3), ('c1ccncc1', 3),
+                                ('c1cc[nH]c1', 2), ('c1ccoc1', 2),
+                                ('c1ccc2ccccc2c1', 5)]:
+            atoms, bonds = smi.parse_smiles(smiles)
+            self.assertEqual(_orders(bonds).count(2), doubles)
+            compound = Compound(atoms, bonds, {})
+            for key, atom in compound.atoms.iteritems():
+                if atom.symbol == 'C':
+                    self.assertEqual(sum(bond.order for bond in atom.bonds), 4)
+
+    def test_errors(self):
+        for smiles in ['C(', 'C)', 'C1CC', 'C==C', 'C$C', '[Cx', '(C)',
+                       'c1cccc1', 'C=', 'C[Xx]C', '[Q]']:
+            with self.assertRaises(ParsingException):
+                smi.parse_smiles(smiles)
+
+
+class TestFiles(unittest.TestCase):
+
+    def test_parser(self):
+        with open(SMILES_FILE, 'r') as smiles_file:
+            parser = smi.SMILESParser(smiles_file)
+        self.assertEqual(parser.smiles, 'O')
+        self.assertEqual(parser.other, {'id': 'Water'})
+        self.assertEqual(parser.molecule['atoms'], parser.atoms)
+
+    def test_iterparse(self):
+        with open(SMILES_FILE, 'r') as smiles_file:
+            parsed = list(smi.iterparse(smiles_file))
+        self.assertEqual([parser.other.get('id') for parser in parsed],
+                         ['Water', 'Acetic acid', 'Benzene', None])
+
+    def test_empty(self):
+        with self.assertRaises(ParsingException):
+            smi.SMILESParser(io.BytesIO('# nothing\n\n'))
+
+    def test_round_trip(self):
+        with open(SMILES_FILE, 'r') as smiles_file:
+            water = compound_from_file(smiles_file, 'smi')
+        output = io.BytesIO()
+        compound_to_file(output, 'smi', water)
+        self.assertEqual(output.getvalue(), 'O Water\n')
+        output.seek(0)
+        self.assertEqual(compound_from_file(output, 'smiles'), water)
+
+
+class TestCanonical(unittest.TestCase):
+
+    @staticmethod
+    def _relabel(atoms, bonds, seed):
+        keys = list(atoms)
+        shuffled = keys[:]
+        random.Random(seed).shuffle(shuffled)
+        new = dict(zip(keys, shuffled))
+        return ({new[key]: symbol for key, symbol in atoms.iteritems()},
+                {'x' + key: (new[first], new[second], info)
+                 for key, (first, second, info) in bonds.iteritems()})
+
+    def _canonical(self, atoms, bonds):
+        return smi.SMILESBuilder({'atoms': atoms, 'bonds': bonds}).smiles
+
+    def test_independent_of_keys(self):
+        for smiles in ['CC(C)(C)Cl', 'C1CC2CCC1C2', 'OC(=O)CC(N)C(=O)O',
+                       'C1CCC2(CC1)CCCC2', 'C12C3C4C1C5C2C3C45',
+                       'CCC(C)CC(CC)C(C)CCO', 'c1ccc2ccccc2c1']:
+            atoms, bonds = smi.parse_smiles(smiles)
+            results = {self._canonical(*self._relabel(atoms, bonds, seed))
+                       for seed in xrange(10)}
+            self.assertEqual(len(results), 1, (smiles, results))
+
+    def test_same_molecule_same_string(self):
+        self.assertEqual(self._canonical(*smi.parse_smiles('OCC')),
+                         self._canonical(*smi.parse_smiles('CCO')))
+        self.assertNotEqual(self._canonical(*smi.parse_smiles('OCC')),
+                            self._canonical(*smi.parse_smiles('COC')))
+
+    def test_round_trip(self):
+        for smiles in ['O', 'CC(=O)O', 'c1ccccc1', 'C1CC2CCC1C2', '[NH4+]',
+                       'O=C=O', '[H][H]', 'C%12CC%12', '[Na+].[Cl-]']:
+            atoms, bonds = smi.parse_smiles(smiles)
+            canonical = self._canonical(atoms, bonds)
+            again = self._canonical(*smi.parse_smiles(canonical))
+            self.assertEqual(canonical, again)
+            self.assertTrue(Compound(atoms, bonds, {}).is_isomorphic(
+                Compound(*smi.parse_smiles(canonical))))
+
+    def test_hydrogens(self):
+        self.assertEqual(self._canonical(*smi.parse_smiles('[NH4+]')),
+                         '[NH4]')
+        self.assertEqual(self._canonical(*smi.parse_smiles('[H]')), '[H]')
+        self.assertEqual(self._canonical(*smi.parse_smiles('C')), 'C')
+
+    def test_canonical_smiles(self):
+        compound = Compound(*smi.parse_smiles('OCC'))
+        self.assertEqual(smi.canonical_smiles(compound), 'CCO')
+
+    def test_canonical_aromatic(self):
+        forms = [Compound(*smi.parse_smiles(smiles)) for smiles in
+                 ('CC1=CC=CC=C1O', 'CC1=C(O)C=CC=C1', 'Cc1ccccc1O')]
+        self.assertNotEqual(smi.canonical_smiles(forms[0]),
+                            smi.canonical_smiles(forms[1]))
+        self.assertEqual(
+            set(smi.canonical_smiles(form, aromatic=True) for form in forms),
+            {'Cc1ccccc1O'})
+        # The aromatic form reads back as the same molecule
+        for smiles in ['c1cc[nH]c1', 'O=c1cccc[nH]1', 'c1ccccc1-c1ccccc1',
+                       'c1ccc2cccc2cc1', 'Cn1cnc2c1c(=O)n(C)c(=O)n2C']:
+            written = smi.canonical_smiles(
+                Compound(*smi.parse_smiles(smiles)), aromatic=True)
+            again = Compound(*smi.parse_smiles(written))
+            self.assertEqual(smi.canonical_smiles(again, aromatic=True),
+                             written)
+
+    def test_ranks(self):
+        neighbours = {'a': [('b', 1)], 'b': [('a', 1), ('c', 1)],
+                      'c': [('b', 1)]}
+        ranks = smi.canonical_ranks(['a', 'b', 'c'], neighbours,
+                                    dict.fromkeys('abc', 0))
+        self.assertEqual(sorted(ranks.values()), [0, 1, 2])
+        # The middle atom is told apart from the ends, which are symmetric
+        # and only separated by the tie break
+        self.assertNotIn(ranks['b'], (ranks['a'], ranks['c']))
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
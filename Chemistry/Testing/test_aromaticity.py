@@ -0,0 +1,157 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.aromaticity import kekulize, kekulize_bonds
+from Chemistry.base.compounds import Compound
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+def _compound(smiles):
+    return Compound(*parse_smiles(smiles))
+
+
+def _double_bonds(compound, key):
+    return sum(1 for data in compound.adj[key].itervalues()
+               if data['bond_obj'].order == 2)
+
+
+class TestKekulize(unittest.TestCase):
+
+    def test_ring(self):
+        edges = [(i, (i + 1) % 6) for i in range(6)]
+        doubles = kekulize(range(6), edges)
+        self.assertEqual(len(doubles), 3)
+        self.assertEqual(sorted(atom for index in doubles
+                                for atom in edges[index]), range(6))
+
+    def test_ignores_atoms_not_given(self):
+        # Pyrrole: the nitrogen (0) doesn't need a double bond
+        edges = [(i, (i + 1) % 5) for i in range(5)]
+        self.assertEqual(kekulize(range(1, 5), edges), {1, 3})
+
+    def test_needs_augmenting(self):
+        # A greedy match of the middle bond of a path of four leaves both ends
+        # without a partner
+        self.assertEqual(kekulize([0, 1, 2, 3], [(1, 2), (0, 1), (2, 3)]),
+                         {1, 2})
+
+    def test_blossom(self):
+        # A ring of five with a tail: only one matching covers every atom
+        edges = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (4, 5)]
+        self.assertEqual(kekulize(range(6), edges), {0, 2, 5})
+
+    def test_nothing_needed(self):
+        self.assertEqual(kekulize([], [(0, 1)]), set())
+
+    def test_impossible(self):
+        with self.assertRaises(ValueError):
+            kekulize(range(5), [(i, (i + 1) % 5) for i in range(5)])
+
+    def test_large_sheet(self):
+        compound = Compound(*synthetic.honeycomb(20, 20, aromatic=True))
+        for key, atom in compound.atoms.iteritems():
+            if atom.symbol == 'C':
+                self.assertEqual(_double_bonds(compound, key), 1)
+
+
+class TestAromaticInput(unittest.TestCase):
+
+    def test_benzene(self):
+        atoms = {'a{}'.format(i): 'C' for i in range(1, 7)}
+        bonds = {'b{}'.format(i): ('a{}'.format(i), 'a{}'.format(i % 6 + 1),
+                                   {'aromatic': True}) for i in range(1, 7)}
+        for i in range(1, 7):
+            atoms['a{}'.format(i + 6)] = 'H'
+            bonds['b{}'.format(i + 6)] = ('a{}'.format(i),
+                                          'a{}'.format(i + 6), {'order': 1})
+        benzene = Compound(atoms, bonds)
+        self.assertTrue(benzene.is_isomorphic(_compound('C1=CC=CC=C1'))
+                        or benzene.is_isomorphic(_compound('C=1C=CC=CC=1')))
+        self.assertEqual(len(benzene.aromaticity.rings), 1)
+        self.assertNotIn('aromatic', benzene.bonds['b1'].__dict__)
+
+    def test_kekulize_bonds(self):
+        atoms = {'a1': 'N', 'a2': 'C', 'a3': 'C', 'a4': 'C', 'a5': 'C',
+                 'a6': 'H', 'a7': 'H', 'a8': 'H', 'a9': 'H', 'a10': 'H'}
+        bonds = {'b{}'.format(i): ('a{}'.format(i), 'a{}'.format(i % 5 + 1),
+                                   {'aromatic': True, 'chirality': None})
+                 for i in range(1, 6)}
+        for i in range(1, 6):
+            bonds['b{}'.format(i + 5)] = ('a{}'.format(i),
+                                          'a{}'.format(i + 5), {})
+        result = kekulize_bonds(atoms, bonds)
+        orders = {key: result[key][2]['order'] for key in bonds
+                  if result[key][2].get('order')}
+        self.assertEqual({key for key, order in orders.iteritems()
+                          if order == 2}, {'b2', 'b4'})
+        self.assertIs(result['b6'], bonds['b6'])
+        self.assertNotIn('aromatic', result['b1'][2])
+
+    def test_impossible(self):
+        atoms = {'a1': 'C', 'a2': 'C', 'a3': 'C', 'a4': 'H', 'a5': 'H',
+                 'a6': 'H'}
+        bonds = {'b1': ('a1', 'a2', {'aromatic': True}),
+                 'b2': ('a2', 'a3', {'aromatic': True}),
+                 'b3': ('a3', 'a1', {'aromatic': True}),
+                 'b4': ('a1', 'a4', {}), 'b5': ('a2', 'a5', {}),
+                 'b6': ('a3', 'a6', {})}
+        with self.assertRaises(ValueError):
+            Compound(atoms, bonds)
+
+
+class TestPerception(unittest.TestCase):
+
+    def assertAromatic(self, smiles, rings, atoms):
+        aromaticity = _compound(smiles).aromaticity
+        self.assertEqual((len(aromaticity.rings), len(aromaticity.atoms)),
+                         (rings, atoms), smiles)
+
+    def test_aromatic(self):
+        for smiles in ['c1ccccc1', 'n1ccccc1', 'c1cc[nH]c1', 'c1ccoc1',
+                       'c1ccsc1', 'O=c1cccc[nH]1']:
+            self.assertAromatic(smiles, 1, len(_compound(smiles).rings.rings[0]))
+
+    def test_not_aromatic(self):
+        for smiles in ['C1CCCCC1', 'C1=CCC=C1', 'C1=CC=CC=CC=C1',
+                       'O=C1C=CC(=O)C=C1', 'C=C1C=CC=C1']:
+            self.assertAromatic(smiles, 0, 0)
+
+    def test_fused(self):
+        self.assertAromatic('c1ccc2ccccc2c1', 2, 10)
+        # Fluorene: the five-membered ring between the benzenes isn't
+        self.assertAromatic('c1ccc2c(c1)Cc1ccccc1-2', 2, 12)
+
+    def test_azulene(self):
+        # Neither ring has 4n + 2 pi electrons alone, but the two together do
+        compound = _compound('c1ccc2cccc2cc1')
+        self.assertEqual(compound.aromaticity.rings, [0, 1])
+        self.assertEqual(len(compound.aromaticity.bonds), 11)
+
+    def test_substituents(self):
+        aromaticity = _compound('Cc1ccccc1').aromaticity
+        self.assertEqual(len(aromaticity.atoms), 6)
+        self.assertEqual(len(aromaticity.bonds), 6)
+
+    def test_cached(self):
+        compound = _compound('c1ccccc1')
+        self.assertIs(compound.aromaticity, compound.aromaticity)
+        key = next(iter(compound.aromaticity.bonds))
+        compound.remove_bond(key)
+        self.assertEqual(len(compound.aromaticity.rings), 0)
+
+    def test_sheet(self):
+        compound = Compound(*synthetic.honeycomb(5, 5, aromatic=True))
+        self.assertEqual(len(compound.aromaticity.rings), 25)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,138 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Chemistry import profiling
+from Chemistry.interface import batch
+
+
+class TestBatch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        molecules = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'test_molecules')
+        cls.cml_directory = os.path.join(molecules, 'CML')
+        cls.sdf = os.path.join(molecules, 'SDF', 'SDF_1.sdf')
+        cls.smiles = os.path.join(molecules, 'SMILES', 'SMILES_1.smi')
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_find_files(self):
+        found = list(batch.find_files([self.cml_directory]))
+        self.assertIn((os.path.join(self.cml_directory, 'CML_4.cml'), 'cml'),
+                      found)
+        self.assertTrue(all(filetype == 'cml' for _, filetype in found))
+
+    def test_process_file(self):
+        result, = batch.process_file(
+            (os.path.join(self.cml_directory, 'CML_4.cml'), 'cml'))
+        self.assertEqual(result['record'], 0)
+        self.assertEqual(len(result['results']), 1)
+        self.assertEqual(result['results'][0]['reaction'], 'AcidBase')
+
+    def test_process_every_record(self):
+        for path, filetype, count in [(self.sdf, 'sdf', 3),
+                                      (self.smiles, 'smi', 4)]:
+            processed = list(batch.process_file((path, filetype)))
+            self.assertEqual([result['record'] for result in processed],
+                             range(count))
+            self.assertTrue(all('results' in result for result in processed))
+
+    def test_process_bad_record(self):
+        path = os.path.join(self.tempdir, 'bad.smi')
+        with open(path, 'w') as bad:
+            bad.write('CCO\nC1CC\nO\n')
+        processed = list(batch.process_file((path, 'smi')))
+        self.assertIn('results', processed[0])
+        self.assertEqual(processed[1]['record'], 1)
+        self.assertIn('error', processed[1])
+
+    def test_process_bad_file(self):
+        path = os.path.join(self.tempdir, 'bad.cml')
+        with open(path, 'w') as bad:
+            bad.write('<molecule')
+        self.assertIn('error', next(batch.process_file((path, 'cml'))))
+        self.assertIn('error', next(batch.process_file((path, 'xyz'))))
+
+    def test_read_file(self):
+        records = batch.read_file((self.sdf, 'sdf'))
+        record = next(records)
+        self.assertEqual(record['record'], 0)
+        atoms, bonds, other = record['molecule']
+        self.assertTrue(atoms)
+        self.assertEqual(len(list(records)), 2)
+
+    def run_batch(self, workers, paths=None, chunksize=4):
+        output = io.BytesIO()
+        summary = batch.run_batch(paths or [self.cml_directory], output,
+                                  workers, chunksize, progress=False)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(summary['records'], len(lines))
+        self.assertEqual(summary['failed'], 0)
+        return {(os.path.basename(line['file']), line['record']): line
+                for line in lines}
+
+    def test_run_batch(self):
+        results = self.run_batch(1)
+        self.assertEqual(results['CML_1.cml', 0]['results'], [])
+        self.assertEqual(len(results['CML_4.cml', 0]['results']), 1)
+
+    def test_run_batch_workers(self):
+        self.assertEqual(self.run_batch(2), self.run_batch(1))
+
+    def test_run_batch_records(self):
+        results = self.run_batch(2, [self.sdf, self.smiles])
+        self.assertEqual(sorted(results),
+                         [('SDF_1.sdf', record) for record in range(3)] +
+                         [('SMILES_1.smi', record) for record in range(4)])
+
+    def test_run_batch_single_file(self):
+        # The records of one file are spread over the workers
+        self.assertEqual(self.run_batch(2, [self.smiles], chunksize=1),
+                         self.run_batch(1, [self.smiles]))
+
+    def test_profile_workers(self):
+        profiling.reset()
+        profiling.enable()
+        try:
+            self.run_batch(2)
+            report = profiling.report()
+        finally:
+            profiling.disable()
+            profiling.reset()
+        # Every reaction runs in a worker
+        for stage in ['acid_base.react', 'compound.construct']:
+            self.assertIn(stage, report)
+
+    def test_progress(self):
+        stream = io.BytesIO()
+        progress = batch.Progress(2, stream, interval=0)
+        progress.update({})
+        progress.read()
+        progress.update({})
+        progress.update({'error': 'oops'})
+        progress.read()
+        progress.finish()
+        self.assertIn('2/2 files, 3 records (1 failed)', stream.getvalue())
+        self.assertTrue(stream.getvalue().endswith('\n'))
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
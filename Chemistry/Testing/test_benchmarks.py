@@ -0,0 +1,98 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+from Chemistry.Testing import benchmarks
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.interface.reaction_utility import separate_molecules
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def _valences(self, atoms, bonds):
+        totals = dict.fromkeys(atoms, 0)
+        for first, second, info in bonds.itervalues():
+            totals[first] += info['order']
+            totals[second] += info['order']
+        return totals
+
+    def test_chain(self):
+        atoms, bonds = synthetic.chain(3)
+        self.assertEqual(sorted(atoms.values()).count('C'), 3)
+        self.assertEqual(sorted(atoms.values()).count('H'), 8)
+        self.assertEqual(len(bonds), 10)
+
+    def test_alcohol(self):
+        atoms, bonds = synthetic.chain(2, heteroatom='O')
+        self.assertEqual(sorted(atoms.values()), ['C', 'C', 'H', 'H', 'H',
+                                                  'H', 'H', 'H', 'O'])
+
+    def test_ring(self):
+        atoms, bonds = synthetic.ring(6)
+        self.assertEqual(len(atoms), 18)
+        self.assertEqual(len(bonds), 18)
+        with self.assertRaises(ValueError):
+            synthetic.ring(2)
+
+    def test_polyaromatic_valences(self):
+        for rings in (1, 2, 5):
+            atoms, bonds = synthetic.polyaromatic(rings)
+            totals = self._valences(atoms, bonds)
+            carbons = [key for key in atoms if atoms[key] == 'C']
+            self.assertEqual(len(carbons), 4 * rings + 2)
+            self.assertTrue(all(totals[key] == 4 for key in carbons))
+            double = [info for _, _, info in bonds.itervalues()
+                      if info['order'] == 2]
+            self.assertEqual(len(double), 2 * rings + 1)
+
+    def test_partial_hydrogens_reproducible(self):
+        first = synthetic.chain(20, hydrogens=0.5, seed=3)
+        second = synthetic.chain(20, hydrogens=0.5, seed=3)
+        self.assertEqual(first, second)
+        self.assertLess(len(first[0]), len(synthetic.chain(20)[0]))
+
+    def test_mixture(self):
+        parts = synthetic.library(10, seed=1)
+        atoms, bonds = synthetic.mixture(parts)
+        self.assertEqual(len(atoms), sum(len(part[0]) for part in parts))
+        self.assertEqual(len(separate_molecules(atoms, bonds)), 10)
+
+    def test_builds_compounds(self):
+        for atoms, bonds in synthetic.library(10):
+            self.assertEqual(len(Compound(atoms, bonds, {})), len(atoms))
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_registered(self):
+        names = benchmarks.load_benchmarks()
+        self.assertIn('construct.chain.10', names)
+        self.assertIn('acid_base.react.alcohol.10', names)
+
+    def test_run(self):
+        results = benchmarks.run(['construct.chain.10'], repeat=1)
+        self.assertIn('construct.chain.10', results)
+        self.assertTrue(all('construct.chain.10' in name for name in results))
+        self.assertGreater(results['construct.chain.10']['best'], 0)
+
+    def test_compare(self):
+        baseline = {'a': {'best': 1.0}, 'b': {'best': 1.0},
+                    'c': {'best': 1.0}}
+        results = {'a': {'best': 1.1}, 'b': {'best': 2.0},
+                   'c': {'best': 0.5}, 'd': {'best': 1.0}}
+        statuses = {name: status for name, _, _, _, status
+                    in benchmarks.compare(results, baseline)}
+        self.assertEqual(statuses, {'a': 'ok', 'b': 'slower',
+                                    'c': 'faster', 'd': 'new'})
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
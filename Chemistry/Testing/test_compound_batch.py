@@ -0,0 +1,122 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import os
+import unittest
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.interface.compound_batch import CompoundBatch, map_compounds
+from Chemistry.parsing.SMILES import canonical_smiles
+from Chemistry.reactions._reactions import Conditions
+from Chemistry.reactions.acid_base import AcidBase
+
+
+def _size(compound):
+    # Module level, so that worker processes can unpickle it
+    return len(compound.atoms), compound.other_info['id']
+
+
+class TestCompoundBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.compounds = [Compound(atoms, bonds, {'id': 'M{}'.format(i)})
+                          for i, (atoms, bonds)
+                          in enumerate(synthetic.library(20))]
+        self.batch = CompoundBatch.from_compounds(self.compounds)
+
+    def test_layout(self):
+        self.assertEqual(len(self.batch), 20)
+        self.assertEqual(self.batch.atom_offsets[-1],
+                         sum(len(compound.atoms)
+                             for compound in self.compounds))
+        self.assertEqual(self.batch.bonds.shape,
+                         (sum(len(compound.bonds)
+                              for compound in self.compounds), 2))
+        self.assertEqual(len(set(self.batch.symbols)),
+                         len(self.batch.symbols))
+        self.assertLessEqual({'C', 'H'}, set(self.batch.symbols))
+
+    def test_materialize(self):
+        for original, compound in zip(self.compounds, self.batch):
+            self.assertEqual(canonical_smiles(compound),
+                             canonical_smiles(original))
+            self.assertEqual(compound.other_info, original.other_info)
+        self.assertEqual(self.batch[-1].other_info['id'], 'M19')
+        with self.assertRaises(IndexError):
+            self.batch[20]
+
+    def test_isomorphism(self):
+        # Keys numbered a1, a2, ... are kept, so the compounds are isomorphic
+        # with the originals, bond keys included
+        water = Compound({'a1': 'H', 'a2': 'H', 'a3': 'O'},
+                         {'b1': ('a1', 'a3', {'order': 1, 'chirality': None}),
+                          'b2': ('a2', 'a3', {'order': 1, 'chirality': None})},
+                         {'id': 'Water'})
+        self.assertEqual(CompoundBatch.from_compounds([water])[0], water)
+
+    def test_acid_base(self):
+        hydronium = Compound(
+            {'a1': 'H', 'a2': 'H', 'a3': 'O', 'a4': 'H'},
+            {'b1': ('a1', 'a3', {'order': 1, 'chirality': None}),
+             'b2': ('a2', 'a3', {'order': 1, 'chirality': None}),
+             'b3': ('a3', 'a4', {'order': 1, 'chirality': None})},
+            {'id': 'Hydronium'})
+        water = Compound({'a1': 'H', 'a2': 'H', 'a3': 'O'},
+                         {'b1': ('a1', 'a3', {'order': 1, 'chirality': None}),
+                          'b2': ('a2', 'a3', {'order': 1, 'chirality': None})},
+                         {'id': 'Water'})
+        batch = CompoundBatch.from_compounds([Acid(hydronium, 'a1', -1.74),
+                                              water])
+        reaction = AcidBase(Acid(batch[0], 'a1', -1.74),
+                            Base(batch[1], 'a3', 15.7), Conditions({}))
+        ids = sorted(product.compound.other_info['id']
+                     for product in reaction.react().major
+                     if product.compound is not None)
+        self.assertEqual(ids, ['Conjugate acid of Water',
+                               'Conjugate base of Hydronium'])
+
+    def test_share(self):
+        shared = self.batch.share()
+        try:
+            self.assertTrue(os.path.exists(shared.name))
+            attached = CompoundBatch.attach(shared.name)
+            self.assertEqual(attached.symbols, self.batch.symbols)
+            self.assertEqual(attached.bonds.tolist(),
+                             self.batch.bonds.tolist())
+            self.assertFalse(attached.elements.flags.writeable)
+            self.assertEqual(canonical_smiles(attached[7]),
+                             canonical_smiles(self.compounds[7]))
+        finally:
+            shared.unlink()
+        self.assertFalse(os.path.exists(shared.name))
+
+    def test_map_compounds(self):
+        expected = [(len(compound.atoms), compound.other_info['id'])
+                    for compound in self.compounds]
+        self.assertEqual(map_compounds(_size, self.batch, workers=1),
+                         expected)
+        self.assertEqual(map_compounds(_size, self.batch, workers=2,
+                                       chunksize=3), expected)
+        self.assertEqual(map_compounds(_size, self.batch, [3, 1], workers=2),
+                         [expected[3], expected[1]])
+
+    def test_empty(self):
+        batch = CompoundBatch.from_compounds([])
+        self.assertEqual(len(batch), 0)
+        shared = batch.share()
+        try:
+            self.assertEqual(len(CompoundBatch.attach(shared.name)), 0)
+        finally:
+            shared.unlink()
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
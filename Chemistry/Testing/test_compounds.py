@@ -6,14 +6,18 @@
 __author__ = "Dan Obermiller"
 
 
+import copy
+import cPickle
 import json
 import os
 import unittest
 
 from Chemistry.base import compounds
 from Chemistry.base.components import Atom, Bond
+from Chemistry.base.reactants import Acid, Base
 from Chemistry.interface.compound_utility import compound_from_file, \
     compound_to_file
+from Chemistry.reactions.acid_base import AcidBase
 
 
 class TestCompound(unittest.TestCase):
@@ -67,6 +71,23 @@ class TestCompound(unittest.TestCase):
             self.compound1._add_edge(
                 'b3', 'a1', 'a2', {'order': 1, 'chirality': None})
 
+    def test_formula(self):
+        self.assertEqual(self.compound1.formula, 'H2O')
+        self.assertEqual(self.compound2.formula, 'C3H6O')
+
+    def test_molecular_weight(self):
+        self.assertAlmostEqual(self.compound1.molecular_weight, 18.015,
+                               places=2)
+        self.assertAlmostEqual(self.compound2.molecular_weight, 58.08,
+                               places=1)
+
+    def test_to_dict(self):
+        flat = self.compound2.to_dict()
+        self.assertEqual(flat['atoms']['a10'], 'O')
+        self.assertEqual(flat['bonds']['b8'],
+                         ('a10', 'a8', {'order': 2, 'chirality': None}))
+        self.assertEqual(compounds.Compound(**flat), self.compound2)
+
     def test_add_edge_(self):
         self.compound1._add_node('a4', Atom('H'))
         self.compound1._add_edge(
@@ -96,6 +117,118 @@ class TestCompound(unittest.TestCase):
         self.assertEqual(compound.charge, -1)
 
 
+class TestEdits(unittest.TestCase):
+
+    def setUp(self):
+        # Hydroxide, plus a lone hydrogen
+        self.compound = compounds.Compound(
+            {'a1': 'H', 'a2': 'O', 'a3': 'H'},
+            {'b1': ('a1', 'a2', {'order': 1})}, {})
+        # Calculate everything that is kept up to date
+        self.compound.charge
+        self.compound.components
+
+    def assertConsistent(self):
+        """Checks the cached perception against a full recalculation."""
+
+        rebuilt = compounds.Compound(**self.compound.to_dict())
+        self.assertEqual(self.compound.charge,
+                         sum(atom.charge
+                             for atom in self.compound.atoms.itervalues()))
+        self.assertEqual(self.compound.charge, rebuilt.charge)
+        self.assertEqual(sorted(map(sorted, self.compound.components)),
+                         sorted(map(sorted, rebuilt.components)))
+        self.assertEqual(self.compound.resonance_candidates,
+                         rebuilt.resonance_candidates)
+        self.assertTrue(self.compound.is_isomorphic(rebuilt))
+
+    def test_add_atom(self):
+        self.assertEqual(self.compound.add_atom('C'), 'a4')
+        self.assertEqual(self.compound.add_atom('N', 'a10'), 'a10')
+        self.assertEqual(self.compound.add_atom('N'), 'a5')
+        self.assertEqual(self.compound.atoms['a4'].symbol, 'C')
+        self.assertEqual(len(self.compound.components), 5)
+        self.assertConsistent()
+        with self.assertRaises(KeyError):
+            self.compound.add_atom('C', 'a1')
+
+    def test_add_bond(self):
+        key = self.compound.add_bond('a2', 'a3')
+        self.assertEqual(key, 'b2')
+        self.assertEqual(self.compound.bonds[key].order, 1)
+        self.assertEqual(self.compound.components, [{'a1', 'a2', 'a3'}])
+        self.assertEqual(self.compound.molecule['bonds'][key],
+                         self.compound.bonds[key])
+        self.assertConsistent()
+        with self.assertRaises(KeyError):
+            self.compound.add_bond('a1', 'a9')
+
+    def test_set_bond_order(self):
+        self.compound.add_bond('a2', 'a3', chirality='R', key='b7')
+        self.compound.set_bond_order('b7', 2)
+        self.assertEqual(self.compound.bonds['b7'].order, 2)
+        self.assertEqual(self.compound.to_dict()['bonds']['b7'],
+                         ('a2', 'a3', {'order': 2, 'chirality': 'R'}))
+        self.assertConsistent()
+        with self.assertRaises(ValueError):
+            self.compound.set_bond_order('b7', 4)
+        self.assertConsistent()
+
+    def test_remove_bond(self):
+        oxygen = self.compound.atoms['a2']
+        self.compound.remove_bond('b1')
+        self.assertEqual(oxygen.bonds, [])
+        self.assertEqual(len(self.compound.components), 3)
+        self.assertNotIn('b1', self.compound.bonds)
+        self.assertConsistent()
+
+    def test_remove_atom(self):
+        self.compound.add_bond('a2', 'a3')
+        self.compound.remove_atom('a2')
+        self.assertEqual(sorted(self.compound.atoms), ['a1', 'a3'])
+        self.assertEqual(self.compound.bonds, {})
+        self.assertEqual(self.compound.number_of_edges(), 0)
+        self.assertEqual(self.compound.atoms['a1'].bonds, [])
+        self.assertConsistent()
+
+    def test_equal_bonds(self):
+        # Two C-O bonds compare equal, but only the one named is removed
+        self.compound = compounds.Compound(
+            {'a1': 'C', 'a2': 'O', 'a3': 'O', 'a4': 'O'},
+            {'b1': ('a1', 'a2', {'order': 1}),
+             'b2': ('a1', 'a3', {'order': 1}),
+             'b3': ('a1', 'a4', {'order': 1})}, {})
+        self.compound.charge
+        self.compound.components
+        self.compound.resonance_candidates
+        carbon = self.compound.atoms['a1']
+        self.compound.remove_bond('b2')
+        self.compound.set_bond_order('b1', 2)
+        self.assertTrue(any(bond is self.compound.bonds['b1']
+                            for bond in carbon.bonds))
+        self.assertEqual(len(carbon.bonds), 2)
+        self.assertConsistent()
+        self.compound.add_bond('a1', 'a3', key='b2')
+        self.compound.remove_atom('a4')
+        self.assertEqual(len(carbon.bonds), 2)
+        self.assertTrue(any(bond is self.compound.bonds['b2']
+                            for bond in carbon.bonds))
+        self.assertConsistent()
+
+    def test_build_from_nothing(self):
+        compound = compounds.Compound({}, {}, {})
+        water = compounds.Compound(
+            {'a1': 'H', 'a2': 'O', 'a3': 'H'},
+            {'b1': ('a1', 'a2', {'order': 1}),
+             'b2': ('a2', 'a3', {'order': 1})}, {})
+        first, oxygen, second = [compound.add_atom(symbol)
+                                 for symbol in 'HOH']
+        compound.add_bond(first, oxygen)
+        compound.add_bond(oxygen, second)
+        self.assertTrue(compound.is_isomorphic(water))
+        self.assertEqual(compound.charge, water.charge)
+
+
 class TestIO(unittest.TestCase):
 
     @classmethod
@@ -126,6 +259,186 @@ class TestIO(unittest.TestCase):
                 self.assertEqual(from_cml, compound_from_file(w, 'cml'))
 
 
+class TestPickle(unittest.TestCase):
+
+    def setUp(self):
+        # Acetic acid
+        self.compound = compounds.Compound(
+            {'a1': 'C', 'a2': 'C', 'a3': 'O', 'a4': 'O', 'a5': 'H',
+             'a6': 'H', 'a7': 'H', 'a8': 'H'},
+            {'b1': ('a1', 'a2', {'order': 1, 'chirality': None}),
+             'b2': ('a2', 'a3', {'order': 2, 'chirality': None}),
+             'b3': ('a4', 'a2', {'order': 1, 'chirality': None}),
+             'b4': ('a4', 'a8', {'order': 1, 'chirality': None}),
+             'b5': ('a1', 'a5', {'order': 1, 'chirality': None}),
+             'b6': ('a1', 'a6', {'order': 1, 'chirality': None}),
+             'b7': ('a1', 'a7', {'order': 1, 'chirality': None})},
+            {'id': 'Acetic acid', 'pka': 4.76})
+
+    def round_trip(self, obj):
+        return cPickle.loads(cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL))
+
+    def test_state(self):
+        state = self.compound.__getstate__()
+        self.assertEqual(state['atoms']['a3'], 'O')
+        # Bonds keep their direction
+        self.assertEqual(state['bonds']['b3'][:2], ('a4', 'a2'))
+        self.assertEqual(state['bonds']['b2'][2]['order'], 2)
+
+    def test_round_trip(self):
+        loaded = self.round_trip(self.compound)
+        self.assertIsInstance(loaded, compounds.Compound)
+        self.assertEqual(loaded.__getstate__(), self.compound.__getstate__())
+        self.assertEqual(loaded.other_info, self.compound.other_info)
+        self.assertEqual(loaded.charge, self.compound.charge)
+        # The rebuilt compound can still be edited
+        loaded.add_bond('a3', loaded.add_atom('H'))
+        self.assertEqual(len(loaded.atoms), 9)
+
+    def test_deepcopy(self):
+        copied = copy.deepcopy(self.compound)
+        copied.other_info['id'] = 'Copy'
+        self.assertEqual(self.compound.other_info['id'], 'Acetic acid')
+        self.assertEqual(copied.__getstate__()['bonds'],
+                         self.compound.__getstate__()['bonds'])
+
+    def test_wrapper(self):
+        acid = self.round_trip(Acid(self.compound, 'a8', 4.76))
+        self.assertIsInstance(acid, Acid)
+        self.assertEqual((acid.acidic_point, acid.pka), ('a8', 4.76))
+        self.assertEqual(acid.compound.__getstate__(),
+                         self.compound.__getstate__())
+        self.assertEqual(acid.other_info['id'], 'Acetic acid')
+
+    def test_long_chain(self):
+        # A deep object graph used to exhaust the recursion limit
+        atoms = {'a{}'.format(i): 'C' for i in xrange(1, 3001)}
+        bonds = {'b{}'.format(i): ('a{}'.format(i), 'a{}'.format(i + 1),
+                                   {'order': 1, 'chirality': None})
+                 for i in xrange(1, 3000)}
+        loaded = self.round_trip(compounds.Compound(atoms, bonds))
+        self.assertEqual(len(loaded.bonds), 2999)
+
+
+class TestFrozen(unittest.TestCase):
+
+    def setUp(self):
+        # Acetic acid
+        self.compound = compounds.Compound(
+            {'a1': 'C', 'a2': 'C', 'a3': 'O', 'a4': 'O', 'a5': 'H',
+             'a6': 'H', 'a7': 'H', 'a8': 'H'},
+            {'b1': ('a1', 'a2', {'order': 1}),
+             'b2': ('a2', 'a3', {'order': 2}),
+             'b3': ('a4', 'a2', {'order': 1}),
+             'b4': ('a4', 'a8', {'order': 1}),
+             'b5': ('a1', 'a5', {'order': 1}),
+             'b6': ('a1', 'a6', {'order': 1}),
+             'b7': ('a1', 'a7', {'order': 1})},
+            {'id': 'Acetic acid'})
+
+    def test_freeze(self):
+        self.assertFalse(self.compound.frozen)
+        self.assertIs(self.compound.freeze(), self.compound)
+        self.assertTrue(self.compound.frozen)
+        self.assertIs(self.compound.freeze(), self.compound)
+        for perception in ['rings', 'aromaticity', 'symmetry', 'distances',
+                           'formula', 'molecular_weight']:
+            self.assertIn(perception, self.compound._perception)
+        # Nothing is left to fill in when it is read
+        self.assertIsNotNone(self.compound.distances._matrix)
+
+    def test_rejects_edits(self):
+        compound = self.compound.freeze()
+        edits = [lambda: compound.add_atom('H'),
+                 lambda: compound.add_bond('a3', 'a5'),
+                 lambda: compound.set_bond_order('b2', 1),
+                 lambda: compound.remove_bond('b4'),
+                 lambda: compound.remove_atom('a8'),
+                 lambda: compound.remove_node('a8'),
+                 lambda: compound.add_edge('a3', 'a5'),
+                 lambda: compound.atoms.pop('a8'),
+                 lambda: compound.bonds.update({}),
+                 lambda: compound.other_info.__setitem__('id', 'Vinegar')]
+        for edit in edits:
+            with self.assertRaises(TypeError):
+                edit()
+        with self.assertRaises(TypeError):
+            compound.other_info = {}
+        self.assertEqual(len(compound.atoms), 8)
+        self.assertEqual(len(compound.edges()), 7)
+        self.assertEqual(compound.other_info, {'id': 'Acetic acid'})
+
+    def test_hash(self):
+        state = self.compound.__getstate__()
+        renamed = compounds.Compound(
+            {key.replace('a', 'x'): symbol
+             for key, symbol in state['atoms'].iteritems()},
+            {key: (first.replace('a', 'x'), second.replace('a', 'x'), rest)
+             for key, (first, second, rest) in state['bonds'].iteritems()})
+        self.assertEqual(hash(self.compound.freeze()), hash(renamed.freeze()))
+        self.assertEqual({self.compound: 1}[renamed], 1)
+        self.assertEqual(len({self.compound, self.compound.thaw().freeze()}),
+                         1)
+
+    def test_unfrozen_hash(self):
+        # Equal compounds have to hash the same, so mutable ones can't hash
+        thawed = self.compound.thaw()
+        self.assertEqual(thawed, self.compound)
+        with self.assertRaises(TypeError):
+            hash(thawed)
+        with self.assertRaises(TypeError):
+            {thawed: 1}
+        with self.assertRaises(TypeError):
+            hash(Acid(thawed, 'a8', 4.76))
+        self.assertEqual(hash(Acid(self.compound.freeze(), 'a8', 4.76)),
+                         hash(self.compound))
+
+    def test_thaw(self):
+        frozen = self.compound.freeze()
+        thawed = frozen.thaw()
+        self.assertFalse(thawed.frozen)
+        self.assertIs(thawed.rings, frozen.rings)
+        self.assertIsNot(thawed.distances, frozen.distances)
+        thawed.other_info['id'] = 'Acetate'
+        thawed.remove_atom('a8')
+        self.assertEqual(thawed.formula, 'C2H3O2')
+        self.assertEqual(frozen.formula, 'C2H4O2')
+        self.assertEqual(frozen.other_info['id'], 'Acetic acid')
+        self.assertEqual(len(frozen.atoms), 8)
+
+    def test_copies(self):
+        frozen = self.compound.freeze()
+        self.assertIs(copy.copy(frozen), frozen)
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        loaded = cPickle.loads(cPickle.dumps(frozen, cPickle.HIGHEST_PROTOCOL))
+        self.assertTrue(loaded.frozen)
+        self.assertEqual(loaded.__getstate__(), frozen.__getstate__())
+        self.assertEqual(hash(loaded), hash(frozen))
+
+    def test_wrapper(self):
+        acid = Acid(self.compound, 'a8', 4.76)
+        self.assertIs(acid.freeze(), acid)
+        self.assertTrue(self.compound.frozen)
+        thawed = acid.thaw()
+        self.assertIsInstance(thawed, Acid)
+        self.assertFalse(thawed.compound.frozen)
+        self.assertEqual((thawed.acidic_point, thawed.pka),
+                         ('a8', 4.76))
+        thawed.remove_atom('a8')
+        self.assertEqual(acid.formula, 'C2H4O2')
+
+    def test_reaction(self):
+        acid = Acid(self.compound.freeze(), 'a8', 4.76)
+        base = Base(compounds.Compound(
+            {'a1': 'O', 'a2': 'H'}, {'b1': ('a1', 'a2', {'order': 1})},
+            {'id': 'Hydroxide'}).freeze(), 'a1', 15.7)
+        conjugate = base.to_conjugate_acid()
+        self.assertFalse(conjugate.compound.frozen)
+        self.assertEqual(conjugate.formula, 'H2O')
+        AcidBase(acid, base, {}).react()
+        self.assertEqual(self.compound.formula, 'C2H4O2')
+
+
 class TestSerializer(unittest.TestCase):
 
     def test_serialize_atom(self):
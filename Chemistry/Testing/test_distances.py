@@ -0,0 +1,93 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+import networkx as nx
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base import distances
+from Chemistry.base.compounds import Compound
+from Chemistry.base.distances import Distances, UNREACHABLE
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+def _path(n):
+    """0-1-2-...-(n-1)"""
+
+    neighbours = {atom: [] for atom in range(n)}
+    for atom in range(n - 1):
+        neighbours[atom].append(atom + 1)
+        neighbours[atom + 1].append(atom)
+    return neighbours
+
+
+class TestDistances(unittest.TestCase):
+
+    def test_matches_networkx(self):
+        compound = Compound(*parse_smiles('CC1=CC=C(C=C1)C(=O)OCC'))
+        expected = nx.all_pairs_shortest_path_length(compound)
+        found = compound.distances
+        for first in compound.atoms:
+            for second in compound.atoms:
+                self.assertEqual(found.distance(first, second),
+                                 expected[first][second])
+
+    def test_matrix(self):
+        matrix = Distances(_path(4)).matrix
+        self.assertEqual(matrix.tolist(), [[0, 1, 2, 3], [1, 0, 1, 2],
+                                           [2, 1, 0, 1], [3, 2, 1, 0]])
+
+    def test_unreachable(self):
+        found = Distances({'a': ['b'], 'b': ['a'], 'c': []})
+        self.assertEqual(found.distance('a', 'c'), UNREACHABLE)
+        self.assertIsNone(found.path('a', 'c'))
+        self.assertEqual(found.within('a', 10), ['b'])
+
+    def test_within(self):
+        found = Distances(_path(6))
+        self.assertEqual(found.within(2, 1), [1, 3])
+        self.assertEqual(found.within(2, 2), [1, 3, 0, 4])
+        self.assertEqual(found.within(2, 0), [])
+
+    def test_path(self):
+        # A square: both ways around are as short, so the smaller key is taken
+        found = Distances({0: [1, 3], 1: [0, 2], 2: [1, 3], 3: [2, 0]})
+        self.assertEqual(found.path(0, 2), [0, 1, 2])
+        self.assertEqual(found.path(2, 2), [2])
+
+    def test_charge_separation(self):
+        found = Distances(_path(6))
+        self.assertEqual(found.charge_separation({}), 0)
+        self.assertEqual(found.charge_separation({0: 1, 5: 1}), 0)
+        self.assertEqual(found.charge_separation({0: 1, 5: -1}), 5)
+        self.assertEqual(found.charge_separation({0: 1, 1: -1, 5: -2}), 11)
+        # Charges closer together score lower
+        self.assertLess(found.charge_separation({2: 1, 3: -1}),
+                        found.charge_separation({0: 1, 3: -1}))
+
+    def test_large_rows_on_demand(self):
+        size = distances.DENSE_LIMIT + 1
+        found = Distances(_path(size))
+        self.assertEqual(found.distance(0, size - 1), size - 1)
+        self.assertIsNone(found._matrix)
+        self.assertEqual(len(found._rows), 1)
+        self.assertEqual(found.within(0, 2), [1, 2])
+
+    def test_kept_until_edited(self):
+        compound = Compound(*synthetic.chain(10, hydrogens=0))
+        found = compound.distances
+        self.assertIs(compound.distances, found)
+        compound.add_bond('a1', compound.add_atom('O'))
+        self.assertIsNot(compound.distances, found)
+        self.assertEqual(len(compound.distances), 11)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,164 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import math
+import unittest
+
+import numpy as np
+
+from Chemistry.base.compounds import Compound
+from Chemistry.base.products import EquilibriumProducts
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.parsing.SMILES import parse_smiles
+from Chemistry.reactions._reactions import Conditions
+from Chemistry.reactions.acid_base import AcidBase
+from Chemistry.reactions.equilibrium import Solution, speciation
+
+
+class TestSolution(unittest.TestCase):
+
+    def test_water(self):
+        self.assertAlmostEqual(Solution().solve().ph, 7.)
+
+    def test_weak_acid(self):
+        solution = Solution()
+        acetic = solution.add('acetic acid', 0.1, [4.76])
+        speciation = solution.solve()
+        self.assertAlmostEqual(speciation.ph, 2.88, places=2)
+        fractions = speciation.fractions(acetic)
+        self.assertAlmostEqual(fractions.sum(), 1.)
+        self.assertAlmostEqual(speciation.reacted(acetic), fractions[1])
+
+    def test_conjugate_base(self):
+        solution = Solution()
+        solution.add('acetate', 0.1, [4.76], charge=0, added=1)
+        self.assertAlmostEqual(solution.solve().ph, 8.88, places=2)
+
+    def test_buffer(self):
+        solution = Solution()
+        solution.add('acetic acid', 0.1, [4.76])
+        solution.add('acetate', 0.1, [4.76], added=1)
+        self.assertAlmostEqual(solution.solve().ph, 4.76, places=2)
+
+    def test_polyprotic(self):
+        solution = Solution()
+        phosphate = solution.add('dihydrogen phosphate', 0.1,
+                                 [2.15, 7.20, 12.35], added=1)
+        speciation = solution.solve()
+        # An amphiprotic salt sits about halfway between its pKas
+        self.assertAlmostEqual(speciation.ph, (2.15 + 7.20) / 2, places=1)
+        self.assertEqual(np.argmax(speciation.fractions(phosphate)), 1)
+        self.assertAlmostEqual(speciation.concentration(phosphate).sum(), 0.1)
+
+    def test_dilute_strong_acid(self):
+        # Too dilute to outweigh the water
+        solution = Solution()
+        solution.add('HCl', 1e-8, [-7])
+        self.assertAlmostEqual(solution.solve().ph, 6.98, places=2)
+
+    def test_charge_doesnt_change_equilibrium(self):
+        first, second = Solution(), Solution()
+        first.add('ammonium', 0.05, [9.25], charge=1)
+        second.add('ammonium', 0.05, [9.25], charge=0)
+        self.assertAlmostEqual(first.solve().ph, second.solve().ph)
+
+    def test_many_species(self):
+        random = np.random.RandomState(0)
+        solution = Solution()
+        for number in range(300):
+            pkas = sorted(random.uniform(0, 14, random.randint(1, 4)))
+            solution.add(number, random.uniform(0, 0.01), pkas,
+                         added=random.randint(0, 2))
+        speciation = solution.solve()
+        # Protons are neither made nor lost
+        lost = sum(family.concentration
+                   * (np.dot(speciation.fractions(number),
+                             np.arange(len(family.pkas) + 1))
+                      - family.added)
+                   for number, family in enumerate(solution.families))
+        h = 10 ** -speciation.ph
+        self.assertAlmostEqual(lost + 1e-14 / h - h, 0., places=12)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Solution().add('acid', 0.1, [4.76], added=2)
+        with self.assertRaises(ValueError):
+            Solution().add('acid', -0.1, [4.76])
+
+
+class TestSpeciation(unittest.TestCase):
+
+    def test_half_at_pka(self):
+        self.assertTrue(np.allclose(speciation([4.76], 4.76), [0.5, 0.5]))
+        self.assertTrue(np.allclose(speciation([4.76], 2.76),
+                                    [100. / 101, 1. / 101]))
+
+    def test_polyprotic(self):
+        fractions = speciation([2.15, 7.20, 12.35], [0, 7.2, 14])
+        self.assertEqual(fractions.shape, (3, 4))
+        self.assertTrue(np.allclose(fractions.sum(axis=-1), 1.))
+        self.assertEqual(fractions.argmax(axis=-1).tolist(), [0, 1, 3])
+        self.assertAlmostEqual(fractions[1, 1], fractions[1, 2])
+
+    def test_padding(self):
+        fractions = speciation([[2.15, 7.20, 12.35], [4.76, np.nan, np.nan]],
+                               4.76)
+        self.assertTrue(np.allclose(fractions[1], [0.5, 0.5, 0, 0]))
+        self.assertTrue(np.allclose(fractions[0],
+                                    speciation([2.15, 7.20, 12.35], 4.76)))
+
+    def test_broadcasting(self):
+        # Compounds x solvents x pH
+        pkas = np.array([[4.76], [9.25]])[:, np.newaxis, :] + [[0.], [1.]]
+        ph = np.linspace(0, 14, 50)
+        fractions = speciation(pkas[:, :, np.newaxis, :], ph)
+        self.assertEqual(fractions.shape, (2, 2, 50, 2))
+        self.assertTrue(np.allclose(fractions[1, 1],
+                                    speciation([10.25], ph)))
+
+    def test_matches_solution(self):
+        solution = Solution()
+        phosphate = solution.add('phosphate', 0.1, [2.15, 7.20, 12.35])
+        found = solution.solve()
+        self.assertTrue(np.allclose(speciation([2.15, 7.20, 12.35], found.ph),
+                                    found.fractions(phosphate)))
+
+
+class TestReactants(unittest.TestCase):
+
+    def setUp(self):
+        self.acetic = Acid(Compound(*parse_smiles('CC(=O)O')), 'a8', 4.76)
+        self.ammonia = Base(Compound(*parse_smiles('N')), 'a1', 9.25)
+
+    def test_add_reactant(self):
+        solution = Solution()
+        solution.add_reactant(self.acetic, 0.1)
+        base = solution.add_reactant(self.ammonia, 0.1)
+        self.assertEqual(solution.families[base].added, 1)
+        self.assertEqual(solution.families[base].charge, 1)
+        self.assertAlmostEqual(solution.solve().ph, (4.76 + 9.25) / 2,
+                               places=2)
+        with self.assertRaises(TypeError):
+            solution.add_reactant(self.acetic.compound, 0.1)
+
+    def test_degeneracy(self):
+        solution = Solution()
+        solution.add_reactant(Acid(self.acetic.compound, 'a8', 4.76, 2), 1.)
+        self.assertEqual(solution.families[0].pkas, [4.76 - math.log10(2)])
+
+    def test_acid_base_ratio(self):
+        result = AcidBase(self.acetic, self.ammonia, Conditions({})).react()
+        self.assertIsInstance(result, EquilibriumProducts)
+        # With equal amounts, the ratio is the square root of K
+        self.assertAlmostEqual(math.log10(result.ratio),
+                               (9.25 - 4.76) / 2, places=2)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
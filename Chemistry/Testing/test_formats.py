@@ -0,0 +1,157 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import bz2
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from Chemistry.exceptions.ParseErrors import UnsupportedFileTypeException
+from Chemistry.interface import batch, formats
+from Chemistry.interface.compound_utility import compound_from_file, \
+    compounds_from_file
+
+
+MOLECULES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'test_molecules')
+SDF_FILE = os.path.join(MOLECULES, 'SDF', 'SDF_1.sdf')
+CML_FILE = os.path.join(MOLECULES, 'CML', 'CML_1.cml')
+SMILES_FILE = os.path.join(MOLECULES, 'SMILES', 'SMILES_1.smi')
+
+
+def _gzipped(data):
+    output = io.BytesIO()
+    with gzip.GzipFile(fileobj=output, mode='wb') as compressed:
+        compressed.write(data)
+    return output.getvalue()
+
+
+class TestDetection(unittest.TestCase):
+
+    def test_split_extension(self):
+        self.assertEqual(formats.split_extension('a/library.SDF.gz'),
+                         ('sdf', 'gz'))
+        self.assertEqual(formats.split_extension('water.cml'), ('cml', None))
+        self.assertEqual(formats.split_extension('x.smi.bz2'), ('smi', 'bz2'))
+        self.assertEqual(formats.split_extension('archive.xz'), ('', 'xz'))
+
+    def test_detect_compression(self):
+        self.assertEqual(formats.detect_compression(_gzipped('CCO')), 'gz')
+        self.assertEqual(formats.detect_compression(bz2.compress('CCO')),
+                         'bz2')
+        self.assertIsNone(formats.detect_compression('CCO'))
+
+    def test_detect_format(self):
+        for path, name in ((SDF_FILE, 'sdf'), (CML_FILE, 'cml'),
+                           (SMILES_FILE, 'smi')):
+            with open(path, 'rb') as file_:
+                self.assertEqual(formats.detect_format(file_.read(1024)).name,
+                                 name)
+        self.assertIsNone(formats.detect_format('not a molecule\n'))
+
+    def test_registry(self):
+        self.assertIs(formats.get_format('mol'), formats.FORMATS['sdf'])
+        self.assertIn('smiles', formats.SUPPORTED_FILETYPES)
+        with self.assertRaises(UnsupportedFileTypeException):
+            formats.get_format('xyz')
+
+    def test_register_format(self):
+        sdf = formats.FORMATS['sdf']
+        try:
+            formats.register_format('fake', sdf.parser, sdf.builder,
+                                    ('fk',), lambda head: head == 'FAKE')
+            self.assertIs(formats.get_format('fk'), formats.FORMATS['fake'])
+            self.assertEqual(formats.detect_format('FAKE').name, 'fake')
+        finally:
+            del formats.FORMATS['fake']
+            for extension in ('fake', 'fk'):
+                del formats._EXTENSIONS[extension]
+                del formats.SUPPORTED_FILETYPES[extension]
+
+
+class TestCompressedFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        with open(SDF_FILE, 'rb') as sdf_file:
+            self.text = sdf_file.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def ids(self, source, filetype=None):
+        return [compound.other_info['id'] for compound
+                in compounds_from_file(source, filetype)]
+
+    def test_gzip_path(self):
+        path = os.path.join(self.tempdir, 'library.sdf.gz')
+        with formats.open_for_writing(path) as output:
+            output.write(self.text)
+        self.assertEqual(self.ids(path), ['Ethanol', 'Ammonium', 'Acetate'])
+        self.assertEqual(compound_from_file(path).other_info['id'], 'Ethanol')
+
+    def test_bz2_without_extension(self):
+        path = os.path.join(self.tempdir, 'library')
+        with formats.open_for_writing(path, 'bz2') as output:
+            output.write(self.text)
+        with formats.open_compound_file(path) as opened:
+            self.assertEqual(opened.compression, 'bz2')
+            self.assertEqual(opened.format.name, 'sdf')
+            self.assertEqual(opened.read(), self.text)
+
+    def test_concatenated_streams(self):
+        data = _gzipped(self.text) + _gzipped(self.text)
+        self.assertEqual(len(self.ids(io.BytesIO(data))), 6)
+        data = bz2.compress(self.text) + bz2.compress(self.text)
+        self.assertEqual(len(self.ids(io.BytesIO(data))), 6)
+
+    def test_small_buffer(self):
+        opened = formats.open_compound_file(io.BytesIO(_gzipped(self.text)),
+                                            'sdf', buffer_size=16)
+        self.assertEqual(opened.read(), self.text)
+
+    def test_file_left_open(self):
+        file_ = io.BytesIO(_gzipped(self.text))
+        with formats.open_compound_file(file_) as opened:
+            opened.read()
+        self.assertFalse(file_.closed)
+
+    def test_smiles(self):
+        with open(SMILES_FILE, 'rb') as smiles_file:
+            data = bz2.compress(smiles_file.read())
+        self.assertEqual(len(list(compounds_from_file(io.BytesIO(data)))),
+                         len(list(compounds_from_file(SMILES_FILE))))
+
+    def test_unknown(self):
+        with self.assertRaises(UnsupportedFileTypeException):
+            compound_from_file(io.BytesIO(_gzipped('not a molecule\n')))
+        with self.assertRaises(UnsupportedFileTypeException):
+            formats.open_compound_file(io.BytesIO(self.text),
+                                       compression='zip')
+
+    @unittest.skipIf(formats.lzma is not None, "the lzma module is available")
+    def test_no_lzma(self):
+        with self.assertRaises(UnsupportedFileTypeException):
+            formats.open_compound_file(io.BytesIO('\xfd7zXZ\x00'))
+
+    def test_batch(self):
+        path = os.path.join(self.tempdir, 'water.cml.gz')
+        with open(CML_FILE, 'rb') as cml_file:
+            with formats.open_for_writing(path) as output:
+                output.write(cml_file.read())
+        self.assertEqual(list(batch.find_files([self.tempdir])),
+                         [(path, 'cml')])
+        self.assertIn('results', next(batch.process_file((path, 'cml'))))
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,106 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+import numpy as np
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.huckel import huckel, huckel_batch
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+def _system(smiles):
+    systems = huckel(Compound(*parse_smiles(smiles)))
+    assert len(systems) == 1
+    return systems[0]
+
+
+class TestHuckel(unittest.TestCase):
+
+    def test_ethylene(self):
+        system = _system('C=C')
+        self.assertEqual(system.energies.tolist(), [1., -1.])
+        self.assertEqual(system.occupations.tolist(), [2., 0.])
+        self.assertAlmostEqual(system.energy, 2.)
+        self.assertAlmostEqual(system.delocalization, 0.)
+        self.assertAlmostEqual(system.bond_orders.values()[0], 1.)
+
+    def test_butadiene(self):
+        system = _system('C=CC=C')
+        self.assertTrue(np.allclose(system.energies,
+                                    [1.618034, 0.618034, -0.618034,
+                                     -1.618034]))
+        self.assertAlmostEqual(system.delocalization, 0.472136, places=6)
+        orders = sorted(system.bond_orders.values())
+        self.assertTrue(np.allclose(orders, [0.447214, 0.894427, 0.894427]))
+
+    def test_benzene(self):
+        system = _system('c1ccccc1')
+        self.assertTrue(np.allclose(system.energies, [2, 1, 1, -1, -1, -2]))
+        self.assertAlmostEqual(system.energy, 8.)
+        self.assertAlmostEqual(system.delocalization, 2.)
+        self.assertTrue(np.allclose(system.bond_orders.values(), 2. / 3))
+        self.assertTrue(np.allclose(system.densities.values(), 1.))
+
+    def test_degenerate_orbitals_share(self):
+        # Cyclobutadiene's two nonbonding orbitals get an electron each
+        system = _system('C1=CC=C1')
+        self.assertEqual(system.occupations.tolist(), [2., 1., 1., 0.])
+        self.assertTrue(np.allclose(system.bond_orders.values(), 0.5))
+
+    def test_allyl_cation(self):
+        system = _system('C=C[CH2+]')
+        self.assertAlmostEqual(sum(system.charges.values()), 1.)
+        ends = [key for key in system.atoms
+                if abs(system.charges[key]) > 1e-8]
+        self.assertEqual(len(ends), 2)
+        for key in ends:
+            self.assertAlmostEqual(system.charges[key], 0.5)
+
+    def test_heteroatoms(self):
+        pyrrole = _system('c1cc[nH]c1')
+        nitrogen = [key for key in pyrrole.atoms
+                    if pyrrole.densities[key] < 1.9
+                    and pyrrole.charges[key] > 0]
+        self.assertEqual(len(nitrogen), 1)
+        self.assertAlmostEqual(sum(pyrrole.charges.values()), 0.)
+        acetate = _system('CC(=O)[O-]')
+        self.assertEqual(len(acetate.atoms), 3)
+        self.assertAlmostEqual(sum(acetate.charges.values()), -1.)
+
+    def test_no_pi_system(self):
+        self.assertEqual(huckel(Compound(*parse_smiles('CCO'))), [])
+        # Each double bond of an allene is a system of its own
+        self.assertEqual(len(huckel(Compound(*parse_smiles('C=C=C')))), 0)
+        self.assertEqual(
+            [len(system.atoms) for system in
+             huckel(Compound(*parse_smiles('C=CCC=C')))], [2, 2])
+
+    def test_batch_matches_single(self):
+        compounds = [Compound(*parse_smiles(smiles)) for smiles in
+                     ('C=CC=C', 'c1ccccc1', 'CCO', 'C=CCC=C', 'c1ccncc1')]
+        compounds.append(Compound(*synthetic.polyaromatic(3)))
+        batched = huckel_batch(compounds)
+        self.assertEqual(len(batched), len(compounds))
+        for compound, systems in zip(compounds, batched):
+            single = huckel(compound)
+            self.assertEqual(len(systems), len(single))
+            for first, second in zip(systems, single):
+                self.assertEqual(first.atoms, second.atoms)
+                self.assertTrue(np.allclose(first.energies, second.energies))
+                self.assertAlmostEqual(first.delocalization,
+                                       second.delocalization)
+                for key, order in first.bond_orders.iteritems():
+                    self.assertAlmostEqual(order, second.bond_orders[key])
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
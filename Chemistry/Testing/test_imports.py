@@ -0,0 +1,66 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import json
+import subprocess
+import sys
+import unittest
+
+
+def _loaded_after(statement, modules):
+    """Runs `statement` in a fresh interpreter and reports which of `modules`
+    were imported as a result.
+    """
+
+    script = ('import json, sys\n{}\n'
+              'print(json.dumps([name for name in {!r} '
+              'if name in sys.modules]))').format(statement, list(modules))
+    return json.loads(subprocess.check_output([sys.executable, '-c', script]))
+
+
+class TestLazyImports(unittest.TestCase):
+
+    heavy = ('networkx', 'lxml', 'Chemistry.base.periodic_table',
+             'Chemistry.base.compounds', 'Chemistry.reactions.acid_base')
+
+    def test_packages_import_nothing_heavy(self):
+        statement = ('import Chemistry, Chemistry.base, Chemistry.parsing, '
+                     'Chemistry.reactions, Chemistry.interface, '
+                     'Chemistry.exceptions, Chemistry.profiling')
+        self.assertEqual(_loaded_after(statement, self.heavy), [])
+
+    def test_cml_parser_defers_lxml(self):
+        self.assertEqual(
+            _loaded_after('import Chemistry.parsing.CheML', ['lxml']), [])
+
+    def test_submodule_on_access(self):
+        self.assertEqual(
+            _loaded_after('import Chemistry; Chemistry.base.compounds',
+                          self.heavy),
+            ['networkx', 'Chemistry.base.periodic_table',
+             'Chemistry.base.compounds'])
+
+    def test_reexported_names(self):
+        from Chemistry.reactions import AcidBase
+        from Chemistry.reactions.acid_base import AcidBase as original
+        self.assertIs(AcidBase, original)
+
+        import Chemistry
+        from Chemistry.base import compounds
+        self.assertIs(Chemistry.base.compounds, compounds)
+        self.assertIn('acid_base', dir(Chemistry.reactions))
+
+    def test_missing_attribute(self):
+        import Chemistry.reactions
+        with self.assertRaises(AttributeError):
+            Chemistry.reactions.not_a_module
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -6,10 +6,13 @@
 __author__ = "Dan Obermiller"
 
 
+import threading
 import unittest
 
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
 from Chemistry.interface.reaction_utility import separate_molecules, \
-    add_other_to_molecule
+    add_other_to_molecule, assign_roles, react_molecules, ReactionRunner
 
 
 class TestSeparate(unittest.TestCase):
@@ -73,3 +76,139 @@ class TestAddOther(unittest.TestCase):
         add_other_to_molecule(resulting_molecules[0], {'name': 'Water'})
         self.assertIn('name', resulting_molecules[0]['other_info'])
         self.assertEqual('Water', resulting_molecules[0]['other_info']['name'])
+
+
+class TestReactMolecules(unittest.TestCase):
+
+    def setUp(self):
+        # Hydronium and hydroxide on the same canvas
+        self.atoms = {'a1': 'H', 'a2': 'H', 'a3': 'O', 'a4': 'H',
+                      'a5': 'H', 'a6': 'O'}
+        self.bonds = {'b1': ('a1', 'a3', {'order': 1, 'chirality': None}),
+                      'b2': ('a2', 'a3', {'order': 1, 'chirality': None}),
+                      'b3': ('a3', 'a4', {'order': 1, 'chirality': None}),
+                      'b4': ('a5', 'a6', {'order': 1, 'chirality': None})}
+        self.other = {'id': 'Canvas', 'acidic_point': 'a1',
+                      'acid_pka': '-1.74', 'basic_point': 'a6',
+                      'base_pka': '15.7'}
+
+    def test_assign_roles(self):
+        compound = Compound({'a5': 'H', 'a6': 'O'},
+                            {'b4': ('a5', 'a6', {'order': 1})}, {})
+        roles = assign_roles(compound, self.other)
+        self.assertEqual(len(roles), 1)
+        self.assertIsInstance(roles[0], Base)
+        self.assertEqual(roles[0].basic_point, 'a6')
+        self.assertEqual(roles[0].pka, 15.7)
+
+    def test_assign_roles_needs_pka(self):
+        compound = Compound({'a5': 'H', 'a6': 'O'},
+                            {'b4': ('a5', 'a6', {'order': 1})}, {})
+        with self.assertRaises(ValueError):
+            assign_roles(compound, {'basic_point': 'a6'})
+
+    def test_no_roles(self):
+        self.assertEqual(react_molecules(self.atoms, self.bonds, {}), [])
+
+    def test_react(self):
+        results = react_molecules(self.atoms, self.bonds, self.other)
+        self.assertEqual(len(results), 1)
+        result = results[0]
+        self.assertEqual(result['reaction'], 'AcidBase')
+        self.assertEqual(result['reactants'], ['Canvas 1', 'Canvas 2'])
+        self.assertFalse(result['equilibrium'])
+        self.assertEqual(len(result['products']), 2)
+        for product in result['products']:
+            water = Compound(product['atoms'], product['bonds'], {})
+            self.assertEqual(sorted(water.atoms[key].symbol
+                                    for key in water.atoms), ['H', 'H', 'O'])
+
+    def test_no_reaction(self):
+        self.other['base_pka'] = '-1.74'
+        results = react_molecules(self.atoms, self.bonds, self.other)
+        self.assertIn('error', results[0])
+
+
+class TestReactionRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.runner = ReactionRunner(self.received.append, self.react)
+
+    def tearDown(self):
+        self.gate.set()
+        self.runner.shutdown()
+
+    def react(self, atoms, bonds, other, **kwargs):
+        """Stands in for react_molecules; blocks until the gate opens if the
+        atoms ask it to.
+        """
+
+        self.started.set()
+        if atoms.get('wait'):
+            self.gate.wait(5)
+        if atoms.get('fail'):
+            raise ValueError('bad molecule')
+        return sorted(atoms.itervalues())
+
+    def test_result_through_callback(self):
+        request = self.runner.submit({'a1': 'H'}, {}, reactions=[])
+        delivered = self.runner.poll(timeout=5)
+        self.assertEqual(len(delivered), 1)
+        self.assertEqual(self.received, delivered)
+        self.assertEqual(delivered[0].request, request)
+        self.assertEqual(delivered[0].results, ['H'])
+        self.assertIsNone(delivered[0].error)
+
+    def test_queue_without_callback(self):
+        self.runner.callback = None
+        self.runner.submit({'a1': 'O'}, {})
+        self.assertEqual(self.runner.poll(timeout=5)[0].results, ['O'])
+        self.assertEqual(self.received, [])
+
+    def test_error(self):
+        self.runner.submit({'fail': True}, {})
+        result = self.runner.poll(timeout=5)[0]
+        self.assertIsNone(result.results)
+        self.assertIsInstance(result.error, ValueError)
+
+    def test_inputs_copied(self):
+        atoms = {'a1': 'H'}
+        self.runner.submit(atoms, {})
+        atoms['a2'] = 'O'
+        self.assertEqual(self.runner.poll(timeout=5)[0].results, ['H'])
+
+    def test_stale_requests(self):
+        self.runner.submit({'wait': True, 'a1': 'C'}, {})
+        self.started.wait(5)
+        self.runner.submit({'a1': 'N'}, {})
+        latest = self.runner.submit({'a1': 'O'}, {})
+        self.gate.set()
+
+        delivered = self.runner.poll(timeout=5)
+        while not delivered:
+            delivered = self.runner.poll(timeout=5)
+        self.assertEqual([result.request for result in delivered], [latest])
+        self.assertEqual(self.received[0].results, ['O'])
+        # The running request finished but was thrown away, and the one in
+        # between never started
+        self.assertEqual(self.runner.cancelled, 2)
+
+    def test_cancel(self):
+        request = self.runner.submit({'a1': 'H'}, {})
+        self.runner.cancel()
+        self.assertTrue(self.runner.is_stale(request))
+        self.runner.shutdown()
+        self.assertEqual(self.runner.poll(), [])
+        self.assertEqual(self.received, [])
+
+    def test_real_reaction(self):
+        runner = ReactionRunner()
+        try:
+            runner.submit({'a1': 'H', 'a2': 'O'},
+                          {'b1': ('a1', 'a2', {'order': 1})})
+            self.assertEqual(runner.poll(timeout=5)[0].results, [])
+        finally:
+            runner.shutdown()
@@ -0,0 +1,148 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+import numpy as np
+
+from Chemistry.base.components import Atom
+from Chemistry.base.compounds import Compound
+from Chemistry.base.isotopes import (element_counts, isotope_pattern,
+                                     isotope_patterns, parse_formula)
+from Chemistry.base.periodic_table import periodic_table
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+def _convolved(counts):
+    """The distribution over nominal masses, convolving atom by atom."""
+
+    distribution = {0: 1.}
+    for symbol, count in counts.iteritems():
+        for _ in range(count):
+            combined = {}
+            for mass, abundance in distribution.iteritems():
+                for isotope, fraction in periodic_table[symbol]['Isotopes']:
+                    key = mass + int(round(isotope))
+                    combined[key] = combined.get(key, 0) + abundance * fraction
+            distribution = combined
+    return distribution
+
+
+class TestIsotopeData(unittest.TestCase):
+
+    def test_abundances(self):
+        for symbol, element in periodic_table.iteritems():
+            if element['Isotopes'] is not None:
+                self.assertAlmostEqual(
+                    sum(abundance for _, abundance in element['Isotopes']),
+                    1., places=3)
+
+    def test_coverage(self):
+        # Every element with a natural isotopic composition has data: all but
+        # Tc and Pm up to bismuth, and thorium, protactinium and uranium
+        missing = {'Tc', 'Pm', 'Po', 'At', 'Rn', 'Fr', 'Ra', 'Ac'}
+        for symbol, element in periodic_table.iteritems():
+            number = element['Atomic Number']
+            if number <= 92 and symbol not in missing:
+                self.assertTrue(element['Isotopes'], symbol)
+            else:
+                self.assertIsNone(element['Isotopes'], symbol)
+
+    def test_atom(self):
+        self.assertEqual(Atom('Cl').isotopes,
+                         [[34.968852682, 0.7576], [36.965902602, 0.2424]])
+
+
+class TestFormulas(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_formula('C6H12O6'), {'C': 6, 'H': 12, 'O': 6})
+        self.assertEqual(parse_formula('CH3CH2OH'), {'C': 2, 'H': 6, 'O': 1})
+        for formula in ['', 'c6', 'C6(H2)', 'Xx2']:
+            with self.assertRaises(ValueError):
+                parse_formula(formula)
+
+    def test_compound(self):
+        compound = Compound(*parse_smiles('CC(=O)O'))
+        self.assertEqual(element_counts(compound),
+                         parse_formula(compound.formula))
+
+
+class TestPatterns(unittest.TestCase):
+
+    def test_carbon(self):
+        pattern = isotope_pattern('C10')
+        self.assertEqual(list(pattern.nominal[:2]), [120, 121])
+        self.assertAlmostEqual(pattern.relative[1], 10 * 0.0107 / 0.9893)
+        self.assertAlmostEqual(pattern.masses[1], 121.003354835)
+        self.assertEqual(pattern.monoisotopic, 120.)
+
+    def test_chlorine(self):
+        pattern = isotope_pattern('Cl2')
+        self.assertEqual(list(pattern.nominal), [70, 72, 74])
+        self.assertTrue(np.allclose(pattern.relative, [1, 0.6399, 0.1024],
+                                    atol=1e-4))
+
+    def test_direct(self):
+        counts = parse_formula('C20H30N2O4SClBr')
+        pattern = isotope_pattern('C20H30N2O4SClBr', threshold=0)
+        expected = _convolved(counts)
+        found = dict(zip(pattern.nominal, pattern.abundances))
+        for mass, abundance in expected.iteritems():
+            self.assertAlmostEqual(found.get(mass, 0), abundance, places=12)
+
+    def test_centroids(self):
+        formula = 'C60H90N10O20S2'
+        pattern = isotope_pattern(formula, threshold=0)
+        self.assertAlmostEqual(pattern.abundances.sum(), 1.)
+        average = sum(count * sum(mass * abundance for mass, abundance
+                                  in periodic_table[symbol]['Isotopes'])
+                      for symbol, count in parse_formula(formula).iteritems())
+        self.assertAlmostEqual(pattern.masses.dot(pattern.abundances),
+                               average, places=6)
+        peaks = pattern.abundances > 1e-9
+        self.assertTrue(np.all(np.abs(pattern.masses[peaks]
+                                      - pattern.nominal[peaks]) < 1))
+
+    def test_large(self):
+        pattern = isotope_pattern('C2000H3000N500O600S20')
+        self.assertGreater(pattern.abundances.sum(), 1 - 1e-5)
+        self.assertTrue(np.all(np.diff(pattern.nominal) == 1))
+        # The peak of the lightest isotopes is far too small to keep
+        self.assertGreater(pattern.nominal[0], 44240)
+
+    def test_batch(self):
+        compounds = ['C6H6', Compound(*parse_smiles('CCO')), 'ZnCl2',
+                     'C1000H2000', 'F2']
+        for batched, compound in zip(isotope_patterns(compounds), compounds):
+            single = isotope_pattern(compound)
+            self.assertTrue(np.array_equal(batched.nominal, single.nominal))
+            self.assertTrue(np.allclose(batched.abundances,
+                                        single.abundances))
+        self.assertEqual(isotope_patterns([]), [])
+
+    def test_heavy_elements(self):
+        for formula in ['SnCl4', 'RuCl3', 'UF6', 'OsO4']:
+            pattern = isotope_pattern(formula, threshold=0)
+            expected = _convolved(parse_formula(formula))
+            found = dict(zip(pattern.nominal, pattern.abundances))
+            for mass, abundance in expected.iteritems():
+                self.assertAlmostEqual(found.get(mass, 0), abundance,
+                                       places=12)
+
+    def test_invalid(self):
+        # Technetium has no stable isotopes, and so no natural abundances
+        with self.assertRaises(ValueError):
+            isotope_pattern('TcCl4')
+        with self.assertRaises(ValueError):
+            isotope_patterns(['C6H6', Compound({}, {}, {})])
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,158 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+import numpy as np
+
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.parsing.SMILES import parse_smiles
+from Chemistry.reactions import kinetics
+from Chemistry.reactions._reactions import Conditions
+from Chemistry.reactions.acid_base import AcidBase
+from Chemistry.reactions.kinetics import Kinetics
+from Chemistry.reactions.network import ReactionNetwork
+
+
+class TestKinetics(unittest.TestCase):
+
+    def test_first_order(self):
+        network = Kinetics()
+        network.add_reaction(['A'], ['B'], 2.)
+        times = np.linspace(0, 3, 7)
+        trajectory = network.simulate({'A': 1.}, times, rtol=1e-6)
+        self.assertTrue(np.allclose(trajectory.course('A'),
+                                    np.exp(-2 * times), atol=1e-5))
+        self.assertTrue(np.allclose(trajectory.concentrations.sum(axis=1),
+                                    1.))
+
+    def test_second_order(self):
+        network = Kinetics()
+        network.add_reaction(['A', 'A'], ['B'], 0.5)
+        times = np.linspace(0, 10, 5)
+        trajectory = network.simulate({'A': 2.}, times, rtol=1e-6)
+        # -dA/dt = 2 k A ** 2
+        self.assertTrue(np.allclose(trajectory.course('A'),
+                                    1 / (0.5 + times), rtol=1e-4))
+        self.assertAlmostEqual(trajectory.final()['B'],
+                               (2 - 1 / 10.5) / 2, places=4)
+
+    def test_reversible(self):
+        network = Kinetics()
+        self.assertEqual(network.add_reaction(['A'], ['B'], 3., 1.), 0)
+        self.assertEqual(len(network.reactions), 2)
+        final = network.simulate({'A': 1.}, [0, 20]).final()
+        self.assertAlmostEqual(final['B'] / final['A'], 3., places=3)
+
+    def test_stiff(self):
+        # Robertson's problem, with rate constants nine orders of magnitude
+        # apart
+        network = Kinetics()
+        network.add_reaction(['A'], ['B'], 0.04)
+        network.add_reaction(['B', 'B'], ['B', 'C'], 3e7)
+        network.add_reaction(['B', 'C'], ['A', 'C'], 1e4)
+        trajectory = network.simulate({'A': 1.}, [0, 40, 4e5], rtol=1e-6,
+                                      atol=1e-14)
+        self.assertTrue(np.allclose(trajectory.concentrations[1],
+                                    [0.7158, 9.185e-6, 0.2842], rtol=1e-3))
+        self.assertTrue(np.allclose(trajectory.concentrations.sum(axis=1),
+                                    1.))
+        # An explicit method would need millions
+        self.assertLess(trajectory.steps, 10000)
+
+    def test_jacobian(self):
+        network = Kinetics()
+        network.add_reaction(['A', 'A', 'B'], ['C'], 2.)
+        network.add_reaction(['C'], ['A', 'B'], 0.5)
+        concentrations = np.array([0.3, 0.7, 0.1])
+        found = network.jacobian(concentrations)
+        steps = np.eye(3) * 1e-6
+        expected = np.array([(network.derivative(concentrations + step)
+                              - network.derivative(concentrations - step))
+                             / 2e-6 for step in steps]).T
+        self.assertTrue(np.allclose(found, expected, atol=1e-6))
+
+    def test_iterative_matches_dense(self):
+        network = Kinetics()
+        random = np.random.RandomState(0)
+        for number in range(60):
+            network.add_reaction([number], [number + 1],
+                                 10 ** random.uniform(-1, 3))
+            network.add_reaction([number, number + 1], [number + 2],
+                                 10 ** random.uniform(-1, 1), 0.1)
+        initial = random.uniform(0, 1, len(network.species))
+        times = np.linspace(0, 5, 6)
+        dense = network.simulate(initial, times)
+        limit = kinetics.DENSE_LIMIT
+        kinetics.DENSE_LIMIT = 0
+        try:
+            sparse = network.simulate(initial, times)
+        finally:
+            kinetics.DENSE_LIMIT = limit
+        self.assertTrue(np.allclose(dense.concentrations,
+                                    sparse.concentrations, atol=1e-6))
+
+    def test_distribution(self):
+        network = Kinetics()
+        network.add_reaction(['A'], ['B'], 3.)
+        network.add_reaction(['A'], ['C'], 1.)
+        trajectory = network.simulate({'A': 1.}, [0, 10])
+        distribution = trajectory.distribution()
+        self.assertEqual(sorted(distribution), ['B', 'C'])
+        self.assertAlmostEqual(distribution['B'], 0.75, places=4)
+        self.assertEqual(trajectory.distribution(['A']), {'A': 0.})
+
+    def test_invalid(self):
+        network = Kinetics()
+        with self.assertRaises(ValueError):
+            network.add_reaction(['A'], ['B'], -1.)
+        network.add_reaction(['A'], ['B'], 1.)
+        with self.assertRaises(ValueError):
+            network.simulate({'A': 1.}, [1, 0])
+
+
+class TestReactions(unittest.TestCase):
+
+    def setUp(self):
+        self.acetic = Acid(Compound(*parse_smiles('CC(=O)O')), 'a8', 4.76)
+        self.ammonia = Base(Compound(*parse_smiles('N')), 'a1', 9.25)
+
+    def test_reactants(self):
+        reaction = AcidBase(self.acetic, self.ammonia, Conditions({}))
+        self.assertEqual(reaction.reactants, (self.acetic, self.ammonia))
+
+    def test_from_reactions(self):
+        reaction = AcidBase(self.acetic, self.ammonia, Conditions({}))
+        network = Kinetics.from_reactions([reaction], [(1e3, 1e-2)])
+        self.assertEqual(len(network.species), 4)
+        self.assertEqual(len(network.reactions), 2)
+        acid = network.network.find(self.acetic)[0]
+        base = network.network.find(self.ammonia)[0]
+        final = network.simulate({acid: 0.1, base: 0.1}, [0, 100]).final()
+        self.assertLess(final[acid], 0.01)
+        self.assertAlmostEqual(sum(final.values()), 0.2, places=6)
+
+    def test_from_network(self):
+        network = ReactionNetwork([self.acetic, self.ammonia])
+        network.expand()
+        reaction = network.reaction_nodes[0]
+        built = Kinetics.from_network(network, {reaction: 1.})
+        self.assertEqual(built.species, network.species)
+        self.assertEqual(len(built.reactions), 1)
+        reactants, products, _ = built.reactions[0]
+        self.assertEqual(sorted(reactants),
+                         sorted(network.graph.predecessors(reaction)))
+        self.assertEqual(products,
+                         tuple(sorted(network.graph.successors(reaction))))
+        self.assertFalse(Kinetics.from_network(network, {}).reactions)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,83 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from Chemistry.base.compounds import Compound
+from Chemistry.interface.compound_utility import compounds_from_file
+from Chemistry.interface.mass_index import MassIndex
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+SDF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'test_molecules', 'SDF', 'SDF_1.sdf')
+
+
+class TestMassIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.index = MassIndex()
+        for smiles in ['CCO', 'O', 'COC', 'c1ccccc1O', 'OCC(O)CO']:
+            self.index.add(Compound(*parse_smiles(smiles)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_sorted(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertTrue(np.all(np.diff(self.index.masses) >= 0))
+        self.assertEqual(self.index.identifiers.tolist(), [1, 0, 2, 4, 3])
+
+    def test_mass_range(self):
+        self.assertEqual(self.index.mass_range(40, 50).tolist(), [0, 2])
+        self.assertEqual(self.index.near(94.11, 0.01).tolist(), [3])
+        self.assertEqual(self.index.mass_range(1000, 2000).tolist(), [])
+
+    def test_isomers(self):
+        self.assertEqual(self.index.isomers('C2H6O').tolist(), [0, 2])
+        self.assertEqual(self.index.isomers('C3H8O3').tolist(), [4])
+        self.assertEqual(self.index.isomers('C6H12O6').tolist(), [])
+        self.assertEqual(self.index.formulas(),
+                         ['C2H6O', 'H2O', 'C6H6O', 'C3H8O3'])
+
+    def test_incremental(self):
+        self.index.mass_range(0, 100)
+        self.assertEqual(self.index.add_entry(46.07, 'C2H6O'), 5)
+        self.index.add_entry(180.16, 'C6H12O6', identifier=42)
+        self.assertEqual(self.index.isomers('C2H6O').tolist(), [0, 2, 5])
+        self.assertEqual(self.index.mass_range(180, 180.2).tolist(), [42])
+
+    def test_save_load(self):
+        path = os.path.join(self.tempdir, 'index')
+        self.index.save(path)
+        self.assertTrue(os.path.exists(os.path.join(path, 'masses.npy')))
+        for mmap in (False, True):
+            loaded = MassIndex.load(path, mmap=mmap)
+            self.assertEqual(len(loaded), 5)
+            self.assertEqual(loaded.mass_range(40, 50).tolist(), [0, 2])
+            self.assertEqual(loaded.isomers('C2H6O').tolist(), [0, 2])
+            loaded.add_entry(18.015, 'H2O')
+            self.assertEqual(loaded.isomers('H2O').tolist(), [1, 5])
+
+    def test_loading_builds_index(self):
+        index = MassIndex()
+        compounds = list(compounds_from_file(SDF_FILE, mass_index=index))
+        self.assertEqual(len(index), len(compounds))
+        for number, compound in enumerate(compounds):
+            self.assertIn(number, index.isomers(compound.formula).tolist())
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
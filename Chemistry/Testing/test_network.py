@@ -0,0 +1,193 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.parsing.SMILES import parse_smiles
+from Chemistry.reactions.acid_base import AcidBase
+from Chemistry.reactions.network import ReactionNetwork, species_key, \
+    available_reactions
+
+
+class TestReactionNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.hydroxide = Compound(
+                                {"a1": "H", "a2": "O"},
+                                {"b1": ("a1", "a2", {'order': 1,
+                                                     'chirality': None})},
+                                {"id": "Hydroxide"})
+        self.hydronium = Compound(
+                                {"a1": "H", "a2": "H", "a3": "O", "a4": "H"},
+                                {"b1": ("a1", "a3", {'order': 1,
+                                                     'chirality': None}),
+                                 "b2": ("a2", "a3", {'order': 1,
+                                                     'chirality': None}),
+                                 "b3": ("a3", "a4", {'order': 1,
+                                                     'chirality': None})},
+                                {"id": "Hydronium"})
+        self.water = Compound(
+                                {"a1": "O", "a2": "H", "a3": "H"},
+                                {"b7": ("a1", "a2", {'order': 1,
+                                                     'chirality': None}),
+                                 "b9": ("a1", "a3", {'order': 1,
+                                                     'chirality': None})},
+                                {"id": "Water"})
+        self.network = ReactionNetwork([Acid(self.hydronium, 'a1', -1.74),
+                                        Base(self.hydroxide, 'a2', 15.7)])
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_available_reactions(self):
+        self.assertIn(AcidBase, available_reactions())
+
+    def test_available_reactions_fresh_process(self):
+        # Nothing has imported the reaction modules yet
+        script = ('import json\n'
+                  'from Chemistry.reactions.network import '
+                  'available_reactions\n'
+                  'print(json.dumps([cls.__name__ '
+                  'for cls in available_reactions()]))')
+        found = json.loads(subprocess.check_output([sys.executable, '-c',
+                                                    script]))
+        self.assertIn('AcidBase', found)
+
+    def test_species_key_ignores_keys(self):
+        water = Compound({"a1": "H", "a2": "O", "a3": "H"},
+                         {"b1": ("a1", "a2", {'order': 1}),
+                          "b2": ("a2", "a3", {'order': 1})},
+                         {})
+        self.assertEqual(species_key(water), species_key(self.water))
+        self.assertNotEqual(species_key(water), species_key(self.hydroxide))
+
+    def test_starting_species(self):
+        self.assertEqual(self.network.species, ['s1', 's2'])
+        self.assertEqual(len(self.network.frontier), 2)
+
+    def test_duplicates_merged(self):
+        key = self.network.add_species(self.water)
+        self.assertEqual(self.network.add_species(
+            Compound({"a1": "H", "a2": "O", "a3": "H"},
+                     {"b1": ("a1", "a2", {'order': 1}),
+                      "b2": ("a2", "a3", {'order': 1})},
+                     {})), key)
+
+    def test_merged_roles_are_remapped(self):
+        key = self.network.add_species(self.water)
+        self.network.add_species(
+            Compound({"a1": "H", "a2": "O", "a3": "H"},
+                     {"b1": ("a1", "a2", {'order': 1}),
+                      "b2": ("a2", "a3", {'order': 1})},
+                     {}),
+            [{'type': 'Base', 'point': 'a2', 'pka': -1.74}])
+        self.assertEqual(self.network.graph.node[key]['roles'],
+                         [{'type': 'Base', 'point': 'a1', 'pka': -1.74}])
+
+    def test_expand(self):
+        self.network.expand(max_depth=3)
+        # Both products are water, so they collapse into a single species
+        self.assertEqual(len(self.network.species), 3)
+        self.assertEqual(len(self.network.reaction_nodes), 1)
+        reaction = self.network.reaction_nodes[0]
+        self.assertEqual(sorted(self.network.graph.predecessors(reaction)),
+                         ['s1', 's2'])
+        self.assertEqual(self.network.graph.successors(reaction), ['s3'])
+        self.assertEqual(self.network.find(self.water)[0], 's3')
+        self.assertFalse(self.network.frontier)
+
+    def test_max_species(self):
+        self.network.expand(max_depth=3, max_species=2)
+        self.assertEqual(len(self.network.species), 2)
+        self.assertEqual(self.network.depth, 0)
+
+    def _acids_and_bases(self):
+        def compound(smiles):
+            return Compound(*parse_smiles(smiles))
+
+        return ReactionNetwork([Acid(compound('CC(=O)O'), 'a5', 4.76),
+                                Acid(compound('C(=O)O'), 'a4', 3.75),
+                                Base(compound('[OH]'), 'a1', 15.7),
+                                Base(compound('N'), 'a1', 9.25)])
+
+    def test_resume_capped(self):
+        full = self._acids_and_bases().expand(max_depth=3)
+        depths = sorted(full.graph.node[key]['depth']
+                        for key in full.reaction_nodes)
+        self.assertEqual(depths, [1, 1, 1, 1, 2, 2])
+        path = os.path.join(self.tempdir, 'network.json')
+        for cap in (5, 6, 7):
+            capped = self._acids_and_bases().expand(
+                max_depth=3, max_species=cap, checkpoint=path)
+            # No reaction's products push the network past the cap
+            self.assertLessEqual(len(capped.species), cap)
+            self.assertEqual(capped.depth, 0)
+            resumed = ReactionNetwork.load(path).expand(max_depth=3)
+            self.assertEqual(len(resumed.species), len(full.species))
+            self.assertEqual(len(resumed.reaction_nodes),
+                             len(full.reaction_nodes))
+            self.assertEqual(sorted(resumed.graph.node[key]['depth']
+                                    for key in resumed.reaction_nodes),
+                             depths)
+            self.assertEqual(resumed.depth, full.depth)
+
+    def test_layer_is_windowed(self):
+        network = ReactionNetwork([Acid(self.water, 'a2', 15.7),
+                                   Acid(self.hydronium, 'a1', -1.74),
+                                   Base(self.water, 'a1', -1.74),
+                                   Base(self.hydroxide, 'a2', 15.7)])
+        total = len(list(network._combinations(network.frontier)))
+        consumed, recorded = [], []
+        work, record = network._work, network._record
+
+        def counting(combinations):
+            for item in work(combinations):
+                consumed.append(item)
+                yield item
+
+        def recording(*args):
+            recorded.append(len(consumed))
+            record(*args)
+
+        network._work, network._record = counting, recording
+        network._expand_layer(set(network.frontier), None, 1, 1, None)
+        self.assertEqual(len(consumed), total)
+        self.assertTrue(recorded)
+        # Each reaction was recorded before the next combination was made
+        self.assertEqual(recorded, sorted(set(recorded)))
+        self.assertLess(recorded[0], total)
+
+    def test_processes(self):
+        self.network.expand(max_depth=2, processes=2)
+        self.assertEqual(len(self.network.species), 3)
+        self.assertEqual(len(self.network.reaction_nodes), 1)
+
+    def test_checkpoint(self):
+        path = os.path.join(self.tempdir, 'network.json')
+        self.network.expand(max_depth=1, checkpoint=path)
+        loaded = ReactionNetwork.load(path)
+        self.assertEqual(loaded.species, self.network.species)
+        self.assertEqual(loaded.reaction_nodes, self.network.reaction_nodes)
+        self.assertEqual(loaded.frontier, self.network.frontier)
+        self.assertEqual(loaded.depth, 1)
+        self.assertEqual(loaded.compound('s3'), self.network.compound('s3'))
+        self.assertEqual(loaded.find(self.water)[0], 's3')
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
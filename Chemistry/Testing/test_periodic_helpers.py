@@ -50,7 +50,11 @@ class test_helpers(unittest.TestCase):
                                      1,
                                      -1
                                  ],
-                                 "Valence": 1
+                                 "Valence": 1,
+                                 "Isotopes": [
+                                     [1.00782503223, 0.999885],
+                                     [2.01410177812, 0.000115]
+                                 ]
                              })
 
 
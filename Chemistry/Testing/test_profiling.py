@@ -0,0 +1,116 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import json
+import unittest
+
+from Chemistry import profiling
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.reactions.acid_base import AcidBase
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        profiling.reset()
+        profiling.enable()
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled_records_nothing(self):
+        profiling.disable()
+        with profiling.timer('block'):
+            pass
+        profiling.count('counter')
+        self.assertEqual(profiling.stats(), {'counters': {}})
+
+    def test_timer(self):
+        for _ in range(3):
+            with profiling.timer('block'):
+                pass
+        stat = profiling.stats()['block']
+        self.assertEqual(stat['calls'], 3)
+        self.assertEqual(sum(stat['histogram'].values()), 3)
+        self.assertLessEqual(stat['min'], stat['mean'])
+        self.assertLessEqual(stat['mean'], stat['max'])
+
+    def test_timed(self):
+        @profiling.timed('function')
+        def function(x):
+            return x * 2
+
+        self.assertEqual(function(2), 4)
+        self.assertEqual(function.__name__, 'function')
+        self.assertEqual(profiling.stats()['function']['calls'], 1)
+
+    def test_timed_records_exceptions(self):
+        @profiling.timed('function')
+        def function():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            function()
+        self.assertEqual(profiling.stats()['function']['calls'], 1)
+
+    def test_count(self):
+        profiling.count('counter')
+        profiling.count('counter', 4)
+        self.assertEqual(profiling.stats()['counters'], {'counter': 5})
+
+    def test_report(self):
+        with profiling.timer('block'):
+            pass
+        profiling.count('counter')
+        self.assertIn('block', profiling.report())
+        self.assertIn('counter', profiling.report())
+        self.assertEqual(json.loads(profiling.report('json'))['counters'],
+                         {'counter': 1})
+        with self.assertRaises(ValueError):
+            profiling.report('xml')
+
+    def test_merge(self):
+        with profiling.timer('block'):
+            pass
+        profiling.count('counter')
+        snapshot = profiling.stats()
+        profiling.merge(snapshot)
+        merged = profiling.stats()
+        self.assertEqual(merged['block']['calls'], 2)
+        self.assertEqual(merged['block']['histogram'],
+                         {bound: 2 * n for bound, n
+                          in snapshot['block']['histogram'].iteritems()})
+        self.assertEqual(merged['counters'], {'counter': 2})
+        profiling.reset()
+        profiling.merge(snapshot)
+        self.assertEqual(profiling.stats(), snapshot)
+
+    def test_pipeline_hooks(self):
+        hydroxide = Compound({"a1": "H", "a2": "O"},
+                             {"b1": ("a1", "a2", {'order': 1})},
+                             {"id": "Hydroxide"})
+        hydronium = Compound({"a1": "H", "a2": "H", "a3": "O", "a4": "H"},
+                             {"b1": ("a1", "a3", {'order': 1}),
+                              "b2": ("a2", "a3", {'order': 1}),
+                              "b3": ("a3", "a4", {'order': 1})},
+                             {"id": "Hydronium"})
+        AcidBase(Acid(hydronium, 'a1', -1.74), Base(hydroxide, 'a2', 15.7),
+                 {}).react()
+        stats = profiling.stats()
+        for stage in ['compound.construct', 'compound.resonance', 'thaw',
+                      'acid_base.calculate_products', 'acid_base.react',
+                      'base.to_conjugate_acid']:
+            self.assertIn(stage, stats)
+        self.assertEqual(stats['acid_base.react']['calls'], 1)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -42,6 +42,11 @@ class TestReactantUtilityMethods(unittest.TestCase):
     def test_new_key3(self):
         self.assertEqual('b2', Reactant._new_key(self.base1, False))
 
+    def test_new_key_numeric(self):
+        compound = Compound({"a{}".format(i): "H" for i in range(1, 11)}, {},
+                            {})
+        self.assertEqual('a11', Reactant._new_key(compound))
+
 
 class TestBase(unittest.TestCase):
 
@@ -0,0 +1,139 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from Chemistry.base.compounds import Compound
+from Chemistry.interface.compound_utility import compound_from_file
+from Chemistry.interface.registry import CompoundRegistry, canonical_key
+from Chemistry.parsing.SMILES import parse_smiles
+
+
+MOLECULES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'test_molecules')
+
+
+def _compound(smiles, name):
+    atoms, bonds = parse_smiles(smiles)
+    return Compound(atoms, bonds, {'id': name})
+
+
+class TestCompoundRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'registry.db')
+        self.registry = CompoundRegistry(self.path)
+        self.ethanol = _compound('CCO', 'Ethanol')
+        self.methoxymethane = _compound('COC', 'Dimethyl ether')
+        self.phenol = _compound('c1ccccc1O', 'Phenol')
+
+    def tearDown(self):
+        self.registry.close()
+        shutil.rmtree(self.tempdir)
+
+    def test_canonical_key(self):
+        self.assertEqual(canonical_key(self.ethanol),
+                         canonical_key(_compound('OCC', 'Ethanol')))
+        self.assertNotEqual(canonical_key(self.ethanol),
+                            canonical_key(self.methoxymethane))
+
+    def test_add(self):
+        identifier = self.registry.add(self.ethanol)
+        self.assertEqual(self.registry.add(_compound('OCC', 'Other')),
+                         identifier)
+        self.assertEqual(len(self.registry), 1)
+        self.assertIn(self.ethanol, self.registry)
+        self.assertNotIn(self.phenol, self.registry)
+        # The first compound registered keeps its information
+        self.assertEqual(self.registry.get(identifier).other_info['id'],
+                         'Ethanol')
+
+    def test_kekule_forms(self):
+        # o-Cresol, drawn with each of benzene's two Kekule structures
+        first = _compound('CC1=CC=CC=C1O', 'o-Cresol')
+        second = _compound('CC1=C(O)C=CC=C1', 'o-Cresol')
+        self.assertEqual(canonical_key(first), canonical_key(second))
+        self.assertEqual(self.registry.add_many([first, second]),
+                         [1, 1])
+        self.assertEqual(len(self.registry), 1)
+        self.assertIn(_compound('Cc1ccccc1O', 'Aromatic'), self.registry)
+
+    def test_add_many(self):
+        compounds = [self.ethanol, self.phenol, _compound('OCC', 'Again'),
+                     self.methoxymethane]
+        identifiers = self.registry.add_many(iter(compounds), batch_size=2)
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(identifiers[0], identifiers[2])
+        self.assertEqual(len(set(identifiers)), 3)
+        self.assertEqual(self.registry.add_many(compounds), identifiers)
+
+    def test_round_trip(self):
+        identifier = self.registry.add(self.phenol)
+        self.registry.close()
+        self.registry = CompoundRegistry(self.path)
+        loaded = self.registry.get(identifier)
+        self.assertTrue(loaded.is_isomorphic(self.phenol))
+        self.assertEqual(canonical_key(loaded), canonical_key(self.phenol))
+        self.assertEqual([compound.other_info['id']
+                          for compound in self.registry.compounds()],
+                         ['Phenol'])
+        with self.assertRaises(KeyError):
+            self.registry.get(identifier + 1)
+
+    def test_record(self):
+        record = self.registry.record(self.registry.add(self.phenol))
+        self.assertEqual(record.formula, 'C6H6O')
+        self.assertAlmostEqual(record.mass, 94.11, places=1)
+        self.assertEqual(record.descriptors['rings'], 1)
+        self.assertEqual(record.descriptors['aromatic_rings'], 1)
+        self.assertEqual(record.descriptors['heavy_atoms'], 7)
+
+    def test_queries(self):
+        ethanol, ether, phenol = self.registry.add_many(
+            [self.ethanol, self.methoxymethane, self.phenol])
+        self.assertEqual(self.registry.with_formula('C2H6O'),
+                         [ethanol, ether])
+        self.assertEqual(self.registry.in_mass_range(40, 100),
+                         [ethanol, ether, phenol])
+        self.assertEqual(self.registry.in_mass_range(90, 100), [phenol])
+        self.assertEqual(self.registry.lookup(canonical_key(self.phenol)),
+                         phenol)
+        self.assertIsNone(self.registry.find(_compound('CC', 'Ethane')))
+
+    def test_custom_descriptors(self):
+        registry = CompoundRegistry(':memory:',
+                                    {'oxygens': lambda compound: sum(
+                                        1 for atom in
+                                        compound.atoms.itervalues()
+                                        if atom.symbol == 'O')})
+        with registry:
+            record = registry.record(registry.add(self.ethanol))
+        self.assertEqual(record.descriptors, {'oxygens': 1})
+
+    def test_sources(self):
+        path = os.path.join(self.tempdir, 'water.cml')
+        shutil.copy(os.path.join(MOLECULES, 'CML', 'CML_1.cml'), path)
+        self.assertIsNone(self.registry.from_source(path))
+        parsed = compound_from_file(path, registry=self.registry)
+        identifier = self.registry.from_source(path)
+        self.assertIsNotNone(identifier)
+        loaded = compound_from_file(path, registry=self.registry)
+        self.assertTrue(loaded.is_isomorphic(parsed))
+        # A changed file is read again
+        with open(path, 'a') as changed:
+            changed.write('\n')
+        self.assertIsNone(self.registry.from_source(path))
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
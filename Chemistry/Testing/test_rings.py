@@ -0,0 +1,127 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.rings import RingInfo, smallest_rings
+
+
+def _neighbours(edges):
+    """The neighbours of each atom of a graph given as (first, second) pairs,
+    with each bond keyed by its position in `edges`.
+    """
+
+    neighbours = {}
+    for key, (first, second) in enumerate(edges):
+        neighbours.setdefault(first, []).append((second, key))
+        neighbours.setdefault(second, []).append((first, key))
+    return neighbours
+
+
+def _sizes(edges):
+    neighbours = _neighbours(edges)
+    return sorted(len(atoms) for atoms, _ in smallest_rings(neighbours,
+                                                            neighbours))
+
+
+class TestSmallestRings(unittest.TestCase):
+
+    def test_acyclic(self):
+        self.assertEqual(_sizes([(1, 2), (2, 3), (2, 4)]), [])
+
+    def test_ring(self):
+        edges = [(i, (i + 1) % 6) for i in range(6)] + [(0, 10), (10, 11)]
+        neighbours = _neighbours(edges)
+        (atoms, bonds), = smallest_rings(neighbours, neighbours)
+        self.assertEqual(set(atoms), set(range(6)))
+        self.assertEqual(set(bonds), set(range(6)))
+        # The atoms go around the ring
+        for first, second in zip(atoms, atoms[1:] + atoms[:1]):
+            self.assertTrue((first, second) in edges
+                            or (second, first) in edges)
+
+    def test_fused(self):
+        # Naphthalene: two rings of six, not a six and a ten
+        edges = [(i, i + 1) for i in range(9)] + [(9, 0), (0, 5)]
+        self.assertEqual(_sizes(edges), [6, 6])
+
+    def test_spiro_and_pieces(self):
+        edges = [(0, 1), (1, 2), (2, 0), (0, 3), (3, 4), (4, 0),
+                 (10, 11), (11, 12), (12, 13), (13, 10)]
+        self.assertEqual(_sizes(edges), [3, 3, 4])
+
+    def test_cubane(self):
+        edges = [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7),
+                 (7, 4), (0, 4), (1, 5), (2, 6), (3, 7)]
+        self.assertEqual(_sizes(edges), [4, 4, 4, 4, 4])
+
+    def test_fallback(self):
+        # A ring of eight with a triangle on every bond: the smallest ring
+        # through any bond is a triangle, but the eight-membered ring is
+        # needed too
+        edges = [(i, (i + 1) % 8) for i in range(8)]
+        for i in range(8):
+            edges += [(i, 10 + i), (10 + i, (i + 1) % 8)]
+        self.assertEqual(_sizes(edges), [3] * 8 + [8])
+
+    def test_honeycomb(self):
+        atoms, bonds = synthetic.honeycomb(4, 5)
+        neighbours = {key: [] for key in atoms}
+        for key, (first, second, _) in bonds.iteritems():
+            neighbours[first].append((second, key))
+            neighbours[second].append((first, key))
+        rings = smallest_rings(atoms, neighbours)
+        self.assertEqual([len(ring) for ring, _ in rings], [6] * 20)
+
+
+class TestRingInfo(unittest.TestCase):
+
+    def setUp(self):
+        # Methylcyclopropane, carbons only
+        self.compound = Compound(
+            {'a1': 'C', 'a2': 'C', 'a3': 'C', 'a4': 'C'},
+            {'b1': ('a1', 'a2', {'order': 1, 'chirality': None}),
+             'b2': ('a2', 'a3', {'order': 1, 'chirality': None}),
+             'b3': ('a3', 'a1', {'order': 1, 'chirality': None}),
+             'b4': ('a1', 'a4', {'order': 1, 'chirality': None})})
+
+    def test_membership(self):
+        rings = self.compound.rings
+        self.assertIsInstance(rings, RingInfo)
+        self.assertEqual(len(rings), 1)
+        self.assertTrue(rings.in_ring('a1'))
+        self.assertTrue(rings.in_ring('b3'))
+        self.assertFalse(rings.in_ring('a4'))
+        self.assertFalse(rings.in_ring('b4'))
+        self.assertEqual(rings.ring_sizes('b2'), [3])
+        self.assertEqual(rings.rings_of('a2'), [0])
+        self.assertEqual(rings.smallest_ring_size('a3'), 3)
+        self.assertIsNone(rings.smallest_ring_size('a4'))
+        self.assertEqual(rings.ring_bonds[0], frozenset(['b1', 'b2', 'b3']))
+
+    def test_cached(self):
+        self.assertIs(self.compound.rings, self.compound.rings)
+
+    def test_edits(self):
+        rings = self.compound.rings
+        # Closing a second ring (bicyclo[1.1.0]butane)
+        self.compound.add_bond('a4', 'a2', key='b5')
+        self.assertIsNot(self.compound.rings, rings)
+        self.assertEqual(len(self.compound.rings), 2)
+        self.assertEqual(sorted(self.compound.rings.ring_sizes('a1')), [3, 3])
+        self.compound.remove_bond('b1')
+        self.assertEqual(self.compound.rings.ring_sizes('a1'), [4])
+        self.compound.remove_atom('a4')
+        self.assertEqual(len(self.compound.rings), 0)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
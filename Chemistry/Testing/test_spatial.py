@@ -0,0 +1,90 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import random
+import unittest
+
+from Chemistry.interface.spatial import SpatialIndex
+
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SpatialIndex(10)
+        for key, pos in (('a1', (0, 0)), ('a2', (5, 5)), ('a3', (25, 25)),
+                         ('a4', (-12, 3)), ('a5', (100, -40))):
+            self.index.insert(key, pos)
+
+    def test_container(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertIn('a3', self.index)
+        self.assertEqual(sorted(self.index),
+                         ['a1', 'a2', 'a3', 'a4', 'a5'])
+        self.assertEqual(self.index.position('a4'), (-12, 3))
+
+    def test_hit(self):
+        self.assertEqual(self.index.hit((4, 4), 15), 'a2')
+        self.assertEqual(self.index.hit((1, -1), 15), 'a1')
+        self.assertEqual(self.index.hit((-20, 0), 8), 'a4')
+        self.assertIsNone(self.index.hit((60, 60), 15))
+
+    def test_hit_margin_is_inclusive(self):
+        self.assertEqual(self.index.hit((40, 25), 15), 'a3')
+        self.assertIsNone(self.index.hit((41, 25), 15))
+
+    def test_query_rect(self):
+        self.assertEqual(sorted(self.index.query_rect(-1, -1, 30, 30)),
+                         ['a1', 'a2', 'a3'])
+        self.assertEqual(sorted(self.index.query_rect(30, 30, -1, -1)),
+                         ['a1', 'a2', 'a3'])
+        self.assertEqual(sorted(self.index.query_rect(-1e6, -1e6, 1e6, 1e6)),
+                         ['a1', 'a2', 'a3', 'a4', 'a5'])
+        self.assertEqual(self.index.query_rect(50, 50, 60, 60), [])
+
+    def test_move_and_remove(self):
+        self.index.insert('a1', (100, -35))
+        self.assertEqual(self.index.position('a1'), (100, -35))
+        self.assertEqual(self.index.hit((0, 0), 3), None)
+        self.assertEqual(sorted(self.index.query_rect(90, -50, 110, -30)),
+                         ['a1', 'a5'])
+        self.index.remove('a5')
+        self.index.remove('a1')
+        self.assertNotIn('a1', self.index)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.query_rect(90, -50, 110, -30), [])
+        with self.assertRaises(KeyError):
+            self.index.remove('a1')
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.cells, {})
+
+    def test_invalid_cell_size(self):
+        with self.assertRaises(ValueError):
+            SpatialIndex(0)
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        points = {'a{}'.format(i): (rng.uniform(0, 500), rng.uniform(0, 500))
+                  for i in xrange(500)}
+        index = SpatialIndex(20)
+        for key, pos in points.iteritems():
+            index.insert(key, pos)
+        for _ in xrange(50):
+            x1, x2 = sorted(rng.uniform(-10, 510) for _ in xrange(2))
+            y1, y2 = sorted(rng.uniform(-10, 510) for _ in xrange(2))
+            expected = [key for key, (x, y) in points.iteritems()
+                        if x1 <= x <= x2 and y1 <= y <= y2]
+            self.assertEqual(sorted(index.query_rect(x1, y1, x2, y2)),
+                             sorted(expected))
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -0,0 +1,153 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+__author__ = "Dan Obermiller"
+
+
+import unittest
+
+from Chemistry.Testing.benchmarks import synthetic
+from Chemistry.base.compounds import Compound
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.base.symmetry import symmetry_classes, representatives
+from Chemistry.parsing.SMILES import parse_smiles
+from Chemistry.reactions.network import ReactionNetwork
+
+
+def _compound(smiles):
+    return Compound(*parse_smiles(smiles))
+
+
+def _classes(compound, symbol):
+    return set(compound.symmetry_classes[key]
+               for key, atom in compound.atoms.iteritems()
+               if atom.symbol == symbol)
+
+
+class TestSymmetryClasses(unittest.TestCase):
+
+    def test_path(self):
+        # 0-1-2-3: the ends swap, and so do the middle atoms
+        neighbours = {0: [(1, 1)], 1: [(0, 1), (2, 1)], 2: [(1, 1), (3, 1)],
+                      3: [(2, 1)]}
+        classes = symmetry_classes(range(4), neighbours,
+                                   dict.fromkeys(range(4), 'C'))
+        self.assertEqual(classes[0], classes[3])
+        self.assertEqual(classes[1], classes[2])
+        self.assertNotEqual(classes[0], classes[1])
+
+    def test_same_refinement_not_symmetric(self):
+        # Two triangles and a hexagon all look alike to refinement, but no
+        # symmetry swaps an atom of a triangle with one of the hexagon
+        edges = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3),
+                 (6, 7), (7, 8), (8, 9), (9, 10), (10, 11), (11, 6)]
+        neighbours = {atom: [] for atom in range(12)}
+        for first, second in edges:
+            neighbours[first].append((second, 1))
+            neighbours[second].append((first, 1))
+        classes = symmetry_classes(range(12), neighbours,
+                                   dict.fromkeys(range(12), 'C'))
+        self.assertEqual(len(set(classes[atom] for atom in range(6))), 1)
+        self.assertEqual(len(set(classes[atom] for atom in range(6, 12))), 1)
+        self.assertNotEqual(classes[0], classes[6])
+
+    def test_methyl(self):
+        compound = _compound('CCO')
+        carbons = sorted(key for key, atom in compound.atoms.iteritems()
+                         if atom.symbol == 'C')
+        methyl = [key for key in compound.adj[carbons[0]]
+                  if compound.atoms[key].symbol == 'H']
+        self.assertEqual(len(methyl), 3)
+        self.assertEqual(len(set(compound.symmetry_classes[key]
+                                 for key in methyl)), 1)
+        self.assertEqual(len(_classes(compound, 'C')), 2)
+
+    def test_benzene(self):
+        compound = _compound('c1ccccc1')
+        self.assertEqual(len(_classes(compound, 'C')), 1)
+        self.assertEqual(len(_classes(compound, 'H')), 1)
+
+    def test_carboxylate(self):
+        # The oxygens only differ by where the double bond is drawn
+        self.assertEqual(len(_classes(_compound('CC(=O)[O-]'), 'O')), 1)
+        self.assertEqual(len(_classes(_compound('CC(=O)O'), 'O')), 2)
+
+    def test_long_chain(self):
+        compound = Compound(*synthetic.chain(200, hydrogens=0))
+        classes = compound.symmetry_classes
+        self.assertEqual(len(set(classes.itervalues())), 100)
+
+    def test_kept_until_edited(self):
+        compound = _compound('CC')
+        classes = compound.symmetry_classes
+        self.assertIs(compound.symmetry_classes, classes)
+        compound.add_bond('a1', compound.add_atom('O'))
+        self.assertIsNot(compound.symmetry_classes, classes)
+        self.assertEqual(len(_classes(compound, 'C')), 2)
+
+    def test_representatives(self):
+        classes = {'a1': 0, 'a2': 1, 'a3': 1, 'a4': 0, 'a5': 2}
+        self.assertEqual(representatives(classes, ['a1', 'a2', 'a3', 'a4']),
+                         [('a1', 2), ('a2', 2)])
+
+
+class TestSites(unittest.TestCase):
+
+    def test_acid_sites(self):
+        compound = _compound('CC(=O)O')
+        sites = Acid.sites(compound, 4.76)
+        self.assertEqual(sorted(acid.degeneracy for acid in sites), [1, 3])
+        self.assertEqual(sum(acid.degeneracy for acid in sites), 4)
+        for acid in sites:
+            self.assertEqual(compound.atoms[acid.acidic_point].symbol, 'H')
+            self.assertEqual(acid.pka, 4.76)
+
+    def test_acid_points(self):
+        compound = _compound('CCO')
+        hydroxyl = [key for key, atom in compound.atoms.iteritems()
+                    if atom.symbol == 'H'
+                    and any(compound.atoms[other].symbol == 'O'
+                            for other in compound.adj[key])]
+        sites = Acid.sites(compound, 16, hydroxyl)
+        self.assertEqual([(acid.acidic_point, acid.degeneracy)
+                          for acid in sites], [(hydroxyl[0], 1)])
+
+    def test_base_sites(self):
+        sites = Base.sites(_compound('CC(=O)[O-]'), 4.76)
+        self.assertEqual(len(sites), 1)
+        self.assertEqual(sites[0].degeneracy, 2)
+
+
+class TestNetworkSites(unittest.TestCase):
+
+    def setUp(self):
+        self.hydronium = Compound(
+                                {"a1": "H", "a2": "H", "a3": "O", "a4": "H"},
+                                {"b1": ("a1", "a3", {'order': 1}),
+                                 "b2": ("a2", "a3", {'order': 1}),
+                                 "b3": ("a3", "a4", {'order': 1})},
+                                {"id": "Hydronium"})
+
+    def test_equivalent_roles_merged(self):
+        network = ReactionNetwork()
+        key = network.add_species(self.hydronium,
+                                  [Acid(self.hydronium, point, -1.74)
+                                   for point in ('a1', 'a2', 'a4')])
+        self.assertEqual(network.graph.node[key]['roles'],
+                         [{'type': 'Acid', 'point': 'a1', 'pka': -1.74,
+                           'degeneracy': 3}])
+        self.assertEqual(len(network.frontier), 1)
+
+    def test_different_roles_kept(self):
+        network = ReactionNetwork()
+        key = network.add_species(self.hydronium,
+                                  [Acid(self.hydronium, 'a1', -1.74),
+                                   Base(self.hydronium, 'a3', -10)])
+        self.assertEqual(len(network.graph.node[key]['roles']), 2)
+
+
+if __name__ == '__main__':
+    from . import helper
+    helper(globals())
@@ -8,6 +8,10 @@
 
 __author__ = "Dan Obermiller"
 
-__all__ = ['exceptions', 'interface', 'parsing', 'base', 'reactions']
+__all__ = ['exceptions', 'interface', 'parsing', 'base', 'reactions',
+           'profiling']
 
 __version__ = 0.0  # pre-release
+
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__)
@@ -0,0 +1,83 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Lazy loading of submodules and the names re-exported by packages.
+
+A package's `__init__` calls `lazy_package` as its last statement.  The package
+then imports none of its submodules up front; each one (and anything the
+package re-exports from it) is imported the first time it is accessed.  This
+keeps `import Chemistry` and friends from dragging in networkx, lxml and the
+periodic table when only a small piece is needed.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module whose attributes can be imported on first access.
+
+    Parameters
+    ----------
+    module : module
+        The module being replaced.  Its namespace is copied over.
+    attributes : dict
+        Maps each lazy attribute to a (module, name) pair.  `module` is
+        relative to this package; `name` is the attribute of that module to
+        return, or None for the module itself.
+    """
+
+    def __init__(self, module, attributes):
+        super(LazyModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(vars(module))
+        # Keep the original alive; Python 2 clears a module's namespace when
+        # the module is garbage collected, even if functions still use it.
+        self.__dict__['_lazy_original'] = module
+        self.__dict__['_lazy_attributes'] = attributes
+
+    def __getattr__(self, attr):
+        try:
+            module_name, name = self._lazy_attributes[attr]
+        except KeyError:
+            raise AttributeError("module {} has no attribute {}".format(
+                self.__name__, attr))
+        value = importlib.import_module(module_name, self.__name__)
+        if name is not None:
+            value = getattr(value, name)
+        setattr(self, attr, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._lazy_attributes))
+
+
+def lazy_package(name, submodules=(), attributes=None):
+    """Makes a package load its submodules and re-exported names lazily.
+
+    Parameters
+    ----------
+    name : string
+        The package's `__name__`.
+    submodules : iterable, optional
+        The submodules that should be available as attributes.
+    attributes : dict, optional
+        Maps other names the package exports to the (module, name) they come
+        from, for example `{'AcidBase': ('.acid_base', 'AcidBase')}`.
+
+    Returns
+    -------
+    LazyModule
+        The module that replaces the package in `sys.modules`.
+    """
+
+    lazy = {submodule: ('.' + submodule, None) for submodule in submodules}
+    lazy.update(attributes or {})
+    module = LazyModule(sys.modules[name], lazy)
+    sys.modules[name] = module
+    return module
@@ -10,4 +10,8 @@ reactions.  All reactions rely on the infrastructure provided within.
 __author__ = "Dan Obermiller"
 
 __all__ = ['compounds', 'periodic_table', 'reactants', 'products', 'resonance',
-           'components']
+           'components', 'rings', 'aromaticity', 'symmetry',
+           'distances', 'huckel', 'isotopes']
+
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__)
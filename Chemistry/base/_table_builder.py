@@ -28,7 +28,8 @@ copyright = """# pyCAOS - An organic chemistry reaction simulator, written in Py
 
 mod_doc_string = """
 \"""This module stores all of the data about each element in the periodic table.
-This includes atomic mass, radius, electronegativity, etc.
+This includes atomic mass, radius, electronegativity, etc., along with the
+exact mass and natural abundance of each naturally occurring isotope.
 \"""
 __author__ = "Dan Obermiller"\n\n
 """
@@ -111,7 +112,8 @@ def build_table():
         for i in range(118):
             tl = element_reader.next()
             col_types = [int, str, str, int, float, float, float,
-                         float, float, float, ast.literal_eval, int]
+                         float, float, float, ast.literal_eval, int,
+                         ast.literal_eval]
             new_row = dict(zip(header, tuple(convert_type(cell, typ)
                             for cell, typ in zip(tl, col_types))))
             per_table[tl[1]] = new_row
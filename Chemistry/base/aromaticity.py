@@ -0,0 +1,331 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Aromaticity perception and Kekulization.
+
+`perceive_aromaticity` applies Huckel's rule (4n + 2 pi electrons) to each of
+a compound's smallest rings (see `Compound.rings`), and to the outline of each
+pair of fused rings, which catches systems like azulene whose rings are only
+aromatic together.  Each ring atom gives one pi electron for a double bond
+inside the ring system, two for the lone pair of a pyrrole nitrogen or a furan
+oxygen, and none for an exocyclic C=O or an empty p orbital.  Compounds don't
+record charges, so a carbon with only three single bonds is taken to be a
+cation (tropylium) rather than an anion (cyclopentadienide).
+
+`kekulize` does the reverse: given which atoms need a double bond, it picks
+bonds so that each gets exactly one, which is a perfect matching.  A greedy
+pass matches almost everything (atoms with a single choice go first, so it
+rarely has to guess); Edmonds' augmenting paths then fix up whatever it left,
+so large fused systems take time linear in their size rather than the cubic
+time of a general maximum matching.  `kekulize_bonds` applies it to bonds
+flagged as aromatic, which is how `Compound` accepts aromatic input.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+
+
+# The valence an atom has before it is given a double bond; an aromatic atom
+# with room left gets one
+_VALENCES = {'B': 3, 'C': 4, 'N': 3, 'O': 2, 'P': 3, 'S': 2, 'As': 3,
+             'Se': 2}
+# Atoms whose double bond out of a ring leaves the ring atom with an empty p
+# orbital (C=O in 2-pyridone), rather than taking it out of conjugation
+_EXOCYCLIC = {'O', 'S', 'N'}
+
+Aromaticity = collections.namedtuple('Aromaticity', ['atoms', 'bonds',
+                                                     'rings'])
+
+
+def kekulize(atoms, edges):
+    """Chooses bonds so that every atom given gets exactly one double bond.
+
+    Parameters
+    ----------
+    atoms : iterable
+        The atoms that need a double bond.
+    edges : list
+        The bonds that may become double, as (first, second) pairs.  Pairs
+        with an atom that isn't in `atoms` are ignored.
+
+    Returns
+    -------
+    set
+        The indices (into `edges`) of the bonds that become double.
+
+    Raises
+    ------
+    ValueError
+        If there's no way to give every atom a double bond.
+    """
+
+    adjacency = {atom: [] for atom in atoms}
+    # The atoms in the order their bonds are listed, which (for a molecule
+    # built or written out in one sweep) keeps neighbours together
+    order = []
+    for index, (first, second) in enumerate(edges):
+        if first in adjacency and second in adjacency:
+            for atom in (first, second):
+                if not adjacency[atom]:
+                    order.append(atom)
+            adjacency[first].append((second, index))
+            adjacency[second].append((first, index))
+
+    match = {}
+    degree = {atom: len(neighbours)
+              for atom, neighbours in adjacency.iteritems()}
+    # A stack of atoms per number of free neighbours.  An atom is pushed again
+    # whenever that number drops, and its old entries are skipped.
+    stacks = [[] for _ in xrange(max(degree.values() or [0]) + 1)]
+    for atom in reversed(order):
+        stacks[degree[atom]].append(atom)
+
+    def pair(first, second):
+        match[first], match[second] = second, first
+        for atom in (first, second):
+            for neighbour, _ in adjacency[atom]:
+                if neighbour not in match:
+                    degree[neighbour] -= 1
+                    stacks[degree[neighbour]].append(neighbour)
+
+    # Greedy matching, always of an atom with the fewest free neighbours, and
+    # of those the one touched last.  One with a single free neighbour has no
+    # choice, and taking the rest this way grows the matched atoms as one
+    # front instead of leaving scattered gaps for the augmenting paths to fix.
+    # A guess takes the last bond listed, which is where SMILES puts a ring's
+    # closing bond.
+    count = 0
+    while count < len(stacks):
+        if not stacks[count]:
+            count += 1
+            continue
+        atom = stacks[count].pop()
+        if atom in match or degree[atom] != count:
+            continue
+        free = [neighbour for neighbour, _ in reversed(adjacency[atom])
+                if neighbour not in match]
+        if free:
+            pair(atom, min(free, key=degree.get))
+        count = 0
+
+    for atom in adjacency:
+        if atom not in match and not _augment(adjacency, match, atom):
+            raise ValueError("Can't give {} a double bond".format(atom))
+
+    return {index for atom, neighbours in adjacency.iteritems()
+            for neighbour, index in neighbours if match[atom] == neighbour}
+
+
+def _augment(adjacency, match, root):
+    """Grows the matching to cover `root`, along an augmenting path (Edmonds'
+    blossom algorithm).
+
+    Returns
+    -------
+    bool
+        Whether there was a path.  `match` is updated if there was.
+    """
+
+    base, parent = {}, {}
+    even, tree = {root}, {root}
+    queue = collections.deque([root])
+
+    def base_of(atom):
+        return base.get(atom, atom)
+
+    def common_ancestor(first, second):
+        seen = set()
+        while True:
+            first = base_of(first)
+            seen.add(first)
+            if first not in match:
+                break
+            first = parent[match[first]]
+        while True:
+            second = base_of(second)
+            if second in seen:
+                return second
+            second = parent[match[second]]
+
+    def mark(atom, ancestor, child, blossom):
+        while base_of(atom) != ancestor:
+            blossom.add(base_of(atom))
+            blossom.add(base_of(match[atom]))
+            parent[atom] = child
+            child = match[atom]
+            atom = parent[match[atom]]
+
+    while queue:
+        atom = queue.popleft()
+        for neighbour, _ in adjacency[atom]:
+            if (base_of(atom) == base_of(neighbour)
+                    or match.get(atom) == neighbour):
+                continue
+            if neighbour == root or (neighbour in match
+                                     and match[neighbour] in parent):
+                # An odd cycle: shrink it into its base
+                ancestor = common_ancestor(atom, neighbour)
+                blossom = set()
+                mark(atom, ancestor, neighbour, blossom)
+                mark(neighbour, ancestor, atom, blossom)
+                for member in list(tree):
+                    if base_of(member) in blossom:
+                        base[member] = ancestor
+                        if member not in even:
+                            even.add(member)
+                            queue.append(member)
+            elif neighbour not in parent:
+                parent[neighbour] = atom
+                tree.add(neighbour)
+                if neighbour not in match:
+                    # Flip every bond along the path back to the root
+                    while neighbour is not None:
+                        previous = parent[neighbour]
+                        following = match.get(previous)
+                        match[neighbour], match[previous] = previous, neighbour
+                        neighbour = following
+                    return True
+                mate = match[neighbour]
+                even.add(mate)
+                tree.add(mate)
+                queue.append(mate)
+    return False
+
+
+def kekulize_bonds(atoms, bonds):
+    """Gives bonds flagged as aromatic alternating orders.
+
+    Parameters
+    ----------
+    atoms : dict
+        The atoms, in the form the Compound constructor takes.
+    bonds : dict
+        The bonds, in the form the Compound constructor takes.  A bond whose
+        information has 'aromatic' set is aromatic, whatever its order.
+
+    Returns
+    -------
+    dict
+        The bonds, with every aromatic bond made single or double and its
+        'aromatic' flag dropped.  Every atom's hydrogens have to be in `atoms`
+        already, as they are for Compounds.
+
+    Raises
+    ------
+    ValueError
+        If the aromatic bonds can't be given alternating orders.
+    """
+
+    used = dict.fromkeys(atoms, 0)
+    aromatic = []
+    for key, bond in bonds.iteritems():
+        first, second = bond[:2]
+        rest = bond[2] if len(bond) > 2 else {}
+        if rest.get('aromatic'):
+            aromatic.append(key)
+            order = 1
+        else:
+            order = rest.get('order', 1)
+        used[first] += order
+        used[second] += order
+
+    in_aromatic = {atom for key in aromatic for atom in bonds[key][:2]}
+    needs = [atom for atom in in_aromatic
+             if used[atom] < _VALENCES.get(atoms[atom], 0)]
+    doubles = kekulize(needs, [bonds[key][:2] for key in aromatic])
+
+    result = dict(bonds)
+    for index, key in enumerate(aromatic):
+        first, second, rest = bonds[key]
+        rest = {name: value for name, value in rest.iteritems()
+                if name != 'aromatic'}
+        rest['order'] = 2 if index in doubles else 1
+        result[key] = (first, second, rest)
+    return result
+
+
+def _pi_electrons(compound, rings, key):
+    """How many pi electrons a ring atom gives its ring, or None if it can't be
+    part of an aromatic ring.
+    """
+
+    symbol = compound.atoms[key].symbol
+    doubles = []
+    for neighbour, data in compound.adj[key].iteritems():
+        order = data['bond_obj'].order
+        if order == 3:
+            return None
+        if order == 2:
+            doubles.append(neighbour)
+    if len(doubles) > 1:
+        return None
+    if doubles:
+        neighbour = doubles[0]
+        if rings.in_ring(neighbour):
+            return 1
+        if compound.atoms[neighbour].symbol in _EXOCYCLIC:
+            return 0
+        return None
+    neighbours = len(compound.adj[key])
+    if symbol in ('C', 'B'):
+        return 0 if neighbours == 3 else None
+    if symbol in ('N', 'P', 'As'):
+        return 2 if neighbours == 3 else None
+    if symbol in ('O', 'S', 'Se'):
+        return 2 if neighbours == 2 else None
+    return None
+
+
+def perceive_aromaticity(compound):
+    """Finds the aromatic rings of a compound.
+
+    Parameters
+    ----------
+    compound : Compound
+
+    Returns
+    -------
+    Aromaticity
+        The aromatic atoms and bonds (as frozensets of keys), and the aromatic
+        rings (as indices into `compound.rings.rings`).
+    """
+
+    rings = compound.rings
+    electrons = {}
+    for atoms in rings.rings:
+        for key in atoms:
+            if key not in electrons:
+                electrons[key] = _pi_electrons(compound, rings, key)
+
+    def huckel(atoms):
+        counts = [electrons[key] for key in atoms]
+        return None not in counts and sum(counts) % 4 == 2
+
+    aromatic = {number for number, atoms in enumerate(rings.rings)
+                if huckel(atoms)}
+    # Fused pairs that aren't aromatic on their own may be together
+    by_bond = collections.defaultdict(list)
+    for number, bonds in enumerate(rings.ring_bonds):
+        for bond in bonds:
+            by_bond[bond].append(number)
+    for numbers in by_bond.itervalues():
+        for i, first in enumerate(numbers):
+            for second in numbers[i + 1:]:
+                if first in aromatic and second in aromatic:
+                    continue
+                shared = rings.ring_bonds[first] & rings.ring_bonds[second]
+                if len(shared) != 1:
+                    continue
+                atoms = set(rings.rings[first]) | set(rings.rings[second])
+                if huckel(atoms):
+                    aromatic.update((first, second))
+
+    return Aromaticity(
+        frozenset(key for number in aromatic for key in rings.rings[number]),
+        frozenset(bond for number in aromatic
+                  for bond in rings.ring_bonds[number]),
+        sorted(aromatic))
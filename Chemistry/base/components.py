@@ -58,6 +58,9 @@ class Atom(object):
         The atomic radius of the atom.
     oxidation : list
         A list of possible oxidation states of the atom.
+    isotopes : list or None
+        The [exact mass, abundance] of each naturally occurring isotope of the
+        atom, or None if there is no data.
     valence : int
         The valence number of the atom.
 
@@ -87,7 +90,8 @@ class Atom(object):
                      "boil": "Boiling Point",
                      "valence": "Valence",
                      "radius": "Atomic Radius",
-                     "oxidation": "Oxidation Number(s)"
+                     "oxidation": "Oxidation Number(s)",
+                     "isotopes": "Isotopes"
                     }
 
     def __init__(self, symbol, chirality=None, **kwargs):
@@ -246,9 +250,19 @@ class Atom(object):
             The bond being broken
         other : Atom
             The atom on the other end of the bond.
+
+        Notes
+        -----
+        The bond is found by identity: two bonds between the same elements
+        with the same order compare equal, but only this one is removed.
         """
 
-        self.bonds.remove(bond)
+        for index, existing in enumerate(self.bonds):
+            if existing is bond:
+                del self.bonds[index]
+                break
+        else:
+            raise ValueError("The bond isn't one of this atom's")
         if other is not None:
             other.remove_bond(bond)
 
@@ -15,11 +15,45 @@ __author__ = "Dan Obermiller"
 
 
 import abc
+import collections
+import copy
+import functools
 import json
 
 import networkx as nx
 
+from Chemistry import profiling
+from Chemistry.base.aromaticity import kekulize_bonds, perceive_aromaticity
 from Chemistry.base.components import Atom, Bond
+from Chemistry.base.distances import DENSE_LIMIT, Distances
+from Chemistry.base.periodic_table import periodic_table
+from Chemistry.base.rings import RingInfo, smallest_rings
+from Chemistry.base.symmetry import symmetry_classes
+
+
+def _mutator(method):
+    """Makes a method that edits a compound refuse to run on a frozen one."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._frozen:
+            raise TypeError("A frozen compound can't be changed; edit the "
+                            "copy from thaw() instead")
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _FrozenDict(dict):
+    """The atoms, bonds or other_info of a frozen compound, which can't be
+    changed.
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("A frozen compound can't be changed; edit the copy "
+                        "from thaw() instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = _refuse
 
 
 class Compound(nx.Graph):
@@ -45,7 +79,9 @@ class Compound(nx.Graph):
         bonded (order doesn't matter here) and the item at index 2 should be a
         dictionary of relevant information.  Information that is not provided
         will be assigned reasonable default values.  The chirality is from
-        index 0 to index 1 of the tuple.
+        index 0 to index 1 of the tuple.  A bond whose information has
+        `'aromatic': True` is given a single or double order, so that the
+        aromatic bonds alternate (see `aromaticity.kekulize_bonds`).
     other_info : dict, optional.
         A dictionary that stores all other relevant information about a
         molecule.  Things like molecular charge, pka, the name/id of the
@@ -58,11 +94,45 @@ class Compound(nx.Graph):
     bonds
     other_info
     charge
+    formula
+    molecular_weight
+    components
+    resonance_candidates
+    rings
+    aromaticity
+    symmetry_classes
+    distances
+    frozen
+
+    Notes
+    -----
+    A compound can be edited in place with `add_atom`, `add_bond`,
+    `set_bond_order`, `remove_bond` and `remove_atom`.  Each edit updates the
+    charge, the connected components and the resonance candidates in time
+    proportional to the size of the change rather than the size of the
+    molecule (once they have been calculated).  Any other cached perception is
+    kept in `_perception` and is thrown away by every edit.
+
+    A compound pickles (and deep-copies) as the flat dictionaries of its
+    `__getstate__`, and is rebuilt by the constructor when it is loaded, so
+    sending one to another process costs about as much as sending
+    `to_dict()`.  Cached perception isn't sent; it is recalculated as needed.
+
+    `freeze` makes a compound immutable, so that it can be shared between
+    threads (or kept as a dictionary key) without being copied, and `thaw`
+    gives a mutable copy to edit.
     """
 
     _atoms = None
     _bonds = None
     _other = None
+    _bond_atoms = None
+    _counters = None
+    _charge = None
+    _component_of = None
+    _candidates = None
+    _frozen = False
+    _hash = None
     resonance_structures = None
 
     @staticmethod
@@ -98,11 +168,18 @@ class Compound(nx.Graph):
 
         return edge1 == edge2
 
+    @profiling.timed('compound.construct')
     def __init__(self, atoms, bonds, other_info=None):
         super(Compound, self).__init__()
+        self._bond_atoms = {}
+        self._perception = {}
         if other_info is None:
             other_info = {}
         self.atoms = atoms
+        if any(len(bond) > 2 and bond[2].get('aromatic')
+               for bond in bonds.itervalues()):
+            with profiling.timer('compound.kekulize'):
+                bonds = kekulize_bonds(atoms, bonds)
         self.bonds = bonds
         self.other_info = other_info
         self.molecule = {'other_info': self.other_info,
@@ -110,6 +187,7 @@ class Compound(nx.Graph):
                          'bonds': self.bonds}
         self.auto_complete()
         self.get_resonance_structures()
+        profiling.count('compound.atoms', len(self.atoms))
 
     @property
     def atoms(self):
@@ -160,6 +238,7 @@ class Compound(nx.Graph):
         return self._other
 
     @other_info.setter
+    @_mutator
     def other_info(self, info):
         self._other = info
         self.graph.update(self._other)
@@ -186,8 +265,191 @@ class Compound(nx.Graph):
             The net charge on a molecule.
         """
 
-        charge = sum(atom.charge for atom in self.atoms.itervalues())
-        return charge
+        if self._charge is None:
+            self._charge = sum(atom.charge for atom in self.atoms.itervalues())
+        return self._charge
+
+    @property
+    def formula(self):
+        """The molecular formula, in Hill order.
+
+        Returns
+        -------
+        string
+            Carbon first, then hydrogen, then the other elements in
+            alphabetical order ('C2H6O').  Without carbon every element,
+            hydrogen included, is in alphabetical order ('H2O').  Kept
+            until the compound is edited.
+        """
+
+        formula = self._perception.get('formula')
+        if formula is None:
+            counts = collections.Counter(atom.symbol
+                                         for atom in self.atoms.itervalues())
+            if 'C' in counts:
+                order = ['C'] + (['H'] if 'H' in counts else []) + sorted(
+                    symbol for symbol in counts if symbol not in ('C', 'H'))
+            else:
+                order = sorted(counts)
+            formula = ''.join(
+                symbol + (str(counts[symbol]) if counts[symbol] > 1 else '')
+                for symbol in order)
+            self._perception['formula'] = formula
+        return formula
+
+    @property
+    def molecular_weight(self):
+        """The molecular weight, as the sum of the standard atomic weights
+        of the atoms.
+
+        Returns
+        -------
+        float
+            Summed element by element in alphabetical order, so that compounds
+            with the same formula get exactly the same weight.  Kept until
+            the compound is edited.
+        """
+
+        weight = self._perception.get('molecular_weight')
+        if weight is None:
+            counts = collections.Counter(atom.symbol
+                                         for atom in self.atoms.itervalues())
+            weight = sum(count * periodic_table[symbol]['Weight']
+                         for symbol, count in sorted(counts.iteritems()))
+            self._perception['molecular_weight'] = weight
+        return weight
+
+    @property
+    def components(self):
+        """The connected components (separate molecules) of the compound.
+
+        Returns
+        -------
+        list
+            A set of atom keys for each component.
+        """
+
+        if self._component_of is None:
+            self._component_of = {}
+            for component in nx.connected_components(self):
+                component = set(component)
+                for key in component:
+                    self._component_of[key] = component
+        unique = {id(component): component
+                  for component in self._component_of.itervalues()}
+        return unique.values()
+
+    @property
+    def resonance_candidates(self):
+        """The atoms and bonds that could take part in resonance.
+
+        Returns
+        -------
+        tuple
+            A set of atom keys and a set of bond keys.
+        """
+
+        if self._candidates is None:
+            self._candidates = (
+                {key for key, atom in self.atoms.iteritems()
+                 if atom.could_resonate()},
+                {key for key, bond in self.bonds.iteritems()
+                 if bond.could_resonate()})
+        return self._candidates
+
+    @property
+    def rings(self):
+        """The smallest set of smallest rings, and which of them each atom
+        and bond is in.
+
+        Returns
+        -------
+        RingInfo
+            Found the first time it is asked for, and kept until the compound
+            is edited.
+        """
+
+        rings = self._perception.get('rings')
+        if rings is None:
+            neighbours = {key: [(neighbour, data['key'])
+                                for neighbour, data in self.adj[key].iteritems()]
+                          for key in self.atoms}
+            with profiling.timer('compound.rings'):
+                rings = RingInfo(smallest_rings(self.atoms, neighbours))
+            self._perception['rings'] = rings
+        return rings
+
+    @property
+    def aromaticity(self):
+        """The aromatic atoms, bonds and rings, by Huckel's rule.
+
+        Returns
+        -------
+        Aromaticity
+            Found the first time it is asked for, and kept until the compound
+            is edited.
+        """
+
+        aromaticity = self._perception.get('aromaticity')
+        if aromaticity is None:
+            with profiling.timer('compound.aromaticity'):
+                aromaticity = perceive_aromaticity(self)
+            self._perception['aromaticity'] = aromaticity
+        return aromaticity
+
+    @property
+    def symmetry_classes(self):
+        """The symmetry class of every atom.  Atoms that some symmetry of the
+        molecule swaps (the three hydrogens of a methyl group) share a class.
+
+        Returns
+        -------
+        dict
+            Maps each atom key to the number of its class (see
+            `symmetry.symmetry_classes`).  Found the first time it is asked
+            for, and kept until the compound is edited.
+
+        Notes
+        -----
+        Bonds that could take part in resonance are compared without their
+        orders, so the two oxygens of a carboxylate share a class even though
+        one of them is drawn with the double bond.
+        """
+
+        classes = self._perception.get('symmetry')
+        if classes is None:
+            resonating = self.resonance_candidates[1]
+            neighbours = {
+                key: [(neighbour, None if data['key'] in resonating
+                       else data['bond_obj'].order)
+                      for neighbour, data in self.adj[key].iteritems()]
+                for key in self.atoms}
+            symbols = {key: atom.symbol
+                       for key, atom in self.atoms.iteritems()}
+            with profiling.timer('compound.symmetry'):
+                classes = symmetry_classes(list(self.atoms), neighbours,
+                                           symbols)
+            self._perception['symmetry'] = classes
+        return classes
+
+    @property
+    def distances(self):
+        """The number of bonds between every pair of atoms.
+
+        Returns
+        -------
+        Distances
+            Answers distance, path and neighbourhood queries (see
+            `distances.Distances`).  Made the first time it is asked for, and
+            kept until the compound is edited.
+        """
+
+        distances = self._perception.get('distances')
+        if distances is None:
+            distances = Distances({key: list(self.adj[key])
+                                   for key in self.atoms})
+            self._perception['distances'] = distances
+        return distances
 
     def _add_edges_from(self, bonds):
         """Adds a group of edges.
@@ -201,6 +463,7 @@ class Compound(nx.Graph):
         for id_, bond in bonds.iteritems():
             self._add_edge(id_, *bond)
 
+    @_mutator
     def _add_node(self, key, atom):
         """Adds a single node.
 
@@ -214,9 +477,17 @@ class Compound(nx.Graph):
 
         if key in self.atoms:
             raise KeyError("There is already an atom {}".format(key))
+        self._perception.clear()
         self.add_node(key, {'symbol': atom.symbol})
         self.atoms[key] = atom
-
+        if self._charge is not None:
+            self._charge += atom.charge
+        if self._component_of is not None:
+            self._component_of[key] = {key}
+        if self._candidates is not None and atom.could_resonate():
+            self._candidates[0].add(key)
+
+    @_mutator
     def _add_edge(self, key, first, second, rest=None):
         """Adds a single edge.
 
@@ -237,9 +508,314 @@ class Compound(nx.Graph):
         if key in self.bonds:
             raise KeyError("There is already a bond {}".format(key))
         else:
-            bond = Bond(self.atoms[first], self.atoms[second], **rest)
-            self.add_edge(first, second, key=key, bond_obj=bond)
-            self.bonds[key] = bond
+            ends = (first, second)
+            self._before_edit(ends)
+            try:
+                bond = Bond(self.atoms[first], self.atoms[second], **rest)
+                self.add_edge(first, second, key=key, bond_obj=bond)
+                self.bonds[key] = bond
+                self._bond_atoms[key] = ends
+                self._merge_components(first, second)
+            finally:
+                self._after_edit(ends)
+
+    def _before_edit(self, keys):
+        """Takes the atoms an edit is about to change out of the cached
+        perception.  Must be followed by `_after_edit` with the same atoms,
+        even if the edit fails.
+
+        Parameters
+        ----------
+        keys : tuple
+            The atoms whose own bonds are changed by the edit.  Their charges
+            and their bonds' resonance candidacy are recalculated; nothing
+            else is touched.
+        """
+
+        self._perception.clear()
+        if self._charge is not None:
+            self._charge -= sum(self.atoms[key].charge for key in keys)
+
+    def _after_edit(self, keys):
+        """Puts the atoms changed by an edit back into the cached
+        perception.
+        """
+
+        if self._charge is None and self._candidates is None:
+            return
+        keys = [key for key in keys if key in self.atoms]
+        if self._charge is not None:
+            self._charge += sum(self.atoms[key].charge for key in keys)
+        if self._candidates is not None:
+            atoms, bonds = self._candidates
+            for key in keys:
+                if self.atoms[key].could_resonate():
+                    atoms.add(key)
+                else:
+                    atoms.discard(key)
+                for data in self[key].itervalues():
+                    if data['bond_obj'].could_resonate():
+                        bonds.add(data['key'])
+                    else:
+                        bonds.discard(data['key'])
+
+    def _merge_components(self, first, second):
+        """Joins the components of two newly bonded atoms."""
+
+        if self._component_of is None:
+            return
+        big, small = self._component_of[first], self._component_of[second]
+        if big is small:
+            return
+        if len(big) < len(small):
+            big, small = small, big
+        big.update(small)
+        for key in small:
+            self._component_of[key] = big
+
+    def _next_key(self, letter):
+        """Generates an unused atom ('a') or bond ('b') key."""
+
+        existing = self.atoms if letter == 'a' else self.bonds
+        if self._counters is None:
+            self._counters = {}
+        if letter not in self._counters:
+            numbers = [int(key[1:]) for key in existing if key[1:].isdigit()]
+            self._counters[letter] = max(numbers) if numbers else 0
+        key = None
+        while key is None or key in existing:
+            self._counters[letter] += 1
+            key = '{}{}'.format(letter, self._counters[letter])
+        return key
+
+    @_mutator
+    def add_atom(self, symbol, key=None):
+        """Adds an atom.
+
+        Parameters
+        ----------
+        symbol : string
+            The atomic symbol of the new atom.
+        key : string, optional
+            The key of the new atom.  A new key is generated by default.
+
+        Returns
+        -------
+        string
+            The key of the new atom.
+
+        Raises
+        ------
+        KeyError
+            If there is already an atom with that key.
+        """
+
+        if key is None:
+            key = self._next_key('a')
+        self._add_node(key, Atom(symbol))
+        return key
+
+    @_mutator
+    def add_bond(self, first, second, order=1, key=None, **info):
+        """Adds a bond between two atoms.
+
+        Parameters
+        ----------
+        first, second : string
+            The keys of the atoms being bonded.
+        order : int, optional
+            The order of the bond.
+        key : string, optional
+            The key of the new bond.  A new key is generated by default.
+        info
+            Other information about the bond, such as its chirality.
+
+        Returns
+        -------
+        string
+            The key of the new bond.
+
+        Raises
+        ------
+        KeyError
+            If there is already a bond with that key, or either atom doesn't
+            exist.
+        """
+
+        if first not in self.atoms or second not in self.atoms:
+            raise KeyError("Can't bond {} and {}".format(first, second))
+        if key is None:
+            key = self._next_key('b')
+        info['order'] = order
+        self._add_edge(key, first, second, info)
+        return key
+
+    @_mutator
+    def set_bond_order(self, key, order):
+        """Changes the order of a bond.
+
+        Parameters
+        ----------
+        key : string
+            The key of the bond.
+        order : int
+            The new order (1, 2, or 3).
+        """
+
+        ends = self._bond_atoms[key]
+        self._before_edit(ends)
+        try:
+            self.bonds[key].order = order
+        finally:
+            self._after_edit(ends)
+
+    @_mutator
+    def remove_bond(self, key):
+        """Removes a bond.
+
+        Parameters
+        ----------
+        key : string
+            The key of the bond.
+        """
+
+        ends = first, second = self._bond_atoms[key]
+        self._before_edit(ends)
+        try:
+            bond = self.bonds.pop(key)
+            del self._bond_atoms[key]
+            bond.first.remove_bond(bond, other=bond.second)
+            self.remove_edge(first, second)
+            if self._candidates is not None:
+                self._candidates[1].discard(key)
+            # Splitting a component can't be done incrementally
+            self._component_of = None
+        finally:
+            self._after_edit(ends)
+
+    @_mutator
+    def remove_atom(self, key):
+        """Removes an atom along with all of its bonds.
+
+        Parameters
+        ----------
+        key : string
+            The key of the atom.
+        """
+
+        for data in self[key].values():
+            self.remove_bond(data['key'])
+        self._before_edit((key,))
+        try:
+            self.remove_node(key)
+            del self.atoms[key]
+            if self._component_of is not None:
+                del self._component_of[key]
+            if self._candidates is not None:
+                self._candidates[0].discard(key)
+        finally:
+            self._after_edit((key,))
+
+    # The graph's own edits, which would bypass the compound's
+    add_node = _mutator(nx.Graph.add_node)
+    add_nodes_from = _mutator(nx.Graph.add_nodes_from)
+    remove_node = _mutator(nx.Graph.remove_node)
+    remove_nodes_from = _mutator(nx.Graph.remove_nodes_from)
+    add_edge = _mutator(nx.Graph.add_edge)
+    add_edges_from = _mutator(nx.Graph.add_edges_from)
+    add_weighted_edges_from = _mutator(nx.Graph.add_weighted_edges_from)
+    remove_edge = _mutator(nx.Graph.remove_edge)
+    remove_edges_from = _mutator(nx.Graph.remove_edges_from)
+    clear = _mutator(nx.Graph.clear)
+
+    @property
+    def frozen(self):
+        """Whether the compound has been frozen (see `freeze`)."""
+
+        return self._frozen
+
+    def freeze(self):
+        """Makes the compound immutable.
+
+        Every perception is calculated first, and kept for good: a frozen
+        compound is only ever read, so threads can share it without copies or
+        locks.  It hashes by its structure (isomorphic frozen compounds hash
+        the same), and copying it gives back the compound itself.  A compound
+        that isn't frozen can't be hashed, since its structure (which it is
+        compared by) could change.
+
+        Returns
+        -------
+        Compound
+            The compound, now frozen.  Freezing a frozen compound does
+            nothing.
+
+        Notes
+        -----
+        Editing a frozen compound, or its atoms, bonds or other_info
+        dictionaries, raises a TypeError.  The Atom and Bond objects
+        themselves aren't guarded, and shouldn't be changed.
+
+        The whole distance matrix is found too, unless the compound has more
+        than `distances.DENSE_LIMIT` atoms.  Then the rows are still found as
+        they are asked for; each is kept by a single dictionary assignment,
+        so threads sharing the compound at worst find a row twice.
+        """
+
+        if self._frozen:
+            return self
+        for perception in ('charge', 'components', 'resonance_candidates',
+                           'rings', 'aromaticity', 'symmetry_classes',
+                           'distances', 'formula', 'molecular_weight'):
+            getattr(self, perception)
+        if len(self.atoms) <= DENSE_LIMIT:
+            self.distances.matrix
+        self._hash = self._refined_hash()
+        self._atoms = _FrozenDict(self._atoms)
+        self._bonds = _FrozenDict(self._bonds)
+        self._other = _FrozenDict(self._other)
+        self.molecule = {'other_info': self.other_info,
+                         'atoms': self.atoms,
+                         'bonds': self.bonds}
+        self._frozen = True
+        return self
+
+    def thaw(self):
+        """A mutable copy of the compound, frozen or not.
+
+        Returns
+        -------
+        Compound
+            A new compound with the same atom and bond keys, and a copy of the
+            other_info.  It shares whatever perception the original has
+            already calculated, until it is edited, except for the distances
+            (which fill in as they are asked for, and so aren't shared).
+        """
+
+        state = self.__getstate__()
+        thawed = self.__class__(state['atoms'], state['bonds'],
+                                copy.deepcopy(state['other_info']))
+        thawed._perception.update(self._perception)
+        thawed._perception.pop('distances', None)
+        return thawed
+
+    def _refined_hash(self):
+        """A hash of the atoms' symbols, refined a few times by the symbols
+        of their neighbours and the orders of the bonds to them.  Isomorphic
+        compounds always share it.
+        """
+
+        if self._hash is not None:
+            return self._hash
+        labels = {key: atom.symbol for key, atom in self.atoms.iteritems()}
+        for _ in range(min(len(labels), 4)):
+            labels = {key: hash((labels[key],
+                                 tuple(sorted((labels[other],
+                                               data['bond_obj'].order)
+                                              for other, data in
+                                              self.edge[key].iteritems()))))
+                      for key in labels}
+        return hash(tuple(sorted(labels.itervalues())))
 
     def auto_complete(self):
         """Fills up the atom with necessary hydrogens and lone pairs.
@@ -253,6 +829,7 @@ class Compound(nx.Graph):
 
         pass
 
+    @profiling.timed('compound.resonance')
     def get_resonance_structures(self):
         """Builds a list of available resonance structures for this compound.
 
@@ -284,20 +861,86 @@ class Compound(nx.Graph):
             can jump to the other side of one of its nodes.
         """
 
-        potential_atoms = [atom for atom in self.atoms.itervalues()
-                           if atom.could_resonate()]
-        potential_bonds = [bond
-                           for bond in self.bonds.itervalues()
-                           if bond.could_resonate()]
+        potential_atoms, potential_bonds = self.resonance_candidates
+
+    def to_dict(self):
+        """Breaks the compound back down into plain dictionaries.
+
+        Returns
+        -------
+        dict
+            A dictionary of form {'atoms': ..., 'bonds': ..., 'other_info': ...}
+            in the same format the constructor takes, so that
+            `Compound(**compound.to_dict())` rebuilds the compound.  It holds
+            only strings, numbers and containers, so it can be sent to another
+            process or written out as JSON.
+        """
+
+        atoms = {key: atom.symbol for key, atom in self.atoms.iteritems()}
+        bonds = {}
+        for first, second, data in self.edges_iter(data=True):
+            bond = data['bond_obj']
+            first, second = sorted((first, second))
+            bonds[data['key']] = (first, second,
+                                  {'order': bond.order,
+                                   'chirality': getattr(bond, 'chirality',
+                                                        None)})
+        return {'atoms': atoms,
+                'bonds': bonds,
+                'other_info': dict(self.other_info)}
+
+    def __getstate__(self):
+        """The compound as flat dictionaries, as the constructor takes them.
+
+        Unlike `to_dict` the bonds keep the direction they were made in (which
+        their chirality depends on).  Nothing in it refers to an Atom or a
+        Bond, so pickling it doesn't recurse through the molecule.
+
+        Returns
+        -------
+        dict
+            {'atoms': ..., 'bonds': ..., 'other_info': ...}
+        """
 
+        bonds = {}
+        for key, bond in self.bonds.iteritems():
+            first, second = self._bond_atoms[key]
+            bonds[key] = (first, second,
+                          {'order': bond.order,
+                           'chirality': getattr(bond, 'chirality', None)})
+        return {'atoms': {key: atom.symbol
+                          for key, atom in self.atoms.iteritems()},
+                'bonds': bonds,
+                'other_info': dict(self.other_info)}
+
+    def __reduce__(self):
+        if self._frozen:
+            return _rebuild_compound, (self.__class__, self.__getstate__(),
+                                       True)
+        return _rebuild_compound, (self.__class__, self.__getstate__())
+
+    def __copy__(self):
+        if self._frozen:
+            return self
+        return _rebuild_compound(self.__class__, self.__getstate__())
+
+    def __deepcopy__(self, memo):
+        if self._frozen:
+            return self
+        return _rebuild_compound(self.__class__,
+                                 copy.deepcopy(self.__getstate__(), memo))
+
+    @profiling.timed('compound.serialize')
     def __str__(self):
         return json.dumps(
             self.molecule, cls=_ChemicalSerializer, sort_keys=True)
 
+    @profiling.timed('compound.serialize')
     def __repr__(self):
         return json.dumps(
             self.molecule, cls=_ChemicalSerializer, sort_keys=True, indent=4)
 
+    @profiling.timed('compound.isomorphism')
     def is_isomorphic(self, other):
         """Determines whether or not a molecule is isomorphically equivalent
         to another.
@@ -323,6 +966,23 @@ class Compound(nx.Graph):
     def __ne__(self, other):
         return not self.is_isomorphic(other)
 
+    def __hash__(self):
+        # Equality is structural, so only a compound whose structure can't
+        # change can be hashed, like a tuple but not a list
+        if self._frozen:
+            return self._hash
+        raise TypeError("A compound that isn't frozen can't be hashed; use "
+                        "freeze() or canonical_smiles() as a key")
+
+
+def _rebuild_compound(cls, state, frozen=False):
+    """Rebuilds a pickled compound from its `__getstate__`."""
+
+    compound = cls(state['atoms'], state['bonds'], state['other_info'])
+    if frozen:
+        compound.freeze()
+    return compound
+
 
 class _CompoundWrapper(object):
     """Abstract base class for compound wrapping classes.
@@ -342,6 +1002,9 @@ class _CompoundWrapper(object):
     Product.  This is easier than creating a brand new Compound object whenever
     I want to analyze a molecule as an Acid, or a Base, or some other reactant
     or product.
+
+    A wrapper pickles as its own attributes, and the wrapped compound in its
+    flat form.
     """
 
     __metaclass__ = abc.ABCMeta
@@ -369,12 +1032,47 @@ class _CompoundWrapper(object):
     def __getattr__(self, attr):
         return getattr(self.compound, attr)
 
+    # Without these pickle would find the compound's, through __getattr__
+    def __getstate__(self):
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
     def __eq__(self, other):
         if hasattr(other, 'compound'):
             return self.compound == other.compound
         else:
             return self.compound == other
 
+    def __hash__(self):
+        return hash(self.compound)
+
+    def freeze(self):
+        """Freezes the wrapped compound (see `Compound.freeze`).
+
+        Returns
+        -------
+        _CompoundWrapper
+            The wrapper itself.
+        """
+
+        self.compound.freeze()
+        return self
+
+    def thaw(self):
+        """A copy of the wrapper, around a mutable copy of the compound (see
+        `Compound.thaw`), so that an Acid thaws into an Acid.
+
+        Returns
+        -------
+        _CompoundWrapper
+        """
+
+        thawed = copy.copy(self)
+        thawed.compound = self.compound.thaw()
+        return thawed
+
     def __str__(self):
         return str(self.compound)
 
@@ -0,0 +1,226 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Topological distances: the number of bonds between two atoms.
+
+A breadth-first search from an atom gives its distance to every other atom in
+time linear in the size of the molecule, and one search per atom fills the
+whole matrix.  The matrix is kept as a NumPy array, so questions about many
+atoms at once (which atoms are within k bonds of this one, how far apart are
+the charges) are answered by array operations rather than a loop in Python.
+
+For molecules of up to `DENSE_LIMIT` atoms the whole matrix is found the first
+time any distance is asked for.  Past that the matrix would take too long to
+fill (and too much memory to hold) for the few rows most callers need, so
+each atom's row is found and kept only when it is asked for.
+
+`Compound.distances` builds one of these and keeps it until the compound is
+edited.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import numpy as np
+
+
+# The most atoms a molecule can have for the whole matrix to be found at once.
+# 1000 atoms is 2 MB of distances, and takes about half a second.
+DENSE_LIMIT = 1000
+# Atoms that can't reach each other (in separate molecules of a mixture)
+UNREACHABLE = -1
+
+
+def _search(adjacency, source, size):
+    """The distance from `source` to every atom, as a list."""
+
+    row = [UNREACHABLE] * size
+    row[source] = 0
+    frontier = [source]
+    distance = 0
+    while frontier:
+        distance += 1
+        following = []
+        for atom in frontier:
+            for neighbour in adjacency[atom]:
+                if row[neighbour] == UNREACHABLE:
+                    row[neighbour] = distance
+                    following.append(neighbour)
+        frontier = following
+    return row
+
+
+class Distances(object):
+    """The topological distances between the atoms of a molecule.
+
+    Parameters
+    ----------
+    neighbours : dict
+        Maps each atom key to an iterable of the keys of its neighbours.
+
+    Attributes
+    ----------
+    keys : list
+        The atom keys, in the order of the matrix's rows and columns.
+    index : dict
+        Maps each atom key to its row.
+    matrix
+
+    Notes
+    -----
+    Distances are in bonds, and are `UNREACHABLE` (-1) between atoms with no
+    path between them.
+    """
+
+    def __init__(self, neighbours):
+        self.keys = sorted(neighbours)
+        self.index = {key: number for number, key in enumerate(self.keys)}
+        self._adjacency = [[self.index[neighbour]
+                            for neighbour in neighbours[key]]
+                           for key in self.keys]
+        size = len(self.keys)
+        self._dtype = np.int16 if size < np.iinfo(np.int16).max else np.int32
+        self._matrix = None
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def matrix(self):
+        """The whole distance matrix, as a square NumPy array.
+
+        Notes
+        -----
+        For a molecule of more than `DENSE_LIMIT` atoms this searches from
+        every atom that hasn't been searched from yet, which is slow.
+        """
+
+        if self._matrix is None:
+            size = len(self.keys)
+            matrix = np.empty((size, size), self._dtype)
+            for number in xrange(size):
+                row = self._rows.get(number)
+                matrix[number] = (row if row is not None else
+                                  _search(self._adjacency, number, size))
+            self._matrix = matrix
+            self._rows.clear()
+        return self._matrix
+
+    def _row(self, number):
+        if self._matrix is None and len(self.keys) <= DENSE_LIMIT:
+            self.matrix
+        if self._matrix is not None:
+            return self._matrix[number]
+        row = self._rows.get(number)
+        if row is None:
+            row = np.array(_search(self._adjacency, number, len(self.keys)),
+                           self._dtype)
+            self._rows[number] = row
+        return row
+
+    def row(self, key):
+        """The distances from an atom to every atom, in the order of `keys`.
+
+        Parameters
+        ----------
+        key : string
+            The atom's key.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        return self._row(self.index[key])
+
+    def distance(self, first, second):
+        """The number of bonds between two atoms, or `UNREACHABLE`."""
+
+        return int(self.row(first)[self.index[second]])
+
+    def within(self, key, bonds):
+        """The atoms at most a number of bonds away from an atom.
+
+        Parameters
+        ----------
+        key : string
+            The atom's key.
+        bonds : int
+            The most bonds away an atom can be.
+
+        Returns
+        -------
+        list
+            The keys of the atoms, nearest first (and by key between atoms as
+            far away as each other).  The atom itself isn't included.
+        """
+
+        row = self.row(key)
+        found = np.flatnonzero((row > 0) & (row <= bonds))
+        found = found[np.argsort(row[found], kind='mergesort')]
+        return [self.keys[number] for number in found]
+
+    def path(self, first, second):
+        """A shortest path between two atoms.
+
+        Parameters
+        ----------
+        first, second : string
+            The keys of the atoms at either end.
+
+        Returns
+        -------
+        list or None
+            The keys of the atoms along the path, from `first` to `second`, or
+            None if there is no path.  Between atoms with several shortest
+            paths, each step goes to the neighbour with the smallest key.
+        """
+
+        target = self.index[second]
+        row = self._row(target)
+        current = self.index[first]
+        if row[current] == UNREACHABLE:
+            return None
+        path = [current]
+        while current != target:
+            current = min(neighbour for neighbour in self._adjacency[current]
+                          if row[neighbour] == row[current] - 1)
+            path.append(current)
+        return [self.keys[number] for number in path]
+
+    def charge_separation(self, charges):
+        """How far apart opposite charges are.  Structures that keep their
+        charges closer together are preferred (the second rule of
+        `Compound.get_resonance_structures`).
+
+        Parameters
+        ----------
+        charges : dict
+            Maps atom keys to their formal charges.  Atoms that aren't given
+            (or have no charge) are neutral.
+
+        Returns
+        -------
+        int
+            The sum, over every pair of oppositely charged atoms, of the
+            product of the sizes of their charges and the number of bonds
+            between them.  0 if there are no opposite charges; pairs that
+            can't reach each other aren't counted.
+        """
+
+        positive = [(self.index[key], charge)
+                    for key, charge in charges.iteritems() if charge > 0]
+        negative = [(self.index[key], -charge)
+                    for key, charge in charges.iteritems() if charge < 0]
+        if not positive or not negative:
+            return 0
+        columns = np.array([number for number, _ in negative])
+        distances = np.array([self._row(number)[columns]
+                              for number, _ in positive], np.int64)
+        distances[distances == UNREACHABLE] = 0
+        weights = np.outer([charge for _, charge in positive],
+                           [charge for _, charge in negative])
+        return int((distances * weights).sum())
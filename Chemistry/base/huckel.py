@@ -0,0 +1,334 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Huckel molecular orbital theory for the conjugated parts of a compound.
+
+The pi system is made of the atoms with a double (or triple) bond, and of the
+atoms next to them that can give it a lone pair (the nitrogen of an amide or a
+pyrrole, the oxygen of an enol or a furan, a halogen) or an empty p orbital (a
+carbon or boron with only three single bonds, which, as in `aromaticity`, is
+taken to be a cation).  Each separate piece of it is a conjugated system.
+
+A system's Huckel matrix has the Coulomb integral of each atom on its diagonal
+and the resonance integral of each bond off it, both in units of beta relative
+to the Coulomb integral alpha of carbon.  Heteroatoms use Streitwieser's
+parameters: alpha + h * beta for the atom and k * beta for its bonds, where a
+bond between two heteroatoms takes the product of their k's.  An eigenvalue x
+of the matrix is an orbital of energy alpha + x * beta, so (beta being
+negative) the larger x is, the more bonding the orbital.
+
+The electrons fill the orbitals from the most bonding up, and orbitals with the
+same energy share theirs evenly, so the densities keep the molecule's
+symmetry.  From the filled orbitals come
+
+- the pi energy, the sum of the energies of the electrons;
+- the delocalization energy, how much lower that is than the energy of the
+  electrons kept in the double bonds and lone pairs they're drawn in, which
+  scores how much resonance stabilizes the compound (2 beta for benzene);
+- the pi electron density on each atom, and its pi charge (its core charge,
+  the electrons it would give the pi system if it were neutral, less its
+  density);
+- the pi bond order of each bond.
+
+`huckel_batch` solves the systems of many compounds together: systems of the
+same size are stacked and diagonalized by a single call to NumPy, so a library
+of small molecules costs a handful of calls rather than one per molecule.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+
+import numpy as np
+
+
+# (h, k) by the symbol of an atom and the number of electrons it gives the pi
+# system
+_PARAMETERS = {('C', 0): (0.0, 1.0), ('C', 1): (0.0, 1.0),
+               ('B', 0): (-1.0, 0.7),
+               ('N', 1): (0.5, 1.0), ('N', 2): (1.5, 0.8),
+               ('O', 1): (1.0, 1.0), ('O', 2): (2.0, 0.8),
+               ('S', 1): (0.5, 0.8), ('S', 2): (1.5, 0.6),
+               ('F', 2): (3.0, 0.7), ('Cl', 2): (2.0, 0.4),
+               ('Br', 2): (1.5, 0.3)}
+# The valence of each atom the pi system can take in.  An atom with a single
+# multiple bond gives one electron, one that has room for another bond but no
+# multiple bond gives an empty p orbital, and the rest give a lone pair.
+_VALENCES = {'B': 3, 'C': 4, 'N': 3, 'O': 2, 'S': 2, 'F': 1, 'Cl': 1,
+             'Br': 1}
+# Atoms that have a lone pair to give, and atoms with an empty p orbital
+_DONORS = {'N', 'O', 'S', 'F', 'Cl', 'Br'}
+_ACCEPTORS = {'B', 'C'}
+# Orbitals whose energies are closer than this share their electrons
+_DEGENERATE = 1e-8
+
+
+class PiSystem(collections.namedtuple('PiSystem', [
+        'atoms', 'energies', 'occupations', 'coefficients', 'energy',
+        'delocalization', 'densities', 'charges', 'bond_orders'])):
+    """A solved conjugated system.
+
+    Attributes
+    ----------
+    atoms : list
+        The keys of the system's atoms, in the order of the matrix's rows.
+    energies : numpy.ndarray
+        The x of each orbital's energy alpha + x * beta, most bonding first.
+    occupations : numpy.ndarray
+        The number of electrons in each orbital.
+    coefficients : numpy.ndarray
+        The orbitals, one per column, in the order of `energies`.
+    energy : float
+        The pi energy, as the x of alpha + x * beta per electron summed.
+    delocalization : float
+        How much of `energy` comes from delocalization, in units of beta.
+    densities : dict
+        The pi electron density on each atom.
+    charges : dict
+        The pi charge on each atom, counting its formal charge.
+    bond_orders : dict
+        The pi bond order of each bond between two of the atoms, by bond key.
+    """
+
+    __slots__ = ()
+
+
+# A system before it is solved: the atoms, the Huckel matrix, the electrons
+# and core charge of each atom, the (row, row, bond key) of each bond and the
+# energy of the electrons where they are drawn
+_Setup = collections.namedtuple('_Setup', ['atoms', 'matrix', 'electrons',
+                                           'cores', 'bonds', 'localized'])
+
+
+def _electrons(compound, key, symbol):
+    """What an atom gives the pi system.
+
+    Returns
+    -------
+    tuple or None
+        The number of electrons it gives, its core charge (the electrons it
+        would give if it had no formal charge) and whether it has a multiple
+        bond of its own.  None if it can't be part of a pi system.
+    """
+
+    if symbol not in _VALENCES:
+        return None
+    multiple = 0
+    used = 0
+    for data in compound.adj[key].itervalues():
+        order = data['bond_obj'].order
+        used += order
+        if order > 1:
+            multiple += 1
+    # Bonds past the usual valence are a positive formal charge, and
+    # (on a heteroatom) missing ones a negative charge
+    formal = used - _VALENCES[symbol]
+    if multiple == 1:
+        count = 1
+    elif multiple:
+        # Cumulated double bonds are at right angles to each other
+        return None
+    elif symbol in _DONORS and formal in (0, -1):
+        count = 2
+    elif symbol in _ACCEPTORS and used == 3:
+        # As in `aromaticity`, a carbon with three single bonds is a cation
+        count = 0
+        formal = 1 if symbol == 'C' else 0
+    else:
+        return None
+    return count, count + formal, bool(multiple)
+
+
+def _setups(compound):
+    """Finds a compound's conjugated systems and builds their Huckel
+    matrices.
+    """
+
+    # Only atoms with a multiple bond and their neighbours can take part, so
+    # saturated parts of the molecule are skipped
+    candidates = set()
+    for first, second, data in compound.edges_iter(data=True):
+        if data['bond_obj'].order > 1:
+            candidates.update(compound.adj[first])
+            candidates.update(compound.adj[second])
+    atoms = compound.atoms
+    electrons = {}
+    for key in candidates:
+        symbol = atoms[key].symbol
+        found = _electrons(compound, key, symbol)
+        if found is not None and (symbol, found[0]) in _PARAMETERS:
+            electrons[key] = found
+    # Lone pairs and empty orbitals only count next to a multiple bond
+    pi = {key for key, (_, _, multiple) in electrons.iteritems()
+          if multiple or any(neighbour in electrons and electrons[neighbour][2]
+                             for neighbour in compound.adj[key])}
+
+    setups = []
+    seen = set()
+    for start in sorted(pi):
+        if start in seen:
+            continue
+        seen.add(start)
+        atoms = [start]
+        for key in atoms:
+            for neighbour in compound.adj[key]:
+                if neighbour in pi and neighbour not in seen:
+                    seen.add(neighbour)
+                    atoms.append(neighbour)
+        if len(atoms) < 2:
+            continue
+        atoms.sort()
+        setups.append(_setup(compound, atoms, electrons))
+    return setups
+
+
+def _setup(compound, atoms, electrons):
+    """Builds the Huckel matrix of a single conjugated system."""
+
+    index = {key: row for row, key in enumerate(atoms)}
+    size = len(atoms)
+    matrix = np.zeros((size, size))
+    counts = np.zeros(size)
+    cores = np.zeros(size)
+    factors = []
+    for row, key in enumerate(atoms):
+        count, cores[row], _ = electrons[key]
+        counts[row] = count
+        coulomb, factor = _PARAMETERS[compound.atoms[key].symbol, count]
+        matrix[row, row] = coulomb
+        factors.append(factor)
+
+    bonds = []
+    localized = 0.
+    paired = set()
+    for row, key in enumerate(atoms):
+        for neighbour, data in compound.adj[key].iteritems():
+            other = index.get(neighbour)
+            if other is None or other < row:
+                continue
+            resonance = factors[row] * factors[other]
+            matrix[row, other] = matrix[other, row] = resonance
+            bonds.append((row, other, data['key']))
+            if data['bond_obj'].order > 1:
+                # The bonding orbital of the double bond on its own
+                mean = (matrix[row, row] + matrix[other, other]) / 2
+                half = (matrix[row, row] - matrix[other, other]) / 2
+                localized += 2 * (mean + np.hypot(half, resonance))
+                paired.update((row, other))
+    for row in xrange(size):
+        if row not in paired:
+            localized += counts[row] * matrix[row, row]
+    return _Setup(atoms, matrix, counts, cores, bonds, localized)
+
+
+def _occupations(energies, electrons):
+    """Fills stacked orbitals (most bonding first) with electrons.
+
+    Parameters
+    ----------
+    energies : numpy.ndarray
+        One row of orbital energies per system, largest x first.
+    electrons : numpy.ndarray
+        The number of electrons of each system.
+
+    Returns
+    -------
+    numpy.ndarray
+        The number of electrons in each orbital.
+    """
+
+    count, size = energies.shape
+    occupations = np.clip(electrons[:, np.newaxis]
+                          - 2 * np.arange(size)[np.newaxis, :], 0, 2)
+    # Number the runs of degenerate orbitals across all the systems, and share
+    # each run's electrons between its orbitals
+    starts = np.ones((count, size), bool)
+    starts[:, 1:] = energies[:, :-1] - energies[:, 1:] > _DEGENERATE
+    groups = np.cumsum(starts.ravel()) - 1
+    totals = np.bincount(groups, occupations.ravel())
+    sizes = np.bincount(groups)
+    return (totals / sizes)[groups].reshape(count, size)
+
+
+def _solve(setups):
+    """Solves systems that all have the same number of atoms."""
+
+    matrices = np.array([setup.matrix for setup in setups])
+    electrons = np.array([setup.electrons.sum() for setup in setups])
+    energies, coefficients = np.linalg.eigh(matrices)
+    # eigh puts the smallest x (the least bonding orbital) first
+    energies = energies[:, ::-1]
+    coefficients = coefficients[:, :, ::-1]
+    occupations = _occupations(energies, electrons)
+    densities = np.einsum('sak,sk,sak->sa', coefficients, occupations,
+                          coefficients)
+    orders = np.einsum('sak,sk,sbk->sab', coefficients, occupations,
+                       coefficients)
+    totals = (energies * occupations).sum(axis=1)
+
+    solved = []
+    for number, setup in enumerate(setups):
+        density = densities[number]
+        solved.append(PiSystem(
+            setup.atoms, energies[number], occupations[number],
+            coefficients[number], float(totals[number]),
+            float(totals[number] - setup.localized),
+            dict(zip(setup.atoms, density.tolist())),
+            dict(zip(setup.atoms, (setup.cores - density).tolist())),
+            {key: float(orders[number, row, other])
+             for row, other, key in setup.bonds}))
+    return solved
+
+
+def huckel_batch(compounds):
+    """Solves the conjugated systems of many compounds.
+
+    Parameters
+    ----------
+    compounds : iterable
+        The compounds.
+
+    Returns
+    -------
+    list
+        A list of PiSystems per compound, one for each of its conjugated
+        systems (in order of their smallest atom key).
+
+    Notes
+    -----
+    Every system of the same size, whichever compound it is from, is solved by
+    the same call to `numpy.linalg.eigh`.
+    """
+
+    setups = [_setups(compound) for compound in compounds]
+    by_size = collections.defaultdict(list)
+    for number, found in enumerate(setups):
+        for position, setup in enumerate(found):
+            by_size[len(setup.atoms)].append((number, position, setup))
+
+    results = [[None] * len(found) for found in setups]
+    for group in by_size.itervalues():
+        solved = _solve([setup for _, _, setup in group])
+        for (number, position, _), system in zip(group, solved):
+            results[number][position] = system
+    return results
+
+
+def huckel(compound):
+    """Solves the conjugated systems of a compound.
+
+    Parameters
+    ----------
+    compound : Compound
+
+    Returns
+    -------
+    list
+        A PiSystem for each conjugated system (in order of their smallest atom
+        key).  Empty if the compound has no pi system.
+    """
+
+    return huckel_batch([compound])[0]
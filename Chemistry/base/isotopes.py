@@ -0,0 +1,277 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Isotope patterns: how the molecules of a compound spread over masses,
+given the natural abundances of the isotopes of its elements.
+
+The pattern is binned by nominal mass (the sum of the mass numbers of the
+isotopes), which is what a mass spectrometer of ordinary resolution sees.  The
+isotopes of each element are a distribution over the mass number above that
+of its lightest isotope, and the distribution of a whole molecule is the
+convolution of those of its atoms.  Rather than convolving atom by atom, each
+element's distribution is Fourier transformed once, where convolving it with
+itself n times is raising it to the nth power, and the powers of every element
+are multiplied together and transformed back.  A molecule of thousands of
+atoms costs a couple of small FFTs.
+
+Each peak also gets its centroid, the average exact mass of the molecules in
+it.  It is carried through the same transforms, as the sum over the elements
+of the mass defects (exact mass less mass number) of each isotope weighted by
+its abundance: the derivative of the product of powers.
+
+Only the bins that can hold anything but the far tail of the distribution are
+transformed, so the cost depends on the spread of the pattern (tens of bins
+for most molecules) rather than on the molecule's size.  `isotope_patterns`
+works on many compounds together: molecules whose patterns need the same
+number of bins share the transforms of each element's distribution and are
+computed by a single matrix product, a block at a time.
+
+There is isotope data for every element with a natural isotopic composition:
+hydrogen through bismuth but technetium and promethium, and thorium,
+protactinium and uranium.  The others have no stable isotopes, so no natural
+abundances, and a compound containing one has no pattern.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+import re
+
+import numpy as np
+
+from Chemistry.base.periodic_table import periodic_table
+
+
+# Bins that would hold less than this fraction of the largest peak are dropped
+THRESHOLD = 1e-6
+# The bins transformed reach this many standard deviations above the average,
+# and this many times the widest spread of a single atom
+_SIGMAS = 12
+_SPANS = 12
+# Rows of the matrix product computed at once
+_BLOCK = 4096
+
+_FORMULA = re.compile(r'([A-Z][a-z]?)(\d*)')
+_WHOLE_FORMULA = re.compile(r'(?:[A-Z][a-z]?\d*)+$')
+
+
+class IsotopePattern(collections.namedtuple('IsotopePattern', [
+        'nominal', 'masses', 'abundances', 'monoisotopic'])):
+    """The isotope pattern of a compound.
+
+    Attributes
+    ----------
+    nominal : numpy.ndarray
+        The nominal mass of each peak, in increasing order.
+    masses : numpy.ndarray
+        The centroid of each peak, the average exact mass of the molecules in
+        it.
+    abundances : numpy.ndarray
+        The fraction of the molecules in each peak.  They sum to 1, less the
+        peaks that were dropped.
+    monoisotopic : float
+        The exact mass of the molecule made of the most abundant isotope of
+        each element.
+    """
+
+    __slots__ = ()
+
+    @property
+    def relative(self):
+        """The abundances relative to the largest peak."""
+
+        return self.abundances / self.abundances.max()
+
+    @property
+    def base_peak(self):
+        """The centroid of the largest peak."""
+
+        return self.masses[np.argmax(self.abundances)]
+
+
+def parse_formula(formula):
+    """Counts the atoms of each element in a molecular formula.
+
+    Parameters
+    ----------
+    formula : string
+        A formula such as 'C6H12O6', in any order.  An element can appear more
+        than once.
+
+    Returns
+    -------
+    collections.Counter
+        The number of atoms of each element.
+
+    Raises
+    ------
+    ValueError
+        If the formula is not a list of element symbols and counts.
+    """
+
+    if not _WHOLE_FORMULA.match(formula):
+        raise ValueError("Can't read the formula {!r}".format(formula))
+    counts = collections.Counter()
+    for symbol, count in _FORMULA.findall(formula):
+        if symbol not in periodic_table:
+            raise ValueError("Unknown element {} in {}".format(symbol,
+                                                               formula))
+        counts[symbol] += int(count) if count else 1
+    return counts
+
+
+def element_counts(compound):
+    """The number of atoms of each element in a compound or formula."""
+
+    if isinstance(compound, basestring):
+        return parse_formula(compound)
+    return collections.Counter(atom.symbol
+                               for atom in compound.atoms.itervalues())
+
+
+class _Element(object):
+    """The isotope distribution of an element, over the mass numbers above
+    that of its lightest isotope.
+    """
+
+    def __init__(self, symbol):
+        isotopes = periodic_table[symbol]['Isotopes']
+        if not isotopes:
+            raise ValueError(
+                "There is no isotope data for {}".format(symbol))
+        numbers = [int(round(mass)) for mass, _ in isotopes]
+        self.lightest = min(numbers)
+        self.span = max(numbers) - self.lightest
+        self.abundances = np.zeros(self.span + 1)
+        # The abundance weighted mass defect in each bin
+        self.defects = np.zeros(self.span + 1)
+        for number, (mass, abundance) in zip(numbers, isotopes):
+            self.abundances[number - self.lightest] += abundance
+            self.defects[number - self.lightest] += abundance * (mass - number)
+        self.monoisotopic = max(isotopes, key=lambda isotope: isotope[1])[0]
+        offsets = np.arange(self.span + 1)
+        self.mean = offsets.dot(self.abundances)
+        self.variance = (offsets ** 2).dot(self.abundances) - self.mean ** 2
+        self._transforms = {}
+
+    def transforms(self, size):
+        """The logarithm of the Fourier transform of the distribution, and the
+        transform of the mass defects over the distribution's.
+        """
+
+        if size not in self._transforms:
+            abundances = np.fft.rfft(self.abundances, size)
+            defects = np.fft.rfft(self.defects, size)
+            # A transform can only vanish by cancellation, and then only at
+            # isolated frequencies; keep it finite there
+            abundances[abundances == 0] = np.finfo(float).tiny
+            self._transforms[size] = (np.log(abundances),
+                                      defects / abundances)
+        return self._transforms[size]
+
+
+_ELEMENTS = {}
+
+
+def _element(symbol):
+    if symbol not in _ELEMENTS:
+        _ELEMENTS[symbol] = _Element(symbol)
+    return _ELEMENTS[symbol]
+
+
+def _sizes(matrix, elements):
+    """The number of bins transformed for each molecule, a power of two."""
+
+    span = matrix.dot([element.span for element in elements])
+    mean = matrix.dot([element.mean for element in elements])
+    deviation = np.sqrt(matrix.dot([element.variance
+                                    for element in elements]))
+    widest = np.max((matrix > 0) * [element.span for element in elements],
+                    axis=1)
+    reach = np.ceil(mean + _SIGMAS * deviation + _SPANS * widest)
+    bins = np.minimum(span, reach).astype(int) + 1
+    return 1 << np.ceil(np.log2(bins)).astype(int)
+
+
+def _patterns(matrix, elements, size, threshold):
+    """The patterns of molecules that are transformed over the same number of
+    bins.
+    """
+
+    logarithms, defects = (np.array(transforms) for transforms in zip(
+        *(element.transforms(size) for element in elements)))
+    lightest = matrix.dot([element.lightest for element in elements])
+    monoisotopic = matrix.dot([element.monoisotopic for element in elements])
+    offsets = np.arange(size)
+    patterns = []
+    for start in xrange(0, len(matrix), _BLOCK):
+        block = matrix[start:start + _BLOCK]
+        transformed = np.exp(block.dot(logarithms))
+        abundances = np.fft.irfft(transformed, size)
+        moments = np.fft.irfft(transformed * block.dot(defects), size)
+        kept = abundances >= threshold * abundances.max(axis=1)[:, None]
+        nominal = lightest[start:start + _BLOCK, None] + offsets
+        with np.errstate(divide='ignore', invalid='ignore'):
+            masses = nominal + moments / abundances
+        for row, mask in enumerate(kept):
+            patterns.append(IsotopePattern(
+                nominal[row][mask].astype(int), masses[row][mask],
+                abundances[row][mask], monoisotopic[start + row]))
+    return patterns
+
+
+def isotope_patterns(compounds, threshold=THRESHOLD):
+    """The isotope patterns of many compounds.
+
+    Parameters
+    ----------
+    compounds : iterable
+        Compounds, or formulas, or a mix of the two.
+    threshold : float, optional
+        Peaks smaller than this fraction of the largest peak of their pattern
+        are dropped.
+
+    Returns
+    -------
+    list
+        The IsotopePattern of each compound, in order.
+
+    Raises
+    ------
+    ValueError
+        If a compound has an element with no isotope data, or no atoms, or a
+        formula can't be read.
+    """
+
+    counts = [element_counts(compound) for compound in compounds]
+    if not counts:
+        return []
+    if not all(counts):
+        raise ValueError("A compound has no atoms")
+    symbols = sorted(set().union(*counts))
+    columns = {symbol: column for column, symbol in enumerate(symbols)}
+    matrix = np.zeros((len(counts), len(symbols)))
+    for row, molecule in enumerate(counts):
+        for symbol, count in molecule.iteritems():
+            matrix[row, columns[symbol]] = count
+    elements = [_element(symbol) for symbol in symbols]
+    sizes = _sizes(matrix, elements)
+    patterns = [None] * len(counts)
+    for size in np.unique(sizes):
+        rows = np.flatnonzero(sizes == size)
+        found = _patterns(matrix[rows], elements, int(size), threshold)
+        for row, pattern in zip(rows, found):
+            patterns[row] = pattern
+    return patterns
+
+
+def isotope_pattern(compound, threshold=THRESHOLD):
+    """The isotope pattern of a compound or formula.
+
+    See `isotope_patterns`.
+    """
+
+    return isotope_patterns([compound], threshold)[0]
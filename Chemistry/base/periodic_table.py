@@ -5,7 +5,8 @@
 
 
 """This module stores all of the data about each element in the periodic table.
-This includes atomic mass, radius, electronegativity, etc.
+This includes atomic mass, radius, electronegativity, etc., along with the
+exact mass and natural abundance of each naturally occurring isotope.
 """
 __author__ = "Dan Obermiller"
 
@@ -29,6 +30,16 @@ def get_element(symbol):
 
 periodic_table = {
                    "H": {
+                       "Isotopes": [
+                           [
+                               1.00782503223, 
+                               0.999885
+                           ], 
+                           [
+                               2.01410177812, 
+                               0.000115
+                           ]
+                       ], 
                        "Electronegativity": 2.2, 
                        "Group": 1, 
                        "Melting Point": 14.01, 
@@ -46,6 +57,16 @@ periodic_table = {
                        ]
                    }, 
                    "He": {
+                       "Isotopes": [
+                           [
+                               3.0160293201, 
+                               1.34e-06
+                           ], 
+                           [
+                               4.00260325413, 
+                               0.99999866
+                           ]
+                       ], 
                        "Electronegativity": None, 
                        "Group": 18, 
                        "Melting Point": 0.956, 
@@ -62,6 +83,16 @@ periodic_table = {
                        ]
                    }, 
                    "Li": {
+                       "Isotopes": [
+                           [
+                               6.0151228874, 
+                               0.0759
+                           ], 
+                           [
+                               7.0160034366, 
+                               0.9241
+                           ]
+                       ], 
                        "Electronegativity": 0.98, 
                        "Group": 1, 
                        "Melting Point": 453.69, 
@@ -78,6 +109,12 @@ periodic_table = {
                        ]
                    }, 
                    "Be": {
+                       "Isotopes": [
+                           [
+                               9.012183065, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.57, 
                        "Group": 2, 
                        "Melting Point": 1560.0, 
@@ -95,6 +132,16 @@ periodic_table = {
                        ]
                    }, 
                    "B": {
+                       "Isotopes": [
+                           [
+                               10.01293695, 
+                               0.199
+                           ], 
+                           [
+                               11.00930536, 
+                               0.801
+                           ]
+                       ], 
                        "Electronegativity": 2.04, 
                        "Group": 13, 
                        "Melting Point": 2349.0, 
@@ -113,6 +160,16 @@ periodic_table = {
                        ]
                    }, 
                    "C": {
+                       "Isotopes": [
+                           [
+                               12.0, 
+                               0.9893
+                           ], 
+                           [
+                               13.00335483507, 
+                               0.0107
+                           ]
+                       ], 
                        "Electronegativity": 2.55, 
                        "Group": 14, 
                        "Melting Point": 3800.0, 
@@ -136,6 +193,16 @@ periodic_table = {
                        ]
                    }, 
                    "N": {
+                       "Isotopes": [
+                           [
+                               14.00307400443, 
+                               0.99636
+                           ], 
+                           [
+                               15.00010889888, 
+                               0.00364
+                           ]
+                       ], 
                        "Electronegativity": 3.04, 
                        "Group": 15, 
                        "Melting Point": 63.15, 
@@ -159,6 +226,20 @@ periodic_table = {
                        ]
                    }, 
                    "O": {
+                       "Isotopes": [
+                           [
+                               15.99491461957, 
+                               0.99757
+                           ], 
+                           [
+                               16.9991317565, 
+                               0.00038
+                           ], 
+                           [
+                               17.99915961286, 
+                               0.00205
+                           ]
+                       ], 
                        "Electronegativity": 3.44, 
                        "Group": 16, 
                        "Melting Point": 54.36, 
@@ -178,6 +259,12 @@ periodic_table = {
                        ]
                    }, 
                    "F": {
+                       "Isotopes": [
+                           [
+                               18.99840316273, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 3.98, 
                        "Group": 17, 
                        "Melting Point": 53.53, 
@@ -194,6 +281,20 @@ periodic_table = {
                        ]
                    }, 
                    "Ne": {
+                       "Isotopes": [
+                           [
+                               19.9924401762, 
+                               0.9048
+                           ], 
+                           [
+                               20.993846685, 
+                               0.0027
+                           ], 
+                           [
+                               21.991385114, 
+                               0.0925
+                           ]
+                       ], 
                        "Electronegativity": None, 
                        "Group": 18, 
                        "Melting Point": 24.56, 
@@ -210,6 +311,12 @@ periodic_table = {
                        ]
                    }, 
                    "Na": {
+                       "Isotopes": [
+                           [
+                               22.989769282, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 0.93, 
                        "Group": 1, 
                        "Melting Point": 370.87, 
@@ -227,6 +334,20 @@ periodic_table = {
                        ]
                    }, 
                    "Mg": {
+                       "Isotopes": [
+                           [
+                               23.985041697, 
+                               0.7899
+                           ], 
+                           [
+                               24.985836976, 
+                               0.1
+                           ], 
+                           [
+                               25.982592968, 
+                               0.1101
+                           ]
+                       ], 
                        "Electronegativity": 1.31, 
                        "Group": 2, 
                        "Melting Point": 923.0, 
@@ -244,6 +365,12 @@ periodic_table = {
                        ]
                    }, 
                    "Al": {
+                       "Isotopes": [
+                           [
+                               26.98153853, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.61, 
                        "Group": 13, 
                        "Melting Point": 933.47, 
@@ -262,6 +389,20 @@ periodic_table = {
                        ]
                    }, 
                    "Si": {
+                       "Isotopes": [
+                           [
+                               27.97692653465, 
+                               0.92223
+                           ], 
+                           [
+                               28.9764946649, 
+                               0.04685
+                           ], 
+                           [
+                               29.973770136, 
+                               0.03092
+                           ]
+                       ], 
                        "Electronegativity": 1.9, 
                        "Group": 14, 
                        "Melting Point": 1687.0, 
@@ -285,6 +426,12 @@ periodic_table = {
                        ]
                    }, 
                    "P": {
+                       "Isotopes": [
+                           [
+                               30.97376199842, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.19, 
                        "Group": 15, 
                        "Melting Point": 317.3, 
@@ -308,6 +455,24 @@ periodic_table = {
                        ]
                    }, 
                    "S": {
+                       "Isotopes": [
+                           [
+                               31.9720711744, 
+                               0.9499
+                           ], 
+                           [
+                               32.9714589098, 
+                               0.0075
+                           ], 
+                           [
+                               33.967867004, 
+                               0.0425
+                           ], 
+                           [
+                               35.96708071, 
+                               0.0001
+                           ]
+                       ], 
                        "Electronegativity": 2.58, 
                        "Group": 16, 
                        "Melting Point": 388.36, 
@@ -330,6 +495,16 @@ periodic_table = {
                        ]
                    }, 
                    "Cl": {
+                       "Isotopes": [
+                           [
+                               34.968852682, 
+                               0.7576
+                           ], 
+                           [
+                               36.965902602, 
+                               0.2424
+                           ]
+                       ], 
                        "Electronegativity": 3.16, 
                        "Group": 17, 
                        "Melting Point": 171.6, 
@@ -353,6 +528,20 @@ periodic_table = {
                        ]
                    }, 
                    "Ar": {
+                       "Isotopes": [
+                           [
+                               35.967545105, 
+                               0.003336
+                           ], 
+                           [
+                               37.96273211, 
+                               0.000629
+                           ], 
+                           [
+                               39.9623831237, 
+                               0.996035
+                           ]
+                       ], 
                        "Electronegativity": None, 
                        "Group": 18, 
                        "Melting Point": 83.8, 
@@ -369,6 +558,20 @@ periodic_table = {
                        ]
                    }, 
                    "K": {
+                       "Isotopes": [
+                           [
+                               38.9637064864, 
+                               0.932581
+                           ], 
+                           [
+                               39.963998166, 
+                               0.000117
+                           ], 
+                           [
+                               40.9618252579, 
+                               0.067302
+                           ]
+                       ], 
                        "Electronegativity": 0.82, 
                        "Group": 1, 
                        "Melting Point": 336.53, 
@@ -386,6 +589,32 @@ periodic_table = {
                        ]
                    }, 
                    "Ca": {
+                       "Isotopes": [
+                           [
+                               39.962590863, 
+                               0.96941
+                           ], 
+                           [
+                               41.95861783, 
+                               0.00647
+                           ], 
+                           [
+                               42.95876644, 
+                               0.00135
+                           ], 
+                           [
+                               43.95548156, 
+                               0.02086
+                           ], 
+                           [
+                               45.953689, 
+                               4e-05
+                           ], 
+                           [
+                               47.95252276, 
+                               0.00187
+                           ]
+                       ], 
                        "Electronegativity": 1.0, 
                        "Group": 2, 
                        "Melting Point": 1115.0, 
@@ -403,6 +632,12 @@ periodic_table = {
                        ]
                    }, 
                    "Sc": {
+                       "Isotopes": [
+                           [
+                               44.95590828, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.36, 
                        "Group": 3, 
                        "Melting Point": 1814.0, 
@@ -421,6 +656,28 @@ periodic_table = {
                        ]
                    }, 
                    "Ti": {
+                       "Isotopes": [
+                           [
+                               45.95262772, 
+                               0.0825
+                           ], 
+                           [
+                               46.95175879, 
+                               0.0744
+                           ], 
+                           [
+                               47.94794198, 
+                               0.7372
+                           ], 
+                           [
+                               48.94786568, 
+                               0.0541
+                           ], 
+                           [
+                               49.94478689, 
+                               0.0518
+                           ]
+                       ], 
                        "Electronegativity": 1.54, 
                        "Group": 4, 
                        "Melting Point": 1941.0, 
@@ -441,6 +698,16 @@ periodic_table = {
                        ]
                    }, 
                    "V": {
+                       "Isotopes": [
+                           [
+                               49.94715601, 
+                               0.0025
+                           ], 
+                           [
+                               50.94395704, 
+                               0.9975
+                           ]
+                       ], 
                        "Electronegativity": 1.63, 
                        "Group": 5, 
                        "Melting Point": 2183.0, 
@@ -462,6 +729,24 @@ periodic_table = {
                        ]
                    }, 
                    "Cr": {
+                       "Isotopes": [
+                           [
+                               49.94604183, 
+                               0.04345
+                           ], 
+                           [
+                               51.94050623, 
+                               0.83789
+                           ], 
+                           [
+                               52.94064815, 
+                               0.09501
+                           ], 
+                           [
+                               53.93887916, 
+                               0.02365
+                           ]
+                       ], 
                        "Electronegativity": 1.66, 
                        "Group": 6, 
                        "Melting Point": 2180.0, 
@@ -485,6 +770,12 @@ periodic_table = {
                        ]
                    }, 
                    "Mn": {
+                       "Isotopes": [
+                           [
+                               54.93804391, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.55, 
                        "Group": 7, 
                        "Melting Point": 1519.0, 
@@ -510,6 +801,24 @@ periodic_table = {
                        ]
                    }, 
                    "Fe": {
+                       "Isotopes": [
+                           [
+                               53.93960899, 
+                               0.05845
+                           ], 
+                           [
+                               55.93493633, 
+                               0.91754
+                           ], 
+                           [
+                               56.93539284, 
+                               0.02119
+                           ], 
+                           [
+                               57.93327443, 
+                               0.00282
+                           ]
+                       ], 
                        "Electronegativity": 1.83, 
                        "Group": 8, 
                        "Melting Point": 1811.0, 
@@ -533,6 +842,12 @@ periodic_table = {
                        ]
                    }, 
                    "Co": {
+                       "Isotopes": [
+                           [
+                               58.93319429, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.88, 
                        "Group": 9, 
                        "Melting Point": 1768.0, 
@@ -554,6 +869,28 @@ periodic_table = {
                        ]
                    }, 
                    "Ni": {
+                       "Isotopes": [
+                           [
+                               57.93534241, 
+                               0.68077
+                           ], 
+                           [
+                               59.93078588, 
+                               0.26223
+                           ], 
+                           [
+                               60.93105557, 
+                               0.011399
+                           ], 
+                           [
+                               61.92834537, 
+                               0.036346
+                           ], 
+                           [
+                               63.92796682, 
+                               0.009255
+                           ]
+                       ], 
                        "Electronegativity": 1.91, 
                        "Group": 10, 
                        "Melting Point": 1728.0, 
@@ -574,6 +911,16 @@ periodic_table = {
                        ]
                    }, 
                    "Cu": {
+                       "Isotopes": [
+                           [
+                               62.92959772, 
+                               0.6915
+                           ], 
+                           [
+                               64.9277897, 
+                               0.3085
+                           ]
+                       ], 
                        "Electronegativity": 1.9, 
                        "Group": 11, 
                        "Melting Point": 1357.77, 
@@ -593,6 +940,28 @@ periodic_table = {
                        ]
                    }, 
                    "Zn": {
+                       "Isotopes": [
+                           [
+                               63.92914201, 
+                               0.4917
+                           ], 
+                           [
+                               65.92603381, 
+                               0.2773
+                           ], 
+                           [
+                               66.92712775, 
+                               0.0404
+                           ], 
+                           [
+                               67.92484455, 
+                               0.1845
+                           ], 
+                           [
+                               69.9253192, 
+                               0.0061
+                           ]
+                       ], 
                        "Electronegativity": 1.65, 
                        "Group": 12, 
                        "Melting Point": 692.88, 
@@ -610,6 +979,16 @@ periodic_table = {
                        ]
                    }, 
                    "Ga": {
+                       "Isotopes": [
+                           [
+                               68.9255735, 
+                               0.60108
+                           ], 
+                           [
+                               70.92470258, 
+                               0.39892
+                           ]
+                       ], 
                        "Electronegativity": 1.81, 
                        "Group": 13, 
                        "Melting Point": 302.9146, 
@@ -628,6 +1007,28 @@ periodic_table = {
                        ]
                    }, 
                    "Ge": {
+                       "Isotopes": [
+                           [
+                               69.92424875, 
+                               0.2057
+                           ], 
+                           [
+                               71.922075826, 
+                               0.2745
+                           ], 
+                           [
+                               72.923458956, 
+                               0.0775
+                           ], 
+                           [
+                               73.921177761, 
+                               0.365
+                           ], 
+                           [
+                               75.921402726, 
+                               0.0773
+                           ]
+                       ], 
                        "Electronegativity": 2.01, 
                        "Group": 14, 
                        "Melting Point": 1211.4, 
@@ -651,6 +1052,12 @@ periodic_table = {
                        ]
                    }, 
                    "As": {
+                       "Isotopes": [
+                           [
+                               74.92159457, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.18, 
                        "Group": 15, 
                        "Melting Point": 1090.0, 
@@ -671,6 +1078,32 @@ periodic_table = {
                        ]
                    }, 
                    "Se": {
+                       "Isotopes": [
+                           [
+                               73.922475934, 
+                               0.0089
+                           ], 
+                           [
+                               75.919213704, 
+                               0.0937
+                           ], 
+                           [
+                               76.919914154, 
+                               0.0763
+                           ], 
+                           [
+                               77.91730928, 
+                               0.2377
+                           ], 
+                           [
+                               79.9165218, 
+                               0.4961
+                           ], 
+                           [
+                               81.9166995, 
+                               0.0873
+                           ]
+                       ], 
                        "Electronegativity": 2.55, 
                        "Group": 16, 
                        "Melting Point": 453.0, 
@@ -691,6 +1124,16 @@ periodic_table = {
                        ]
                    }, 
                    "Br": {
+                       "Isotopes": [
+                           [
+                               78.9183376, 
+                               0.5069
+                           ], 
+                           [
+                               80.9162897, 
+                               0.4931
+                           ]
+                       ], 
                        "Electronegativity": 2.96, 
                        "Group": 17, 
                        "Melting Point": 265.8, 
@@ -713,6 +1156,32 @@ periodic_table = {
                        ]
                    }, 
                    "Kr": {
+                       "Isotopes": [
+                           [
+                               77.92036494, 
+                               0.00355
+                           ], 
+                           [
+                               79.91637808, 
+                               0.02286
+                           ], 
+                           [
+                               81.91348273, 
+                               0.11593
+                           ], 
+                           [
+                               82.91412716, 
+                               0.115
+                           ], 
+                           [
+                               83.9114977282, 
+                               0.56987
+                           ], 
+                           [
+                               85.9106106269, 
+                               0.17279
+                           ]
+                       ], 
                        "Electronegativity": 3.0, 
                        "Group": 18, 
                        "Melting Point": 115.79, 
@@ -729,6 +1198,16 @@ periodic_table = {
                        ]
                    }, 
                    "Rb": {
+                       "Isotopes": [
+                           [
+                               84.9117897379, 
+                               0.7217
+                           ], 
+                           [
+                               86.909180531, 
+                               0.2783
+                           ]
+                       ], 
                        "Electronegativity": 0.82, 
                        "Group": 1, 
                        "Melting Point": 312.46, 
@@ -746,6 +1225,24 @@ periodic_table = {
                        ]
                    }, 
                    "Sr": {
+                       "Isotopes": [
+                           [
+                               83.9134191, 
+                               0.0056
+                           ], 
+                           [
+                               85.9092606, 
+                               0.0986
+                           ], 
+                           [
+                               86.9088775, 
+                               0.07
+                           ], 
+                           [
+                               87.9056125, 
+                               0.8258
+                           ]
+                       ], 
                        "Electronegativity": 0.95, 
                        "Group": 2, 
                        "Melting Point": 1050.0, 
@@ -763,6 +1260,12 @@ periodic_table = {
                        ]
                    }, 
                    "Y": {
+                       "Isotopes": [
+                           [
+                               88.9058403, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.22, 
                        "Group": 3, 
                        "Melting Point": 1799.0, 
@@ -781,6 +1284,28 @@ periodic_table = {
                        ]
                    }, 
                    "Zr": {
+                       "Isotopes": [
+                           [
+                               89.9046977, 
+                               0.5145
+                           ], 
+                           [
+                               90.9056396, 
+                               0.1122
+                           ], 
+                           [
+                               91.9050347, 
+                               0.1715
+                           ], 
+                           [
+                               93.9063108, 
+                               0.1738
+                           ], 
+                           [
+                               95.9082714, 
+                               0.028
+                           ]
+                       ], 
                        "Electronegativity": 1.33, 
                        "Group": 4, 
                        "Melting Point": 2128.0, 
@@ -800,6 +1325,12 @@ periodic_table = {
                        ]
                    }, 
                    "Nb": {
+                       "Isotopes": [
+                           [
+                               92.906373, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.6, 
                        "Group": 5, 
                        "Melting Point": 2750.0, 
@@ -821,6 +1352,36 @@ periodic_table = {
                        ]
                    }, 
                    "Mo": {
+                       "Isotopes": [
+                           [
+                               91.90680796, 
+                               0.1453
+                           ], 
+                           [
+                               93.9050849, 
+                               0.0915
+                           ], 
+                           [
+                               94.90583877, 
+                               0.1584
+                           ], 
+                           [
+                               95.90467612, 
+                               0.1667
+                           ], 
+                           [
+                               96.90601812, 
+                               0.096
+                           ], 
+                           [
+                               97.90540482, 
+                               0.2439
+                           ], 
+                           [
+                               99.9074718, 
+                               0.0982
+                           ]
+                       ], 
                        "Electronegativity": 2.16, 
                        "Group": 6, 
                        "Melting Point": 2896.0, 
@@ -844,6 +1405,7 @@ periodic_table = {
                        ]
                    }, 
                    "Tc": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.9, 
                        "Group": 7, 
                        "Melting Point": 2430.0, 
@@ -868,6 +1430,36 @@ periodic_table = {
                        ]
                    }, 
                    "Ru": {
+                       "Isotopes": [
+                           [
+                               95.90759025, 
+                               0.0554
+                           ], 
+                           [
+                               97.9052868, 
+                               0.0187
+                           ], 
+                           [
+                               98.9059341, 
+                               0.1276
+                           ], 
+                           [
+                               99.9042143, 
+                               0.126
+                           ], 
+                           [
+                               100.9055769, 
+                               0.1706
+                           ], 
+                           [
+                               101.9043441, 
+                               0.3155
+                           ], 
+                           [
+                               103.9054275, 
+                               0.1862
+                           ]
+                       ], 
                        "Electronegativity": 2.2, 
                        "Group": 8, 
                        "Melting Point": 2607.0, 
@@ -892,6 +1484,12 @@ periodic_table = {
                        ]
                    }, 
                    "Rh": {
+                       "Isotopes": [
+                           [
+                               102.905498, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.28, 
                        "Group": 9, 
                        "Melting Point": 2237.0, 
@@ -914,6 +1512,32 @@ periodic_table = {
                        ]
                    }, 
                    "Pd": {
+                       "Isotopes": [
+                           [
+                               101.9056022, 
+                               0.0102
+                           ], 
+                           [
+                               103.9040305, 
+                               0.1114
+                           ], 
+                           [
+                               104.9050796, 
+                               0.2233
+                           ], 
+                           [
+                               105.9034804, 
+                               0.2733
+                           ], 
+                           [
+                               107.9038916, 
+                               0.2646
+                           ], 
+                           [
+                               109.9051722, 
+                               0.1172
+                           ]
+                       ], 
                        "Electronegativity": 2.2, 
                        "Group": 10, 
                        "Melting Point": 1828.05, 
@@ -933,6 +1557,16 @@ periodic_table = {
                        ]
                    }, 
                    "Ag": {
+                       "Isotopes": [
+                           [
+                               106.9050916, 
+                               0.51839
+                           ], 
+                           [
+                               108.9047553, 
+                               0.48161
+                           ]
+                       ], 
                        "Electronegativity": 1.93, 
                        "Group": 11, 
                        "Melting Point": 1234.93, 
@@ -952,6 +1586,40 @@ periodic_table = {
                        ]
                    }, 
                    "Cd": {
+                       "Isotopes": [
+                           [
+                               105.9064599, 
+                               0.0125
+                           ], 
+                           [
+                               107.9041834, 
+                               0.0089
+                           ], 
+                           [
+                               109.90300661, 
+                               0.1249
+                           ], 
+                           [
+                               110.90418287, 
+                               0.128
+                           ], 
+                           [
+                               111.90276287, 
+                               0.2413
+                           ], 
+                           [
+                               112.90440813, 
+                               0.1222
+                           ], 
+                           [
+                               113.90336509, 
+                               0.2873
+                           ], 
+                           [
+                               115.90476315, 
+                               0.0749
+                           ]
+                       ], 
                        "Electronegativity": 1.69, 
                        "Group": 12, 
                        "Melting Point": 594.22, 
@@ -969,6 +1637,16 @@ periodic_table = {
                        ]
                    }, 
                    "In": {
+                       "Isotopes": [
+                           [
+                               112.90406184, 
+                               0.0429
+                           ], 
+                           [
+                               114.903878776, 
+                               0.9571
+                           ]
+                       ], 
                        "Electronegativity": 1.78, 
                        "Group": 13, 
                        "Melting Point": 429.75, 
@@ -987,6 +1665,48 @@ periodic_table = {
                        ]
                    }, 
                    "Sn": {
+                       "Isotopes": [
+                           [
+                               111.90482387, 
+                               0.0097
+                           ], 
+                           [
+                               113.9027827, 
+                               0.0066
+                           ], 
+                           [
+                               114.903344699, 
+                               0.0034
+                           ], 
+                           [
+                               115.9017428, 
+                               0.1454
+                           ], 
+                           [
+                               116.90295398, 
+                               0.0768
+                           ], 
+                           [
+                               117.90160657, 
+                               0.2422
+                           ], 
+                           [
+                               118.90331117, 
+                               0.0859
+                           ], 
+                           [
+                               119.90220163, 
+                               0.3258
+                           ], 
+                           [
+                               121.9034438, 
+                               0.0463
+                           ], 
+                           [
+                               123.9052766, 
+                               0.0579
+                           ]
+                       ], 
                        "Electronegativity": 1.96, 
                        "Group": 14, 
                        "Melting Point": 505.08, 
@@ -1005,6 +1725,16 @@ periodic_table = {
                        ]
                    }, 
                    "Sb": {
+                       "Isotopes": [
+                           [
+                               120.903812, 
+                               0.5721
+                           ], 
+                           [
+                               122.9042132, 
+                               0.4279
+                           ]
+                       ], 
                        "Electronegativity": 2.05, 
                        "Group": 15, 
                        "Melting Point": 903.78, 
@@ -1023,6 +1753,40 @@ periodic_table = {
                        ]
                    }, 
                    "Te": {
+                       "Isotopes": [
+                           [
+                               119.9040593, 
+                               0.0009
+                           ], 
+                           [
+                               121.9030435, 
+                               0.0255
+                           ], 
+                           [
+                               122.9042698, 
+                               0.0089
+                           ], 
+                           [
+                               123.9028171, 
+                               0.0474
+                           ], 
+                           [
+                               124.9044299, 
+                               0.0707
+                           ], 
+                           [
+                               125.9033109, 
+                               0.1884
+                           ], 
+                           [
+                               127.90446128, 
+                               0.3174
+                           ], 
+                           [
+                               129.906222748, 
+                               0.3408
+                           ]
+                       ], 
                        "Electronegativity": 2.1, 
                        "Group": 16, 
                        "Melting Point": 722.66, 
@@ -1043,6 +1807,12 @@ periodic_table = {
                        ]
                    }, 
                    "I": {
+                       "Isotopes": [
+                           [
+                               126.9044719, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.66, 
                        "Group": 17, 
                        "Melting Point": 386.85, 
@@ -1064,6 +1834,44 @@ periodic_table = {
                        ]
                    }, 
                    "Xe": {
+                       "Isotopes": [
+                           [
+                               123.905892, 
+                               0.000952
+                           ], 
+                           [
+                               125.9042983, 
+                               0.00089
+                           ], 
+                           [
+                               127.903531, 
+                               0.019102
+                           ], 
+                           [
+                               128.9047808611, 
+                               0.264006
+                           ], 
+                           [
+                               129.903509349, 
+                               0.04071
+                           ], 
+                           [
+                               130.90508406, 
+                               0.212324
+                           ], 
+                           [
+                               131.9041550856, 
+                               0.269086
+                           ], 
+                           [
+                               133.90539466, 
+                               0.104357
+                           ], 
+                           [
+                               135.907214484, 
+                               0.088573
+                           ]
+                       ], 
                        "Electronegativity": 2.6, 
                        "Group": 18, 
                        "Melting Point": 161.4, 
@@ -1084,6 +1892,12 @@ periodic_table = {
                        ]
                    }, 
                    "Cs": {
+                       "Isotopes": [
+                           [
+                               132.905451961, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 0.79, 
                        "Group": 1, 
                        "Melting Point": 301.59, 
@@ -1101,6 +1915,36 @@ periodic_table = {
                        ]
                    }, 
                    "Ba": {
+                       "Isotopes": [
+                           [
+                               129.9063207, 
+                               0.00106
+                           ], 
+                           [
+                               131.9050611, 
+                               0.00101
+                           ], 
+                           [
+                               133.90450818, 
+                               0.02417
+                           ], 
+                           [
+                               134.90568838, 
+                               0.06592
+                           ], 
+                           [
+                               135.90457573, 
+                               0.07854
+                           ], 
+                           [
+                               136.90582714, 
+                               0.11232
+                           ], 
+                           [
+                               137.905247, 
+                               0.71698
+                           ]
+                       ], 
                        "Electronegativity": 0.89, 
                        "Group": 2, 
                        "Melting Point": 1000.0, 
@@ -1117,6 +1961,16 @@ periodic_table = {
                        ]
                    }, 
                    "La": {
+                       "Isotopes": [
+                           [
+                               137.9071149, 
+                               0.0008881
+                           ], 
+                           [
+                               138.9063563, 
+                               0.9991119
+                           ]
+                       ], 
                        "Electronegativity": 1.1, 
                        "Group": 0, 
                        "Melting Point": 1193.0, 
@@ -1134,6 +1988,24 @@ periodic_table = {
                        ]
                    }, 
                    "Ce": {
+                       "Isotopes": [
+                           [
+                               135.90712921, 
+                               0.00185
+                           ], 
+                           [
+                               137.905991, 
+                               0.00251
+                           ], 
+                           [
+                               139.9054431, 
+                               0.8845
+                           ], 
+                           [
+                               141.9092504, 
+                               0.11114
+                           ]
+                       ], 
                        "Electronegativity": 1.12, 
                        "Group": 0, 
                        "Melting Point": 1068.0, 
@@ -1152,6 +2024,12 @@ periodic_table = {
                        ]
                    }, 
                    "Pr": {
+                       "Isotopes": [
+                           [
+                               140.9076576, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.13, 
                        "Group": 0, 
                        "Melting Point": 1208.0, 
@@ -1170,6 +2048,36 @@ periodic_table = {
                        ]
                    }, 
                    "Nd": {
+                       "Isotopes": [
+                           [
+                               141.907729, 
+                               0.27152
+                           ], 
+                           [
+                               142.90982, 
+                               0.12174
+                           ], 
+                           [
+                               143.910093, 
+                               0.23798
+                           ], 
+                           [
+                               144.9125793, 
+                               0.08293
+                           ], 
+                           [
+                               145.9131226, 
+                               0.17189
+                           ], 
+                           [
+                               147.9168993, 
+                               0.05756
+                           ], 
+                           [
+                               149.9209022, 
+                               0.05638
+                           ]
+                       ], 
                        "Electronegativity": 1.14, 
                        "Group": 0, 
                        "Melting Point": 1297.0, 
@@ -1188,6 +2096,7 @@ periodic_table = {
                        ]
                    }, 
                    "Pm": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.13, 
                        "Group": 0, 
                        "Melting Point": 1315.0, 
@@ -1205,6 +2114,36 @@ periodic_table = {
                        ]
                    }, 
                    "Sm": {
+                       "Isotopes": [
+                           [
+                               143.9120065, 
+                               0.0307
+                           ], 
+                           [
+                               146.9149044, 
+                               0.1499
+                           ], 
+                           [
+                               147.9148292, 
+                               0.1124
+                           ], 
+                           [
+                               148.9171921, 
+                               0.1382
+                           ], 
+                           [
+                               149.9172829, 
+                               0.0738
+                           ], 
+                           [
+                               151.9197397, 
+                               0.2675
+                           ], 
+                           [
+                               153.9222169, 
+                               0.2275
+                           ]
+                       ], 
                        "Electronegativity": 1.17, 
                        "Group": 0, 
                        "Melting Point": 1345.0, 
@@ -1222,6 +2161,16 @@ periodic_table = {
                        ]
                    }, 
                    "Eu": {
+                       "Isotopes": [
+                           [
+                               150.9198578, 
+                               0.4781
+                           ], 
+                           [
+                               152.921238, 
+                               0.5219
+                           ]
+                       ], 
                        "Electronegativity": 1.2, 
                        "Group": 0, 
                        "Melting Point": 1099.0, 
@@ -1239,6 +2188,36 @@ periodic_table = {
                        ]
                    }, 
                    "Gd": {
+                       "Isotopes": [
+                           [
+                               151.9197995, 
+                               0.002
+                           ], 
+                           [
+                               153.9208741, 
+                               0.0218
+                           ], 
+                           [
+                               154.9226305, 
+                               0.148
+                           ], 
+                           [
+                               155.9221312, 
+                               0.2047
+                           ], 
+                           [
+                               156.9239686, 
+                               0.1565
+                           ], 
+                           [
+                               157.9241123, 
+                               0.2484
+                           ], 
+                           [
+                               159.9270624, 
+                               0.2186
+                           ]
+                       ], 
                        "Electronegativity": 1.2, 
                        "Group": 0, 
                        "Melting Point": 1585.0, 
@@ -1257,6 +2236,12 @@ periodic_table = {
                        ]
                    }, 
                    "Tb": {
+                       "Isotopes": [
+                           [
+                               158.9253547, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.2, 
                        "Group": 0, 
                        "Melting Point": 1629.0, 
@@ -1276,6 +2261,36 @@ periodic_table = {
                        ]
                    }, 
                    "Dy": {
+                       "Isotopes": [
+                           [
+                               155.9242847, 
+                               0.00056
+                           ], 
+                           [
+                               157.9244159, 
+                               0.00095
+                           ], 
+                           [
+                               159.9252046, 
+                               0.02329
+                           ], 
+                           [
+                               160.9269405, 
+                               0.18889
+                           ], 
+                           [
+                               161.9268056, 
+                               0.25475
+                           ], 
+                           [
+                               162.9287383, 
+                               0.24896
+                           ], 
+                           [
+                               163.9291819, 
+                               0.2826
+                           ]
+                       ], 
                        "Electronegativity": 1.22, 
                        "Group": 0, 
                        "Melting Point": 1680.0, 
@@ -1294,6 +2309,12 @@ periodic_table = {
                        ]
                    }, 
                    "Ho": {
+                       "Isotopes": [
+                           [
+                               164.9303288, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.23, 
                        "Group": 0, 
                        "Melting Point": 1734.0, 
@@ -1311,6 +2332,32 @@ periodic_table = {
                        ]
                    }, 
                    "Er": {
+                       "Isotopes": [
+                           [
+                               161.9287884, 
+                               0.00139
+                           ], 
+                           [
+                               163.9292088, 
+                               0.01601
+                           ], 
+                           [
+                               165.9302995, 
+                               0.33503
+                           ], 
+                           [
+                               166.9320546, 
+                               0.22869
+                           ], 
+                           [
+                               167.9323767, 
+                               0.26978
+                           ], 
+                           [
+                               169.9354702, 
+                               0.1491
+                           ]
+                       ], 
                        "Electronegativity": 1.24, 
                        "Group": 0, 
                        "Melting Point": 1802.0, 
@@ -1328,6 +2375,12 @@ periodic_table = {
                        ]
                    }, 
                    "Tm": {
+                       "Isotopes": [
+                           [
+                               168.9342179, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.25, 
                        "Group": 0, 
                        "Melting Point": 1818.0, 
@@ -1346,6 +2399,36 @@ periodic_table = {
                        ]
                    }, 
                    "Yb": {
+                       "Isotopes": [
+                           [
+                               167.9338896, 
+                               0.00123
+                           ], 
+                           [
+                               169.9347664, 
+                               0.02982
+                           ], 
+                           [
+                               170.9363302, 
+                               0.1409
+                           ], 
+                           [
+                               171.9363859, 
+                               0.2168
+                           ], 
+                           [
+                               172.9382151, 
+                               0.16103
+                           ], 
+                           [
+                               173.9388664, 
+                               0.32026
+                           ], 
+                           [
+                               175.9425764, 
+                               0.12996
+                           ]
+                       ], 
                        "Electronegativity": 1.1, 
                        "Group": 0, 
                        "Melting Point": 1097.0, 
@@ -1363,6 +2446,16 @@ periodic_table = {
                        ]
                    }, 
                    "Lu": {
+                       "Isotopes": [
+                           [
+                               174.9407752, 
+                               0.97401
+                           ], 
+                           [
+                               175.9426897, 
+                               0.02599
+                           ]
+                       ], 
                        "Electronegativity": 1.27, 
                        "Group": 3, 
                        "Melting Point": 1925.0, 
@@ -1379,6 +2472,32 @@ periodic_table = {
                        ]
                    }, 
                    "Hf": {
+                       "Isotopes": [
+                           [
+                               173.9400461, 
+                               0.0016
+                           ], 
+                           [
+                               175.9414076, 
+                               0.0526
+                           ], 
+                           [
+                               176.9432277, 
+                               0.186
+                           ], 
+                           [
+                               177.9437058, 
+                               0.2728
+                           ], 
+                           [
+                               178.9458232, 
+                               0.1362
+                           ], 
+                           [
+                               179.946557, 
+                               0.3508
+                           ]
+                       ], 
                        "Electronegativity": 1.3, 
                        "Group": 4, 
                        "Melting Point": 2506.0, 
@@ -1397,6 +2516,16 @@ periodic_table = {
                        ]
                    }, 
                    "Ta": {
+                       "Isotopes": [
+                           [
+                               179.9474648, 
+                               0.0001201
+                           ], 
+                           [
+                               180.9479958, 
+                               0.9998799
+                           ]
+                       ], 
                        "Electronegativity": 1.5, 
                        "Group": 5, 
                        "Melting Point": 3290.0, 
@@ -1417,6 +2546,28 @@ periodic_table = {
                        ]
                    }, 
                    "W": {
+                       "Isotopes": [
+                           [
+                               179.9467108, 
+                               0.0012
+                           ], 
+                           [
+                               181.94820394, 
+                               0.265
+                           ], 
+                           [
+                               182.95022275, 
+                               0.1431
+                           ], 
+                           [
+                               183.95093092, 
+                               0.3064
+                           ], 
+                           [
+                               185.9543628, 
+                               0.2843
+                           ]
+                       ], 
                        "Electronegativity": 2.36, 
                        "Group": 6, 
                        "Melting Point": 3695.0, 
@@ -1440,6 +2591,16 @@ periodic_table = {
                        ]
                    }, 
                    "Re": {
+                       "Isotopes": [
+                           [
+                               184.9529545, 
+                               0.374
+                           ], 
+                           [
+                               186.9557501, 
+                               0.626
+                           ]
+                       ], 
                        "Electronegativity": 1.9, 
                        "Group": 7, 
                        "Melting Point": 3459.0, 
@@ -1464,6 +2625,36 @@ periodic_table = {
                        ]
                    }, 
                    "Os": {
+                       "Isotopes": [
+                           [
+                               183.9524885, 
+                               0.0002
+                           ], 
+                           [
+                               185.953835, 
+                               0.0159
+                           ], 
+                           [
+                               186.9557474, 
+                               0.0196
+                           ], 
+                           [
+                               187.9558352, 
+                               0.1324
+                           ], 
+                           [
+                               188.9581442, 
+                               0.1615
+                           ], 
+                           [
+                               189.9584437, 
+                               0.2626
+                           ], 
+                           [
+                               191.961477, 
+                               0.4078
+                           ]
+                       ], 
                        "Electronegativity": 2.2, 
                        "Group": 8, 
                        "Melting Point": 3306.0, 
@@ -1489,6 +2680,16 @@ periodic_table = {
                        ]
                    }, 
                    "Ir": {
+                       "Isotopes": [
+                           [
+                               190.9605893, 
+                               0.373
+                           ], 
+                           [
+                               192.9629216, 
+                               0.627
+                           ]
+                       ], 
                        "Electronegativity": 2.2, 
                        "Group": 9, 
                        "Melting Point": 2719.0, 
@@ -1514,6 +2715,32 @@ periodic_table = {
                        ]
                    }, 
                    "Pt": {
+                       "Isotopes": [
+                           [
+                               189.9599297, 
+                               0.00012
+                           ], 
+                           [
+                               191.9610387, 
+                               0.00782
+                           ], 
+                           [
+                               193.9626809, 
+                               0.3286
+                           ], 
+                           [
+                               194.9647917, 
+                               0.3378
+                           ], 
+                           [
+                               195.96495209, 
+                               0.2521
+                           ], 
+                           [
+                               197.9678949, 
+                               0.07356
+                           ]
+                       ], 
                        "Electronegativity": 2.28, 
                        "Group": 10, 
                        "Melting Point": 2041.4, 
@@ -1537,6 +2764,12 @@ periodic_table = {
                        ]
                    }, 
                    "Au": {
+                       "Isotopes": [
+                           [
+                               196.96656879, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.54, 
                        "Group": 11, 
                        "Melting Point": 1337.33, 
@@ -1557,6 +2790,36 @@ periodic_table = {
                        ]
                    }, 
                    "Hg": {
+                       "Isotopes": [
+                           [
+                               195.965833, 
+                               0.0015
+                           ], 
+                           [
+                               197.9667686, 
+                               0.0997
+                           ], 
+                           [
+                               198.96828064, 
+                               0.1687
+                           ], 
+                           [
+                               199.96832659, 
+                               0.231
+                           ], 
+                           [
+                               200.97030284, 
+                               0.1318
+                           ], 
+                           [
+                               201.9706434, 
+                               0.2986
+                           ], 
+                           [
+                               203.97349398, 
+                               0.0687
+                           ]
+                       ], 
                        "Electronegativity": 2.0, 
                        "Group": 12, 
                        "Melting Point": 234.43, 
@@ -1575,6 +2838,16 @@ periodic_table = {
                        ]
                    }, 
                    "Tl": {
+                       "Isotopes": [
+                           [
+                               202.9723446, 
+                               0.2952
+                           ], 
+                           [
+                               204.9744278, 
+                               0.7048
+                           ]
+                       ], 
                        "Electronegativity": 1.62, 
                        "Group": 13, 
                        "Melting Point": 577.0, 
@@ -1593,6 +2866,24 @@ periodic_table = {
                        ]
                    }, 
                    "Pb": {
+                       "Isotopes": [
+                           [
+                               203.973044, 
+                               0.014
+                           ], 
+                           [
+                               205.9744657, 
+                               0.241
+                           ], 
+                           [
+                               206.9758973, 
+                               0.221
+                           ], 
+                           [
+                               207.9766525, 
+                               0.524
+                           ]
+                       ], 
                        "Electronegativity": 1.87, 
                        "Group": 14, 
                        "Melting Point": 600.61, 
@@ -1611,6 +2902,12 @@ periodic_table = {
                        ]
                    }, 
                    "Bi": {
+                       "Isotopes": [
+                           [
+                               208.9803991, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 2.02, 
                        "Group": 15, 
                        "Melting Point": 544.7, 
@@ -1630,6 +2927,7 @@ periodic_table = {
                        ]
                    }, 
                    "Po": {
+                       "Isotopes": None, 
                        "Electronegativity": 2.0, 
                        "Group": 16, 
                        "Melting Point": 527.0, 
@@ -1650,6 +2948,7 @@ periodic_table = {
                        ]
                    }, 
                    "At": {
+                       "Isotopes": None, 
                        "Electronegativity": 2.2, 
                        "Group": 17, 
                        "Melting Point": 575.0, 
@@ -1670,6 +2969,7 @@ periodic_table = {
                        ]
                    }, 
                    "Rn": {
+                       "Isotopes": None, 
                        "Electronegativity": 2.2, 
                        "Group": 18, 
                        "Melting Point": 202.0, 
@@ -1687,6 +2987,7 @@ periodic_table = {
                        ]
                    }, 
                    "Fr": {
+                       "Isotopes": None, 
                        "Electronegativity": 0.7, 
                        "Group": 1, 
                        "Melting Point": 300.0, 
@@ -1703,6 +3004,7 @@ periodic_table = {
                        ]
                    }, 
                    "Ra": {
+                       "Isotopes": None, 
                        "Electronegativity": 0.9, 
                        "Group": 2, 
                        "Melting Point": 973.0, 
@@ -1719,6 +3021,7 @@ periodic_table = {
                        ]
                    }, 
                    "Ac": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.1, 
                        "Group": 0, 
                        "Melting Point": 1323.0, 
@@ -1736,6 +3039,12 @@ periodic_table = {
                        ]
                    }, 
                    "Th": {
+                       "Isotopes": [
+                           [
+                               232.0380558, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 2115.0, 
@@ -1754,6 +3063,12 @@ periodic_table = {
                        ]
                    }, 
                    "Pa": {
+                       "Isotopes": [
+                           [
+                               231.0358842, 
+                               1.0
+                           ]
+                       ], 
                        "Electronegativity": 1.5, 
                        "Group": 0, 
                        "Melting Point": 1841.0, 
@@ -1773,6 +3088,20 @@ periodic_table = {
                        ]
                    }, 
                    "U": {
+                       "Isotopes": [
+                           [
+                               234.0409523, 
+                               5.4e-05
+                           ], 
+                           [
+                               235.0439301, 
+                               0.007204
+                           ], 
+                           [
+                               238.0507884, 
+                               0.992742
+                           ]
+                       ], 
                        "Electronegativity": 1.38, 
                        "Group": 0, 
                        "Melting Point": 1405.3, 
@@ -1793,6 +3122,7 @@ periodic_table = {
                        ]
                    }, 
                    "Np": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.36, 
                        "Group": 0, 
                        "Melting Point": 917.0, 
@@ -1813,6 +3143,7 @@ periodic_table = {
                        ]
                    }, 
                    "Pu": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.28, 
                        "Group": 0, 
                        "Melting Point": 912.5, 
@@ -1834,6 +3165,7 @@ periodic_table = {
                        ]
                    }, 
                    "Am": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.13, 
                        "Group": 0, 
                        "Melting Point": 1449.0, 
@@ -1855,6 +3187,7 @@ periodic_table = {
                        ]
                    }, 
                    "Cm": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.28, 
                        "Group": 0, 
                        "Melting Point": 1613.0, 
@@ -1875,6 +3208,7 @@ periodic_table = {
                        ]
                    }, 
                    "Bk": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1259.0, 
@@ -1893,6 +3227,7 @@ periodic_table = {
                        ]
                    }, 
                    "Cf": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1173.0, 
@@ -1911,6 +3246,7 @@ periodic_table = {
                        ]
                    }, 
                    "Es": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1133.0, 
@@ -1929,6 +3265,7 @@ periodic_table = {
                        ]
                    }, 
                    "Fm": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1125.0, 
@@ -1946,6 +3283,7 @@ periodic_table = {
                        ]
                    }, 
                    "Md": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1100.0, 
@@ -1963,6 +3301,7 @@ periodic_table = {
                        ]
                    }, 
                    "No": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 0, 
                        "Melting Point": 1100.0, 
@@ -1980,6 +3319,7 @@ periodic_table = {
                        ]
                    }, 
                    "Lr": {
+                       "Isotopes": None, 
                        "Electronegativity": 1.3, 
                        "Group": 3, 
                        "Melting Point": 1900.0, 
@@ -1996,6 +3336,7 @@ periodic_table = {
                        ]
                    }, 
                    "Rf": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 4, 
                        "Melting Point": 2400.0, 
@@ -2012,6 +3353,7 @@ periodic_table = {
                        ]
                    }, 
                    "Db": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 5, 
                        "Melting Point": None, 
@@ -2028,6 +3370,7 @@ periodic_table = {
                        ]
                    }, 
                    "Sg": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 6, 
                        "Melting Point": None, 
@@ -2044,6 +3387,7 @@ periodic_table = {
                        ]
                    }, 
                    "Bh": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 7, 
                        "Melting Point": None, 
@@ -2060,6 +3404,7 @@ periodic_table = {
                        ]
                    }, 
                    "Hs": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 8, 
                        "Melting Point": None, 
@@ -2076,6 +3421,7 @@ periodic_table = {
                        ]
                    }, 
                    "Mt": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 9, 
                        "Melting Point": None, 
@@ -2092,6 +3438,7 @@ periodic_table = {
                        ]
                    }, 
                    "Ds": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 10, 
                        "Melting Point": None, 
@@ -2106,6 +3453,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Rg": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 11, 
                        "Melting Point": None, 
@@ -2120,6 +3468,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Cn": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 12, 
                        "Melting Point": None, 
@@ -2134,6 +3483,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Uut": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 13, 
                        "Melting Point": 700.0, 
@@ -2148,6 +3498,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Fl": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 14, 
                        "Melting Point": 340.0, 
@@ -2162,6 +3513,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Uup": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 15, 
                        "Melting Point": 700.0, 
@@ -2176,6 +3528,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Lv": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 16, 
                        "Melting Point": 708.5, 
@@ -2190,6 +3543,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Uus": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 17, 
                        "Melting Point": 673.0, 
@@ -2204,6 +3558,7 @@ periodic_table = {
                        "Oxidation Number(s)": None
                    }, 
                    "Uuo": {
+                       "Isotopes": None, 
                        "Electronegativity": None, 
                        "Group": 18, 
                        "Melting Point": 258.0, 
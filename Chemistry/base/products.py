@@ -136,19 +136,25 @@ class EquilibriumProducts(object):
         Tuple of the reactants.
     products : Products
         Products object.
+    ratio : float, optional
+        How much of the products there is at equilibrium, relative to a value
+        of `1` for the reactants.  None if it isn't known.
 
     Attributes
     ----------
     products
     reactants
+    ratio : float
+        As above.
     """
 
     _reactants = None
     _products = None
 
-    def __init__(self, reactants, products):
+    def __init__(self, reactants, products, ratio=None):
         self.reactants = reactants
         self.products = products
+        self.ratio = ratio
 
     @property
     def products(self):
@@ -11,10 +11,10 @@ reaction.
 __author__ = "Dan Obermiller"
 
 
-from copy import deepcopy
-
+from Chemistry import profiling
 from Chemistry.base.components import Atom
 from Chemistry.base.compounds import _CompoundWrapper
+from Chemistry.base.symmetry import representatives
 
 
 class Reactant(_CompoundWrapper):
@@ -52,10 +52,10 @@ class Reactant(_CompoundWrapper):
         """
 
         if atom:
-            max_key = max(compound.atoms)
+            max_key = max(compound.atoms, key=lambda key: int(key[1:]))
             letter = 'a'
         else:
-            max_key = max(compound.bonds)
+            max_key = max(compound.bonds, key=lambda key: int(key[1:]))
             letter = 'b'
         number = int(max_key[1:])+1
         return "{}{}".format(letter, number)
@@ -99,12 +99,44 @@ class Acid(Reactant):
         The key of the 'acidic point' of the molecule, or the most acidic H+.
     pka : float
         The pKa of the aforementioned most acidic H+.
+    degeneracy : int, optional
+        How many equivalent acidic points the molecule has, of which
+        `acidic_point` is one.  Defaults to 1.
     """
 
-    def __init__(self, compound, acidic_point, pka):
+    def __init__(self, compound, acidic_point, pka, degeneracy=1):
         super(Acid, self).__init__(compound)
         self.acidic_point = acidic_point
         self.pka = pka
+        self.degeneracy = degeneracy
+
+    @classmethod
+    def sites(cls, compound, pka, points=None):
+        """An acid for each set of equivalent acidic points of a molecule.
+
+        Parameters
+        ----------
+        compound : Compound
+            The molecule being treated as an acid.
+        pka : float
+            The pKa of the acidic points.
+        points : iterable, optional
+            The acidic points to choose from.  Defaults to every hydrogen.
+
+        Returns
+        -------
+        list
+            An Acid for one point of each symmetry class (see
+            `Compound.symmetry_classes`), whose `degeneracy` is how many of
+            the points are in that class.  Reacting each of them once covers
+            every point.
+        """
+
+        if points is None:
+            points = sorted(key for key, atom in compound.atoms.iteritems()
+                            if atom.symbol == 'H')
+        return [cls(compound, point, pka, count) for point, count
+                in representatives(compound.symmetry_classes, points)]
 
     def to_conjugate_base(self):
         """Transforms the current acid into its conjugate base."""
@@ -124,13 +156,46 @@ class Base(Reactant):
         most accepting of H+.
     pka : float
         The pKa of the conjugate acid.
+    degeneracy : int, optional
+        How many equivalent basic points the molecule has, of which
+        `basic_point` is one.  Defaults to 1.
     """
 
-    def __init__(self, compound, basic_point, pka):
+    def __init__(self, compound, basic_point, pka, degeneracy=1):
         super(Base, self).__init__(compound)
         self.basic_point = basic_point
         self.pka = pka
+        self.degeneracy = degeneracy
+
+    @classmethod
+    def sites(cls, compound, pka, points=None):
+        """A base for each set of equivalent basic points of a molecule.
+
+        Parameters
+        ----------
+        compound : Compound
+            The molecule being treated as a base.
+        pka : float
+            The pKa of the conjugate acid.
+        points : iterable, optional
+            The basic points to choose from.  Defaults to every atom other
+            than carbon and hydrogen.
+
+        Returns
+        -------
+        list
+            A Base for one point of each symmetry class (see
+            `Compound.symmetry_classes`), whose `degeneracy` is how many of
+            the points are in that class.
+        """
+
+        if points is None:
+            points = sorted(key for key, atom in compound.atoms.iteritems()
+                            if atom.symbol not in ('C', 'H'))
+        return [cls(compound, point, pka, count) for point, count
+                in representatives(compound.symmetry_classes, points)]
 
+    @profiling.timed('base.to_conjugate_acid')
     def to_conjugate_acid(self):
         """Transforms the current base into its conjugate acid.  Is side-effect
         free; all changes happen on a copy of this base.
@@ -140,7 +205,8 @@ class Base(Reactant):
         Acid
             The conjugate acid of the base."""
 
-        conjugate = deepcopy(self.compound)
+        with profiling.timer('thaw'):
+            conjugate = self.compound.thaw()
         a_key = Reactant._new_key(conjugate)
         b_key = Reactant._new_key(conjugate, False)
         hydrogen = Atom('H')
@@ -0,0 +1,287 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Ring perception: the smallest set of smallest rings (SSSR) of a molecule.
+
+A molecule with m bonds, n atoms and c separate pieces has m - n + c
+independent rings, and the SSSR is a set of that many rings, as small as
+possible, from which every other ring can be built.  It is found in three
+steps:
+
+1. A depth-first search finds the bridges (the bonds that aren't in any ring).
+2. For every other bond, a breadth-first search finds the shortest way around
+   it, which is the smallest ring it is in.  The search stops as soon as it
+   gets back, so in a fused system of small rings it only ever looks at a few
+   atoms, and the whole step is linear in the size of the molecule.
+3. Those rings are taken from smallest to largest, skipping any that can be
+   built from the ones already taken (Gaussian elimination over GF(2), with
+   each ring's bonds as the bits of an integer).
+
+The rings from step 2 are enough for nearly every molecule.  For the few where
+they aren't (cage compounds, where a bond's smallest ring can also be built
+from others), step 3 is run again on Horton's larger set of candidates: the
+shortest paths from every atom to both ends of every bond.  Those are found
+by searches that only go a few bonds out (far enough for rings as large as
+the ones from step 2), going further only if that isn't enough, so the cost
+stays linear for fused systems of small rings.
+
+`Compound.rings` runs this once and keeps the result until the compound is
+edited.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+
+
+def _bridges(atoms, neighbours):
+    """Finds the bonds that aren't in any ring (Tarjan's bridge finding).
+
+    Returns
+    -------
+    tuple
+        The set of bridges, and the number of separate pieces.
+    """
+
+    index, low = {}, {}
+    bridges = set()
+    pieces = 0
+    for root in atoms:
+        if root in index:
+            continue
+        pieces += 1
+        index[root] = low[root] = len(index)
+        # (atom, the bond it was reached by, its remaining neighbours)
+        stack = [(root, None, iter(neighbours[root]))]
+        while stack:
+            atom, via, remaining = stack[-1]
+            for neighbour, bond in remaining:
+                if bond == via:
+                    continue
+                if neighbour not in index:
+                    index[neighbour] = low[neighbour] = len(index)
+                    stack.append((neighbour, bond, iter(neighbours[neighbour])))
+                    break
+                low[atom] = min(low[atom], index[neighbour])
+            else:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[atom])
+                    if low[atom] > index[parent]:
+                        bridges.add(via)
+    return bridges, pieces
+
+
+def _shortest_ring(start, end, bond, neighbours):
+    """The smallest ring through `bond`, which joins `start` and `end`.
+
+    Returns
+    -------
+    tuple
+        The ring's atoms (in order, from `start` to `end`) and bonds.
+    """
+
+    parents = {start: None}
+    queue = collections.deque([start])
+    while queue:
+        atom = queue.popleft()
+        for neighbour, via in neighbours[atom]:
+            if via == bond or neighbour in parents:
+                continue
+            parents[neighbour] = (atom, via)
+            if neighbour == end:
+                queue.clear()
+                break
+            queue.append(neighbour)
+    atoms, bonds = [end], [bond]
+    while parents[atoms[-1]] is not None:
+        atom, via = parents[atoms[-1]]
+        atoms.append(atom)
+        bonds.append(via)
+    atoms.reverse()
+    return tuple(atoms), bonds
+
+
+def _horton_rings(ring_atoms, neighbours, depth):
+    """Horton's candidates: for every atom and every bond, the shortest paths
+    from the atom to the bond's ends, joined by the bond, when those paths
+    only meet at the atom.
+
+    Only paths up to `depth` bonds long are followed, which gives every
+    candidate of up to 2 * depth + 1 atoms (and some larger ones) while only
+    looking at the atoms near each one.
+    """
+
+    for root in ring_atoms:
+        parents = {root: None}
+        queue = collections.deque([(root, 0)])
+        while queue:
+            atom, distance = queue.popleft()
+            if distance == depth:
+                continue
+            for neighbour, via in neighbours[atom]:
+                if neighbour not in parents:
+                    parents[neighbour] = (atom, via)
+                    queue.append((neighbour, distance + 1))
+
+        def path(atom):
+            atoms, bonds = [atom], []
+            while parents[atoms[-1]] is not None:
+                previous, via = parents[atoms[-1]]
+                atoms.append(previous)
+                bonds.append(via)
+            return atoms, bonds
+
+        for atom in parents:
+            for neighbour, bond in neighbours[atom]:
+                if neighbour not in parents or atom > neighbour:
+                    continue
+                if parents[atom] is not None and parents[atom][1] == bond:
+                    continue
+                if (parents[neighbour] is not None
+                        and parents[neighbour][1] == bond):
+                    continue
+                first_atoms, first_bonds = path(atom)
+                second_atoms, second_bonds = path(neighbour)
+                if set(first_atoms) & set(second_atoms) != {root}:
+                    continue
+                yield (tuple(reversed(first_atoms)) + tuple(second_atoms[:-1]),
+                       first_bonds + second_bonds + [bond])
+
+
+def smallest_rings(atoms, neighbours):
+    """Finds the smallest set of smallest rings.
+
+    Parameters
+    ----------
+    atoms : iterable
+        The atom keys.
+    neighbours : dict
+        Maps each atom to a list of (neighbour, bond key) pairs.
+
+    Returns
+    -------
+    list
+        An (atoms, bonds) pair of tuples per ring, smallest ring first.  The
+        atoms go around the ring in order; the bonds are in no particular
+        order.
+    """
+
+    atoms = list(atoms)
+    bridges, pieces = _bridges(atoms, neighbours)
+    bond_ends = {}
+    for atom in atoms:
+        for neighbour, bond in neighbours[atom]:
+            bond_ends.setdefault(bond, (atom, neighbour))
+    needed = len(bond_ends) - len(atoms) + pieces
+    if not needed:
+        return []
+
+    # Only ring bonds matter from here on
+    ring_neighbours = {atom: [(neighbour, bond)
+                              for neighbour, bond in neighbours[atom]
+                              if bond not in bridges]
+                       for atom in atoms}
+    ring_atoms = [atom for atom in atoms if ring_neighbours[atom]]
+    bits = {}
+    for atom in ring_atoms:
+        for _, bond in ring_neighbours[atom]:
+            bits.setdefault(bond, 1 << len(bits))
+
+    def take(candidates):
+        """The smallest independent rings among the candidates, or None if
+        there aren't enough of them.
+        """
+
+        found = []
+        basis = {}
+        seen = set()
+        for ring_atoms_, ring_bonds in sorted(candidates,
+                                              key=lambda ring: len(ring[0])):
+            vector = 0
+            for bond in ring_bonds:
+                vector |= bits[bond]
+            if vector in seen:
+                continue
+            seen.add(vector)
+            reduced = vector
+            while reduced:
+                pivot = reduced & -reduced
+                if pivot not in basis:
+                    basis[pivot] = reduced
+                    found.append((ring_atoms_, tuple(ring_bonds)))
+                    break
+                reduced ^= basis[pivot]
+            if len(found) == needed:
+                return found
+        return None
+
+    shortest = [_shortest_ring(bond_ends[bond][0], bond_ends[bond][1], bond,
+                               ring_neighbours) for bond in bits]
+    found = take(shortest)
+    # Horton's candidates always hold a smallest set, so they are searched on
+    # their own rather than added to the rings taken so far.  Taking the
+    # candidates of up to 2 * depth + 1 atoms in order of size is the same as
+    # taking all of them, as long as that finds enough rings.
+    depth = max(len(atoms_) for atoms_, _ in shortest) // 2
+    while found is None:
+        found = take(_horton_rings(ring_atoms, ring_neighbours, depth))
+        depth *= 2
+    return found
+
+
+class RingInfo(object):
+    """The rings of a molecule, and which rings each atom and bond is in.
+
+    Parameters
+    ----------
+    rings : list
+        (atoms, bonds) pairs, as `smallest_rings` returns them.
+
+    Attributes
+    ----------
+    rings : list
+        The atoms of each ring, in order around it, smallest ring first.
+    ring_bonds : list
+        The bonds of each ring, as a frozenset.
+    """
+
+    def __init__(self, rings):
+        self.rings = [atoms for atoms, _ in rings]
+        self.ring_bonds = [frozenset(bonds) for _, bonds in rings]
+        self._membership = {}
+        for number, (atoms, bonds) in enumerate(rings):
+            for key in atoms + bonds:
+                self._membership.setdefault(key, []).append(number)
+
+    def __len__(self):
+        return len(self.rings)
+
+    def __iter__(self):
+        return iter(self.rings)
+
+    def in_ring(self, key):
+        """Whether an atom or bond is in a ring."""
+
+        return key in self._membership
+
+    def rings_of(self, key):
+        """The rings (as indices into `rings`) that an atom or bond is in."""
+
+        return list(self._membership.get(key, ()))
+
+    def ring_sizes(self, key):
+        """The sizes of the rings an atom or bond is in, smallest first."""
+
+        return [len(self.rings[number])
+                for number in self._membership.get(key, ())]
+
+    def smallest_ring_size(self, key):
+        """The size of the smallest ring an atom or bond is in, or None."""
+
+        numbers = self._membership.get(key)
+        return len(self.rings[numbers[0]]) if numbers else None
@@ -0,0 +1,341 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Canonical ranks and symmetry classes of a molecule's atoms.
+
+Both start from the same partition.  Atoms are split into classes by their
+invariants, then by the classes of their neighbours, until no class splits
+any further (see `_refine`).  Atoms in different classes can never be swapped
+by a symmetry of the molecule; atoms in the same class almost always can.
+
+`canonical_ranks` breaks whatever ties are left to number the atoms.
+`symmetry_classes` finds the automorphism orbits instead: for each atom of a
+class it looks for a symmetry mapping one of the class's known orbits onto it
+(fixing the two atoms and refining again, and backtracking over any ties that
+are left), and starts a new orbit where there is none.  Every symmetry found
+joins all of the atoms it swaps, so a molecule with a single mirror plane
+takes a single search, and atoms with the same neighbours (the hydrogens of a
+CH2) are joined without one.  Each search first guesses all of the remaining
+ties at once and only backtracks if that fails, so the usual independent swaps
+(the methyl groups of a tert-butyl) don't have to be fixed one at a time.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import itertools
+
+
+def _partition(atoms, neighbours, invariants):
+    """Classes of atoms that can't be told apart by refinement.
+
+    Returns
+    -------
+    tuple
+        `ranks`, mapping each atom to its class, and `members`, mapping each
+        class to its atoms.  A class is numbered by the position of its first
+        atom in sorted order, so splitting one never renumbers another.
+    """
+
+    ranks = {}
+    members = {}
+    position = 0
+    for _, group in itertools.groupby(sorted(atoms, key=invariants.get),
+                                      key=invariants.get):
+        group = list(group)
+        for atom in group:
+            ranks[atom] = position
+        members[position] = group
+        position += len(group)
+    _refine(neighbours, ranks, members, set(atoms))
+    return ranks, members
+
+
+def _individualize(neighbours, ranks, members, atom):
+    """Moves an atom ahead of the rest of its class, and refines again.
+    Updates `ranks` and `members` in place.
+    """
+
+    rank = ranks[atom]
+    group = members[rank]
+    rest = [other for other in group if other != atom]
+    members[rank] = [atom]
+    members[rank + 1] = rest
+    for other in rest:
+        ranks[other] = rank + 1
+    _refine(neighbours, ranks, members, set(group))
+
+
+def canonical_ranks(atoms, neighbours, invariants):
+    """Ranks atoms so that the ranking doesn't depend on their keys.
+
+    Atoms start out ranked by their invariants.  Atoms that share a rank are
+    then told apart by the ranks (and bond orders) of their neighbours, which
+    may tell their neighbours apart in turn, and so on.  Only the ranks next to
+    one that just changed are looked at again, so a long chain doesn't cost a
+    pass over the whole molecule per bond.  Atoms that are still tied
+    (usually because they're symmetric) are separated by moving one of them
+    ahead of the others and refining again.
+
+    Parameters
+    ----------
+    atoms : list
+        The atom keys.
+    neighbours : dict
+        Maps each atom to a list of (neighbour, bond order) pairs.
+    invariants : dict
+        Maps each atom to a sortable value describing it.
+
+    Returns
+    -------
+    dict
+        Maps each atom to its rank, from 0 to len(atoms) - 1.
+    """
+
+    ranks, members = _partition(atoms, neighbours, invariants)
+    while True:
+        tied = [rank for rank, group in members.iteritems() if len(group) > 1]
+        if not tied:
+            return ranks
+        # Break the lowest tie, using the atoms' keys so that the result is
+        # reproducible
+        _individualize(neighbours, ranks, members, min(members[min(tied)]))
+
+
+def symmetry_classes(atoms, neighbours, invariants):
+    """Splits atoms into symmetry classes (the orbits of the molecule's
+    automorphisms): two atoms are in the same class if some symmetry of the
+    molecule swaps them.
+
+    Parameters
+    ----------
+    atoms : list
+        The atom keys.
+    neighbours : dict
+        Maps each atom to a list of (neighbour, bond order) pairs.
+    invariants : dict
+        Maps each atom to a sortable value describing it.  Atoms with
+        different invariants are never in the same class.
+
+    Returns
+    -------
+    dict
+        Maps each atom to the number of its class.  The numbers don't depend
+        on the atoms' keys, unless refinement alone couldn't tell two classes
+        apart.
+    """
+
+    ranks, members = _partition(atoms, neighbours, invariants)
+    adjacency = {atom: set(neighbours[atom]) for atom in atoms}
+    joined = {atom: atom for atom in atoms}
+
+    def root(atom):
+        while joined[atom] != atom:
+            joined[atom] = joined[joined[atom]]
+            atom = joined[atom]
+        return atom
+
+    # Atoms with the same neighbours (the hydrogens of a CH2) can always be
+    # swapped, which saves a search per group of them
+    twins = {}
+    for atom in atoms:
+        twins.setdefault((ranks[atom], tuple(sorted(neighbours[atom]))),
+                         []).append(atom)
+    for group in twins.itervalues():
+        for atom in group[1:]:
+            joined[root(atom)] = root(group[0])
+
+    classes = {}
+    for rank, group in members.iteritems():
+        orbits = []
+        for atom in sorted(group):
+            if any(root(atom) == root(orbit) for orbit in orbits):
+                continue
+            for orbit in orbits:
+                mapping = _symmetry(neighbours, adjacency, ranks, members,
+                                    orbit, atom)
+                if mapping is not None:
+                    for key, image in mapping.iteritems():
+                        joined[root(key)] = root(image)
+                    break
+            else:
+                orbits.append(atom)
+        for atom in group:
+            classes[atom] = rank + next(number for number, orbit
+                                        in enumerate(orbits)
+                                        if root(orbit) == root(atom))
+    return classes
+
+
+def representatives(classes, keys):
+    """Picks one atom of each symmetry class out of a group of atoms.
+
+    Parameters
+    ----------
+    classes : dict
+        Maps atoms to their classes, as `symmetry_classes` returns them.
+    keys : iterable
+        The atoms to pick from.
+
+    Returns
+    -------
+    list
+        A (key, count) pair per class: the first of `keys` in the class, and
+        how many of `keys` are in it.
+    """
+
+    picked = {}
+    order = []
+    for key in keys:
+        number = classes[key]
+        if number not in picked:
+            picked[number] = [key, 0]
+            order.append(number)
+        picked[number][1] += 1
+    return [tuple(picked[number]) for number in order]
+
+
+def _symmetry(neighbours, adjacency, ranks, members, first, second):
+    """A symmetry of the molecule that maps `first` to `second`, as a mapping
+    of every atom to its image, or None if there isn't one.
+    """
+
+    left = dict(ranks), dict(members)
+    _individualize(neighbours, left[0], left[1], first)
+    right = dict(ranks), dict(members)
+    _individualize(neighbours, right[0], right[1], second)
+    return _extend(neighbours, adjacency, left, right)
+
+
+def _extend(neighbours, adjacency, left, right):
+    """Finishes a symmetry between two refined partitions, each class of the
+    left one mapping onto the same class of the right one.
+    """
+
+    if not _same_shape(left[1], right[1]):
+        return None
+    tied = [rank for rank, group in left[1].iteritems() if len(group) > 1]
+    if not tied:
+        return _leaf(neighbours, adjacency, left[1], right[1])
+
+    # The classes still tied are nearly always swaps that have nothing to do
+    # with each other (the hydrogens of each CH2 of a chain), where any choice
+    # works, so one guess for all of them is tried before backtracking
+    # through them one at a time
+    mapping = _guess(neighbours, adjacency, left, right)
+    if mapping is not None:
+        return mapping
+
+    rank = min(tied)
+    atom = min(left[1][rank])
+    fixed = dict(left[0]), dict(left[1])
+    _individualize(neighbours, fixed[0], fixed[1], atom)
+    for image in sorted(right[1][rank], key=lambda image: image != atom):
+        candidate = dict(right[0]), dict(right[1])
+        _individualize(neighbours, candidate[0], candidate[1], image)
+        mapping = _extend(neighbours, adjacency, fixed, candidate)
+        if mapping is not None:
+            return mapping
+    return None
+
+
+def _same_shape(left_members, right_members):
+    return len(left_members) == len(right_members) and all(
+        len(group) == len(right_members.get(rank, ()))
+        for rank, group in left_members.iteritems())
+
+
+def _leaf(neighbours, adjacency, left_members, right_members):
+    mapping = {group[0]: right_members[rank][0]
+               for rank, group in left_members.iteritems()}
+    return mapping if _is_symmetry(neighbours, adjacency, mapping) else None
+
+
+def _guess(neighbours, adjacency, left, right):
+    """Fixes every tied class on both sides at once, mapping atoms to
+    themselves where they can.  Returns the symmetry if that makes one.
+    """
+
+    left = dict(left[0]), dict(left[1])
+    right = dict(right[0]), dict(right[1])
+    while True:
+        if not _same_shape(left[1], right[1]):
+            return None
+        tied = sorted(rank for rank, group in left[1].iteritems()
+                      if len(group) > 1)
+        if not tied:
+            return _leaf(neighbours, adjacency, left[1], right[1])
+        for rank in tied:
+            if len(left[1][rank]) < 2:
+                continue
+            if len(left[1][rank]) != len(right[1].get(rank, ())):
+                return None
+            atom = min(left[1][rank])
+            image = atom if atom in right[1][rank] else min(right[1][rank])
+            _individualize(neighbours, left[0], left[1], atom)
+            _individualize(neighbours, right[0], right[1], image)
+
+
+def _is_symmetry(neighbours, adjacency, mapping):
+    """Whether a mapping of atoms keeps every bond (and its order)."""
+
+    for atom, image in mapping.iteritems():
+        if len(neighbours[atom]) != len(adjacency[image]):
+            return False
+        for other, order in neighbours[atom]:
+            if (mapping[other], order) not in adjacency[image]:
+                return False
+    return True
+
+
+def _refine(neighbours, ranks, members, changed):
+    """Splits classes by their members' neighbours' ranks, until no class
+    can be split.  Updates `ranks` and `members` in place.
+    """
+
+    def signature(atom):
+        return tuple(sorted((ranks[other], order)
+                            for other, order in neighbours[atom]))
+
+    while changed:
+        # Only the atoms next to one whose rank just changed can be split off
+        # from their class; the rest of the class still look alike
+        touched = {}
+        for atom in changed:
+            for other, _ in neighbours[atom]:
+                touched.setdefault(ranks[other], set()).add(other)
+
+        moved = []
+        for rank, atoms in touched.iteritems():
+            group = members[rank]
+            if len(group) == 1:
+                continue
+            parts = {}
+            for atom in atoms:
+                parts.setdefault(signature(atom), []).append(atom)
+            if len(atoms) < len(group):
+                rest = [atom for atom in group if atom not in atoms]
+                parts.setdefault(signature(rest[0]), []).extend(rest)
+            if len(parts) == 1:
+                continue
+            # The largest part keeps the class's rank and the others move past
+            # it, so only the smaller parts change rank
+            keys = sorted(parts)
+            largest = max(keys, key=lambda key: (len(parts[key]), key))
+            keys.remove(largest)
+            start = rank
+            for key in [largest] + keys:
+                members[start] = parts[key]
+                if start != rank:
+                    moved.append((start, parts[key]))
+                start += len(parts[key])
+
+        # Ranks only change once every class has been looked at, so that each
+        # class is split by the same ranks
+        changed = set()
+        for start, part in moved:
+            for atom in part:
+                ranks[atom] = start
+            changed.update(part)
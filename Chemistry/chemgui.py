@@ -10,6 +10,7 @@ import kivy
 kivy.require('1.8.0')
 
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.graphics.vertex_instructions import Line
 from kivy.graphics.context_instructions import Color
 from kivy.uix.button import Button
@@ -21,8 +22,8 @@ from kivy.properties import StringProperty, ObjectProperty, NumericProperty,\
                                ListProperty
 
 from Chemistry.base.compounds import Compound
-from Chemistry.base.reactants import Acid, Base
-from Chemistry.reactions._reactions import Conditions
+from Chemistry.interface.reaction_utility import ReactionRunner
+from Chemistry.interface.spatial import SpatialIndex
 from Chemistry.reactions import AcidBase
 
 
@@ -75,14 +76,16 @@ class Element(Widget):
 
 class Bond(Widget):
 
+    key = StringProperty('b1')
     first = StringProperty()
     second = StringProperty()
     _order = NumericProperty()
     _chirality = ObjectProperty()
     size_hint = ListProperty([None, None])
 
-    def __init__(self, first, second, order, chirality=None, **kwargs):
+    def __init__(self, key, first, second, order, chirality=None, **kwargs):
         super(Bond, self).__init__(**kwargs)
+        self.key = key
         x1, y1 = first.pos
         x2, y2 = second.pos
         x1, x2 = ((x1+12, x2-2) if x1<x2 else (x1-2, x2+12))
@@ -129,6 +132,7 @@ class Bond(Widget):
             else:
                 self.order += 1
             self.chirality = app.chirality
+            self.parent.compound.set_bond_order(self.key, self.order)
 
 
 class LabTable(FloatLayout):
@@ -144,6 +148,11 @@ class LabTable(FloatLayout):
     margins = {'Element': 15, 'Bond':20}
     first, second = None, None
 
+    def __init__(self, **kwargs):
+        super(LabTable, self).__init__(**kwargs)
+        self.element_index = SpatialIndex(max(self.margins.itervalues()) * 2)
+        self.compound = Compound({}, {}, {})
+
     def on_touch_down(self, touch):
         if not self.collide_point(*touch.pos):
             return False
@@ -151,11 +160,11 @@ class LabTable(FloatLayout):
             child = self.compare_touch(touch)
             if child.__class__.__name__ == app.mode:
                 child.update()
-                return True
             elif app.mode == 'Element':
                 self.add_element(touch)
             elif app.mode == 'Bond':
                 self.add_bond(touch)
+            app.edited()
             self.canvas.ask_update()
             return True
 
@@ -163,6 +172,8 @@ class LabTable(FloatLayout):
         key = 'a{}'.format(self.acount)
         with self.canvas:
             self.element_locs[key] = touch.pos
+            self.element_index.insert(key, touch.pos)
+            self.compound.add_atom(app.element, key)
             e = Element(key, app.element, touch.pos)
             self.element_keys[key] = app.element, e
             self.add_widget(e)
@@ -175,7 +186,11 @@ class LabTable(FloatLayout):
                 key = 'b{}'.format(self.bcount)
                 with self.canvas:
                     self.bond_locs[key] = touch.pos
-                    b = Bond(self.first, self.second, app.order, app.chirality)
+                    self.compound.add_bond(self.first.key, self.second.key,
+                                           app.order, key,
+                                           chirality=app.chirality)
+                    b = Bond(key, self.first, self.second, app.order,
+                             app.chirality)
                     self.bond_keys[key] = (self.first.key, self.second.key,
                                            {'order': app.order,
                                             'chirality': app.chirality}, b)
@@ -187,16 +202,38 @@ class LabTable(FloatLayout):
             if not isinstance(self.first, Element):
                 self.first = None
 
+    def remove_bond(self, key):
+        first, second, info, b = self.bond_keys.pop(key)
+        del self.bond_locs[key]
+        self.compound.remove_bond(key)
+        self.remove_widget(b)
+
+    def remove_element(self, key):
+        for bond_key, (first, second, _, _) in self.bond_keys.items():
+            if key in (first, second):
+                self.remove_bond(bond_key)
+        _, e = self.element_keys.pop(key)
+        del self.element_locs[key]
+        self.element_index.remove(key)
+        self.compound.remove_atom(key)
+        self.remove_widget(e)
+
     def compare_touch(self, touch):
         try:
             margin = self.margins[app.mode]
         except KeyError:
             return False
-        right, top = map(lambda x: x + margin, touch.pos)
-        left, bottom = map(lambda x: x - margin, touch.pos)
-        for key, (x, y) in self.element_locs.iteritems():
-            if (left <= x and right >= x) and (top >= y and bottom <= y):
-                return self.element_keys[key][-1]
+        key = self.element_index.hit(touch.pos, margin)
+        if key is not None:
+            return self.element_keys[key][-1]
+
+    def select(self, left, bottom, right, top):
+        """The Elements inside a rectangle, for operating on several atoms
+        at once.
+        """
+
+        return [self.element_keys[key][-1] for key in
+                self.element_index.query_rect(left, bottom, right, top)]
 
 
 class TextWindow(Widget):
@@ -260,16 +297,28 @@ class ChemApp(App):
     _chirality = None
 
     molecule = {}
-    compound = None
-    conditions = None
     widget = None
     labtable = None
     reactionlist = None
+    runner = None
 
     def build(self):
         self.widget = Workbench()
+        self.runner = ReactionRunner(self.on_reaction_result)
+        Clock.schedule_interval(lambda dt: self.runner.poll(), 0.1)
         return self.widget
 
+    def on_stop(self):
+        self.runner.shutdown(wait=False)
+
+    def edited(self):
+        """The canvas changed, so any reaction still being worked out is
+        out of date.
+        """
+
+        if self.runner is not None:
+            self.runner.cancel()
+
     def popup(self):
         self._popup = Popup(title='Periodic Table',
                             content=PeriodicTable(),
@@ -304,33 +353,39 @@ class ChemApp(App):
         self._chirality = chiral
 
     def react(self):
-        """The steps taken by my program to react a molecule"""
+        """The steps taken by my program to react a molecule.  The reaction
+        itself is worked out in the background by the runner, which calls
+        `on_reaction_result` when it's done.
+        """
 
         self.molecule = {}
         self.labtable = self.widget.children[0].children[0]
         self.store_molecule()
         self.clean_molecule()
         self.get_information()
-        self.to_compound()
-        self.generate_conditions()
         self.list_reactions()
-        self.test_reactions()
+        self.runner.submit(self.molecule['atoms'], self.molecule['bonds'],
+                           self.molecule['other_info'],
+                           reactions=self.reactionlist)
+
+    def on_reaction_result(self, result):
+        """Receives the outcome of the latest reaction from the runner"""
+
+        if result.error is not None:
+            print('Reaction failed: {}'.format(result.error))
+            return
+        self.successful_reactions = [
+            outcome for outcome in result.results if 'error' not in outcome]
         self.pick_result()
         self.build_instructions()
         self.display_result()
-        print(self.compound)
 
     def store_molecule(self):
         """Store the molecules in the appropriate format for turning it into
         a Compound object
         """
 
-        self.molecule['atoms'] = {}
-        for k, v in self.labtable.element_keys.iteritems():
-            self.molecule['atoms'][k] = v[0]
-        self.molecule['bonds'] = {}
-        for k, v in self.labtable.bond_keys.iteritems():
-            self.molecule['bonds'][k] = v[:-1]
+        self.molecule.update(self.labtable.compound.to_dict())
 
     def clean_molecule(self):
         """Cleans up the molecule if necessary.  For example removes any
@@ -347,20 +402,6 @@ class ChemApp(App):
         self.molecule['other_info'] = {}
         print('getting info')
 
-    def to_compound(self):
-        """Transforms the molecule dictionary into a Compound object"""
-
-        self.compound = [Compound(self.molecule['atoms'],
-                                  self.molecule['bonds'],
-                                  self.molecule['other_info']),
-                         Compound({}, {}, {})]
-
-    def generate_conditions(self):
-        """Generates the reaction conditions"""
-
-        self.conditions = Conditions({})
-        print self.conditions
-
     def list_reactions(self):
         """Generates a list of reactions in order of probability based
         on the structure of the molecule and the conditions
@@ -369,18 +410,6 @@ class ChemApp(App):
         # I don't really have this working yet
         self.reactionlist = sorted(reaction_list)
 
-    def test_reactions(self):
-        """Tests the reactions to determine which will come to fruition"""
-
-        self.successful_reactions = []
-        for reaction in self.reactionlist:
-            testing_reaction = reaction(Acid(self.compound[0], 'a1', -1.74),
-                                        Base(self.compound[1], 'a3', 16),
-                                        self.conditions)
-            print testing_reaction._acid
-            print testing_reaction._conditions
-            print testing_reaction._base
-
     def pick_result(self): pass
     def build_instructions(self): pass
     def display_result(self): pass
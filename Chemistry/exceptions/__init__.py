@@ -7,4 +7,7 @@
 
 __author__ = "Dan Obermiller"
 
-__all__ = ['ParseErrors', 'ReactionErrors']
+__all__ = ['AtomicErrors', 'ParseErrors', 'ReactionErrors']
+
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__)
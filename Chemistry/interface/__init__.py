@@ -14,4 +14,8 @@ eventually.
 
 __author__ = "Dan Obermiller"
 
-__all__ = ['compound_utility']
\ No newline at end of file
+__all__ = ['compound_utility', 'reaction_utility', 'batch', 'spatial',
+           'formats', 'compound_batch', 'registry', 'mass_index']
+
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__)
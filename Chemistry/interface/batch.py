@@ -0,0 +1,352 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Headless batch processing: runs the reaction pipeline over many molecule
+files and streams the results out as JSON lines (one object per record, so a
+multi-record SD or SMILES file gives a line per molecule in it).
+
+The records are the unit of work, not the files: they are read one at a time
+and handed to the worker processes a window at a time, so a library of a
+million molecules in a single file is spread over every worker, is never held
+in memory at once, and has its results written as each record is done.
+
+This is what `main.py --batch` runs.  Nothing here imports the GUI, so it is
+cheap to start on a server.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from Chemistry import profiling
+from Chemistry.interface.formats import SUPPORTED_FILETYPES, \
+    open_compound_file, split_extension
+from Chemistry.interface.reaction_utility import react_molecules
+
+
+# How many chunks of records per worker are handed to the pool at a time
+_WINDOW = 4
+
+
+def find_files(paths):
+    """Finds every molecule file that can be read.
+
+    Parameters
+    ----------
+    paths : iterable
+        Files and/or directories.  Directories are searched recursively for
+        files whose extension is one of the SUPPORTED_FILETYPES, optionally
+        followed by a compression's ('water.cml.gz').  Files given directly
+        are always included.
+
+    Yields
+    ------
+    tuple
+        (path, filetype) pairs.  The filetype is None for a file given
+        directly whose extension isn't supported; its format is worked out
+        from its contents.
+    """
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    filetype = _filetype(name)
+                    if filetype in SUPPORTED_FILETYPES:
+                        yield os.path.join(root, name), filetype
+        else:
+            yield path, _filetype(path)
+
+
+def _filetype(path):
+    """The filetype of a file, going by its extension."""
+
+    filetype = split_extension(path)[0]
+    return filetype if filetype in SUPPORTED_FILETYPES else None
+
+
+def _records(file_):
+    """Parses every record of an open compound file, one at a time."""
+
+    if file_.format.iterparse is None:
+        yield file_.format.parser(file_)
+    else:
+        for parsed in file_.format.iterparse(file_):
+            yield parsed
+
+
+def _error(err):
+    return '{}: {}'.format(err.__class__.__name__, err)
+
+
+def read_file(job):
+    """Reads the records of a single file, one at a time.
+
+    Parameters
+    ----------
+    job : tuple
+        A (path, filetype) pair.
+
+    Yields
+    ------
+    dict
+        A record to hand to `process_record`: {'file': path, 'record': index,
+        'molecule': (atoms, bonds, other)}, or with an 'error' message in place
+        of the molecule if it couldn't be read.  Reading stops at the first
+        record that can't be read.  A file that can't be opened at all gives a
+        single {'file': path, 'error': message}.
+    """
+
+    path, filetype = job
+    # A bad file or record shouldn't take down the whole batch; it gets
+    # reported instead
+    try:
+        with open_compound_file(path, filetype) as file_:
+            records = _records(file_)
+            for index in itertools.count():
+                try:
+                    parsed = next(records, None)
+                except Exception as err:
+                    yield {'file': path, 'record': index, 'error': _error(err)}
+                    return
+                if parsed is None:
+                    return
+                yield {'file': path, 'record': index,
+                       'molecule': (parsed.atoms, parsed.bonds, parsed.other)}
+    except Exception as err:
+        yield {'file': path, 'error': _error(err)}
+
+
+def process_record(record):
+    """Runs every reaction on a record read by `read_file`.
+
+    Returns
+    -------
+    dict
+        {'file': path, 'record': index, 'results': [...]} as returned by
+        `react_molecules`, or with an 'error' message in place of the results
+        if the record couldn't be read or reacted.
+    """
+
+    if 'error' in record:
+        return record
+    try:
+        results = react_molecules(*record['molecule'])
+    except Exception as err:
+        return {'file': record['file'], 'record': record['record'],
+                'error': _error(err)}
+    return {'file': record['file'], 'record': record['record'],
+            'results': results}
+
+
+def process_file(job):
+    """Reads a single file and runs every reaction on each record in it.
+
+    Parameters
+    ----------
+    job : tuple
+        A (path, filetype) pair.
+
+    Yields
+    ------
+    dict
+        The result of each record, in order, as it is done (see `read_file`
+        and `process_record`).
+    """
+
+    for record in read_file(job):
+        yield process_record(record)
+
+
+def _start_worker(profile):
+    """Sets up a worker process of a batch's pool."""
+
+    if profile:
+        profiling.enable()
+    else:
+        profiling.disable()
+
+
+def _process_profiled(record):
+    """Processes a record in a worker, and sends back what the profiling
+    recorded along with the result.
+    """
+
+    profiling.reset()
+    return process_record(record), profiling.stats()
+
+
+class Progress(object):
+    """Reports how many files have been read, and how many of their records
+    have been processed and how quickly.
+
+    Parameters
+    ----------
+    total : int
+        The number of files in the batch.
+    stream : file-like, optional
+        Where the progress is written.  Defaults to stderr.
+    interval : float, optional
+        The minimum number of seconds between updates.
+    """
+
+    def __init__(self, total, stream=None, interval=0.5):
+        self.total = total
+        self.stream = sys.stderr if stream is None else stream
+        self.interval = interval
+        self.files = 0
+        self.records = 0
+        self.failed = 0
+        self.start = time.time()
+        self._last = 0
+
+    @property
+    def rate(self):
+        """Records processed per second so far."""
+
+        elapsed = time.time() - self.start
+        return self.records / elapsed if elapsed else 0.0
+
+    def read(self):
+        """Counts a file whose records have all been read."""
+
+        self.files += 1
+
+    def update(self, result):
+        """Counts a processed record, and writes the progress if enough time
+        has passed since it was last written.
+
+        Parameters
+        ----------
+        result : dict
+            The record's result, as returned by `process_record`.
+        """
+
+        self.records += 1
+        self.failed += 'error' in result
+        if time.time() - self._last >= self.interval:
+            self._write()
+
+    def finish(self):
+        """Writes the final progress."""
+
+        self._write()
+        self.stream.write('\n')
+        self.stream.flush()
+
+    def _write(self):
+        self._last = time.time()
+        self.stream.write(
+            '\r{}/{} files, {} records ({} failed)  {:.1f} records/s'.format(
+                self.files, self.total, self.records, self.failed, self.rate))
+        self.stream.flush()
+
+
+def run_batch(paths, output, workers=None, chunksize=4, progress=True):
+    """Runs the reaction pipeline over every file.
+
+    Parameters
+    ----------
+    paths : iterable
+        Files and/or directories, as for `find_files`.
+    output : file-like
+        Each record's result is written here as a line of JSON as soon as it
+        is done.  With more than one worker the records come back in the order
+        they finish; each line names its file and record.
+    workers : int, optional
+        The number of worker processes.  Defaults to the number of CPUs; 1 runs
+        everything in this process.
+    chunksize : int, optional
+        How many records are handed to a worker at a time.  The records are
+        read as they are needed, `_WINDOW` chunks per worker at a time, so
+        this also bounds how many are held in memory.
+    progress : bool, optional
+        Whether to report progress and throughput on stderr.
+
+    Notes
+    -----
+    If profiling is enabled (see `Chemistry.profiling`), it is enabled in the
+    workers too, and what they record is merged into this process's stats.
+
+    Returns
+    -------
+    dict
+        A summary: the number of 'files' and 'records', how many records (or
+        files that couldn't be opened) 'failed', and the 'seconds' the batch
+        took.
+    """
+
+    jobs = list(find_files(paths))
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    tracker = Progress(len(jobs), stream=None if progress else _Discard())
+
+    def records():
+        for job in jobs:
+            for record in read_file(job):
+                yield record
+            tracker.read()
+
+    pool = None
+    try:
+        if workers > 1 and jobs:
+            profile = profiling.is_enabled()
+            pool = multiprocessing.Pool(workers, _start_worker, (profile,))
+            results = _pooled(pool, records(), workers * chunksize * _WINDOW,
+                              chunksize, profile)
+        else:
+            results = itertools.imap(process_record, records())
+        for result in results:
+            output.write(json.dumps(result, sort_keys=True) + '\n')
+            tracker.update(result)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    tracker.finish()
+
+    return {'files': tracker.files,
+            'records': tracker.records,
+            'failed': tracker.failed,
+            'seconds': time.time() - tracker.start}
+
+
+def _pooled(pool, records, window, chunksize, profile):
+    """Processes records on a pool, a window of them at a time, yielding each
+    result as it is done.
+    """
+
+    while True:
+        # Pool.imap_unordered would read every record up front, so it is only
+        # ever given a window of them
+        batch = list(itertools.islice(records, window))
+        if not batch:
+            return
+        if not profile:
+            for result in pool.imap_unordered(process_record, batch,
+                                              chunksize):
+                yield result
+            continue
+        for result, recorded in pool.imap_unordered(_process_profiled, batch,
+                                                    chunksize):
+            profiling.merge(recorded)
+            yield result
+
+
+class _Discard(object):
+    """A stream that throws away everything written to it."""
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
@@ -0,0 +1,320 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Many compounds packed into a few flat arrays, which worker processes can
+share instead of each being sent its own pickled copy of a library.
+
+A `CompoundBatch` holds, for the whole library, the element of every atom, the
+two atoms and the order of every bond, each compound's other information (as
+JSON) and where each compound's atoms, bonds and information start.  `share`
+writes those arrays to a named block of shared memory (a file in /dev/shm,
+where there is one) and `attach` maps the block into another process without
+copying it, so handing a library to N workers costs N names.  Compounds are
+materialized one at a time by index, as ordinary `Compound` objects.
+
+`map_compounds` does the fan-out: it shares the batch, and each worker of a
+process pool attaches once and works through the indices it is given.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import json
+import multiprocessing
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from Chemistry.base.compounds import Compound
+
+
+_MAGIC = b'PYCAOSB1'
+_ALIGNMENT = 8
+_ARRAYS = (('elements', np.int16), ('atom_offsets', np.int64),
+           ('bonds', np.int32), ('orders', np.int8),
+           ('bond_offsets', np.int64), ('info', np.uint8),
+           ('info_offsets', np.int64))
+
+
+def _number(key):
+    """Sorts 'a2' before 'a10', and keys that aren't numbered last."""
+
+    try:
+        return (0, int(key[1:]), key)
+    except ValueError:
+        return (1, 0, key)
+
+
+class CompoundBatch(object):
+    """A library of compounds stored as flat arrays.
+
+    Made by `from_compounds` or `attach` rather than directly.
+
+    Parameters
+    ----------
+    symbols : list
+        The atomic symbols that `elements` indexes.
+    arrays : dict
+        The arrays, by name (see Attributes).
+    name : string, optional
+        The shared block the arrays are mapped from, if they are.
+
+    Attributes
+    ----------
+    symbols : list
+    elements : numpy.ndarray
+        The index (into `symbols`) of every atom of every compound.
+    atom_offsets : numpy.ndarray
+        Compound `i` has atoms `atom_offsets[i]` up to `atom_offsets[i + 1]`.
+    bonds : numpy.ndarray
+        The two atoms of every bond, as an (n, 2) array of indices into the
+        compound's own atoms.
+    orders : numpy.ndarray
+        The order of every bond.
+    bond_offsets : numpy.ndarray
+        Compound `i` has bonds `bond_offsets[i]` up to `bond_offsets[i + 1]`.
+    info, info_offsets : numpy.ndarray
+        Each compound's other information as JSON, and where it starts.
+    name : string
+        The name of the shared block, or None if the batch isn't shared.
+
+    Notes
+    -----
+    A materialized compound's atoms are 'a1', 'a2', ... and its bonds 'b1',
+    'b2', ..., in the order of the original keys (so a compound whose keys
+    were already numbered that way keeps them).  Bond chirality isn't kept,
+    and other information has to be JSON serializable.
+    """
+
+    def __init__(self, symbols, arrays, name=None):
+        self.symbols = list(symbols)
+        for attr, _ in _ARRAYS:
+            setattr(self, attr, arrays[attr])
+        self.name = name
+
+    @classmethod
+    def from_compounds(cls, compounds):
+        """Packs compounds into a batch.
+
+        Parameters
+        ----------
+        compounds : iterable
+            Compounds, or wrappers of them (Reactants, Products, ...).
+
+        Returns
+        -------
+        CompoundBatch
+        """
+
+        symbols = {}
+        elements, atom_offsets = [], [0]
+        bonds, orders, bond_offsets = [], [], [0]
+        info, info_offsets = [], [0]
+        for compound in compounds:
+            state = getattr(compound, 'compound', compound).__getstate__()
+            keys = sorted(state['atoms'], key=_number)
+            index = {key: i for i, key in enumerate(keys)}
+            for key in keys:
+                elements.append(symbols.setdefault(state['atoms'][key],
+                                                   len(symbols)))
+            for key in sorted(state['bonds'], key=_number):
+                first, second, rest = state['bonds'][key]
+                bonds.append((index[first], index[second]))
+                orders.append(rest.get('order', 1))
+            text = json.dumps(state['other_info'], sort_keys=True)
+            info.append(text)
+            atom_offsets.append(len(elements))
+            bond_offsets.append(len(bonds))
+            info_offsets.append(info_offsets[-1] + len(text))
+
+        arrays = {'elements': elements, 'atom_offsets': atom_offsets,
+                  'bonds': np.reshape(bonds, (len(bonds), 2)),
+                  'orders': orders, 'bond_offsets': bond_offsets,
+                  'info': np.frombuffer(b''.join(info), np.uint8),
+                  'info_offsets': info_offsets}
+        arrays = {attr: np.asarray(arrays[attr], dtype)
+                  for attr, dtype in _ARRAYS}
+        return cls(sorted(symbols, key=symbols.get), arrays)
+
+    def __len__(self):
+        return len(self.atom_offsets) - 1
+
+    def __getitem__(self, index):
+        """Materializes compound `index` as a Compound."""
+
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("batch index out of range")
+        return Compound(*self._parts(index))
+
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self[index]
+
+    def _parts(self, index):
+        start, stop = self.atom_offsets[index:index + 2]
+        atoms = {'a{}'.format(i): self.symbols[element] for i, element
+                 in enumerate(self.elements[start:stop].tolist(), 1)}
+        start, stop = self.bond_offsets[index:index + 2]
+        bonds = {}
+        for i, ((first, second), order) in enumerate(
+                zip(self.bonds[start:stop].tolist(),
+                    self.orders[start:stop].tolist()), 1):
+            bonds['b{}'.format(i)] = ('a{}'.format(first + 1),
+                                      'a{}'.format(second + 1),
+                                      {'order': order, 'chirality': None})
+        start, stop = self.info_offsets[index:index + 2]
+        other = json.loads(self.info[start:stop].tostring())
+        return atoms, bonds, other
+
+    @property
+    def nbytes(self):
+        """The size of the arrays, in bytes."""
+
+        return sum(getattr(self, attr).nbytes for attr, _ in _ARRAYS)
+
+    def share(self, directory=None):
+        """Copies the batch into a named block of shared memory.
+
+        Parameters
+        ----------
+        directory : string, optional
+            Where the block is made.  Defaults to /dev/shm if there is one
+            (so the block lives in memory), or the temporary directory.
+
+        Returns
+        -------
+        CompoundBatch
+            The shared batch, whose `name` other processes can `attach` to.
+            It owns the block; call its `unlink` once the workers are done.
+        """
+
+        if directory is None and os.path.isdir('/dev/shm'):
+            directory = '/dev/shm'
+        # The magic, the header's length, the header (JSON), then the arrays;
+        # every array starts on an aligned offset
+        layout = {}
+        position = 0
+        for attr, _ in _ARRAYS:
+            array = getattr(self, attr)
+            layout[attr] = [position, array.dtype.str, list(array.shape)]
+            position += _aligned(array.nbytes)
+        header = json.dumps({'symbols': self.symbols, 'arrays': layout})
+        start = _aligned(len(_MAGIC) + 8 + len(header))
+
+        fd, name = tempfile.mkstemp(prefix='pycaos-batch-', dir=directory)
+        with os.fdopen(fd, 'wb') as block:
+            block.write(_MAGIC + struct.pack('<Q', len(header)) + header)
+            for attr, _ in _ARRAYS:
+                block.seek(start + layout[attr][0])
+                block.write(np.ascontiguousarray(getattr(self, attr)).data)
+            block.truncate(start + position)
+        return CompoundBatch.attach(name)
+
+    @classmethod
+    def attach(cls, name):
+        """Maps a shared batch into this process, without copying it.
+
+        Parameters
+        ----------
+        name : string
+            The `name` of a shared batch.
+
+        Returns
+        -------
+        CompoundBatch
+            A batch whose arrays are read-only views of the shared block.
+        """
+
+        block = np.memmap(name, np.uint8, 'r')
+        if block[:len(_MAGIC)].tostring() != _MAGIC:
+            raise ValueError("{} isn't a shared compound batch".format(name))
+        length, = struct.unpack('<Q', block[len(_MAGIC):len(_MAGIC) + 8])
+        header = json.loads(block[len(_MAGIC) + 8:
+                                  len(_MAGIC) + 8 + length].tostring())
+        start = _aligned(len(_MAGIC) + 8 + length)
+        arrays = {}
+        for attr, (offset, dtype, shape) in header['arrays'].iteritems():
+            dtype = np.dtype(str(dtype))
+            size = int(np.prod(shape)) * dtype.itemsize
+            arrays[attr] = block[start + offset:start + offset + size].view(
+                dtype).reshape(shape)
+        return cls(header['symbols'], arrays, name)
+
+    def unlink(self):
+        """Removes the shared block.  Processes that are attached to it keep
+        their mapping until they let go of the batch.
+        """
+
+        if self.name is not None and os.path.exists(self.name):
+            os.remove(self.name)
+
+
+def _aligned(size):
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+# The batches this process is attached to, by name
+_attached = {}
+
+
+def _attach(name):
+    if name not in _attached:
+        _attached[name] = CompoundBatch.attach(name)
+    return _attached[name]
+
+
+def _apply(job):
+    function, name, index = job
+    return function(_attach(name)[index])
+
+
+def map_compounds(function, batch, indices=None, workers=None, chunksize=16):
+    """Calls a function on compounds of a batch, in a pool of processes that
+    share the batch.
+
+    Parameters
+    ----------
+    function : callable
+        Takes a Compound.  It has to be picklable (defined at the top level of
+        a module), as do its results.
+    batch : CompoundBatch
+        The compounds.  A batch that isn't shared yet is shared for the call.
+    indices : iterable, optional
+        The compounds to call `function` on.  Defaults to all of them.
+    workers : int, optional
+        The number of worker processes.  Defaults to the number of CPUs; 1
+        runs everything in this process.
+    chunksize : int, optional
+        How many compounds are handed to a worker at a time.
+
+    Returns
+    -------
+    list
+        The results, in the order of `indices`.
+    """
+
+    if indices is None:
+        indices = xrange(len(batch))
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers == 1:
+        return [function(batch[index]) for index in indices]
+
+    shared = batch if batch.name is not None else batch.share()
+    pool = multiprocessing.Pool(workers)
+    try:
+        # Each job is the function's name, the block's name and an index
+        return pool.map(_apply, [(function, shared.name, index)
+                                 for index in indices], chunksize)
+    finally:
+        pool.terminate()
+        pool.join()
+        if shared is not batch:
+            shared.unlink()
@@ -10,14 +10,16 @@ converting Compound objects back into file or dictionaries.
 __author__ = "Dan Obermiller"
 
 
+import itertools
+
 from Chemistry.base.compounds import Compound
-from Chemistry.parsing.CheML import CMLParser, CMLBuilder
+from Chemistry.interface.formats import SUPPORTED_FILETYPES, \
+    open_compound_file
+from Chemistry.parsing.SDF import SDFBuilder, build_index, \
+    iterparse as iterparse_sdf, parse_record
 from Chemistry.exceptions.ParseErrors import UnsupportedFileTypeException
 
 
-SUPPORTED_FILETYPES = {'cml': [CMLParser, CMLBuilder]}
-
-
 def compound_from_dict(atoms, bonds, other):
     """Builds a compound from dictionaries representing the atoms, bonds, and
     other necessary information.
@@ -86,32 +88,117 @@ def _parser_to_compound(parsed_file):
 
     return Compound(parsed_file.atoms, parsed_file.bonds, parsed_file.other)
 
-def compound_from_file(file_, filetype):
+
+def _indexed(compounds, mass_index):
+    """Adds compounds to a MassIndex as they go by."""
+
+    for compound in compounds:
+        mass_index.add(compound)
+        yield compound
+
+
+def compound_from_file(file_, filetype=None, registry=None, mass_index=None):
     """Builds a compound object from file.
 
     Parameters
     ----------
-    file_ : file-like object
-        The (open) file-like object from which data can be read and parsed.
-    filetype : string
+    file_ : file-like object or string
+        The (open) file-like object from which data can be read and parsed,
+        or the path of the file.  Compressed files (gzip, bz2 and, where the
+        lzma module is available, xz) are decompressed as they are read.
+    filetype : string, optional
         The type of file that is being parsed.  This should be one of the keys
-        of the SUPPORTED_FILETYPES constant.
+        of the SUPPORTED_FILETYPES constant.  If it isn't given it is worked
+        out from the path's extension or from the start of the file, which
+        then has to be open in binary mode.
+    registry : CompoundRegistry, optional
+        If given with a path, a file the registry has read before (and that
+        hasn't changed since) is loaded from it rather than parsed, and any
+        other file is parsed and its compound added to it.
+    mass_index : MassIndex, optional
+        An index the compound is added to.
 
     Returns
     -------
     Compound
-        The `Compound` object that can be generated from the file.
+        The `Compound` object that can be generated from the file.  Only the
+        first molecule of a file that holds several is read; see
+        `compounds_from_file`.
 
     Raises
     ------
     UnsupportedFiletypeException
-        Raised if the filetype given is not supported.
+        Raised if the filetype given is not supported, or couldn't be worked
+        out.
     """
 
+    if mass_index is not None:
+        compound = compound_from_file(file_, filetype, registry)
+        mass_index.add(compound)
+        return compound
+
+    if registry is not None and isinstance(file_, basestring):
+        identifier = registry.from_source(file_)
+        if identifier is not None:
+            return registry.get(identifier)
+        compound = compound_from_file(file_, filetype)
+        registry.add(compound, source=file_)
+        return compound
+
+    if filetype is not None and not isinstance(file_, basestring):
+        try:
+            parser = SUPPORTED_FILETYPES[filetype][0]
+        except KeyError:
+            raise UnsupportedFileTypeException(filetype,
+                                               "Unsupported filetype {}")
+        return _parser_to_compound(parser(file_))
+
+    opened = open_compound_file(file_, filetype)
     try:
-        return _parser_to_compound(SUPPORTED_FILETYPES[filetype][0](file_))
-    except KeyError:
-        raise UnsupportedFileTypeException(filetype, "Unsupported filetype {}")
+        return _parser_to_compound(opened.format.parser(opened))
+    finally:
+        if isinstance(file_, basestring):
+            opened.close()
+
+
+def compounds_from_file(file_, filetype=None, mass_index=None):
+    """Reads every compound in a file, one at a time.
+
+    Parameters
+    ----------
+    file_ : file-like object or string
+        The file, or its path, as for `compound_from_file`.  A large
+        compressed library is decompressed a chunk at a time as the compounds
+        are read, never all at once.
+    filetype : string, optional
+        As for `compound_from_file`.
+    mass_index : MassIndex, optional
+        An index each compound is added to as it is read.
+
+    Yields
+    ------
+    Compound
+        A compound per molecule in the file.  Formats that hold a single
+        molecule per file (CML) yield just the one.
+    """
+
+    if mass_index is not None:
+        for compound in _indexed(compounds_from_file(file_, filetype),
+                                 mass_index):
+            yield compound
+        return
+
+    opened = open_compound_file(file_, filetype)
+    try:
+        file_format = opened.format
+        if file_format.iterparse is None:
+            yield _parser_to_compound(file_format.parser(opened))
+        else:
+            for parser in file_format.iterparse(opened):
+                yield _parser_to_compound(parser)
+    finally:
+        if isinstance(file_, basestring):
+            opened.close()
 
 
 def compound_to_file(file_, filetype, compound):
@@ -137,3 +224,83 @@ def compound_to_file(file_, filetype, compound):
         SUPPORTED_FILETYPES[filetype][1].from_compound(compound).to_file(file_)
     except KeyError:
         raise UnsupportedFileTypeException(filetype, "Unsupported filetype {}")
+
+
+def compounds_from_sdf(file_, start=0, stop=None, index=None,
+                       mass_index=None):
+    """Reads the compounds in an SD file one record at a time, so that only
+    one record is held in memory at once.
+
+    Parameters
+    ----------
+    file_ : file-like object
+        The (open) SD file.
+    start, stop : int, optional
+        Only the records from `start` up to (not including) `stop` are read,
+        as in a slice.
+    index : list, optional
+        The byte offset of each record, from `sdf_index`.  With an index the
+        records before `start` are skipped over without being read at all;
+        without one they are parsed and thrown away.
+    mass_index : MassIndex, optional
+        An index each compound is added to as it is read.
+
+    Yields
+    ------
+    Compound
+        A compound per record.  Its other_info holds the record's title as the
+        'id' and its data fields.
+    """
+
+    if mass_index is not None:
+        for compound in _indexed(compounds_from_sdf(file_, start, stop, index),
+                                 mass_index):
+            yield compound
+    elif index is not None:
+        for offset in index[start:stop]:
+            yield _parser_to_compound(parse_record(file_, offset))
+    else:
+        for parser in itertools.islice(iterparse_sdf(file_), start, stop):
+            yield _parser_to_compound(parser)
+
+
+def compounds_to_sdf(file_, compounds):
+    """Writes compounds to an SD file, one record each.
+
+    Parameters
+    ----------
+    file_ : file-like object
+        The (open) file to which the records will be written.
+    compounds : iterable
+        The compounds being written.
+
+    Returns
+    -------
+    list
+        The byte offset of each record written, which can be used as the
+        file's index (see `sdf_index`) if the file was empty to begin with.
+    """
+
+    offsets = []
+    for compound in compounds:
+        offsets.append(file_.tell())
+        SDFBuilder.from_compound(compound).to_file(file_)
+    return offsets
+
+
+def sdf_index(file_):
+    """Builds the index of an SD file: the byte offset of every record.
+
+    Parameters
+    ----------
+    file_ : file-like object
+        The (open) SD file, opened in binary mode.
+
+    Returns
+    -------
+    list
+        The offsets.  Pass the list to `compounds_from_sdf` for random access;
+        slicing it (`index[i::n]`) splits the file among `n` workers.
+    """
+
+    return build_index(file_)
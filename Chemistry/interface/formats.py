@@ -0,0 +1,423 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""The registry of molecule file formats, and opening (possibly compressed)
+molecule files without having to say what is in them.
+
+Each format registers its parser, its builder, the extensions it goes by and a
+test that recognizes the start of its files.  `open_compound_file` works out
+whether a file is compressed (from its extension, or its first few bytes) and
+decompresses it as it is read, so a 'library.sdf.gz' is never written out to
+disk uncompressed.  The result is read through a read-ahead buffer, which is
+what lets the formats be recognized from their first bytes too.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import bz2
+import collections
+import gzip
+import io
+import os
+import zlib
+
+from Chemistry.exceptions.ParseErrors import ParsingException, \
+    UnsupportedFileTypeException
+from Chemistry.parsing import CheML, SDF, SMILES
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+
+# How much is read ahead of the parser, and how much compressed data is
+# decompressed at a time
+BUFFER_SIZE = 1 << 17
+_CHUNK_SIZE = 1 << 16
+# Enough of the start of a file to recognize its format
+_HEAD_SIZE = 1024
+
+FileFormat = collections.namedtuple(
+    'FileFormat', ['name', 'parser', 'builder', 'extensions', 'sniff',
+                   'iterparse'])
+
+FORMATS = {}
+# Maps every extension (and format name) to the format's parser and builder
+SUPPORTED_FILETYPES = {}
+_EXTENSIONS = {}
+
+
+def register_format(name, parser, builder, extensions=(), sniff=None,
+                    iterparse=None):
+    """Adds a file format to the registry, or replaces one.
+
+    Parameters
+    ----------
+    name : string
+        The format's name, for example 'sdf'.
+    parser : type
+        Takes an open file and parses its (first) molecule into `atoms`,
+        `bonds` and `other` attributes.
+    builder : type
+        Has a `from_compound` classmethod returning an object with a `to_file`
+        method.
+    extensions : iterable, optional
+        Other extensions the format's files go by ('mol' for 'sdf').  The name
+        is always one of them.
+    sniff : callable, optional
+        Takes up to the first kilobyte of a file and returns whether the file
+        is in this format.  Formats without one can only be recognized by
+        their extension.
+    iterparse : callable, optional
+        Takes an open file and yields a parser per molecule in it, for formats
+        that hold more than one molecule per file.
+
+    Returns
+    -------
+    FileFormat
+    """
+
+    file_format = FileFormat(name, parser, builder,
+                             (name,) + tuple(extensions), sniff, iterparse)
+    FORMATS[name] = file_format
+    for extension in file_format.extensions:
+        _EXTENSIONS[extension] = file_format
+        SUPPORTED_FILETYPES[extension] = [parser, builder]
+    return file_format
+
+
+def get_format(filetype):
+    """The registered format that goes by `filetype`.
+
+    Raises
+    ------
+    UnsupportedFileTypeException
+        If no format goes by it.
+    """
+
+    try:
+        return _EXTENSIONS[filetype]
+    except KeyError:
+        raise UnsupportedFileTypeException("Unsupported filetype {}",
+                                           filetype)
+
+
+def _looks_like_cml(head):
+    return head.lstrip().startswith('<')
+
+
+def _looks_like_sdf(head):
+    lines = head.splitlines()
+    return len(lines) > 3 and ('V2000' in lines[3] or 'V3000' in lines[3])
+
+
+def _looks_like_smiles(head):
+    # Letters alone can't tell 'CCO' from a word, so the first line is parsed
+    for line in head.splitlines():
+        if line.strip() and not line.startswith('#'):
+            try:
+                SMILES.parse_smiles(line.split()[0])
+            except ParsingException:
+                return False
+            return True
+    return False
+
+
+register_format('cml', CheML.CMLParser, CheML.CMLBuilder, (),
+                _looks_like_cml)
+register_format('sdf', SDF.SDFParser, SDF.SDFBuilder, ('mol', 'sd'),
+                _looks_like_sdf, SDF.iterparse)
+register_format('smi', SMILES.SMILESParser, SMILES.SMILESBuilder,
+                ('smiles',), _looks_like_smiles, SMILES.iterparse)
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Reads a compressed stream, decompressing a chunk at a time.
+
+    Parameters
+    ----------
+    compressed : file-like object
+        The open, compressed file.
+    decompressor : callable
+        Returns a new decompressor object (with `decompress` and
+        `unused_data`).  Another one is made for each stream when several were
+        concatenated, as `cat a.gz b.gz` does.
+    close : bool, optional
+        Whether closing this closes `compressed`.
+    """
+
+    def __init__(self, compressed, decompressor, close=True):
+        super(_DecompressingReader, self).__init__()
+        self._compressed = compressed
+        self._close = close
+        self._decompressor_type = decompressor
+        self._decompressor = decompressor()
+        self._pending = b''
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _decompress(self, data):
+        output = []
+        while data:
+            try:
+                output.append(self._decompressor.decompress(data))
+            except EOFError:
+                # The bz2 decompressor refuses data after its stream has ended
+                output.append(b'')
+            else:
+                data = self._decompressor.unused_data
+                if data:
+                    self._decompressor = self._decompressor_type()
+                continue
+            self._decompressor = self._decompressor_type()
+        return b''.join(output)
+
+    def readinto(self, buffer_):
+        while not self._pending and not self._eof:
+            data = self._compressed.read(_CHUNK_SIZE)
+            if not data:
+                self._eof = True
+            else:
+                self._pending = self._decompress(data)
+        size = min(len(buffer_), len(self._pending))
+        buffer_[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed and self._close:
+            self._compressed.close()
+        super(_DecompressingReader, self).close()
+
+
+def _lzma_decompressor():
+    if lzma is None:
+        raise UnsupportedFileTypeException(
+            "Reading {} files needs the lzma module", 'xz')
+    return lzma.LZMADecompressor()
+
+
+# Maps each compression to its magic bytes and its decompressor
+COMPRESSIONS = {
+    'gz': (b'\x1f\x8b', lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)),
+    'bz2': (b'BZh', bz2.BZ2Decompressor),
+    'xz': (b'\xfd7zXZ\x00', _lzma_decompressor),
+}
+_COMPRESSED_EXTENSIONS = {'gz': 'gz', 'gzip': 'gz', 'bz2': 'bz2', 'xz': 'xz',
+                          'lzma': 'xz'}
+
+
+def split_extension(path):
+    """Works out a file's format and compression from its name.
+
+    Parameters
+    ----------
+    path : string
+
+    Returns
+    -------
+    tuple
+        (filetype, compression).  'library.sdf.gz' gives ('sdf', 'gz') and
+        'water.cml' gives ('cml', None).  The filetype is whatever the
+        extension is, registered or not, or '' if there isn't one.
+    """
+
+    root, extension = os.path.splitext(path)
+    extension = extension.lstrip('.').lower()
+    compression = _COMPRESSED_EXTENSIONS.get(extension)
+    if compression is not None:
+        extension = os.path.splitext(root)[1].lstrip('.').lower()
+    return extension, compression
+
+
+def detect_compression(head):
+    """The compression whose magic bytes `head` starts with, or None."""
+
+    for compression, (magic, _) in COMPRESSIONS.iteritems():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def detect_format(head):
+    """The registered format whose files start like `head` does.
+
+    Returns
+    -------
+    FileFormat
+        The format, or None if none of them recognize it.
+    """
+
+    # SMILES accepts the most, so it is tried last
+    for name in sorted(FORMATS, key=lambda name: name == 'smi'):
+        sniff = FORMATS[name].sniff
+        if sniff is not None and sniff(head):
+            return FORMATS[name]
+    return None
+
+
+def _peek(file_, size):
+    """Up to the first `size` bytes of a buffered file, without using them."""
+
+    # peek returns what is in the buffer, which can be more or less than asked;
+    # less only happens when the buffer holds the rest of the file (or the
+    # whole first chunk of it), which is plenty to go by
+    return file_.peek(size)[:size]
+
+
+class CompoundFile(io.BufferedReader):
+    """An open molecule file, decompressed as it is read.
+
+    Made by `open_compound_file`.  It is read like any other file, and can be
+    passed to a format's parser or `iterparse`.
+
+    Attributes
+    ----------
+    format : FileFormat
+        The format of the file.
+    compression : string
+        The compression the file was read through, or None.
+    """
+
+    format = None
+    compression = None
+
+
+def open_compound_file(source, filetype=None, compression=None,
+                       buffer_size=BUFFER_SIZE):
+    """Opens a molecule file for reading, working out whatever isn't given.
+
+    Parameters
+    ----------
+    source : string or file-like object
+        A path, or a file opened in binary mode.
+    filetype : string, optional
+        The format (any of its extensions).  By default it comes from the
+        extension of the path, or failing that from the start of the
+        (decompressed) file.
+    compression : string, optional
+        One of the COMPRESSIONS, or 'none'.  By default it comes from the
+        extension of the path, or failing that from the first bytes of the
+        file.
+    buffer_size : int, optional
+        How many (decompressed) bytes are read ahead of the parser.
+
+    Returns
+    -------
+    CompoundFile
+        The open file.  Closing it closes the file it opened from a path, but
+        never a file that was passed in.
+
+    Raises
+    ------
+    UnsupportedFileTypeException
+        If the format or compression isn't supported, or couldn't be worked
+        out.
+    """
+
+    if isinstance(source, basestring):
+        extension, extension_compression = split_extension(source)
+        if filetype is None and extension in _EXTENSIONS:
+            filetype = extension
+        if compression is None:
+            compression = extension_compression
+        raw = io.open(source, 'rb', buffering=buffer_size)
+    elif hasattr(source, 'peek'):
+        raw = source
+    else:
+        raw = io.BufferedReader(_Unbuffered(source, close=False),
+                                buffer_size)
+    opened_here = raw is not source
+
+    try:
+        if compression is None:
+            compression = detect_compression(_peek(raw, 8))
+        if compression not in (None, 'none'):
+            try:
+                decompressor = COMPRESSIONS[compression][1]
+            except KeyError:
+                raise UnsupportedFileTypeException(
+                    "Unsupported compression {}", compression)
+            # Fail now, rather than on the first read
+            decompressor()
+            opened = CompoundFile(
+                _DecompressingReader(raw, decompressor, opened_here),
+                buffer_size)
+        else:
+            compression = None
+            opened = CompoundFile(_Unbuffered(raw, opened_here), buffer_size)
+
+        if filetype is not None:
+            opened.format = get_format(filetype)
+        else:
+            opened.format = detect_format(_peek(opened, _HEAD_SIZE))
+            if opened.format is None:
+                raise UnsupportedFileTypeException(
+                    "Couldn't work out the format of {}",
+                    getattr(source, 'name', source))
+    except Exception:
+        if opened_here:
+            raw.close()
+        raise
+    opened.compression = compression
+    return opened
+
+
+class _Unbuffered(io.RawIOBase):
+    """Presents any file-like object with a `read` method as a raw stream."""
+
+    def __init__(self, file_, close=True):
+        super(_Unbuffered, self).__init__()
+        self._file = file_
+        self._close = close
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer_):
+        data = self._file.read(len(buffer_))
+        buffer_[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed and self._close:
+            self._file.close()
+        super(_Unbuffered, self).close()
+
+
+def open_for_writing(path, compression=None):
+    """Opens a file for writing, compressing it if its extension (or
+    `compression`) says to.
+
+    Parameters
+    ----------
+    path : string
+    compression : string, optional
+        'gz', 'bz2', 'xz' or 'none'.  By default it comes from the extension.
+
+    Returns
+    -------
+    file-like object
+    """
+
+    if compression is None:
+        compression = split_extension(path)[1]
+    if compression in (None, 'none'):
+        return open(path, 'wb')
+    if compression == 'gz':
+        return gzip.open(path, 'wb')
+    if compression == 'bz2':
+        return bz2.BZ2File(path, 'wb')
+    if compression == 'xz' and lzma is not None:
+        return lzma.LZMAFile(path, 'wb')
+    raise UnsupportedFileTypeException("Unsupported compression {}",
+                                       compression)
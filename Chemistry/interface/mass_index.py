@@ -0,0 +1,241 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""An in-memory index of a library's molecular weights and formulas, for
+range and isomer queries over millions of compounds.
+
+The weights are kept in a sorted NumPy array, with the id and formula of each
+entry in arrays alongside it, so every compound between two weights is a pair
+of binary searches (`numpy.searchsorted`) and a slice.  Formulas are kept as
+numbers, with a dict from each formula to its number; the entries are also
+grouped by that number (in arrays laid out like a sparse matrix's rows), so
+the isomers of a formula are a dict lookup and another slice.
+
+Entries can be added one at a time as a library is read (the loaders of
+`compound_utility` take an index to add to).  They are held back until the
+next query, and then merged into the sorted arrays all at once, so loading a
+library costs one sort rather than one insertion into a large array per
+compound.
+
+An index is saved as a directory of `.npy` files, which `load` can map into
+memory rather than read, so opening an index of millions of entries only
+reads the (few) formulas.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import os
+
+import numpy as np
+
+
+_FILES = ('masses', 'identifiers', 'codes', 'formulas')
+
+
+class MassIndex(object):
+    """Molecular weights and formulas, indexed for queries.
+
+    Attributes
+    ----------
+    masses : numpy.ndarray
+        The molecular weight of every entry, in increasing order.
+    identifiers : numpy.ndarray
+        The id of every entry, in the order of `masses`.
+    """
+
+    def __init__(self):
+        self._masses = np.empty(0)
+        self._identifiers = np.empty(0, np.int64)
+        self._codes = np.empty(0, np.int32)
+        self._formulas = []
+        self._numbers = {}
+        # The weight, id and formula number of each entry added since the
+        # last query
+        self._pending = ([], [], [])
+        self._groups = None
+
+    def __len__(self):
+        return len(self._masses) + len(self._pending[0])
+
+    def add(self, compound, identifier=None):
+        """Adds a compound.
+
+        Parameters
+        ----------
+        compound : Compound
+        identifier : int, optional
+            The id to file it under.  Defaults to the number of entries before
+            it, so the compounds of a library are numbered in the order they
+            were read.
+
+        Returns
+        -------
+        int
+            The id.
+        """
+
+        return self.add_entry(compound.molecular_weight, compound.formula,
+                              identifier)
+
+    def add_entry(self, mass, formula, identifier=None):
+        """Adds an entry without a compound.
+
+        Parameters
+        ----------
+        mass : float
+            The molecular weight.
+        formula : string
+            The formula, in Hill order (see `Compound.formula`).
+        identifier : int, optional
+            As for `add`.
+
+        Returns
+        -------
+        int
+            The id.
+        """
+
+        if identifier is None:
+            identifier = len(self)
+        code = self._numbers.get(formula)
+        if code is None:
+            code = self._numbers[formula] = len(self._formulas)
+            self._formulas.append(formula)
+        masses, identifiers, codes = self._pending
+        masses.append(mass)
+        identifiers.append(identifier)
+        codes.append(code)
+        return identifier
+
+    def _flush(self):
+        """Merges the entries added since the last query into the sorted
+        arrays.
+        """
+
+        masses, identifiers, codes = self._pending
+        if not masses:
+            return
+        self._pending = ([], [], [])
+        masses = np.array(masses, float)
+        order = np.argsort(masses, kind='mergesort')
+        # After any entries of the same weight, so ties stay in the order they
+        # were added
+        positions = np.searchsorted(self._masses, masses[order], 'right')
+        self._masses = np.insert(self._masses, positions, masses[order])
+        self._identifiers = np.insert(
+            self._identifiers, positions,
+            np.array(identifiers, np.int64)[order])
+        self._codes = np.insert(self._codes, positions,
+                                np.array(codes, np.int32)[order])
+        self._groups = None
+
+    @property
+    def masses(self):
+        self._flush()
+        return self._masses
+
+    @property
+    def identifiers(self):
+        self._flush()
+        return self._identifiers
+
+    def mass_range(self, low, high):
+        """The entries with a molecular weight from `low` to `high`
+        (inclusive).
+
+        Returns
+        -------
+        numpy.ndarray
+            Their ids, lightest first.
+        """
+
+        self._flush()
+        start = np.searchsorted(self._masses, low, 'left')
+        stop = np.searchsorted(self._masses, high, 'right')
+        return self._identifiers[start:stop]
+
+    def near(self, mass, tolerance):
+        """The entries within `tolerance` of a molecular weight, lightest
+        first.
+        """
+
+        return self.mass_range(mass - tolerance, mass + tolerance)
+
+    def isomers(self, formula):
+        """The entries with a formula.
+
+        Parameters
+        ----------
+        formula : string
+            The formula, in Hill order.
+
+        Returns
+        -------
+        numpy.ndarray
+            Their ids, lightest first.  Isomers added by `add` all have the
+            same weight, and entries of the same weight are in the order they
+            were added.  Empty if there are none.
+        """
+
+        self._flush()
+        code = self._numbers.get(formula)
+        if code is None:
+            return self._identifiers[:0]
+        if self._groups is None:
+            order = np.argsort(self._codes, kind='mergesort')
+            starts = np.searchsorted(self._codes[order],
+                                     np.arange(len(self._formulas) + 1))
+            self._groups = self._identifiers[order], starts
+        members, starts = self._groups
+        return members[starts[code]:starts[code + 1]]
+
+    def formulas(self):
+        """Every formula in the index, in the order they were first added."""
+
+        return list(self._formulas)
+
+    def save(self, directory):
+        """Writes the index to a directory of `.npy` files, making the
+        directory if it doesn't exist.
+        """
+
+        self._flush()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        arrays = {'masses': self._masses, 'identifiers': self._identifiers,
+                  'codes': self._codes,
+                  'formulas': np.array(self._formulas, np.string_)}
+        for name in _FILES:
+            np.save(os.path.join(directory, name + '.npy'), arrays[name])
+
+    @classmethod
+    def load(cls, directory, mmap=False):
+        """Reads an index that `save` wrote.
+
+        Parameters
+        ----------
+        directory : string
+            The directory it was saved to.
+        mmap : bool, optional
+            Whether to map the weights, ids and formula numbers into memory
+            rather than read them.  The index can still be added to; the first
+            query after that reads them in.
+
+        Returns
+        -------
+        MassIndex
+        """
+
+        mode = 'r' if mmap else None
+        index = cls()
+        index._masses, index._identifiers, index._codes = (
+            np.load(os.path.join(directory, name + '.npy'), mmap_mode=mode)
+            for name in _FILES[:3])
+        formulas = np.load(os.path.join(directory, 'formulas.npy'))
+        index._formulas = [str(formula) for formula in formulas]
+        index._numbers = {formula: code
+                          for code, formula in enumerate(index._formulas)}
+        return index
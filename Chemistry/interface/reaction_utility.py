@@ -27,11 +27,19 @@ I would expect that the general process of a reaction should be as follows:
 __author__ = "Dan Obermiller"
 
 
+import copy
+import itertools
+import Queue
+import threading
 from collections import namedtuple
 
 import networkx as nx
 
+from Chemistry.base.compounds import Compound
+from Chemistry.base.products import EquilibriumProducts
+from Chemistry.base.reactants import Acid, Base
 from Chemistry.reactions._reactions import Conditions
+from Chemistry.reactions.network import available_reactions
 from Chemistry.exceptions.ReactionErrors import ReactionError, NoReactionError
 
 
@@ -172,3 +180,274 @@ def build_reaction_conditions(molecules, solvent, **kwargs):
     cond_dict.update(kwargs)
     cond = Conditions(cond_dict)
     return cond
+
+
+def assign_roles(compound, info):
+    """Wraps a compound in the roles described by a molecule's information.
+
+    Parameters
+    ----------
+    compound : Compound
+        The compound being wrapped.
+    info : dict
+        Information about the molecule (usually the `other_info` read from a
+        file).  An 'acidic_point' key marks the most acidic hydrogen and a
+        'basic_point' key the most basic atom; their pKas are read from
+        'acid_pka' and 'base_pka' respectively, falling back to 'pka'.  Points
+        that aren't atoms of this compound are ignored, so the same info can be
+        used for every molecule separated from a single canvas or file.
+
+    Returns
+    -------
+    roles : list
+        Zero or more Acid and Base objects.
+    """
+
+    roles = []
+    for point, pka, role in [('acidic_point', 'acid_pka', Acid),
+                             ('basic_point', 'base_pka', Base)]:
+        if info.get(point) in compound.atoms:
+            value = info.get(pka, info.get('pka'))
+            if value is None:
+                raise ValueError("A {} needs a {} or a pka".format(point, pka))
+            roles.append(role(compound, info[point], float(value)))
+    return roles
+
+
+def _describe_products(result):
+    """Turns the result of a reaction into JSON friendly dictionaries."""
+
+    equilibrium = isinstance(result, EquilibriumProducts)
+    if equilibrium:
+        ratio = result.ratio
+        result = result.products
+    products = []
+    for kind, group in [('major', result.major), ('minor', result.minor)]:
+        for product in group:
+            if product.compound is None:
+                continue
+            described = product.compound.to_dict()
+            described['percentage'] = product.percentage
+            described['kind'] = kind
+            if equilibrium:
+                described['ratio'] = ratio
+            products.append(described)
+    return equilibrium, products
+
+
+def react_molecules(atoms, bonds, other=None, reactions=None, solvent=None,
+                    **kwargs):
+    """Runs the whole reaction pipeline over a set of atoms and bonds.
+
+    This is steps 1 through 5 described above: the atoms and bonds are split
+    into molecules, each molecule becomes a Compound (wrapped as an Acid or a
+    Base where `other` says so), the conditions are built, and then every
+    reaction is tried with every combination of roles it accepts.
+
+    Parameters
+    ----------
+    atoms : dict
+        Every atom, in the form the Compound constructor takes.
+    bonds : dict
+        Every bond, in the form the Compound constructor takes.
+    other : dict, optional
+        Other information; it is added to every molecule and used to assign
+        roles (see `assign_roles`).
+    reactions : list, optional
+        The `_Reaction` subclasses to try.  Defaults to every reaction that
+        declares its reactant types.
+    solvent : Solvent, optional
+        The solvent in the reaction.
+    kwargs
+        Passed on to `build_reaction_conditions`.
+
+    Returns
+    -------
+    results : list
+        A dictionary per attempted reaction, holding the 'reaction' name, the
+        ids of its 'reactants' and either its 'products' (flattened compounds
+        with their 'percentage', and the equilibrium 'ratio' of products to
+        reactants if there is one) and whether it reached an 'equilibrium', or
+        the 'error' that stopped it.
+    """
+
+    if other is None:
+        other = {}
+    if reactions is None:
+        reactions = available_reactions()
+
+    compounds, roles = [], []
+    molecules = separate_molecules(atoms, bonds)
+    for i, molecule in enumerate(molecules, 1):
+        info = dict(other)
+        if len(molecules) > 1:
+            info['id'] = '{} {}'.format(other.get('id', 'Molecule'), i)
+        add_other_to_molecule(molecule, info)
+        compound = Compound(molecule['atoms'], molecule['bonds'],
+                            molecule['other_info'])
+        compounds.append(compound)
+        roles.extend(assign_roles(compound, other))
+
+    conditions = build_reaction_conditions(compounds, solvent, **kwargs)
+
+    results = []
+    for reaction in reactions:
+        pools = [[role for role in roles if isinstance(role, typ)]
+                 for typ in reaction.reactant_types]
+        for members in itertools.product(*pools):
+            result = {'reaction': reaction.__name__,
+                      'reactants': [member.other_info.get('id')
+                                    for member in members]}
+            try:
+                outcome = reaction(*(members + (conditions,))).react()
+            except ReactionError as err:
+                result['error'] = str(err)
+            else:
+                result['equilibrium'], result['products'] = \
+                    _describe_products(outcome)
+            results.append(result)
+    return results
+
+
+ReactionResult = namedtuple('ReactionResult', ['request', 'results', 'error'])
+
+
+class ReactionRunner(object):
+    """Runs `react_molecules` in the background, so that an interface doesn't
+    freeze while a reaction is worked out.
+
+    Only the most recent request matters: submitting a new one (or calling
+    `cancel`) makes every earlier request stale.  Stale requests that haven't
+    started are skipped, and the results of those that were already running
+    are thrown away.
+
+    Results are handed back on the thread that calls `poll`, which lets a GUI
+    poll from its own event loop (for example with Kivy's Clock) and update
+    itself safely.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called by `poll` with each ReactionResult.  Without a callback `poll`
+        just returns them.
+    react : callable, optional
+        What does the work; it is called as `react(atoms, bonds, other,
+        **kwargs)`.  Defaults to `react_molecules`.
+
+    Attributes
+    ----------
+    callback : callable
+    cancelled : int
+        How many requests were skipped or had their results thrown away.
+    """
+
+    def __init__(self, callback=None, react=react_molecules):
+        self.callback = callback
+        self.cancelled = 0
+        self._react = react
+        self._jobs = Queue.Queue()
+        self._results = Queue.Queue()
+        self._lock = threading.Lock()
+        self._latest = 0
+        self._stale = 0
+        self._worker = threading.Thread(target=self._work,
+                                        name='ReactionRunner')
+        self._worker.daemon = True
+        self._worker.start()
+
+    def submit(self, atoms, bonds, other=None, **kwargs):
+        """Requests a reaction, making every earlier request stale.
+
+        The arguments are the same as for `react_molecules`.  They are copied,
+        so the caller is free to keep editing them.
+
+        Returns
+        -------
+        int
+            The request's number, which its ReactionResult will carry.
+        """
+
+        args = copy.deepcopy((atoms, bonds, other))
+        with self._lock:
+            self._latest += 1
+            self._stale = self._latest - 1
+            request = self._latest
+        self._jobs.put((request, args, kwargs))
+        return request
+
+    def cancel(self):
+        """Makes every request submitted so far stale."""
+
+        with self._lock:
+            self._stale = self._latest
+
+    def is_stale(self, request):
+        """Whether a request has been superseded or cancelled."""
+
+        return request <= self._stale
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            request, args, kwargs = job
+            if self.is_stale(request):
+                self._discard()
+                continue
+            try:
+                result = ReactionResult(request, self._react(*args, **kwargs),
+                                        None)
+            # Whatever goes wrong belongs to the caller, not to this thread
+            except Exception as err:
+                result = ReactionResult(request, None, err)
+            self._results.put(result)
+
+    def _discard(self):
+        with self._lock:
+            self.cancelled += 1
+
+    def poll(self, timeout=0):
+        """Hands back the results that have finished.
+
+        Parameters
+        ----------
+        timeout : number, optional
+            How long to wait for a result if none is ready.  0 doesn't wait at
+            all, and None waits for as long as it takes.
+
+        Returns
+        -------
+        list
+            The ReactionResults of the requests that are still current, in the
+            order they finished.  Each is passed to the callback as well.
+        """
+
+        finished = []
+        try:
+            if timeout != 0:
+                finished.append(self._results.get(timeout=timeout))
+            while True:
+                finished.append(self._results.get_nowait())
+        except Queue.Empty:
+            pass
+
+        delivered = []
+        for result in finished:
+            if self.is_stale(result.request):
+                self._discard()
+                continue
+            delivered.append(result)
+            if self.callback is not None:
+                self.callback(result)
+        return delivered
+
+    def shutdown(self, wait=True):
+        """Stops the runner once the request it is working on is done.
+        Pending requests are cancelled.
+        """
+
+        self.cancel()
+        self._jobs.put(None)
+        if wait:
+            self._worker.join()
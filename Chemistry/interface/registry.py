@@ -0,0 +1,387 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""A registry of compounds kept in a local SQLite file, so that molecules seen
+in one run don't have to be parsed and perceived again in the next.
+
+Every compound is stored once, under its canonical key (its canonical SMILES,
+with aromatic rings written as aromatic; see `canonical_key`), as the flat
+atoms, bonds and other_info the constructor takes, along with its formula, its
+molecular weight and the descriptors (ring counts and the like) that would
+otherwise be perceived again every time it is loaded.  The key, formula and
+mass columns are indexed, so finding a compound, every compound with a formula
+or every compound in a mass window is a single indexed query.
+
+Compounds are added in batches, each in a single transaction, which is what
+makes adding a large library fast: SQLite commits a transaction by syncing
+the file, and syncing once per compound costs far more than the inserts do.
+
+A registry also remembers the files compounds were read from, by path, size
+and modification time.  `Chemistry.interface.compound_utility.
+compound_from_file` takes a registry, and loads a file it has seen before
+(and that hasn't changed since) from it instead of parsing it again.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+import json
+import os
+import sqlite3
+
+from Chemistry.base.compounds import Compound
+from Chemistry.parsing.SMILES import canonical_smiles
+
+
+DESCRIPTORS = collections.OrderedDict([
+    ('atoms', lambda compound: len(compound.atoms)),
+    ('heavy_atoms', lambda compound: sum(
+        1 for atom in compound.atoms.itervalues() if atom.symbol != 'H')),
+    ('bonds', lambda compound: len(compound.bonds)),
+    ('rings', lambda compound: len(compound.rings)),
+    ('aromatic_rings', lambda compound: len(compound.aromaticity.rings)),
+    ('components', lambda compound: len(compound.components)),
+    ('symmetry_classes',
+     lambda compound: len(set(compound.symmetry_classes.itervalues())))])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS compounds (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    formula TEXT NOT NULL,
+    mass REAL NOT NULL,
+    atoms TEXT NOT NULL,
+    bonds TEXT NOT NULL,
+    other_info TEXT NOT NULL,
+    descriptors TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS compounds_formula ON compounds (formula);
+CREATE INDEX IF NOT EXISTS compounds_mass ON compounds (mass);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    compound INTEGER NOT NULL REFERENCES compounds (id)
+);
+"""
+# SQLite allows at most 999 parameters in a statement
+_CHUNK = 900
+
+
+def canonical_key(compound):
+    """The key a compound is registered under.
+
+    Parameters
+    ----------
+    compound : Compound
+
+    Returns
+    -------
+    string
+        The compound's canonical SMILES, with the bonds of its aromatic rings
+        written as aromatic.  Compounds that are the same up to their atom and
+        bond keys and the Kekule structures of their aromatic rings get the
+        same key, and compounds with the same key are the same molecule.
+    """
+
+    return canonical_smiles(compound, aromatic=True)
+
+
+Record = collections.namedtuple('Record', ['id', 'key', 'formula', 'mass',
+                                           'descriptors'])
+
+
+class CompoundRegistry(object):
+    """Compounds stored in an SQLite file.
+
+    Parameters
+    ----------
+    path : string
+        The database file.  It is made if it doesn't exist; ':memory:' keeps
+        the registry in memory for as long as it is open.
+    descriptors : dict, optional
+        Maps the name of each descriptor to a function computing it from a
+        compound.  Defaults to `DESCRIPTORS`.  The values have to be JSON
+        serializable.
+
+    Notes
+    -----
+    Can be used as a context manager, which closes it at the end.
+    """
+
+    def __init__(self, path, descriptors=None):
+        self.path = path
+        self.descriptors = DESCRIPTORS if descriptors is None else descriptors
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        """Closes the database."""
+
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM compounds').fetchone()[0]
+
+    def __contains__(self, compound):
+        return self.find(compound) is not None
+
+    def _row(self, compound, key):
+        """The values of a compound's row, less its id."""
+
+        flat = compound.to_dict()
+        descriptors = {name: function(compound)
+                       for name, function in self.descriptors.iteritems()}
+        return (key, compound.formula, compound.molecular_weight,
+                json.dumps(flat['atoms'], sort_keys=True),
+                json.dumps(flat['bonds'], sort_keys=True),
+                json.dumps(flat['other_info'], sort_keys=True),
+                json.dumps(descriptors, sort_keys=True))
+
+    def _ids(self, keys):
+        """The ids of the compounds with the given keys, by key."""
+
+        found = {}
+        for start in xrange(0, len(keys), _CHUNK):
+            chunk = keys[start:start + _CHUNK]
+            found.update(self._connection.execute(
+                'SELECT key, id FROM compounds WHERE key IN ({})'.format(
+                    ', '.join('?' * len(chunk))), chunk))
+        return found
+
+    def add(self, compound, source=None):
+        """Adds a compound, unless it is already registered.
+
+        Parameters
+        ----------
+        compound : Compound
+        source : string, optional
+            The path of the file the compound was read from, which is
+            remembered along with its size and modification time.
+
+        Returns
+        -------
+        int
+            The compound's id, which is that of the compound already
+            registered under its key if there is one.
+        """
+
+        identifier = self.add_many([compound])[0]
+        if source is not None:
+            self.remember(source, identifier)
+        return identifier
+
+    def add_many(self, compounds, batch_size=1000):
+        """Adds many compounds, a batch at a time.
+
+        Parameters
+        ----------
+        compounds : iterable
+            The compounds.  They are read lazily, so this can be a generator
+            over a large file.
+        batch_size : int, optional
+            How many compounds are added in each transaction.
+
+        Returns
+        -------
+        list
+            The id of each compound, in order.  A compound that was already
+            registered (or appears more than once) keeps the id it was first
+            given, along with the other_info it was first given.
+        """
+
+        identifiers = []
+        batch = []
+        for compound in compounds:
+            batch.append(compound)
+            if len(batch) >= batch_size:
+                identifiers.extend(self._add_batch(batch))
+                batch = []
+        if batch:
+            identifiers.extend(self._add_batch(batch))
+        return identifiers
+
+    def _add_batch(self, compounds):
+        """Adds compounds in a single transaction."""
+
+        keys = [canonical_key(compound) for compound in compounds]
+        known = self._ids(list(set(keys)))
+        rows = []
+        for compound, key in zip(compounds, keys):
+            if key not in known:
+                known[key] = None
+                rows.append(self._row(compound, key))
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO compounds (key, formula, mass, atoms, bonds, '
+                'other_info, descriptors) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        known.update(self._ids([row[0] for row in rows]))
+        return [known[key] for key in keys]
+
+    def remember(self, path, identifier):
+        """Records that a file holds a registered compound.
+
+        Parameters
+        ----------
+        path : string
+            The file's path.
+        identifier : int
+            The compound's id.
+        """
+
+        status = os.stat(path)
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO sources (path, size, modified, '
+                'compound) VALUES (?, ?, ?, ?)',
+                (os.path.abspath(path), status.st_size, status.st_mtime,
+                 identifier))
+
+    def from_source(self, path):
+        """The id of the compound read from a file, if the file hasn't
+        changed since.
+
+        Parameters
+        ----------
+        path : string
+            The file's path.
+
+        Returns
+        -------
+        int or None
+            None if the file was never read, or its size or modification time
+            have changed since.
+        """
+
+        found = self._connection.execute(
+            'SELECT size, modified, compound FROM sources WHERE path = ?',
+            (os.path.abspath(path),)).fetchone()
+        if found is None:
+            return None
+        status = os.stat(path)
+        size, modified, identifier = found
+        if size != status.st_size or modified != status.st_mtime:
+            return None
+        return identifier
+
+    def find(self, compound):
+        """The id of a compound, or None if it isn't registered."""
+
+        return self.lookup(canonical_key(compound))
+
+    def lookup(self, key):
+        """The id of the compound with a canonical key, or None."""
+
+        found = self._connection.execute(
+            'SELECT id FROM compounds WHERE key = ?', (key,)).fetchone()
+        return found[0] if found is not None else None
+
+    def with_formula(self, formula):
+        """The ids of every compound with a formula (in Hill order, as
+        `Compound.formula` gives it), in the order they were added.
+        """
+
+        return [identifier for identifier, in self._connection.execute(
+            'SELECT id FROM compounds WHERE formula = ? ORDER BY id',
+            (formula,))]
+
+    def in_mass_range(self, low, high):
+        """The ids of every compound with a molecular weight from `low` to
+        `high` (inclusive), lightest first.
+        """
+
+        return [identifier for identifier, in self._connection.execute(
+            'SELECT id FROM compounds WHERE mass BETWEEN ? AND ? '
+            'ORDER BY mass, id', (low, high))]
+
+    def record(self, identifier):
+        """Everything stored about a compound except its structure.
+
+        Parameters
+        ----------
+        identifier : int
+            The compound's id.
+
+        Returns
+        -------
+        Record
+            The id, key, formula, mass and descriptors (as a dict).
+
+        Raises
+        ------
+        KeyError
+            If there is no compound with the id.
+        """
+
+        found = self._connection.execute(
+            'SELECT id, key, formula, mass, descriptors FROM compounds '
+            'WHERE id = ?', (identifier,)).fetchone()
+        if found is None:
+            raise KeyError(identifier)
+        return Record(*(found[:4] + (json.loads(found[4]),)))
+
+    def get(self, identifier):
+        """Rebuilds a registered compound.
+
+        Parameters
+        ----------
+        identifier : int
+            The compound's id.
+
+        Returns
+        -------
+        Compound
+
+        Raises
+        ------
+        KeyError
+            If there is no compound with the id.
+        """
+
+        found = self._connection.execute(
+            'SELECT atoms, bonds, other_info FROM compounds WHERE id = ?',
+            (identifier,)).fetchone()
+        if found is None:
+            raise KeyError(identifier)
+        return _load(*found)
+
+    def compounds(self, identifiers=None):
+        """Rebuilds many registered compounds.
+
+        Parameters
+        ----------
+        identifiers : iterable, optional
+            The ids of the compounds.  Defaults to every compound, in the
+            order they were added.
+
+        Yields
+        ------
+        Compound
+        """
+
+        if identifiers is None:
+            for row in self._connection.execute(
+                    'SELECT atoms, bonds, other_info FROM compounds '
+                    'ORDER BY id'):
+                yield _load(*row)
+        else:
+            for identifier in identifiers:
+                yield self.get(identifier)
+
+
+def _load(atoms, bonds, other_info):
+    """Builds a compound from the JSON columns of its row."""
+
+    bonds = {key: (first, second, rest)
+             for key, (first, second, rest) in json.loads(bonds).iteritems()}
+    return Compound(json.loads(atoms), bonds, json.loads(other_info))
@@ -0,0 +1,170 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""A uniform grid over the positions of the atoms drawn on the canvas.
+
+The GUI uses it to find the atom under a touch and the atoms inside a selection
+rectangle without scanning every atom.  Nothing here depends on Kivy.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import math
+
+
+class SpatialIndex(object):
+    """Points (atom positions) bucketed into square cells.
+
+    A lookup only visits the cells that overlap the area being searched, so as
+    long as the cells are about as large as the areas searched a hit-test
+    looks at a handful of points no matter how many are on the canvas.
+
+    Parameters
+    ----------
+    cell_size : number, optional
+        The width and height of each cell.
+
+    Attributes
+    ----------
+    cell_size : number
+    cells : dict
+        Maps each non-empty cell, as an (i, j) pair, to a dictionary of the
+        points inside it: {key: (x, y)}.
+    """
+
+    def __init__(self, cell_size=32):
+        if cell_size <= 0:
+            raise ValueError(
+                "cell_size must be positive (not {})".format(cell_size))
+        self.cell_size = cell_size
+        self.cells = {}
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)),
+                int(math.floor(y / self.cell_size)))
+
+    def position(self, key):
+        """The (x, y) position of `key`.
+
+        Raises
+        ------
+        KeyError
+            If `key` isn't in the index.
+        """
+
+        return self._positions[key]
+
+    def insert(self, key, pos):
+        """Adds a point, or moves it if `key` is already in the index.
+
+        Parameters
+        ----------
+        key : hashable
+            The point's key, for example the atom's key.
+        pos : tuple
+            The point's (x, y) position.
+        """
+
+        if key in self._positions:
+            self.remove(key)
+        x, y = pos
+        self._positions[key] = (x, y)
+        self.cells.setdefault(self._cell(x, y), {})[key] = (x, y)
+
+    def remove(self, key):
+        """Removes a point.
+
+        Raises
+        ------
+        KeyError
+            If `key` isn't in the index.
+        """
+
+        x, y = self._positions.pop(key)
+        cell = self._cell(x, y)
+        del self.cells[cell][key]
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def clear(self):
+        """Removes every point."""
+
+        self.cells.clear()
+        self._positions.clear()
+
+    def query_rect(self, left, bottom, right, top):
+        """Finds every point inside a rectangle (edges included).
+
+        Parameters
+        ----------
+        left, bottom, right, top : number
+            The edges of the rectangle.  They may be given in either order, so
+            a rectangle dragged up and to the left works too.
+
+        Returns
+        -------
+        list
+            The keys of the points inside, in no particular order.
+        """
+
+        left, right = min(left, right), max(left, right)
+        bottom, top = min(bottom, top), max(bottom, top)
+        first_i, first_j = self._cell(left, bottom)
+        last_i, last_j = self._cell(right, top)
+
+        found = []
+        # A large rectangle over a sparse canvas has more cells than points,
+        # in which case looking at each occupied cell is cheaper.
+        if (last_i - first_i + 1) * (last_j - first_j + 1) > len(self.cells):
+            cells = (points for (i, j), points in self.cells.iteritems()
+                     if first_i <= i <= last_i and first_j <= j <= last_j)
+        else:
+            cells = (self.cells[i, j]
+                     for i in xrange(first_i, last_i + 1)
+                     for j in xrange(first_j, last_j + 1)
+                     if (i, j) in self.cells)
+        for points in cells:
+            for key, (x, y) in points.iteritems():
+                if left <= x <= right and bottom <= y <= top:
+                    found.append(key)
+        return found
+
+    def hit(self, pos, margin):
+        """Finds the point closest to `pos`, within a square of half-width
+        `margin` around it.
+
+        Parameters
+        ----------
+        pos : tuple
+            The (x, y) position, for example of a touch.
+        margin : number
+            How far away (in x and in y) a point can be and still count.
+
+        Returns
+        -------
+        hashable
+            The key of the closest point, or None if there isn't one.
+        """
+
+        x, y = pos
+        best, best_distance = None, None
+        for key in self.query_rect(x - margin, y - margin,
+                                   x + margin, y + margin):
+            px, py = self._positions[key]
+            distance = (px - x) ** 2 + (py - y) ** 2
+            if best is None or distance < best_distance:
+                best, best_distance = key, distance
+        return best
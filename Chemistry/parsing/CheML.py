@@ -10,8 +10,11 @@ __author__ = "Dan Obermiller"
 
 import json
 
-from lxml import etree
-from lxml import builder as lb
+from Chemistry import profiling
+
+# lxml is imported by the methods that need it rather than up here, so that
+# importing this module (and everything that registers it as a filetype) stays
+# cheap until a CML file is actually read or written.
 
 
 class CMLParser(object):
@@ -29,6 +32,7 @@ class CMLParser(object):
     this more generalizable.
     """
 
+    @profiling.timed('cml.parse')
     def __init__(self, CML_file):
         self.CML_file = CML_file
         self.bonds = {}
@@ -38,6 +42,8 @@ class CMLParser(object):
                          'bonds': self.bonds,
                          'other_info': self.other}
 
+        from lxml import etree
+
         self.CML_tree = etree.iterparse(self.CML_file)
         atom, bond = True, False
         last = ''
@@ -137,6 +143,8 @@ class CMLBuilder(object):
         return CMLBuilder(m)
 
     def __init__(self, molecule_dict):
+        from lxml import builder as lb
+
         self.atoms = molecule_dict['atoms']
         self.bonds = molecule_dict['bonds']
         self.attribs = molecule_dict['other_info']
@@ -174,7 +182,10 @@ class CMLBuilder(object):
 
         cml_file.write(str(self))
 
+    @profiling.timed('cml.build')
     def __str__(self):
+        from lxml import etree
+
         return etree.tostring(self.CML, pretty_print=True)
 
     def __repr__(self):
@@ -0,0 +1,390 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Parser and builder for MDL molfiles and SD files (V2000).
+
+An SD file is a series of molfile records, each followed by its data fields
+and ended by a '$$$$' line.  `iterparse` streams the records of a file one at a
+time, so a library of any size is read in constant memory, and `build_index`
+finds where each record starts so that records can be read out of order (or
+shared out among processes) with `parse_record`.
+
+The atom and bond blocks are read by column, as the format defines them.
+Hydrogens that aren't written out are added as atoms, using the charges from
+the atom block and 'M  CHG' lines.  The title line becomes `other['id']` and
+each data field becomes `other[name]`.  Coordinates, stereo flags and other
+properties are skipped, and aromatic and query bonds aren't supported.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+from Chemistry import profiling
+from Chemistry.exceptions.ParseErrors import ParsingException
+from Chemistry.parsing.SMILES import implicit_hydrogens
+
+
+END = '$$$$'
+# The charge column of the atom block holds a code rather than the charge
+_CHARGE_CODES = {0: 0, 1: 3, 2: 2, 3: 1, 4: 0, 5: -1, 6: -2, 7: -3}
+
+
+def _error(msg):
+    # ParsingException formats its message with the filetype
+    return ParsingException('SDF', msg.replace('{', '{{').replace('}', '}}'))
+
+
+def _lines(sdf_file):
+    """The lines of a file, without their line endings."""
+
+    for line in iter(sdf_file.readline, ''):
+        yield line.rstrip('\r\n')
+
+
+def _parse(lines):
+    """Parses a single record from an iterator over lines.
+
+    Returns
+    -------
+    tuple
+        (atoms, bonds, other), or None if the lines ran out before a record
+        started.
+    """
+
+    title = next(lines, None)
+    while title is not None and title.strip() == END:
+        title = next(lines, None)
+    if title is None:
+        return None
+    # The program and timestamp line, then the comment line
+    header = [title, next(lines, None), next(lines, None)]
+    counts = next(lines, None)
+    if counts is None:
+        # Blank lines at the end of a file aren't a record
+        if not ''.join(line or '' for line in header).strip():
+            return None
+        raise _error("The record '{}' ends before its counts line".format(
+            title))
+    if 'V3000' in counts:
+        raise _error("V3000 records aren't supported")
+    try:
+        atom_count, bond_count = int(counts[0:3]), int(counts[3:6])
+    except ValueError:
+        raise _error("Bad counts line '{}'".format(counts))
+
+    # Line numbers in errors count from the record's title line
+    symbols, charges = [], []
+    for number in xrange(5, 5 + atom_count):
+        line = next(lines, '')
+        symbol = line[31:34].strip()
+        if not symbol:
+            raise _error("Bad atom line '{}' in '{}'".format(line, title))
+        symbols.append(symbol)
+        code = line[36:39].strip()
+        try:
+            charges.append(_CHARGE_CODES.get(int(code), 0) if code else 0)
+        except ValueError:
+            raise _error("Bad charge '{}' on line {} of '{}'".format(
+                code, number, title))
+
+    edges = []
+    for _ in xrange(bond_count):
+        line = next(lines, '')
+        try:
+            first, second, order = (int(line[0:3]), int(line[3:6]),
+                                    int(line[6:9]))
+        except ValueError:
+            raise _error("Bad bond line '{}' in '{}'".format(line, title))
+        if order not in (1, 2, 3):
+            raise _error("Bond type {} isn't supported".format(order))
+        edges.append((first, second, order))
+
+    other = {}
+    if title.strip():
+        other['id'] = title.strip()
+
+    # Properties, up to M  END.  'M  CHG' replaces every charge in the atom
+    # block.
+    charged = False
+    ended = False
+    for number, line in enumerate(lines, 5 + atom_count + bond_count):
+        if line.startswith('M  END'):
+            break
+        if line.strip() == END:
+            ended = True
+            break
+        if line.startswith('M  CHG'):
+            if not charged:
+                charges = [0] * atom_count
+                charged = True
+            values = line[9:].split()
+            try:
+                for atom, charge in zip(values[::2], values[1::2]):
+                    charges[int(atom) - 1] = int(charge)
+            except (ValueError, IndexError):
+                raise _error("Bad charges '{}' on line {} of '{}'".format(
+                    line, number, title))
+
+    # Data fields, up to $$$$
+    name, value = None, []
+    for line in ([] if ended else lines):
+        if line.strip() == END:
+            break
+        if line.startswith('>'):
+            start, stop = line.find('<'), line.find('>', 1)
+            name = line[start + 1:stop] if start != -1 else line[1:].strip()
+            value = []
+        elif name is not None:
+            if line.strip():
+                value.append(line)
+            else:
+                other[name] = '\n'.join(value)
+                name = None
+    if name is not None:
+        other[name] = '\n'.join(value)
+
+    return _to_dicts(symbols, charges, edges) + (other,)
+
+
+def _to_dicts(symbols, charges, edges):
+    """Builds the atoms and bonds dictionaries, adding hydrogens."""
+
+    atoms = {'a{}'.format(i): symbol for i, symbol in enumerate(symbols, 1)}
+    bonds = {}
+    used = [0] * (len(symbols) + 1)
+    for number, (first, second, order) in enumerate(edges, 1):
+        used[first] += order
+        used[second] += order
+        bonds['b{}'.format(number)] = ('a{}'.format(first),
+                                       'a{}'.format(second),
+                                       {'order': order, 'chirality': None})
+
+    atom_number, bond_number = len(atoms), len(bonds)
+    for index, symbol in enumerate(symbols, 1):
+        for _ in xrange(implicit_hydrogens(symbol, used[index],
+                                           charges[index - 1])):
+            atom_number += 1
+            bond_number += 1
+            key = 'a{}'.format(atom_number)
+            atoms[key] = 'H'
+            bonds['b{}'.format(bond_number)] = (
+                'a{}'.format(index), key, {'order': 1, 'chirality': None})
+    return atoms, bonds
+
+
+class SDFParser(object):
+    """Parser for molfiles and SD files.
+
+    Parameters
+    ----------
+    sdf_file : file-like object
+        The (open) file that contains the data.  Only the first record is read;
+        use `iterparse` to read them all.
+
+    Attributes
+    ----------
+    atoms, bonds, other : dict
+        The molecule, as the Compound constructor takes it.
+    """
+
+    @profiling.timed('sdf.parse')
+    def __init__(self, sdf_file):
+        parsed = _parse(_lines(sdf_file))
+        if parsed is None:
+            raise _error("No record in the file")
+        self._set(*parsed)
+
+    def _set(self, atoms, bonds, other):
+        self.atoms, self.bonds, self.other = atoms, bonds, other
+        self.molecule = {'atoms': self.atoms,
+                         'bonds': self.bonds,
+                         'other_info': self.other}
+
+    @classmethod
+    def _from_parsed(cls, parsed):
+        parser = cls.__new__(cls)
+        parser._set(*parsed)
+        return parser
+
+
+def iterparse(sdf_file):
+    """Parses every record of an SD file, one at a time.
+
+    Parameters
+    ----------
+    sdf_file : file-like object
+        The (open) file, positioned at the start of a record.
+
+    Yields
+    ------
+    SDFParser
+        A parser per record.
+    """
+
+    lines = _lines(sdf_file)
+    while True:
+        parsed = _parse(lines)
+        if parsed is None:
+            return
+        yield SDFParser._from_parsed(parsed)
+
+
+def build_index(sdf_file):
+    """Finds the byte offset of every record in an SD file.
+
+    Parameters
+    ----------
+    sdf_file : file-like object
+        The (open) file, positioned at the start of a record.  It should be
+        opened in binary mode, so that the offsets are true byte offsets.
+
+    Returns
+    -------
+    list
+        The offset at which each record starts.  Slicing it (`index[i::n]`)
+        is a cheap way to split a file among `n` workers.
+    """
+
+    offsets = []
+    position = sdf_file.tell()
+    start, content = True, False
+    for line in iter(sdf_file.readline, ''):
+        stripped = line.strip()
+        if stripped == END:
+            start = True
+        elif start:
+            offsets.append(position)
+            start, content = False, bool(stripped)
+        else:
+            content = content or bool(stripped)
+        position += len(line)
+    # Blank lines at the end of a file aren't a record
+    if not start and not content:
+        offsets.pop()
+    return offsets
+
+
+def parse_record(sdf_file, offset):
+    """Parses the record that starts at `offset` (see `build_index`).
+
+    Returns
+    -------
+    SDFParser
+    """
+
+    sdf_file.seek(offset)
+    return SDFParser(sdf_file)
+
+
+def _implied_charge(symbol, used):
+    """The charge an atom needs for a reader to add no hydrogens to it."""
+
+    if not implicit_hydrogens(symbol, used):
+        return 0
+    for charge in (1, -1, 2, -2):
+        if not implicit_hydrogens(symbol, used, charge):
+            return charge
+    return 0
+
+
+class SDFBuilder(object):
+    """Object used to build a molfile record.
+
+    Parameters
+    ----------
+    molecule_dict : dict
+        Dictionary storing all of the molecular information.
+
+    Notes
+    -----
+    Every atom, hydrogens included, is written out, along with whatever
+    charges stop a reader from adding more hydrogens to them (an ammonium
+    nitrogen gets +1, for example).  Compounds don't have coordinates, so all
+    of them are 0.  The 'id' in the other information becomes the title and
+    every other item a data field.
+    """
+
+    @classmethod
+    def from_compound(cls, comp):
+        """Generates an SDFBuilder object from a Compound object.
+
+        Parameters
+        ----------
+        comp : Compound
+            The compound to be written.
+
+        Returns
+        -------
+        SDFBuilder
+        """
+
+        return SDFBuilder(comp.to_dict())
+
+    def __init__(self, molecule_dict):
+        self.atoms = molecule_dict['atoms']
+        self.bonds = molecule_dict['bonds']
+        self.other = molecule_dict.get('other_info', {})
+
+    @staticmethod
+    def _number(key):
+        try:
+            return (0, int(key[1:]), key)
+        except ValueError:
+            return (1, 0, key)
+
+    @profiling.timed('sdf.build')
+    def __str__(self):
+        keys = sorted(self.atoms, key=self._number)
+        numbers = {key: i for i, key in enumerate(keys, 1)}
+        bonds = [self.bonds[key] for key in sorted(self.bonds,
+                                                   key=self._number)]
+        if len(keys) > 999 or len(bonds) > 999:
+            raise ValueError("V2000 records hold at most 999 atoms and bonds")
+
+        lines = [str(self.other.get('id', '')),
+                 '  pyCAOS',
+                 '',
+                 '{:3d}{:3d}  0  0  0  0  0  0  0  0999 V2000'.format(
+                     len(keys), len(bonds))]
+        for key in keys:
+            lines.append('{:10.4f}{:10.4f}{:10.4f} {:<3} 0  0  0  0  0  0  0'
+                         '  0  0  0  0  0'.format(0, 0, 0, self.atoms[key]))
+        used = dict.fromkeys(keys, 0)
+        for first, second, info in bonds:
+            order = int(info.get('order', 1))
+            used[first] += order
+            used[second] += order
+            lines.append('{:3d}{:3d}{:3d}  0'.format(
+                numbers[first], numbers[second], order))
+        charges = [(numbers[key], _implied_charge(self.atoms[key], used[key]))
+                   for key in keys]
+        charges = [pair for pair in charges if pair[1]]
+        for i in xrange(0, len(charges), 8):
+            chunk = charges[i:i + 8]
+            lines.append('M  CHG{:3d}'.format(len(chunk)) + ''.join(
+                ' {:3d} {:3d}'.format(atom, charge) for atom, charge in chunk))
+        lines.append('M  END')
+        for name in sorted(self.other):
+            if name == 'id':
+                continue
+            lines.append('>  <{}>'.format(name))
+            lines.append(str(self.other[name]))
+            lines.append('')
+        lines.append(END)
+        return '\n'.join(lines) + '\n'
+
+    def __repr__(self):
+        return str(self)
+
+    def to_file(self, sdf_file):
+        """Writes the record to file.
+
+        Parameters
+        ----------
+        sdf_file : file-like
+            The open file to which the compound should be written.
+        """
+
+        sdf_file.write(str(self))
@@ -0,0 +1,638 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Parser and builder for SMILES strings and files.
+
+A SMILES file holds one molecule per line: the SMILES string, optionally
+followed by whitespace and the molecule's id.  `SMILESParser` reads the first
+molecule of a file (like `CMLParser` does) and `iterparse` reads every line of
+one.  `SMILESBuilder` writes canonical SMILES, which `canonical_smiles` also
+provides as a compact key for comparing and caching compounds.
+
+Compounds store every hydrogen as an atom, so the parser adds the implicit
+hydrogens of the organic subset (and the hydrogens counted in brackets, such as
+[NH4+]) as atoms, and the builder folds hydrogens back into their neighbours.
+Charges, isotopes, atom classes and stereochemistry are read but not kept; a
+Compound works its charge out from its bonds.  Aromatic atoms are kekulized;
+the builder writes the Kekule form, unless it's asked to write the bonds of a
+compound's aromatic rings as aromatic, which makes a string that doesn't depend
+on which Kekule structure the compound was drawn with.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import re
+
+from Chemistry import profiling
+from Chemistry.base.aromaticity import kekulize
+from Chemistry.base.periodic_table import periodic_table
+from Chemistry.base.symmetry import canonical_ranks
+from Chemistry.exceptions.ParseErrors import ParsingException
+
+
+# The valences the organic subset may have without brackets, in the order
+# they're tried when adding implicit hydrogens
+_VALENCES = {'B': (3,), 'C': (4,), 'N': (3, 5), 'O': (2,), 'P': (3, 5),
+             'S': (2, 4, 6), 'F': (1,), 'Cl': (1,), 'Br': (1,), 'I': (1,)}
+_AROMATIC = {'b': 'B', 'c': 'C', 'n': 'N', 'o': 'O', 'p': 'P', 's': 'S'}
+_BOND_ORDERS = {'-': 1, '=': 2, '#': 3, ':': 1, '/': 1, '\\': 1}
+_BOND_SYMBOLS = {1: '', 2: '=', 3: '#'}
+# The order aromatic bonds are ranked and written with
+_AROMATIC_ORDER = 1.5
+
+_BRACKET = re.compile(r"""\[(?P<isotope>\d*)
+                          (?P<symbol>[A-Z][a-z]?|[bcnops]|se|as|\*)
+                          (?P<chirality>@*)
+                          (?:H(?P<hydrogens>\d*))?
+                          (?P<charge>[+-]\d*|\++|-+)?
+                          (?::(?P<class>\d+))?\]""", re.VERBOSE)
+
+
+def _error(msg):
+    # ParsingException formats its message with the filetype
+    return ParsingException('SMILES', msg.replace('{', '{{').replace('}', '}}'))
+
+
+def implicit_hydrogens(symbol, used, charge=0):
+    """How many hydrogens an atom gets if they aren't written out, going by
+    the usual valences of the organic subset.
+
+    Parameters
+    ----------
+    symbol : string
+        The atomic symbol.
+    used : int
+        The total order of the atom's bonds.
+    charge : int, optional
+        The atom's formal charge.  A charge takes a bond away from carbon
+        and the halogens (as in a carbocation), gives one to nitrogen, oxygen,
+        phosphorus and sulfur (as in ammonium) and moves boron with its sign
+        (as in borohydride).
+
+    Returns
+    -------
+    int
+        The number of hydrogens; 0 for elements outside the organic subset.
+    """
+
+    if symbol in ('C', 'F', 'Cl', 'Br', 'I'):
+        used += abs(charge)
+    elif symbol == 'B':
+        used += charge
+    else:
+        used -= charge
+    for valence in _VALENCES.get(symbol, ()):
+        if valence >= used:
+            return valence - used
+    return 0
+
+
+def parse_smiles(smiles):
+    """Parses a single SMILES string into the dictionaries a Compound takes.
+
+    Parameters
+    ----------
+    smiles : string
+        The SMILES string (without an id).
+
+    Returns
+    -------
+    atoms : dict
+        Maps 'a#' keys to atomic symbols.  The atoms written in the string come
+        first, in order, followed by their hydrogens.
+    bonds : dict
+        Maps 'b#' keys to (first, second, {'order': #, 'chirality': None}).
+
+    Raises
+    ------
+    ParsingException
+        If the string isn't valid SMILES, or can't be represented (for example
+        a quadruple bond, or aromatic atoms that can't be kekulized).
+    """
+
+    symbols = []            # the symbol of each atom, by index
+    hydrogens = []          # explicit hydrogen count, or None if implicit
+    aromatic = []
+    edges = []              # [first, second, order, aromatic] per bond
+    branches = []
+    rings = {}
+    previous = None
+    order = None
+    i, length = 0, len(smiles)
+
+    while i < length:
+        char = smiles[i]
+        if char in _BOND_ORDERS or char == '.':
+            if order is not None:
+                raise _error("Two bonds in a row at {} of {}".format(
+                    i, smiles))
+            order = '.' if char == '.' else char
+            i += 1
+            continue
+        elif char == '(':
+            if previous is None:
+                raise _error("Branch before any atom in {}".format(smiles))
+            branches.append(previous)
+            i += 1
+            continue
+        elif char == ')':
+            if not branches:
+                raise _error("Unmatched ) in {}".format(smiles))
+            previous = branches.pop()
+            i += 1
+            continue
+        elif char.isdigit() or char == '%':
+            if char == '%':
+                number = smiles[i + 1:i + 3]
+                if not number.isdigit() or len(number) != 2:
+                    raise _error("Bad ring number at {} of {}".format(
+                        i, smiles))
+                i += 3
+            else:
+                number = char
+                i += 1
+            if previous is None:
+                raise _error("Ring bond before any atom in {}".format(smiles))
+            if number in rings:
+                other, other_order = rings.pop(number)
+                if (other_order is not None and order is not None
+                        and other_order != order):
+                    raise _error("Conflicting ring bond {} in {}".format(
+                        number, smiles))
+                symbol = order if order is not None else other_order
+                edges.append(_edge(other, previous, symbol, aromatic))
+            else:
+                rings[number] = (previous, order)
+            order = None
+            continue
+
+        # Otherwise it's an atom
+        if char == '[':
+            match = _BRACKET.match(smiles, i)
+            if match is None:
+                raise _error("Bad bracket atom at {} of {}".format(i, smiles))
+            symbol = match.group('symbol')
+            if symbol != '*' and symbol.capitalize() not in periodic_table:
+                raise _error("Unknown element {} at {} of {}".format(
+                    symbol, i, smiles))
+            count = match.group('hydrogens')
+            hydrogens.append(0 if count is None else int(count or 1))
+            i = match.end()
+        elif smiles[i:i + 2] in ('Cl', 'Br'):
+            symbol = smiles[i:i + 2]
+            hydrogens.append(None)
+            i += 2
+        elif char in _VALENCES or char in _AROMATIC:
+            symbol = char
+            hydrogens.append(None)
+            i += 1
+        else:
+            raise _error("Unexpected {!r} at {} of {}".format(char, i, smiles))
+
+        if symbol == '*':
+            raise _error("Wildcard atoms aren't supported")
+        is_aromatic = symbol in _AROMATIC or symbol in ('se', 'as')
+        aromatic.append(is_aromatic)
+        symbols.append(symbol.capitalize() if is_aromatic else symbol)
+        current = len(symbols) - 1
+        if previous is not None and order != '.':
+            edges.append(_edge(previous, current, order, aromatic))
+        previous = current
+        order = None
+
+    if branches:
+        raise _error("Unmatched ( in {}".format(smiles))
+    if rings:
+        raise _error("Unclosed ring {} in {}".format(
+            ', '.join(sorted(rings)), smiles))
+    if order is not None:
+        raise _error("Dangling bond at the end of {}".format(smiles))
+
+    _kekulize(symbols, hydrogens, aromatic, edges, smiles)
+    return _to_dicts(symbols, hydrogens, edges)
+
+
+def _edge(first, second, symbol, aromatic):
+    """A bond between two atoms (by index) written with `symbol` (or nothing,
+    if `symbol` is None).
+    """
+
+    if symbol is None:
+        both = aromatic[first] and aromatic[second]
+        return [first, second, 1, both]
+    return [first, second, _BOND_ORDERS[symbol], symbol == ':']
+
+
+def _kekulize(symbols, hydrogens, aromatic, edges, smiles):
+    """Turns aromatic bonds into alternating single and double bonds.
+
+    Each aromatic atom that has a free valence needs exactly one double bond
+    among its aromatic bonds, which makes this a perfect matching problem
+    (see `aromaticity.kekulize`).
+    """
+
+    if not any(aromatic):
+        return
+    used = [0] * len(symbols)
+    for first, second, order, _ in edges:
+        used[first] += order
+        used[second] += order
+
+    needs = set()
+    for index, is_aromatic in enumerate(aromatic):
+        if not is_aromatic:
+            continue
+        # An atom gets a double bond if it has room for one: pyridine's n
+        # does, pyrrole's [nH] and furan's o don't
+        if implicit_hydrogens(symbols[index],
+                               used[index] + (hydrogens[index] or 0)):
+            needs.add(index)
+
+    aromatic_edges = [index for index, edge in enumerate(edges) if edge[3]]
+    try:
+        doubles = kekulize(needs, [edges[index][:2]
+                                   for index in aromatic_edges])
+    except ValueError:
+        raise _error("Can't kekulize {}".format(smiles))
+    for number in doubles:
+        edges[aromatic_edges[number]][2] = 2
+
+
+def _to_dicts(symbols, hydrogens, edges):
+    """Builds the atoms and bonds dictionaries, adding hydrogens."""
+
+    atoms = {'a{}'.format(i + 1): symbol for i, symbol in enumerate(symbols)}
+    bonds = {}
+    used = [0] * len(symbols)
+    for number, (first, second, order, _) in enumerate(edges, 1):
+        used[first] += order
+        used[second] += order
+        bonds['b{}'.format(number)] = ('a{}'.format(first + 1),
+                                       'a{}'.format(second + 1),
+                                       {'order': order, 'chirality': None})
+
+    atom_number, bond_number = len(atoms), len(bonds)
+    for index, symbol in enumerate(symbols):
+        count = hydrogens[index]
+        if count is None:
+            count = (implicit_hydrogens(symbol, used[index])
+                     if symbol in _VALENCES else 0)
+        for _ in xrange(count):
+            atom_number += 1
+            bond_number += 1
+            key = 'a{}'.format(atom_number)
+            atoms[key] = 'H'
+            bonds['b{}'.format(bond_number)] = (
+                'a{}'.format(index + 1), key,
+                {'order': 1, 'chirality': None})
+    return atoms, bonds
+
+
+def _split_line(line):
+    """Splits a line of a SMILES file into the SMILES and the id (or None)."""
+
+    parts = line.split(None, 1)
+    if not parts:
+        return None, None
+    return parts[0], parts[1].strip() if len(parts) > 1 else None
+
+
+class SMILESParser(object):
+    """Parser for SMILES files.
+
+    Parameters
+    ----------
+    smiles_file : file-like object
+        The (open) file that contains the data.  Only the first molecule (the
+        first line that isn't blank or a # comment) is read; use `iterparse`
+        to read them all.
+
+    Attributes
+    ----------
+    atoms, bonds, other : dict
+        The molecule, as the Compound constructor takes it.  The id, if the
+        line has one, is `other['id']`.
+    smiles : string
+        The SMILES string that was parsed.
+    """
+
+    @profiling.timed('smiles.parse')
+    def __init__(self, smiles_file):
+        for line in smiles_file:
+            smiles, id_ = _split_line(line)
+            if smiles is not None and not smiles.startswith('#'):
+                break
+        else:
+            raise _error("No molecule in the file")
+        self._parse(smiles, id_)
+
+    def _parse(self, smiles, id_):
+        self.smiles = smiles
+        self.atoms, self.bonds = parse_smiles(smiles)
+        self.other = {} if id_ is None else {'id': id_}
+        self.molecule = {'atoms': self.atoms,
+                         'bonds': self.bonds,
+                         'other_info': self.other}
+
+    @classmethod
+    def from_string(cls, smiles, id_=None):
+        """Parses a SMILES string.
+
+        Parameters
+        ----------
+        smiles : string
+        id_ : string, optional
+            The molecule's id.
+
+        Returns
+        -------
+        SMILESParser
+        """
+
+        parser = cls.__new__(cls)
+        parser._parse(smiles, id_)
+        return parser
+
+    def __str__(self):
+        return self.smiles
+
+
+def iterparse(smiles_file):
+    """Parses every molecule in a SMILES file, one line at a time.
+
+    Parameters
+    ----------
+    smiles_file : file-like object
+        The (open) file.  Blank lines and lines starting with # are skipped.
+
+    Yields
+    ------
+    SMILESParser
+        A parser per molecule.
+    """
+
+    for line in smiles_file:
+        smiles, id_ = _split_line(line)
+        if smiles is not None and not smiles.startswith('#'):
+            yield SMILESParser.from_string(smiles, id_)
+
+
+class SMILESBuilder(object):
+    """Object used to build a canonical SMILES string or file.
+
+    Parameters
+    ----------
+    molecule_dict : dict
+        Dictionary storing all of the molecular information.
+
+    Attributes
+    ----------
+    smiles : string
+        The canonical SMILES.  Molecules that are the same up to the keys of
+        their atoms and bonds get the same string (as long as their Kekule
+        structures are the same, or the bonds that differ are flagged as
+        aromatic).
+    id : string
+        The molecule's id, or None.
+
+    Notes
+    -----
+    Bonds flagged with `'aromatic': True` (as `Compound` takes them) keep their
+    Kekule order but are written as aromatic bonds, between lowercase atoms.
+    """
+
+    @classmethod
+    def from_compound(cls, comp, aromatic=False):
+        """Generates a SMILESBuilder object from a Compound object.
+
+        Parameters
+        ----------
+        comp : Compound
+            The compound to be written.
+        aromatic : bool, optional
+            Whether to write the bonds of the compound's aromatic rings (see
+            `Compound.aromaticity`) as aromatic.
+
+        Returns
+        -------
+        SMILESBuilder
+        """
+
+        molecule = comp.to_dict()
+        if aromatic:
+            for key in comp.aromaticity.bonds:
+                molecule['bonds'][key][2]['aromatic'] = True
+        return SMILESBuilder(molecule)
+
+    @profiling.timed('smiles.build')
+    def __init__(self, molecule_dict):
+        atoms = molecule_dict['atoms']
+        self.id = molecule_dict.get('other_info', {}).get('id')
+
+        neighbours = {key: [] for key in atoms}
+        # The total Kekule order of each atom's bonds, and the number of its
+        # aromatic bonds that are double
+        valences = dict.fromkeys(atoms, 0)
+        doubles = dict.fromkeys(atoms, 0)
+        aromatic = set()
+        for first, second, info in molecule_dict['bonds'].itervalues():
+            order = int(info.get('order', 1))
+            valences[first] += order
+            valences[second] += order
+            if info.get('aromatic'):
+                aromatic.update((first, second))
+                doubles[first] += order - 1
+                doubles[second] += order - 1
+                order = _AROMATIC_ORDER
+            neighbours[first].append((second, order))
+            neighbours[second].append((first, order))
+
+        # Hydrogens bonded to a single non-hydrogen are written as a count on
+        # that atom; every other atom is written out
+        hydrogens = dict.fromkeys(atoms, 0)
+        heavy = []
+        for key, symbol in atoms.iteritems():
+            if (symbol == 'H' and len(neighbours[key]) == 1
+                    and atoms[neighbours[key][0][0]] != 'H'):
+                hydrogens[neighbours[key][0][0]] += 1
+            else:
+                heavy.append(key)
+        heavy_set = set(heavy)
+        skeleton = {key: [(other, order) for other, order in neighbours[key]
+                          if other in heavy_set]
+                    for key in heavy}
+
+        invariants = {key: (atoms[key], len(skeleton[key]), hydrogens[key],
+                            sum(order for _, order in skeleton[key]))
+                      for key in heavy}
+        ranks = canonical_ranks(heavy, skeleton, invariants)
+        tokens = {}
+        for key in heavy:
+            used = valences[key] - hydrogens[key]
+            if key in aromatic:
+                tokens[key] = self._aromatic_token(
+                    atoms[key], hydrogens[key], used, doubles[key])
+            else:
+                tokens[key] = self._token(atoms[key], hydrogens[key], used)
+        # Single bonds between aromatic atoms that aren't aromatic themselves
+        # have to be written out
+        explicit = {frozenset((key, other))
+                    for key in aromatic.intersection(heavy)
+                    for other, order in skeleton[key]
+                    if order == 1 and other in aromatic}
+
+        pieces = []
+        seen = set()
+        for start in sorted(heavy, key=ranks.get):
+            if start not in seen:
+                pieces.append(self._write(start, skeleton, ranks, tokens,
+                                          seen, explicit))
+        self.smiles = '.'.join(sorted(pieces))
+
+    @staticmethod
+    def _token(symbol, hydrogens, used):
+        """How an atom is written."""
+
+        if symbol in _VALENCES and implicit_hydrogens(symbol,
+                                                       used) == hydrogens:
+            return symbol
+        if hydrogens == 0:
+            return '[{}]'.format(symbol)
+        elif hydrogens == 1:
+            return '[{}H]'.format(symbol)
+        return '[{}H{}]'.format(symbol, hydrogens)
+
+    @staticmethod
+    def _aromatic_token(symbol, hydrogens, used, doubles):
+        """How an aromatic atom is written: lowercase, and in brackets unless
+        reading it back would give it the same hydrogens and double bond.
+        """
+
+        lower = symbol.lower()
+        if symbol in _VALENCES:
+            # A parser takes the atom's aromatic bonds to be single, and gives
+            # it a double bond if that leaves room for one
+            needs = implicit_hydrogens(symbol, used - doubles) > 0
+            if (needs == bool(doubles)
+                    and implicit_hydrogens(symbol, used) == hydrogens):
+                return lower
+        if hydrogens == 0:
+            return '[{}]'.format(lower)
+        elif hydrogens == 1:
+            return '[{}H]'.format(lower)
+        return '[{}H{}]'.format(lower, hydrogens)
+
+    @staticmethod
+    def _write(start, skeleton, ranks, tokens, seen, explicit=frozenset()):
+        """Writes the component containing `start` (depth first, visiting
+        neighbours in rank order).  The bonds in `explicit` (as frozensets of
+        their atoms) are single bonds written as '-'.
+        """
+
+        def bond(first, second, order):
+            if order == 1 and frozenset((first, second)) in explicit:
+                return '-'
+            return _BOND_SYMBOLS.get(order, '')
+
+        # The first pass finds the spanning tree and the bonds that close rings
+        children = {start: []}
+        parent = {start: None}
+        closures = {}
+        order_of = {}
+        seen.add(start)
+        stack = [(start, iter(sorted(skeleton[start],
+                                     key=lambda pair: ranks[pair[0]])))]
+        while stack:
+            atom, remaining = stack[-1]
+            for other, order in remaining:
+                if other not in seen:
+                    seen.add(other)
+                    parent[other] = atom
+                    children[other] = []
+                    children[atom].append(other)
+                    order_of[other] = order
+                    stack.append((other, iter(sorted(
+                        skeleton[other], key=lambda pair: ranks[pair[0]]))))
+                    break
+                elif other != parent[atom] and atom != parent[other]:
+                    closures.setdefault(atom, {})[other] = order
+            else:
+                stack.pop()
+
+        # The second pass writes it out
+        output = []
+        digits = {}
+        free = []
+        next_digit = 1
+        stack = [start]
+        while stack:
+            item = stack.pop()
+            if item in ('(', ')'):
+                output.append(item)
+                continue
+            if parent[item] is not None:
+                output.append(bond(parent[item], item, order_of[item]))
+            output.append(tokens[item])
+            for other in sorted(closures.get(item, ()), key=ranks.get):
+                pair = frozenset((item, other))
+                if pair in digits:
+                    digit = digits.pop(pair)
+                    free.append(digit)
+                    free.sort()
+                    order = ''
+                else:
+                    if free:
+                        digit = free.pop(0)
+                    else:
+                        digit, next_digit = next_digit, next_digit + 1
+                    digits[pair] = digit
+                    order = bond(item, other, closures[item][other])
+                output.append(order + (str(digit) if digit < 10
+                                       else '%{}'.format(digit)))
+            kids = children[item]
+            pushes = []
+            for kid in kids[:-1]:
+                pushes.extend(['(', kid, ')'])
+            pushes.extend(kids[-1:])
+            stack.extend(reversed(pushes))
+        return ''.join(output)
+
+    def to_file(self, smiles_file):
+        """Writes the molecule to file, as a line of a SMILES file.
+
+        Parameters
+        ----------
+        smiles_file : file-like
+            The open file to which the compound should be written.
+        """
+
+        smiles_file.write(str(self) + '\n')
+
+    def __str__(self):
+        if self.id is None:
+            return self.smiles
+        return '{} {}'.format(self.smiles, self.id)
+
+    def __repr__(self):
+        return str(self)
+
+
+def canonical_smiles(compound, aromatic=False):
+    """The canonical SMILES of a compound, without its id.
+
+    Parameters
+    ----------
+    compound : Compound
+    aromatic : bool, optional
+        Whether to write the compound's aromatic rings with aromatic bonds, so
+        that the string doesn't depend on the Kekule structure it has.
+
+    Returns
+    -------
+    string
+    """
+
+    return SMILESBuilder.from_compound(compound, aromatic).smiles
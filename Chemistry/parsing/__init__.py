@@ -10,4 +10,7 @@ OpenBabel support is fully integrated.
 
 __author__ = "Dan Obermiller"
 
-__all__ = ['CheML']
+__all__ = ['CheML', 'SMILES', 'SDF']
+
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__)
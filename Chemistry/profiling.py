@@ -0,0 +1,282 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Lightweight timers and counters for the hot paths of the program.
+
+Instrumentation is off by default.  While it is off, a `timed` function costs
+one extra call and a flag check, and a `timer` block costs little more than
+that, so the hooks can stay in place permanently.  Turn it on with `enable()`
+(or `main.py --profile`) and every named stage records its call count, total
+time and a latency histogram.
+
+    >>> from Chemistry import profiling
+    >>> profiling.enable()
+    >>> with profiling.timer('my stage'):
+    ...     pass
+    >>> profiling.stats()['my stage']['calls']
+    1
+    >>> profiling.disable(); profiling.reset()
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import functools
+import json
+import threading
+import time
+
+
+_enabled = False
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+
+# Histogram buckets are powers of two of microseconds: bucket n holds the calls
+# that took less than 2**n us (and at least 2**(n-1) us).  The last bucket
+# catches everything slower than about 17 minutes.
+_BUCKETS = 31
+
+
+def enable():
+    """Starts recording timers and counters."""
+
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stops recording timers and counters.  Recorded data is kept."""
+
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """Whether or not instrumentation is currently recording.
+
+    Returns
+    -------
+    bool
+    """
+
+    return _enabled
+
+
+def reset():
+    """Throws away everything recorded so far."""
+
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+
+def _bucket(elapsed):
+    """Finds the histogram bucket for a duration given in seconds."""
+
+    micros = int(elapsed * 1e6)
+    return min(micros.bit_length(), _BUCKETS - 1)
+
+
+def record(name, elapsed):
+    """Records a single timing.
+
+    Parameters
+    ----------
+    name : string
+        The name of the stage being timed.
+    elapsed : float
+        How long the stage took, in seconds.
+    """
+
+    with _lock:
+        try:
+            stat = _timers[name]
+        except KeyError:
+            stat = _timers[name] = {'calls': 0, 'total': 0.0,
+                                    'min': elapsed, 'max': elapsed,
+                                    'histogram': [0] * _BUCKETS}
+        stat['calls'] += 1
+        stat['total'] += elapsed
+        if elapsed < stat['min']:
+            stat['min'] = elapsed
+        if elapsed > stat['max']:
+            stat['max'] = elapsed
+        stat['histogram'][_bucket(elapsed)] += 1
+
+
+def count(name, n=1):
+    """Increments a named counter.
+
+    Parameters
+    ----------
+    name : string
+        The name of the counter.
+    n : int, optional
+        How much to increment by.  Defaults to 1.
+    """
+
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+class timer(object):
+    """Context manager that times the block it wraps.
+
+    Parameters
+    ----------
+    name : string
+        The name the timing is recorded under.
+
+    Notes
+    -----
+    Whether or not to record is decided when the block is entered, so a block
+    that is running when instrumentation is turned off still gets recorded.
+    """
+
+    __slots__ = ['name', '_start']
+
+    def __init__(self, name):
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        if _enabled:
+            self._start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._start is not None:
+            record(self.name, time.time() - self._start)
+            self._start = None
+        return False
+
+
+def timed(name):
+    """Decorator that times every call to a function.
+
+    Parameters
+    ----------
+    name : string
+        The name the timings are recorded under.
+
+    Returns
+    -------
+    function
+        The decorator.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.time() - start)
+        return wrapper
+    return decorator
+
+
+def stats():
+    """A snapshot of everything recorded so far.
+
+    Returns
+    -------
+    dict
+        Maps each timer name to a dictionary with 'calls', 'total', 'mean',
+        'min' and 'max' (all in seconds) and 'histogram' (a dictionary mapping
+        the upper bound of each non-empty bucket, in microseconds, to its
+        count).  The 'counters' entry maps each counter name to its value.
+    """
+
+    with _lock:
+        result = {}
+        for name, stat in _timers.iteritems():
+            result[name] = {
+                'calls': stat['calls'],
+                'total': stat['total'],
+                'mean': stat['total'] / stat['calls'],
+                'min': stat['min'],
+                'max': stat['max'],
+                'histogram': {2 ** i: n
+                              for i, n in enumerate(stat['histogram']) if n}}
+        result['counters'] = dict(_counters)
+    return result
+
+
+def merge(snapshot):
+    """Adds what another process recorded to what has been recorded here.
+
+    Parameters
+    ----------
+    snapshot : dict
+        What `stats` returned in the other process (a worker of a pool, say).
+        It is added whether or not instrumentation is enabled here.
+    """
+
+    with _lock:
+        for name, value in snapshot.get('counters', {}).iteritems():
+            _counters[name] = _counters.get(name, 0) + value
+        for name, stat in snapshot.iteritems():
+            if name == 'counters':
+                continue
+            try:
+                mine = _timers[name]
+            except KeyError:
+                mine = _timers[name] = {'calls': 0, 'total': 0.0,
+                                        'min': stat['min'], 'max': stat['max'],
+                                        'histogram': [0] * _BUCKETS}
+            mine['calls'] += stat['calls']
+            mine['total'] += stat['total']
+            mine['min'] = min(mine['min'], stat['min'])
+            mine['max'] = max(mine['max'], stat['max'])
+            for bound, n in stat['histogram'].iteritems():
+                mine['histogram'][int(bound).bit_length() - 1] += n
+
+
+def report(fmt='text'):
+    """Formats everything recorded so far.
+
+    Parameters
+    ----------
+    fmt : string, optional
+        Either 'text' (a table, the default) or 'json'.
+
+    Returns
+    -------
+    string
+        The report.
+
+    Raises
+    ------
+    ValueError
+        Raised if the format is unknown.
+    """
+
+    data = stats()
+    if fmt == 'json':
+        return json.dumps(data, indent=4, sort_keys=True)
+    elif fmt != 'text':
+        raise ValueError("Unknown report format {}".format(fmt))
+
+    counters = data.pop('counters')
+    lines = ['{:<32} {:>8} {:>12} {:>12} {:>12}'.format(
+        'stage', 'calls', 'total (s)', 'mean (ms)', 'max (ms)')]
+    for name, stat in sorted(data.iteritems(),
+                             key=lambda item: -item[1]['total']):
+        lines.append('{:<32} {:>8} {:>12.4f} {:>12.4f} {:>12.4f}'.format(
+            name, stat['calls'], stat['total'],
+            stat['mean'] * 1e3, stat['max'] * 1e3))
+    if counters:
+        lines.append('')
+        lines.append('{:<32} {:>8}'.format('counter', 'count'))
+        for name, value in sorted(counters.iteritems()):
+            lines.append('{:<32} {:>8}'.format(name, value))
+    return '\n'.join(lines)
@@ -11,6 +11,8 @@ necessary code to describe reaction objects and their processes.
 
 __author__ = "Dan Obermiller"
 
-__all__ = ['acid_base', '_reactions']
+__all__ = ['acid_base', '_reactions', 'network', 'equilibrium',
+           'kinetics']
 
-from .acid_base import AcidBase
+from Chemistry._lazy import lazy_package
+lazy_package(__name__, __all__, {'AcidBase': ('.acid_base', 'AcidBase')})
@@ -136,12 +136,21 @@ class Solvent(_CompoundWrapper):
 class _Reaction(object):
     """The abstract base `_Reaction` object.
 
+    Attributes
+    ----------
+    reactant_types : tuple
+        The Reactant classes a reaction takes, in the order its constructor
+        takes them (the Conditions always come last).  Reactions that leave
+        this empty can't be discovered automatically, for example by a
+        ReactionNetwork.
+
     Notes
     -----
     Reactions are treated as first class citizens (somewhat like functions).
     """
 
     __metaclass__ = abc.ABCMeta
+    reactant_types = ()
 
     @abc.abstractmethod
     def react(self):
@@ -155,6 +164,15 @@ class _Reaction(object):
 
         raise NotImplementedError
 
+    @property
+    def reactants(self):
+        """The Reactant objects that take part, in the order of
+        `reactant_types`.  Reactions that don't keep track of theirs raise
+        NotImplementedError.
+        """
+
+        raise NotImplementedError
+
     @classmethod
     def _remove_node(cls, compound, rem_key):
         """Removes a node from a compound and make a new one based on it.
@@ -8,10 +8,13 @@
 __author__ = "Dan Obermiller"
 
 
-from copy import deepcopy
+import math
 
+from Chemistry import profiling
 from Chemistry.base import compounds
+from Chemistry.base.reactants import Acid, Base
 from Chemistry.reactions._reactions import _Reaction, Conditions
+from Chemistry.reactions.equilibrium import Solution
 from Chemistry.base.products import Product, Products, EquilibriumProducts
 from Chemistry.exceptions.ReactionErrors import NoReactionError
 
@@ -42,6 +45,7 @@ class AcidBase(_Reaction):
     and the underlying framework.
     """
 
+    reactant_types = (Acid, Base)
     _conditions = None
     _acid = ()
     _base = ()
@@ -118,6 +122,14 @@ class AcidBase(_Reaction):
         else:
             self._base = (base_, base_.basic_point)
 
+    @property
+    def reactants(self):
+        """The acid and the base that react, after the conditions have had
+        their say.
+        """
+
+        return self.acid[0], self.base[0]
+
     def _equilibrium(self, threshold=10.):
         # TODO: Check the wording of this docstring
         """Calculates what, if any, equilibrium will be reached by the reaction.
@@ -138,9 +150,21 @@ class AcidBase(_Reaction):
         NoReactionError
             Raised if the acid and base have equal pKa (and thus no reaction
             would occur).
+
+        Notes
+        -----
+        Once they are known to differ, the pKas are corrected for the
+        `degeneracy` of the acid and base (the number of equivalent sites each
+        reacts on behalf of), if they have one.
         """
 
         pka1, pka2 = self.acid[0].pka, self.base[0].pka
+        if pka1 == pka2:
+            raise NoReactionError("These two molecules have identical pka")
+        # An acid with n equivalent protons gives one up n times as often, and
+        # a base with m equivalent sites takes one m times as often
+        pka1 -= math.log10(getattr(self.acid[0], 'degeneracy', 1))
+        pka2 += math.log10(getattr(self.base[0], 'degeneracy', 1))
         diff = pka1-pka2
         if diff == 0:
             raise NoReactionError("These two molecules have identical pka")
@@ -180,6 +204,7 @@ class AcidBase(_Reaction):
         else:
             return pow(10, difference)
 
+    @profiling.timed('acid_base.calculate_products')
     def _calculate_products(self):
         """Determines the expected products of the reaction.
 
@@ -206,8 +231,9 @@ class AcidBase(_Reaction):
         conjugate_base = None
         salt = None   # NYI
 
-        acid, base = deepcopy(self.acid[0]), deepcopy(self.base[0])
-        conjugate_acid = base.to_conjugate_acid()
+        with profiling.timer('thaw'):
+            acid = self.acid[0].thaw()
+        conjugate_acid = self.base[0].to_conjugate_acid()
         other = acid.other_info
 
         try:
@@ -221,6 +247,36 @@ class AcidBase(_Reaction):
                  Product(salt, 0)),
                 (Product(None, 0),))
 
+    def _ratio(self):
+        """Solves the equilibrium of the acid and base in solution.
+
+        Returns
+        -------
+        float or None
+            How much of the products there is, relative to a value of `1` for
+            the reactants.  None if the acid or base came from the conditions
+            and isn't an Acid or a Base.
+
+        Notes
+        -----
+        The acid and base both start at the conditions' `concentration`
+        (1 mol/L if it isn't given), in a solvent whose autoprotolysis
+        constant is the conditions' `pkw` (14, for water, if it isn't given).
+        """
+
+        acid, base = self.acid[0], self.base[0]
+        if not (isinstance(acid, Acid) and isinstance(base, Base)):
+            return None
+        concentration = getattr(self.conditions, 'concentration', 1.)
+        solution = Solution(getattr(self.conditions, 'pkw', 14.))
+        solution.add_reactant(acid, concentration)
+        protonated = solution.add_reactant(base, concentration)
+        reacted = solution.solve().reacted(protonated)
+        if reacted >= 1:
+            return float('inf')
+        return reacted / (1 - reacted)
+
+    @profiling.timed('acid_base.react')
     def react(self):
         """Performs the actual acid-base reaction.
 
@@ -240,5 +296,5 @@ class AcidBase(_Reaction):
         if reactant_ratio == 0:
             return Products(major, minor)
         else:
-            # This doesn't work at all how it should.  Here for completeness
-            return EquilibriumProducts(major, minor)
+            return EquilibriumProducts((self.acid[0], self.base[0]),
+                                       (major, minor), self._ratio())
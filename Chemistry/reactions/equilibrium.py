@@ -0,0 +1,331 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Acid-base equilibria of a whole solution.
+
+A `Solution` holds any number of acid-base families.  A family is a molecule
+in each of its protonation states, from the most protonated (state 0) to the
+least (one state per pKa), and is added in one of those states at some total
+concentration.  Solving it finds the concentration of every state at
+equilibrium, along with the pH.
+
+Each family's states are in the ratios its pKas give at a given concentration
+of H+, so every mass balance can be met exactly once that concentration is
+known:
+
+    log c[j, k] = log C[j] - sum(pKa[j, :k]) - k log h - log Z[j](h)
+
+where Z[j] sums the numerators over the family's states.  That leaves the
+charge balance (equivalently, that no protons are made or lost), which is a
+single increasing function of log h.  It is solved by Newton's method on log
+h, falling back to bisection whenever a step would leave the interval the
+root is known to be in, so it always converges.  Every step is a handful of
+NumPy operations over all the states of all the families together, so a
+solution of hundreds of species takes about as long as one of two.
+
+`speciation` answers the simpler question of a compound's fractions at a
+given pH, for whole arrays of compounds and pHs at once.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+import math
+
+import numpy as np
+
+from Chemistry.base.reactants import Acid, Base
+from Chemistry.exceptions.ReactionErrors import ReactionError
+
+
+_LN10 = math.log(10)
+# The log h the solver starts from is bracketed by these, which are far enough
+# out that the charge balance always has opposite signs at them
+_LOWEST, _HIGHEST = -40., 20.
+
+Family = collections.namedtuple('Family', ['species', 'concentration',
+                                           'pkas', 'charge', 'added'])
+
+
+def speciation(pkas, ph):
+    """The fraction of a compound in each protonation state, at each pH.
+
+    Parameters
+    ----------
+    pkas : array_like
+        The pKas of each compound, from the first proton lost to the last,
+        along the last axis.  Compounds with fewer pKas than others are padded
+        with NaN.  The other axes broadcast against `ph`, so a grid of
+        solvents or temperatures is just more axes of pKas.
+    ph : array_like
+        The pH values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Shaped like `pkas` and `ph` broadcast together (less the last axis of
+        `pkas`), with a last axis of the fraction in each state, from the most
+        protonated to the least.  States past a NaN pKa get 0.
+
+    Examples
+    --------
+    A library of compounds with up to three pKas, over a pH sweep:
+
+    >>> speciation(pkas[:, np.newaxis, :], np.linspace(0, 14, 1000))
+
+    is an array of shape (compounds, 1000, 4).
+    """
+
+    pkas = np.asarray(pkas, float)
+    ph = np.asarray(ph, float)[..., np.newaxis]
+    # State k has lost k protons, so its share goes as 10 ** (k pH - the sum
+    # of the first k pKas)
+    steps = np.cumsum(ph - pkas, axis=-1)
+    exponents = np.concatenate(
+        [np.zeros(steps.shape[:-1] + (1,)), steps], axis=-1) * _LN10
+    exponents[np.isnan(exponents)] = -np.inf
+    exponents -= exponents.max(axis=-1)[..., np.newaxis]
+    shares = np.exp(exponents)
+    return shares / shares.sum(axis=-1)[..., np.newaxis]
+
+
+class Solution(object):
+    """A solution of acids and bases.
+
+    Parameters
+    ----------
+    pkw : float, optional
+        The negative log of the solvent's autoprotolysis constant.  Defaults
+        to 14, for water.
+
+    Attributes
+    ----------
+    families : list
+        The Family (species, concentration, pKas, charge, added state) of
+        each acid-base family, in the order they were added.
+    """
+
+    def __init__(self, pkw=14.):
+        self.pkw = pkw
+        self.families = []
+
+    def add(self, species, concentration, pkas, charge=0, added=0):
+        """Adds an acid-base family.
+
+        Parameters
+        ----------
+        species : object
+            Anything that identifies the family, such as its Compound.
+        concentration : float
+            The total concentration of the family, in mol/L.
+        pkas : iterable
+            The pKa of each proton the family can lose, from the first lost to
+            the last.
+        charge : int, optional
+            The charge of the family's most protonated state.  Defaults to 0.
+        added : int, optional
+            The state the family was added in, as the number of protons it had
+            lost.  Defaults to 0, the most protonated state.  Counter ions
+            that balance its charge are assumed to be spectators.
+
+        Returns
+        -------
+        int
+            The index of the family.
+        """
+
+        pkas = [float(pka) for pka in pkas]
+        if not 0 <= added <= len(pkas):
+            raise ValueError("A family with {} pKas has no state {}".format(
+                len(pkas), added))
+        if concentration < 0:
+            raise ValueError("Concentrations can't be negative")
+        self.families.append(Family(species, float(concentration), pkas,
+                                    charge, added))
+        return len(self.families) - 1
+
+    def add_reactant(self, reactant, concentration):
+        """Adds an Acid or a Base as a family with a single pKa.
+
+        Parameters
+        ----------
+        reactant : Acid, Base
+            The reactant.  An acid is added in its protonated state; a base is
+            added in its deprotonated state, and its pKa is that of its
+            conjugate acid.
+        concentration : float
+            The reactant's concentration, in mol/L.
+
+        Returns
+        -------
+        int
+            The index of the family.
+
+        Notes
+        -----
+        The pKa is given the same statistical correction for the reactant's
+        `degeneracy` as `AcidBase` gives it.
+        """
+
+        degeneracy = getattr(reactant, 'degeneracy', 1)
+        if isinstance(reactant, Acid):
+            return self.add(reactant, concentration,
+                            [reactant.pka - math.log10(degeneracy)])
+        if isinstance(reactant, Base):
+            return self.add(reactant, concentration,
+                            [reactant.pka + math.log10(degeneracy)],
+                            charge=1, added=1)
+        raise TypeError("Only Acids and Bases have a pKa")
+
+    def _arrays(self):
+        """Flattens the families into one entry per state."""
+
+        family, states, log_beta, charges = [], [], [], []
+        totals, offsets = [], []
+        spectators = 0.
+        for number, (_, concentration, pkas, charge, added) in enumerate(
+                self.families):
+            offsets.append(len(states))
+            cumulative = np.concatenate([[0.], -np.cumsum(pkas)])
+            family.extend([number] * (len(pkas) + 1))
+            states.extend(range(len(pkas) + 1))
+            log_beta.extend(cumulative)
+            charges.extend(charge - state for state in range(len(pkas) + 1))
+            totals.append(concentration)
+            spectators -= concentration * (charge - added)
+        return (np.array(family, int), np.array(states, float),
+                np.array(log_beta) * _LN10, np.array(charges, float),
+                np.array(totals), np.array(offsets, int), spectators)
+
+    def solve(self, tolerance=1e-12, max_iterations=200):
+        """Finds the equilibrium.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The solver stops once a step changes the pH by less than this.
+        max_iterations : int, optional
+            The most steps the solver takes.
+
+        Returns
+        -------
+        Speciation
+
+        Raises
+        ------
+        ReactionError
+            If the solver takes too many steps.
+        """
+
+        family, states, log_beta, charges, totals, offsets, spectators = \
+            self._arrays()
+        log_totals = np.log(np.where(totals > 0, totals, 1.))
+        kw = 10 ** -self.pkw
+
+        def evaluate(log_h):
+            """The concentrations, charge balance and its derivative."""
+
+            exponents = log_beta - states * log_h * _LN10
+            if len(states):
+                peaks = np.maximum.reduceat(exponents, offsets)
+                shifted = np.exp(exponents - peaks[family])
+                sums = np.add.reduceat(shifted, offsets)
+                fractions = shifted / sums[family]
+            else:
+                fractions = exponents
+            concentrations = fractions * totals[family]
+            h = 10 ** log_h
+            balance = (h - kw / h + np.dot(concentrations, charges)
+                       + spectators)
+            # d(mean state)/d(log h) is -ln 10 times the variance of the state
+            means = np.bincount(family, fractions * states, len(totals))
+            squares = np.bincount(family, fractions * states * states,
+                                  len(totals))
+            slope = _LN10 * (h + kw / h
+                             + np.dot(totals, squares - means * means))
+            return concentrations, balance, slope
+
+        low, high = _LOWEST, _HIGHEST
+        log_h = -self.pkw / 2.
+        for _ in xrange(max_iterations):
+            concentrations, balance, slope = evaluate(log_h)
+            if balance > 0:
+                high = log_h
+            else:
+                low = log_h
+            step = balance / slope if slope > 0 else np.inf
+            following = log_h - step
+            if not low < following < high:
+                following = (low + high) / 2.
+            if abs(following - log_h) < tolerance:
+                log_h = following
+                break
+            log_h = following
+        else:
+            raise ReactionError("The equilibrium solver didn't converge")
+
+        concentrations, _, _ = evaluate(log_h)
+        return Speciation(self, -log_h, concentrations, offsets)
+
+
+class Speciation(object):
+    """The equilibrium of a Solution.
+
+    Parameters
+    ----------
+    solution : Solution
+        The solution that was solved.
+    ph : float
+        The pH at equilibrium.
+    concentrations : numpy.ndarray
+        The concentration of every state of every family, in order.
+    offsets : numpy.ndarray
+        Where each family's states start in `concentrations`.
+
+    Attributes
+    ----------
+    ph : float
+    concentrations : numpy.ndarray
+    """
+
+    def __init__(self, solution, ph, concentrations, offsets):
+        self.solution = solution
+        self.ph = ph
+        self.concentrations = concentrations
+        self._offsets = offsets
+
+    def concentration(self, family):
+        """The concentration of each state of a family.
+
+        Parameters
+        ----------
+        family : int
+            The index `Solution.add` returned.
+
+        Returns
+        -------
+        numpy.ndarray
+            From the most protonated state to the least.
+        """
+
+        start = self._offsets[family]
+        return self.concentrations[
+            start:start + len(self.solution.families[family].pkas) + 1]
+
+    def fractions(self, family):
+        """The fraction of a family in each of its states."""
+
+        total = self.solution.families[family].concentration
+        found = self.concentration(family)
+        return found / total if total else found
+
+    def reacted(self, family):
+        """The fraction of a family that has gained or lost protons since it
+        was added.
+        """
+
+        added = self.solution.families[family].added
+        return 1. - self.fractions(family)[added]
@@ -0,0 +1,618 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Kinetic simulation of a network of reactions.
+
+A `Kinetics` is a set of species and of elementary reactions between them,
+each with a rate constant.  Every reaction goes at the rate mass action gives
+it, the rate constant times the concentration of each reactant, so the
+concentrations c change as
+
+    dc/dt = S r(c)
+
+where S is the stoichiometry matrix, with a column per reaction of how much of
+each species it makes (negative for what it uses up), and r is the rate of
+each reaction.  A reversible reaction is two reactions, one each way.
+
+A network of thousands of species only has a few entries in each column of S,
+so S is kept as its nonzero entries: parallel arrays of (species, reaction,
+coefficient).  The rates, dc/dt and the Jacobian d(dc/dt)/dc (one entry per
+pair of a species a reaction changes and a reactant of that reaction) are
+each a handful of NumPy operations over those arrays, however large the
+network.
+
+Rate constants in a network commonly span many orders of magnitude, which
+makes the equations stiff: an explicit method would need steps as short as
+the fastest reaction for as long as the slowest one takes.  They are instead
+integrated by the modified Rosenbrock triple of Shampine and Reichelt (1997,
+the method of MATLAB's ode23s).  Its second order step is L-stable, so a fast
+reaction that has finished doesn't hold the step size back, and a third order
+stage estimates the error of the step, from which the next step's size is
+picked.  A step needs one Jacobian and three solutions of a linear system in
+I - gamma h J.  For up to `DENSE_LIMIT` species J is made into a matrix; past
+that the systems are solved by GMRES, using the Jacobian's entries only to
+multiply by it, so memory and time go as the number of reactions rather than
+the square of the number of species.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+import math
+
+import numpy as np
+
+from Chemistry.base.products import EquilibriumProducts
+from Chemistry.exceptions.ReactionErrors import ReactionError
+
+
+# The most species a network can have for its Jacobian to be made into a
+# matrix.  Past this the linear systems are solved iteratively.
+DENSE_LIMIT = 400
+# The coefficients of the modified Rosenbrock triple
+_GAMMA = 1 / (2 + math.sqrt(2))
+_E32 = 6 + math.sqrt(2)
+# The most a step can grow or shrink by, and the safety factor on the size
+# the error estimate picks
+_GROWTH, _SHRINK, _SAFETY = 5., 0.2, 0.9
+
+
+def _gmres(multiply, rhs, inverse, tolerance, restart=30, max_restarts=10):
+    """Solves a linear system by restarted GMRES.
+
+    Parameters
+    ----------
+    multiply : callable
+        Multiplies a vector by the matrix.
+    rhs : numpy.ndarray
+        The right hand side.
+    inverse : numpy.ndarray
+        The inverse of the matrix's diagonal, used to precondition it (on the
+        right).
+    tolerance : float
+        How small the residual has to be, relative to `rhs`.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The solution, or None if GMRES didn't converge.
+    """
+
+    size = len(rhs)
+    target = tolerance * (np.linalg.norm(rhs) or 1.)
+    solution = rhs * inverse
+    for _ in xrange(max_restarts):
+        residual = rhs - multiply(solution)
+        norm = np.linalg.norm(residual)
+        if norm <= target:
+            return solution
+        basis = np.zeros((restart + 1, size))
+        hessenberg = np.zeros((restart + 1, restart))
+        basis[0] = residual / norm
+        for column in xrange(restart):
+            vector = multiply(inverse * basis[column])
+            # Classical Gram-Schmidt, done twice to keep the basis orthogonal
+            for _ in xrange(2):
+                projection = basis[:column + 1].dot(vector)
+                vector -= projection.dot(basis[:column + 1])
+                hessenberg[:column + 1, column] += projection
+            hessenberg[column + 1, column] = np.linalg.norm(vector)
+            goal = np.zeros(column + 2)
+            goal[0] = norm
+            small = hessenberg[:column + 2, :column + 1]
+            weights = np.linalg.lstsq(small, goal, rcond=None)[0]
+            remaining = np.linalg.norm(small.dot(weights) - goal)
+            if (remaining <= target
+                    or hessenberg[column + 1, column] <= 1e-14 * norm):
+                break
+            basis[column + 1] = vector / hessenberg[column + 1, column]
+        solution = solution + inverse * weights.dot(basis[:column + 1])
+    residual = rhs - multiply(solution)
+    if np.linalg.norm(residual) <= target:
+        return solution
+    return None
+
+
+class Kinetics(object):
+    """A network of elementary reactions with rate constants.
+
+    Attributes
+    ----------
+    species : list
+        Whatever identifies each species (a ReactionNetwork's species key, a
+        name), in the order of the columns of every concentration array.
+    index : dict
+        Maps each species to its column.
+    reactions : list
+        The (reactants, products, rate constant) of each reaction, where the
+        reactants and products are tuples of species and a species appears
+        once per molecule of it.
+    network : ReactionNetwork or None
+        The network the species keys refer to, if the kinetics were built
+        from one.
+    """
+
+    def __init__(self):
+        self.species = []
+        self.index = {}
+        self.reactions = []
+        self.network = None
+        self._compiled = None
+
+    def add_species(self, species):
+        """Adds a species, if it isn't already known.
+
+        Parameters
+        ----------
+        species : object
+            Anything hashable that identifies the species.
+
+        Returns
+        -------
+        int
+            The species' column.
+        """
+
+        column = self.index.get(species)
+        if column is None:
+            column = self.index[species] = len(self.species)
+            self.species.append(species)
+            self._compiled = None
+        return column
+
+    def add_reaction(self, reactants, products, rate, reverse=None):
+        """Adds an elementary reaction.
+
+        Parameters
+        ----------
+        reactants, products : iterable
+            The species used up and made, once per molecule, so A + A -> B is
+            (A, A), (B,).  Species that aren't known yet are added.
+        rate : float
+            The forward rate constant.
+        reverse : float, optional
+            The rate constant of the reverse reaction.  If given, it is added
+            as a reaction of its own.
+
+        Returns
+        -------
+        int
+            The index of the (forward) reaction.
+
+        Raises
+        ------
+        ValueError
+            If a rate constant is negative.
+        """
+
+        reactants, products = tuple(reactants), tuple(products)
+        for constant in (rate, reverse):
+            if constant is not None and constant < 0:
+                raise ValueError("Rate constants can't be negative")
+        for species in reactants + products:
+            self.add_species(species)
+        self.reactions.append((reactants, products, float(rate)))
+        self._compiled = None
+        if reverse is not None:
+            self.reactions.append((products, reactants, float(reverse)))
+        return len(self.reactions) - (2 if reverse is not None else 1)
+
+    @classmethod
+    def from_network(cls, network, rates):
+        """Builds the kinetics of a ReactionNetwork.
+
+        Parameters
+        ----------
+        network : ReactionNetwork
+            The network.  Each reaction node uses up one molecule of each of
+            its reactant species and makes one of each of its products.
+        rates : float, tuple or dict
+            The rate constant of each reaction node, by key, or one for all
+            of them.  A (forward, reverse) tuple makes a reaction reversible.
+            Reaction nodes missing from a dict are left out.
+
+        Returns
+        -------
+        Kinetics
+            Its species are the network's species keys.
+
+        Notes
+        -----
+        The network has a single edge from a reaction node to each product
+        species, so a reaction that makes two molecules of the same species
+        (hydronium and hydroxide making water) is taken to make one.
+        `from_reactions` counts them properly.
+        """
+
+        kinetics = cls()
+        kinetics.network = network
+        for key in network.species:
+            kinetics.add_species(key)
+        for key in network.reaction_nodes:
+            rate = rates.get(key) if isinstance(rates, dict) else rates
+            if rate is None:
+                continue
+            forward, reverse = rate if isinstance(rate, tuple) else (rate,
+                                                                     None)
+            kinetics.add_reaction(
+                sorted(network.graph.predecessors(key),
+                       key=lambda first: network.graph.edge[first][key]['role']),
+                sorted(network.graph.successors(key)), forward, reverse)
+        return kinetics
+
+    @classmethod
+    def from_reactions(cls, reactions, rates, network=None):
+        """Builds the kinetics of a set of reactions.
+
+        Parameters
+        ----------
+        reactions : iterable
+            `_Reaction` instances.  Each is reacted, and uses up one molecule
+            of each of its reactants to make one of each of its products.
+        rates : iterable
+            The rate constant of each reaction, in the same order.  A
+            (forward, reverse) tuple makes a reaction reversible.
+        network : ReactionNetwork, optional
+            The network the reactants and products are added to, so that the
+            same compound made by two reactions is one species.  A new, empty
+            network is used if none is given.
+
+        Returns
+        -------
+        Kinetics
+            Its species are the network's species keys.  `network.find` gives
+            the key of a compound.
+        """
+
+        if network is None:
+            from Chemistry.reactions.network import ReactionNetwork
+            network = ReactionNetwork(reactions=[])
+        kinetics = cls()
+        kinetics.network = network
+        for reaction, rate in zip(reactions, rates):
+            result = reaction.react()
+            products = (result.products if isinstance(
+                result, EquilibriumProducts) else result)
+            reactant_keys = [network.add_species(reactant.compound,
+                                                 [reactant])
+                             for reactant in reaction.reactants]
+            product_keys = [network.add_species(product.compound)
+                            for product in products.major + products.minor]
+            forward, reverse = rate if isinstance(rate, tuple) else (rate,
+                                                                     None)
+            kinetics.add_reaction(reactant_keys, product_keys, forward,
+                                  reverse)
+        return kinetics
+
+    def _compile(self):
+        """Lays the reactions out as arrays."""
+
+        if self._compiled is not None:
+            return self._compiled
+        size = len(self.species)
+        count = len(self.reactions)
+        orders = [collections.Counter(self.index[species]
+                                      for species in reactants)
+                  for reactants, _, _ in self.reactions]
+        width = max([len(order) for order in orders] + [1])
+        # Each reaction's reactants and their orders, padded with a column
+        # (`size`) that always holds a concentration of 1
+        slots = np.full((count, width), size, int)
+        powers = np.zeros((count, width))
+        net_species, net_reactions, net_coefficients = [], [], []
+        for number, (order, (_, products, _)) in enumerate(
+                zip(orders, self.reactions)):
+            for slot, (column, power) in enumerate(sorted(order.items())):
+                slots[number, slot] = column
+                powers[number, slot] = power
+            change = collections.Counter(self.index[species]
+                                         for species in products)
+            change.subtract(order)
+            for column, coefficient in sorted(change.items()):
+                if coefficient:
+                    net_species.append(column)
+                    net_reactions.append(number)
+                    net_coefficients.append(coefficient)
+        net_species = np.array(net_species, int)
+        net_reactions = np.array(net_reactions, int)
+        net_coefficients = np.array(net_coefficients, float)
+
+        # One Jacobian entry per pair of a nonzero in S and a reactant of the
+        # same reaction
+        entries = np.repeat(np.arange(len(net_species)), width)
+        pair_slots = np.tile(np.arange(width), len(net_species))
+        pair_reactions = net_reactions[entries]
+        columns = slots[pair_reactions, pair_slots]
+        real = columns < size
+        self._compiled = {
+            'constants': np.array([rate for _, _, rate in self.reactions]),
+            'slots': slots, 'powers': powers,
+            'net_species': net_species, 'net_reactions': net_reactions,
+            'net_coefficients': net_coefficients,
+            'rows': net_species[entries][real], 'columns': columns[real],
+            'pair_reactions': pair_reactions[real],
+            'pair_slots': pair_slots[real],
+            'pair_coefficients': net_coefficients[entries][real]}
+        return self._compiled
+
+    def rates(self, concentrations):
+        """The rate of each reaction.
+
+        Parameters
+        ----------
+        concentrations : numpy.ndarray
+            The concentration of each species, in the order of `species`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The rate of each reaction, in the order of `reactions`.
+        """
+
+        arrays = self._compile()
+        padded = np.append(np.maximum(concentrations, 0.), 1.)
+        factors = padded[arrays['slots']] ** arrays['powers']
+        return arrays['constants'] * factors.prod(axis=1)
+
+    def derivative(self, concentrations):
+        """How fast each concentration is changing, dc/dt."""
+
+        arrays = self._compile()
+        rates = self.rates(concentrations)
+        return np.bincount(arrays['net_species'],
+                           arrays['net_coefficients']
+                           * rates[arrays['net_reactions']],
+                           len(self.species))
+
+    def _jacobian(self, concentrations):
+        """The nonzero entries of the Jacobian, as (rows, columns, values).
+        Entries with the same row and column are to be summed.
+        """
+
+        arrays = self._compile()
+        padded = np.append(np.maximum(concentrations, 0.), 1.)
+        reactant = padded[arrays['slots']]
+        powers = arrays['powers']
+        factors = reactant ** powers
+        # The product of every other reactant's factor, from the products of
+        # the factors before and after each one
+        count, width = factors.shape
+        before = np.ones((count, width + 1))
+        before[:, 1:] = np.cumprod(factors, axis=1)
+        after = np.ones((count, width + 1))
+        after[:, :-1] = np.cumprod(factors[:, ::-1], axis=1)[:, ::-1]
+        partials = (arrays['constants'][:, np.newaxis] * powers
+                    * reactant ** np.maximum(powers - 1, 0)
+                    * before[:, :-1] * after[:, 1:])
+        values = (arrays['pair_coefficients']
+                  * partials[arrays['pair_reactions'], arrays['pair_slots']])
+        return arrays['rows'], arrays['columns'], values
+
+    def jacobian(self, concentrations):
+        """The Jacobian d(dc/dt)/dc, as a square matrix.
+
+        Notes
+        -----
+        This is only meant for small networks; the integrator keeps the
+        Jacobian of a large one as its nonzero entries.
+        """
+
+        rows, columns, values = self._jacobian(concentrations)
+        size = len(self.species)
+        return np.bincount(rows * size + columns, values,
+                           size * size).reshape(size, size)
+
+    def _solver(self, concentrations, scale, tolerance):
+        """Makes a function that solves (I - scale J) x = b."""
+
+        size = len(self.species)
+        rows, columns, values = self._jacobian(concentrations)
+        if size <= DENSE_LIMIT:
+            matrix = np.eye(size) - scale * np.bincount(
+                rows * size + columns, values, size * size).reshape(size, size)
+            return lambda rhs: np.linalg.solve(matrix, rhs)
+        values = scale * values
+        diagonal = 1. - np.bincount(rows[rows == columns],
+                                    values[rows == columns], size)
+        inverse = 1. / diagonal
+
+        def multiply(vector):
+            return vector - np.bincount(rows, values * vector[columns], size)
+
+        return lambda rhs: _gmres(multiply, rhs, inverse, tolerance)
+
+    def _step(self, current, slope, step, tolerance):
+        """Takes a single step of the modified Rosenbrock triple.
+
+        Returns
+        -------
+        tuple or None
+            The concentrations after the step, dc/dt there and the estimated
+            error of the step, or None if a linear system couldn't be solved.
+        """
+
+        solve = self._solver(current, _GAMMA * step, tolerance)
+        first = solve(slope)
+        if first is None:
+            return None
+        middle = self.derivative(current + 0.5 * step * first)
+        second = solve(middle - first)
+        if second is None:
+            return None
+        second += first
+        following = current + step * second
+        following_slope = self.derivative(following)
+        third = solve(following_slope - _E32 * (second - middle)
+                      - 2 * (first - slope))
+        if third is None:
+            return None
+        return (following, following_slope,
+                step / 6. * (first - 2 * second + third))
+
+    def simulate(self, initial, times, rtol=1e-4, atol=1e-10,
+                 max_steps=100000):
+        """Integrates the concentrations over time.
+
+        Parameters
+        ----------
+        initial : dict or array_like
+            The starting concentration of each species, by species (missing
+            species start at 0) or in the order of `species`.
+        times : array_like
+            The times to report the concentrations at, in increasing order.
+            The first is the time the `initial` concentrations are at.
+        rtol, atol : float, optional
+            The relative and absolute error allowed in each step.
+        max_steps : int, optional
+            The most steps (accepted or not) the integrator takes.
+
+        Returns
+        -------
+        Trajectory
+
+        Raises
+        ------
+        ReactionError
+            If the integrator takes too many steps.
+        """
+
+        times = np.asarray(times, float)
+        if isinstance(initial, dict):
+            current = np.zeros(len(self.species))
+            for species, concentration in initial.iteritems():
+                current[self.index[species]] = concentration
+        else:
+            current = np.array(initial, float)
+        if len(times) < 1 or np.any(np.diff(times) < 0):
+            raise ValueError("The times must be in increasing order")
+        concentrations = np.empty((len(times), len(self.species)))
+        concentrations[0] = current
+        start = current.copy()
+
+        time = times[0]
+        span = times[-1] - times[0]
+        slope = self.derivative(current)
+        scale = atol + rtol * np.abs(current)
+        size = np.sqrt(np.mean((current / scale) ** 2)) if len(current) else 0
+        speed = np.sqrt(np.mean((slope / scale) ** 2)) if len(current) else 0
+        step = (0.01 * size / speed if size > 1e-5 and speed > 1e-5
+                else 1e-6 * span)
+        steps = rejected = 0
+        for number in xrange(1, len(times)):
+            while time < times[number]:
+                if steps + rejected >= max_steps:
+                    raise ReactionError("The kinetics took too many steps")
+                # A step cut short to land on a reported time doesn't hold
+                # back the ones after it
+                trial = min(step, times[number] - time)
+                found = self._step(current, slope, trial, rtol * 1e-3)
+                if found is None:
+                    # GMRES didn't converge; a shorter step is easier to solve
+                    rejected += 1
+                    step = trial * _SHRINK
+                    continue
+                following, following_slope, error = found
+                scale = atol + rtol * np.maximum(np.abs(current),
+                                                 np.abs(following))
+                norm = np.sqrt(np.mean((error / scale) ** 2))
+                factor = min(_GROWTH, max(_SHRINK, _SAFETY * max(
+                    norm, 1e-10) ** (-1. / 3)))
+                if norm > 1.:
+                    rejected += 1
+                    step = trial * min(factor, 1.)
+                    continue
+                steps += 1
+                time = (times[number] if trial == times[number] - time
+                        else time + trial)
+                # Concentrations can't be negative; any that are come from
+                # rounding in a species that has all but run out
+                if following.min() < 0:
+                    following = np.maximum(following, 0.)
+                    following_slope = self.derivative(following)
+                current, slope = following, following_slope
+                step = max(step, trial * factor) if trial < step else (
+                    trial * factor)
+            concentrations[number] = current
+        return Trajectory(self, times, concentrations, start, steps, rejected)
+
+
+class Trajectory(object):
+    """The concentrations of a simulated network over time.
+
+    Parameters
+    ----------
+    kinetics : Kinetics
+        The network that was simulated.
+    times : numpy.ndarray
+        The times the concentrations are reported at.
+    concentrations : numpy.ndarray
+        A row for each time, with a column for each species.
+    initial : numpy.ndarray
+        The starting concentrations.
+    steps, rejected : int
+        How many steps the integrator took, and how many it tried and threw
+        away.
+
+    Attributes
+    ----------
+    times : numpy.ndarray
+    concentrations : numpy.ndarray
+    steps : int
+    rejected : int
+    """
+
+    def __init__(self, kinetics, times, concentrations, initial, steps,
+                 rejected):
+        self.kinetics = kinetics
+        self.times = times
+        self.concentrations = concentrations
+        self.initial = initial
+        self.steps = steps
+        self.rejected = rejected
+
+    def course(self, species):
+        """The concentration of a species at each of the times."""
+
+        return self.concentrations[:, self.kinetics.index[species]]
+
+    def final(self):
+        """The concentration of every species at the last time.
+
+        Returns
+        -------
+        dict
+            Maps each species to its concentration.
+        """
+
+        return dict(zip(self.kinetics.species,
+                        self.concentrations[-1].tolist()))
+
+    def distribution(self, species=None):
+        """The share of the products each species makes up at the end.
+
+        Parameters
+        ----------
+        species : iterable, optional
+            The species to share between.  Defaults to the products: every
+            species that started with none.
+
+        Returns
+        -------
+        dict
+            Maps each of the species to its fraction of their total
+            concentration at the last time (all 0 if there is none).
+        """
+
+        if species is None:
+            species = [key for key, concentration
+                       in zip(self.kinetics.species, self.initial)
+                       if concentration == 0]
+        final = np.array([self.concentrations[-1, self.kinetics.index[key]]
+                          for key in species])
+        total = final.sum()
+        if total > 0:
+            final = final / total
+        return dict(zip(species, final.tolist()))
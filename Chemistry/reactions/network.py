@@ -0,0 +1,710 @@
+# pyCAOS - An organic chemistry reaction simulator, written in Python
+# Copyright (C) 2014, 2015 Dan Obermiller
+#
+# The full license is available in the root directory of the repository
+
+"""Tools to explore what a set of starting compounds can turn into over several
+reaction steps.
+
+A `ReactionNetwork` is a directed, bipartite graph.  Species nodes ('s#') hold
+a Compound and the roles (Acid, Base, ...) it can play in a reaction.  Reaction
+nodes ('r#') record a single successful reaction; edges run from the reactant
+species to the reaction node, and from the reaction node to each product
+species.
+
+The network is expanded breadth-first.  Each layer tries every `_Reaction`
+subclass against every combination of roles that includes at least one role
+from the current frontier, so nothing is reacted twice.  Products that are
+isomorphic to a known species are merged into it instead of creating a new
+node.  Roles at symmetry-equivalent atoms (see `Compound.symmetry_classes`) are
+merged the same way, so the three protons of a methyl group are reacted once,
+by a role whose 'degeneracy' is 3.
+"""
+
+__author__ = "Dan Obermiller"
+
+
+import collections
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+
+import networkx as nx
+from networkx.algorithms import isomorphism
+
+from Chemistry import profiling
+from Chemistry.base import reactants
+from Chemistry.base.compounds import Compound
+from Chemistry.base.products import EquilibriumProducts
+from Chemistry.reactions._reactions import _Reaction, Conditions
+from Chemistry.exceptions.ReactionErrors import ReactionError
+
+
+# The modules that define reactions.  They are imported before the reactions
+# are looked for, since the package loads its submodules lazily and a reaction
+# only becomes a subclass of `_Reaction` once its module has been imported.
+REACTION_MODULES = ('Chemistry.reactions.acid_base',)
+# How many chunks of work per process are handed to a pool at a time
+_WINDOW = 4
+
+
+def available_reactions():
+    """Finds every concrete `_Reaction` subclass that declares its reactants.
+
+    Returns
+    -------
+    list
+        The reaction classes, in a stable order.  The modules in
+        `REACTION_MODULES` are imported first, so the result doesn't depend on
+        what the process has imported so far.
+    """
+
+    for module in REACTION_MODULES:
+        importlib.import_module(module)
+    found = []
+    to_visit = list(_Reaction.__subclasses__())
+    while to_visit:
+        cls = to_visit.pop(0)
+        to_visit.extend(cls.__subclasses__())
+        if cls.reactant_types and not getattr(cls, '__abstractmethods__', ()):
+            found.append(cls)
+    return sorted(set(found), key=lambda cls: cls.__name__)
+
+
+def species_key(compound):
+    """Generates a key for a compound that is the same for isomorphic
+    compounds.
+
+    Parameters
+    ----------
+    compound : Compound, _CompoundWrapper
+        The compound being keyed.
+
+    Returns
+    -------
+    string
+        The key.
+
+    Notes
+    -----
+    The key comes from a few rounds of neighborhood refinement of the atomic
+    symbols and bond orders.  Isomorphic compounds always share a key, but a
+    shared key does not guarantee isomorphism, so it should only be used to
+    narrow down the candidates that need a full isomorphism check.
+    """
+
+    return '{:x}'.format(compound._refined_hash() & 0xffffffff)
+
+
+def _same_order(edge1, edge2):
+    """Edge matcher that only considers the order of the bonds."""
+
+    return edge1['bond_obj'].order == edge2['bond_obj'].order
+
+
+def _flatten_role(reactant):
+    """Describes the role a reactant plays, without its compound.
+
+    Returns
+    -------
+    dict or None
+        None if the object is not a role that the network understands.
+    """
+
+    if isinstance(reactant, reactants.Acid):
+        point = reactant.acidic_point
+    elif isinstance(reactant, reactants.Base):
+        point = reactant.basic_point
+    else:
+        return None
+    role = {'type': reactant.__class__.__name__,
+            'point': point,
+            'pka': reactant.pka}
+    if getattr(reactant, 'degeneracy', 1) != 1:
+        role['degeneracy'] = reactant.degeneracy
+    return role
+
+
+def _build_role(compound, role):
+    """Inverse of `_flatten_role`; wraps a compound in the described role."""
+
+    return getattr(reactants, role['type'])(compound, role['point'],
+                                            role['pka'],
+                                            role.get('degeneracy', 1))
+
+
+def _site_roles(roles, classes):
+    """Merges roles at symmetry-equivalent points into a role per class.
+
+    Parameters
+    ----------
+    roles : list
+        Role dictionaries, including the ones a species already has.
+    classes : dict
+        The symmetry classes of the species' atoms.
+
+    Returns
+    -------
+    list
+        The roles, less any that play the same part (same type and pKa) at a
+        point equivalent to an earlier one's.  Each role's 'degeneracy' is the
+        number of equivalent points it stands for, and is left out when that
+        is 1.
+    """
+
+    sizes = collections.Counter(classes.itervalues())
+    merged = []
+    seen = set()
+    for role in roles:
+        site = (role['type'], role['pka'], classes[role['point']])
+        if site in seen:
+            continue
+        seen.add(site)
+        role = dict(role)
+        role.pop('degeneracy', None)
+        if sizes[site[2]] > 1:
+            role['degeneracy'] = sizes[site[2]]
+        merged.append(role)
+    return merged
+
+
+def _default_roles(compound):
+    """Default role assignment for reaction products.
+
+    Products that come out of a reaction already wrapped in a role (the
+    conjugate acid from an AcidBase reaction, for example) keep that role.
+    Anything else becomes a species that can't react further.
+    """
+
+    if isinstance(compound, reactants.Reactant):
+        return [compound]
+    return []
+
+
+def _react_combination(work):
+    """Runs a single reaction.  Module level so it can be used by a Pool.
+
+    Parameters
+    ----------
+    work : tuple
+        (reaction class, conditions, assign_roles, [(flat compound, role)...])
+
+    Returns
+    -------
+    list or None
+        A (percentage, flat compound, [roles]) tuple for each product, or None
+        if no reaction occurred.
+    """
+
+    reaction, conditions, assign_roles, members = work
+    built = [_build_role(Compound(flat['atoms'], flat['bonds'],
+                                  flat['other_info']), role)
+             for flat, role in members]
+    try:
+        result = reaction(*(built + [conditions])).react()
+    except ReactionError:
+        return None
+
+    if isinstance(result, EquilibriumProducts):
+        result = result.products
+    products = []
+    for product in result.major + result.minor:
+        if product.compound is None:
+            continue
+        roles = [_flatten_role(role) for role in assign_roles(product.compound)]
+        products.append((product.percentage,
+                         product.compound.to_dict(),
+                         [role for role in roles if role is not None]))
+    return products
+
+
+class ReactionNetwork(object):
+    """A network of species connected by the reactions between them.
+
+    Parameters
+    ----------
+    species : iterable, optional
+        The starting species.  Each should be a Reactant (Acid, Base, etc.) or
+        a plain Compound; the same compound may be given more than once with
+        different roles.
+    reactions : list, optional
+        The `_Reaction` subclasses to apply.  Defaults to every available
+        reaction.
+    conditions : Conditions, dict, optional
+        The conditions every reaction is run under.
+    assign_roles : callable, optional
+        Called with each product compound, returns the list of Reactant objects
+        it should participate as.  Must be picklable (module level) to be used
+        with more than one process.
+
+    Attributes
+    ----------
+    graph : networkx.DiGraph
+        The species and reaction nodes.
+    depth : int
+        How many layers have been expanded.
+    frontier : set
+        The (species key, role index) pairs that have not been reacted yet.
+    """
+
+    def __init__(self, species=(), reactions=None, conditions=None,
+                 assign_roles=None):
+        if reactions is None:
+            reactions = available_reactions()
+        if conditions is None:
+            conditions = {}
+        if isinstance(conditions, dict):
+            conditions = Conditions(conditions)
+        if assign_roles is None:
+            assign_roles = _default_roles
+        self.reactions = list(reactions)
+        self.conditions = conditions
+        self.assign_roles = assign_roles
+        self.graph = nx.DiGraph()
+        self.depth = 0
+        self.frontier = set()
+        # The frontier of a layer that was cut short, and the (reaction name,
+        # members) it recorded, so that finishing it doesn't make them again
+        self._unfinished = set()
+        self._reacted = set()
+        self._buckets = {}
+        self._scount = 1
+        self._rcount = 1
+
+        for reactant in species:
+            if isinstance(reactant, reactants.Reactant):
+                self.add_species(reactant.compound, [reactant])
+            else:
+                self.add_species(reactant)
+
+    @property
+    def species(self):
+        """The keys of all of the species nodes.
+
+        Returns
+        -------
+        list
+            The species keys, in the order they were found.
+        """
+
+        return sorted((node for node, data in self.graph.nodes_iter(data=True)
+                       if data['kind'] == 'species'),
+                      key=lambda node: int(node[1:]))
+
+    @property
+    def reaction_nodes(self):
+        """The keys of all of the reaction nodes.
+
+        Returns
+        -------
+        list
+            The reaction keys, in the order they occurred.
+        """
+
+        return sorted((node for node, data in self.graph.nodes_iter(data=True)
+                       if data['kind'] == 'reaction'),
+                      key=lambda node: int(node[1:]))
+
+    def compound(self, key):
+        """The compound stored for a species.
+
+        Parameters
+        ----------
+        key : string
+            The species key.
+
+        Returns
+        -------
+        Compound
+        """
+
+        return self.graph.node[key]['compound']
+
+    def roles(self, key):
+        """The roles a species can take in a reaction.
+
+        Parameters
+        ----------
+        key : string
+            The species key.
+
+        Returns
+        -------
+        list
+            Reactant objects wrapping the species' compound.
+        """
+
+        compound = self.compound(key)
+        return [_build_role(compound, role)
+                for role in self.graph.node[key]['roles']]
+
+    def find(self, compound):
+        """Finds the species isomorphic to a compound.
+
+        Parameters
+        ----------
+        compound : Compound, _CompoundWrapper
+            The compound being looked for.
+
+        Returns
+        -------
+        tuple
+            (species key, mapping of the compound's atom keys to the species'
+            atom keys), or (None, None) if the compound is unknown.
+        """
+
+        if isinstance(compound, reactants.Reactant):
+            compound = compound.compound
+        for key in self._buckets.get(species_key(compound), ()):
+            matcher = isomorphism.GraphMatcher(
+                compound, self.compound(key),
+                node_match=Compound._node_matcher, edge_match=_same_order)
+            if matcher.is_isomorphic():
+                return key, matcher.mapping
+        return None, None
+
+    @profiling.timed('network.add_species')
+    def add_species(self, compound, roles=()):
+        """Adds a species to the network, merging it with an existing isomorphic
+        species if there is one.
+
+        Parameters
+        ----------
+        compound : Compound
+            The species' compound.
+        roles : iterable, optional
+            Reactant objects (or the dictionaries produced for them) describing
+            how the compound can react.  Their atom keys refer to `compound`.
+
+        Returns
+        -------
+        key : string
+            The key of the species node.
+        """
+
+        roles = [role if isinstance(role, dict) else _flatten_role(role)
+                 for role in roles]
+        key, mapping = self.find(compound)
+        if key is None:
+            key = 's{}'.format(self._scount)
+            self._scount += 1
+            self.graph.add_node(key, {'kind': 'species',
+                                      'compound': compound,
+                                      'roles': []})
+            self._buckets.setdefault(species_key(compound), []).append(key)
+        else:
+            roles = [dict(role, point=mapping[role['point']])
+                     for role in roles if role is not None]
+
+        # Equivalent points would only give the same products again, so each
+        # class of them is reacted once, on behalf of all of them
+        known = self.graph.node[key]['roles']
+        merged = _site_roles(known + [role for role in roles
+                                      if role is not None],
+                             self.compound(key).symmetry_classes)
+        for role in merged[len(known):]:
+            known.append(role)
+            self.frontier.add((key, len(known) - 1))
+        return key
+
+    def _combinations(self, frontier, later=frozenset()):
+        """Lazily generates every reaction that a frontier makes possible.
+
+        Parameters
+        ----------
+        frontier : set
+            The (species key, role index) pairs that haven't been reacted.
+        later : set, optional
+            Pairs that are left out, because they were found after the layer
+            started and belong to the next one.
+
+        Yields
+        ------
+        tuple
+            (reaction class, [(species key, role index), ...])
+
+        Notes
+        -----
+        The roles each reaction can draw on are collected before anything is
+        yielded, so species and roles recorded while the combinations are
+        being consumed are left to the next layer.  Combinations already
+        recorded by an unfinished layer are skipped.
+        """
+
+        roles = [(key, i, getattr(reactants, role['type']))
+                 for key in self.species
+                 for i, role in enumerate(self.graph.node[key]['roles'])
+                 if (key, i) not in later]
+        pools = [[[(key, i) for key, i, cls in roles if issubclass(cls, typ)]
+                  for typ in reaction.reactant_types]
+                 for reaction in self.reactions]
+        for reaction, reaction_pools in zip(self.reactions, pools):
+            for members in itertools.product(*reaction_pools):
+                if (any(member in frontier for member in members) and
+                        (reaction.__name__, members) not in self._reacted):
+                    yield reaction, members
+
+    def _work(self, combinations):
+        """Converts generated combinations into picklable work items."""
+
+        flats = {}
+        for reaction, members in combinations:
+            flat_members = []
+            for key, i in members:
+                if key not in flats:
+                    flats[key] = self.compound(key).to_dict()
+                flat_members.append((flats[key],
+                                     self.graph.node[key]['roles'][i]))
+            yield (reaction, members), (reaction, self.conditions,
+                                        self.assign_roles, flat_members)
+
+    @staticmethod
+    def _products(products):
+        """Builds the compounds of the products a worker sent back."""
+
+        return [(percentage,
+                 Compound(flat['atoms'], flat['bonds'], flat['other_info']),
+                 roles)
+                for percentage, flat, roles in products]
+
+    def _fits(self, products, max_species):
+        """Whether the network stays within `max_species` with a reaction's
+        products added.
+        """
+
+        if max_species is None:
+            return True
+        new = sum(1 for _, product, _ in products
+                  if self.find(product)[0] is None)
+        return self._scount - 1 + new <= max_species
+
+    def _record(self, reaction, members, products):
+        """Adds a reaction node and its (built) products to the graph."""
+
+        profiling.count('network.reactions')
+        self._reacted.add((reaction.__name__, tuple(members)))
+        r_key = 'r{}'.format(self._rcount)
+        self._rcount += 1
+        self.graph.add_node(r_key, {'kind': 'reaction',
+                                    'reaction': reaction.__name__,
+                                    'depth': self.depth + 1})
+        for key, i in members:
+            self.graph.add_edge(key, r_key, {'role': i})
+        for percentage, product, roles in products:
+            p_key = self.add_species(product, roles)
+            self.graph.add_edge(r_key, p_key, {'percentage': percentage})
+
+    def expand(self, max_depth=1, max_species=None, processes=None,
+               chunksize=16, checkpoint=None):
+        """Expands the network breadth-first.
+
+        Parameters
+        ----------
+        max_depth : int, optional
+            The number of layers to expand.  Defaults to a single layer.
+        max_species : int, optional
+            Stops expanding once the network holds this many species.  A
+            reaction is only recorded if its new products fit, so the network
+            never grows past it.  A layer cut short keeps its frontier and
+            remembers the reactions it recorded (checkpoints included), so a
+            later call with a larger cap finishes that layer first, without
+            repeating them.
+        processes : int, optional
+            The number of worker processes used to run each layer.  The default
+            (None) runs everything in this process.
+        chunksize : int, optional
+            How many reactions are sent to a worker at a time.  Combinations are
+            generated lazily and handed to the pool `_WINDOW` chunks per
+            process at a time, so this also bounds how much work is in flight.
+        checkpoint : string, optional
+            A path the network is saved to after every layer.
+
+        Returns
+        -------
+        self : ReactionNetwork
+            The network, for convenience.
+        """
+
+        pool = None
+        if processes is not None and processes > 1:
+            pool = multiprocessing.Pool(processes)
+
+        try:
+            for _ in range(max_depth):
+                if (not (self.frontier or self._unfinished)
+                        or self._full(max_species)):
+                    break
+                if self._unfinished:
+                    # Finish the layer that was cut short; the roles found
+                    # since it started are left to the next one
+                    frontier, self._unfinished = self._unfinished, set()
+                    later = set(self.frontier)
+                else:
+                    frontier, self.frontier = self.frontier, set()
+                    later = set()
+                window = chunksize * _WINDOW * (processes or 1)
+                finished = self._expand_layer(frontier, pool, chunksize,
+                                              window, max_species, later)
+                if finished:
+                    self.depth += 1
+                    self._reacted.clear()
+                else:
+                    self._unfinished = frontier
+                if checkpoint is not None:
+                    self.save(checkpoint)
+                if not finished:
+                    break
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        return self
+
+    def _full(self, max_species):
+        # Species are numbered from 1 without gaps, so the next number says
+        # how many there are
+        return max_species is not None and self._scount - 1 >= max_species
+
+    def _expand_layer(self, frontier, pool, chunksize, window, max_species,
+                      later=frozenset()):
+        """Runs every reaction made possible by a single frontier layer, at
+        most `window` reactions at a time.
+
+        Returns
+        -------
+        bool
+            False if the layer stopped at a reaction whose products wouldn't
+            fit in `max_species`.
+        """
+
+        work = self._work(self._combinations(frontier, later))
+        while True:
+            # Pool.imap would read the whole iterable up front, so it is only
+            # ever given a window of it
+            batch = list(itertools.islice(work, window))
+            if not batch:
+                return True
+            tags, items = zip(*batch)
+            if pool is None:
+                results = itertools.imap(_react_combination, items)
+            else:
+                results = pool.imap(_react_combination, items, chunksize)
+
+            for (reaction, members), products in itertools.izip(tags,
+                                                                results):
+                if products is None:
+                    continue
+                products = self._products(products)
+                if not self._fits(products, max_species):
+                    return False
+                self._record(reaction, members, products)
+
+    def to_dict(self):
+        """Generates a JSON friendly representation of the network.
+
+        Returns
+        -------
+        dict
+        """
+
+        species = {}
+        for key in self.species:
+            data = self.graph.node[key]
+            species[key] = {'compound': data['compound'].to_dict(),
+                            'roles': data['roles']}
+        reactions = {}
+        for key in self.reaction_nodes:
+            data = self.graph.node[key]
+            reactions[key] = {
+                'reaction': data['reaction'],
+                'depth': data['depth'],
+                'reactants': [(first, edge['role']) for first, _, edge in
+                              self.graph.in_edges_iter(key, data=True)],
+                'products': [(second, edge['percentage']) for _, second, edge
+                             in self.graph.out_edges_iter(key, data=True)]}
+        return {'depth': self.depth,
+                'species': species,
+                'reactions': reactions,
+                'frontier': sorted(self.frontier),
+                'unfinished': sorted(self._unfinished),
+                'reacted': sorted([name, list(members)]
+                                  for name, members in self._reacted)}
+
+    def save(self, path):
+        """Checkpoints the network to disk.
+
+        Parameters
+        ----------
+        path : string
+            The file the network is written to.  Written to a temporary file
+            first, so an interrupted save never clobbers the last checkpoint.
+        """
+
+        temp = path + '.tmp'
+        with open(temp, 'w') as checkpoint:
+            json.dump(self.to_dict(), checkpoint, sort_keys=True)
+        _replace(temp, path)
+
+    @classmethod
+    def load(cls, path, reactions=None, conditions=None, assign_roles=None):
+        """Restores a checkpointed network so it can keep expanding.
+
+        Parameters
+        ----------
+        path : string
+            The file written by `save`.
+        reactions, conditions, assign_roles
+            As for the constructor; these are not stored in the checkpoint.
+
+        Returns
+        -------
+        ReactionNetwork
+        """
+
+        with open(path, 'r') as checkpoint:
+            data = json.load(checkpoint)
+
+        network = cls(reactions=reactions, conditions=conditions,
+                      assign_roles=assign_roles)
+        for key in sorted(data['species'], key=lambda key: int(key[1:])):
+            info = data['species'][key]
+            flat = info['compound']
+            bonds = {b_key: (first, second, rest) for b_key, (first, second,
+                                                              rest)
+                     in flat['bonds'].iteritems()}
+            compound = Compound(flat['atoms'], bonds, flat['other_info'])
+            network.graph.add_node(key, {'kind': 'species',
+                                         'compound': compound,
+                                         'roles': info['roles']})
+            network._buckets.setdefault(species_key(compound), []).append(key)
+        for key in sorted(data['reactions'], key=lambda key: int(key[1:])):
+            info = data['reactions'][key]
+            network.graph.add_node(key, {'kind': 'reaction',
+                                         'reaction': info['reaction'],
+                                         'depth': info['depth']})
+            for first, role in info['reactants']:
+                network.graph.add_edge(first, key, {'role': role})
+            for second, percentage in info['products']:
+                network.graph.add_edge(key, second,
+                                       {'percentage': percentage})
+
+        network.depth = data['depth']
+        network.frontier = set((key, i) for key, i in data['frontier'])
+        network._unfinished = set(
+            (key, i) for key, i in data.get('unfinished', ()))
+        network._reacted = set(
+            (name, tuple((key, i) for key, i in members))
+            for name, members in data.get('reacted', ()))
+        network._scount = len(data['species']) + 1
+        network._rcount = len(data['reactions']) + 1
+        return network
+
+
+def _replace(source, destination):
+    """Moves a file over another one, as atomically as the OS allows."""
+
+    if os.name == 'nt' and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
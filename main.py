@@ -15,8 +15,28 @@ parser.add_argument('-c', '--clean', dest='clean',
                     help='Signals that the directory should get cleaned up')
 parser.add_argument('-g', '--gui', dest='gui', default=False,
                     action='store_true', help='Runs the GUI')
+parser.add_argument('-b', '--batch', dest='batch', nargs='+', default=None,
+                    metavar='PATH',
+                    help=' '.join(['Runs the reactions over every molecule',
+                                   'file (or directory of them) without the',
+                                   'GUI']))
+parser.add_argument('-o', '--output', dest='output', default='-',
+                    help=' '.join(['Where batch results are written, as JSON',
+                                   'lines.  Defaults to stdout']))
+parser.add_argument('-w', '--workers', dest='workers', default=None, type=int,
+                    help=' '.join(['Worker processes used by a batch.',
+                                   'Defaults to the number of CPUs']))
+parser.add_argument('-p', '--profile', dest='profile', default=None,
+                    nargs='?', const='-', metavar='FILE',
+                    help=' '.join(['Times the reaction pipeline and writes',
+                                   'the report to FILE (JSON if it ends in',
+                                   '.json), or stderr if no FILE is given']))
 args = parser.parse_args()
 
+if args.profile is not None:
+    from Chemistry import profiling
+    profiling.enable()
+
 if args.clean:
     from scripts.make_clean import make_clean
     from scripts.strip_whitespace import strip_whitespace
@@ -29,5 +49,24 @@ if args.gui:
     sys.argv = sys.argv[:1]   # kivy messes up if I don't do this
     from Chemistry import chemgui
     chemgui.main()
-else:   
-    pass
+elif args.batch:
+    import sys
+    from Chemistry.interface.batch import run_batch
+
+    if args.output == '-':
+        summary = run_batch(args.batch, sys.stdout, args.workers)
+    else:
+        with open(args.output, 'w') as output:
+            summary = run_batch(args.batch, output, args.workers)
+    sys.stderr.write(
+        '{files} files, {records} records ({failed} failed) in '
+        '{seconds:.2f}s\n'.format(**summary))
+
+if args.profile is not None:
+    if args.profile == '-':
+        import sys
+        sys.stderr.write(profiling.report() + '\n')
+    else:
+        fmt = 'json' if args.profile.endswith('.json') else 'text'
+        with open(args.profile, 'w') as report:
+            report.write(profiling.report(fmt) + '\n')